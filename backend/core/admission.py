@@ -0,0 +1,176 @@
+"""
+backend/core/admission.py
+=========================
+v1 엔드포인트 DB 호출 입장 제어 (load shedding + deadline).
+
+Supabase 가 느려지면 동기 supabase-py 호출이 이벤트 루프를 붙잡고 요청이 계속 쌓여
+결국 모든 클라이언트가 타임아웃됩니다. 여기서는 DB 호출을
+  1) 동시 실행 상한(MAX_INFLIGHT) 세마포어 뒤에서
+  2) 워커 스레드(asyncio.to_thread)로 실행하고
+  3) 요청별 deadline(DB_DEADLINE) 을 넘기면 대기를 끊어
+일부 요청만 빠르게 거절하고 나머지는 정상 응답하도록 합니다.
+
+스레드 안의 DB 호출은 취소할 수 없으므로 슬롯은 스레드가 실제로 끝날 때 반납합니다
+(deadline 으로 요청만 먼저 돌려줘도 동시 DB 호출 수는 MAX_INFLIGHT 를 넘지 않음).
+스레드가 오래 붙잡히지 않도록 supabase 클라이언트(backend/core/db.py)의
+PostgREST HTTP 타임아웃도 DB_DEADLINE 으로 맞춥니다.
+
+거절(Overloaded) 사유:
+  queue_full   대기열(MAX_QUEUE) 가득
+  queue_wait   QUEUE_TIMEOUT 내 슬롯 확보 실패
+  deadline     DB 호출이 DB_DEADLINE 초과
+               (요청은 즉시 반환, 슬롯은 HTTP 타임아웃으로 스레드가 끝날 때 반납)
+
+거절 시 serve_stale_or_503() 이 캐시의 stale 사본(cache.cache_get_stale)을 반환하거나,
+없으면 503 + Retry-After 를 돌려줍니다.
+
+환경변수:
+  V1_MAX_INFLIGHT    동시 DB 호출 상한       (기본 16)
+  V1_MAX_QUEUE       슬롯 대기 요청 상한      (기본 32)
+  V1_QUEUE_TIMEOUT   슬롯 대기 최대 초        (기본 1.0)
+  V1_DB_DEADLINE     DB 호출 deadline 초      (기본 5.0, PostgREST HTTP 타임아웃 겸용)
+
+사용 예시:
+  from backend.core.admission import run_db, Overloaded, serve_stale_or_503
+
+  try:
+      rows = await run_db(lambda: query.limit(limit).execute().data or [])
+  except Overloaded:
+      return await serve_stale_or_503(cache_key, MyResponse, response)
+"""
+
+import asyncio
+import logging
+import os
+from typing import Any, Callable, Optional
+
+from fastapi import HTTPException, Response
+
+from backend.core.cache import cache_get_stale
+
+logger = logging.getLogger(__name__)
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+MAX_INFLIGHT  = int(_env_float("V1_MAX_INFLIGHT", 16))
+MAX_QUEUE     = int(_env_float("V1_MAX_QUEUE", 32))
+QUEUE_TIMEOUT = _env_float("V1_QUEUE_TIMEOUT", 1.0)
+DB_DEADLINE   = _env_float("V1_DB_DEADLINE", 5.0)
+RETRY_AFTER   = 5   # 503 응답 Retry-After (초)
+
+
+class Overloaded(Exception):
+    """입장 거절. reason: queue_full / queue_wait / deadline"""
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+# ── 상태 + 집계 (프로세스 재시작 시 초기화) ───────────────────────────────────
+
+_semaphore: Optional[asyncio.Semaphore] = None
+_inflight: int = 0
+_waiting: int = 0
+_STATS: dict[str, int] = {
+    "admitted":   0,
+    "queue_full": 0,
+    "queue_wait": 0,
+    "deadline":   0,
+    "stale":      0,
+    "rejected":   0,   # stale 없이 503 반환
+}
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    # 이벤트 루프 생성 이후에 만들어야 하므로 lazy init
+    global _semaphore
+    if _semaphore is None:
+        _semaphore = asyncio.Semaphore(MAX_INFLIGHT)
+    return _semaphore
+
+
+def get_admission_stats() -> dict:
+    """현재 대기열 깊이 / 실행 중 / 거절 통계 반환."""
+    shed = _STATS["queue_full"] + _STATS["queue_wait"] + _STATS["deadline"]
+    return {
+        "inflight":     _inflight,
+        "queue_depth":  _waiting,
+        "max_inflight": MAX_INFLIGHT,
+        "max_queue":    MAX_QUEUE,
+        "shed":         shed,
+        **_STATS,
+    }
+
+
+# ── 공개 API ──────────────────────────────────────────────────────────────────
+
+async def run_db(fn: Callable[[], Any], deadline: Optional[float] = None) -> Any:
+    """
+    동기 DB 호출 fn() 을 입장 제어 하에 워커 스레드에서 실행합니다.
+
+    Raises:
+        Overloaded: 대기열 초과 / 슬롯 대기 타임아웃 / deadline 초과
+        Exception:  fn() 자체 예외는 그대로 전파 (호출부에서 500 처리)
+    """
+    global _inflight, _waiting
+    sem = _get_semaphore()
+
+    if sem.locked() and _waiting >= MAX_QUEUE:
+        _STATS["queue_full"] += 1
+        raise Overloaded("queue_full")
+
+    _waiting += 1
+    try:
+        await asyncio.wait_for(sem.acquire(), QUEUE_TIMEOUT)
+    except asyncio.TimeoutError:
+        _STATS["queue_wait"] += 1
+        raise Overloaded("queue_wait")
+    finally:
+        _waiting -= 1
+
+    _inflight += 1
+    _STATS["admitted"] += 1
+    # 슬롯 반납은 스레드 종료 시점 — deadline 초과로 요청을 먼저 돌려줘도 DB 호출은 계속 진행 중
+    fut = asyncio.ensure_future(asyncio.to_thread(fn))
+    fut.add_done_callback(_release_slot)
+    try:
+        return await asyncio.wait_for(asyncio.shield(fut), deadline or DB_DEADLINE)
+    except asyncio.TimeoutError:
+        _STATS["deadline"] += 1
+        raise Overloaded("deadline")
+
+
+def _release_slot(fut: asyncio.Future) -> None:
+    global _inflight
+    _inflight -= 1
+    _get_semaphore().release()
+    if not fut.cancelled():
+        fut.exception()   # deadline 후 끝난 호출의 예외는 버림 (미조회 경고 방지)
+
+
+async def serve_stale_or_503(cache_key: str, model: type, response: Response):
+    """
+    Overloaded 처리: stale 캐시가 있으면 model(**stale) 반환 (X-Cache-Status: stale),
+    없으면 503 + Retry-After.
+    """
+    stale = await cache_get_stale(cache_key)
+    if stale is not None:
+        _STATS["stale"] += 1
+        response.headers["X-Cache-Status"] = "stale"
+        logger.warning(f"[admission] 과부하 → stale 응답: {cache_key}")
+        return model(**stale)
+
+    _STATS["rejected"] += 1
+    logger.warning(f"[admission] 과부하 → 503: {cache_key}")
+    raise HTTPException(
+        status_code=503,
+        detail="요청이 많아 일시적으로 처리할 수 없습니다. 잠시 후 다시 시도하세요.",
+        headers={"Retry-After": str(RETRY_AFTER)},
+    )
@@ -3,22 +3,25 @@ backend/core/cache.py
 =====================
 비동기 캐시 레이어.
 
-Redis 가 있으면 Redis, 없으면 in-process TTL dict 폴백.
+Redis 가 있으면 Redis, 없으면 워커 간 공유 캐시(shared_cache.py) 또는 in-process TTL dict 폴백.
 
 환경변수:
-  REDIS_URL   redis://host:port/db  (없으면 로컬 in-process 캐시 사용)
+  REDIS_URL          redis://host:port/db  (없으면 로컬 캐시 사용)
+  SHARED_CACHE_PATH  공유 캐시 파일 경로   (또는 WEB_CONCURRENCY>1 이면 /dev/shm 기본 경로)
 
 공개 API:
   make_cache_key(prefix, **params)  -> str
   cache_get(key)                    -> Any | None
-  cache_set(key, value, ttl)        -> None
+  cache_set(key, value, ttl, keep_stale=False) -> None  (keep_stale: 과부하 폴백용 stale 사본도 저장)
   cache_delete_pattern(pattern)     -> int  (삭제된 키 수)
+  cache_get_stale(key)              -> Any | None  (과부하 시 만료된 값 폴백용)
 
 TTL 상수 (엔드포인트별):
   TTL_DISCLOSURES    = 300    # 5 min  – 장 중 신규 공시 주기
   TTL_SECTOR_SIGNALS = 600    # 10 min – EOD 1회 갱신
   TTL_MARKET_RADAR   = 900    # 15 min – EOD 1회 갱신
   TTL_EVENTS         = 3600   # 60 min – event_stats 거의 불변
+  TTL_TIMELINE       = 3600   # 60 min – stock_timelines EOD 1회 갱신
 
 사용 예시:
   from backend.core.cache import make_cache_key, cache_get, cache_set, TTL_DISCLOSURES
@@ -30,7 +33,7 @@ TTL 상수 (엔드포인트별):
 
   # ... Supabase 쿼리 ...
 
-  await cache_set(key, result.model_dump(), TTL_DISCLOSURES)
+  await cache_set(key, result.model_dump(), TTL_DISCLOSURES, keep_stale=True)
   return result
 """
 
@@ -41,6 +44,8 @@ import os
 import time
 from typing import Any, Optional
 
+from backend.core.shared_cache import get_shared_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -63,6 +68,14 @@ TTL_DISCLOSURES    = 300    # 5 min  — 장 중에도 신규 공시 유입 가
 TTL_SECTOR_SIGNALS = 600    # 10 min — compute_sector_signals 가 EOD에 1회 갱신
 TTL_MARKET_RADAR   = 900    # 15 min — market_radar 는 EOD에 1회 갱신
 TTL_EVENTS         = 3600   # 60 min — event_stats 는 backfill_prices --stats-only 후 갱신
+TTL_TIMELINE       = 3600   # 60 min — build_stock_timelines 가 EOD에 1회 갱신
+
+# stale 사본: cache_set(..., keep_stale=True) 시 "stale:" 접두사로 함께 저장.
+# 정상 TTL 이 지나도 STALE_TTL 동안 남아, DB 과부하 시(admission.py) 대체 응답으로 사용.
+# cache_delete_pattern("v1:...") 무효화 대상이 아니므로 serve_stale_or_503 을 쓰는
+# 공개 데이터 엔드포인트만 켠다 (사용자·플랜 레코드는 남기지 않음).
+STALE_PREFIX = "stale:"
+STALE_TTL    = 86400  # 24 h
 
 
 def _log_ratio_if_needed() -> None:
@@ -75,10 +88,18 @@ def _log_ratio_if_needed() -> None:
 
 # ── in-process TTL dict (Redis 없을 때 폴백) ──────────────────────────────────
 # { key: (value, expire_at_monotonic) }
+# 공유 캐시(shared_cache.py)가 활성화되어 있으면 _LOCAL 대신 그쪽을 사용합니다.
+# 공유 캐시가 잠금 대기 초과 등으로 실패하면 그 호출만 _LOCAL 로 처리합니다.
 _LOCAL: dict[str, tuple[Any, float]] = {}
 
 
 def _local_get(key: str) -> Optional[Any]:
+    shared = get_shared_cache()
+    if shared:
+        try:
+            return shared.get(key)
+        except Exception as e:
+            logger.debug(f"[cache] shared get 오류 → 로컬 캐시 조회: {e}")
     entry = _LOCAL.get(key)
     if entry:
         value, expire_at = entry
@@ -89,16 +110,31 @@ def _local_get(key: str) -> Optional[Any]:
 
 
 def _local_set(key: str, value: Any, ttl: int) -> None:
+    shared = get_shared_cache()
+    if shared:
+        try:
+            shared.set(key, value, ttl)
+            return
+        except Exception as e:
+            logger.debug(f"[cache] shared set 오류 → 로컬 캐시 저장: {e}")
     _LOCAL[key] = (value, time.monotonic() + ttl)
 
 
 def _local_delete_pattern(pattern: str) -> int:
     """단순 prefix* 패턴 삭제."""
+    # 공유 캐시 실패 중 _LOCAL 에 들어간 항목도 있을 수 있으므로 _LOCAL 은 항상 정리
+    deleted = 0
+    shared = get_shared_cache()
+    if shared:
+        try:
+            deleted = shared.delete_pattern(pattern)
+        except Exception as e:
+            logger.debug(f"[cache] shared delete_pattern 오류: {e}")
     prefix = pattern.rstrip("*")
     targets = [k for k in list(_LOCAL.keys()) if k.startswith(prefix)]
     for k in targets:
         _LOCAL.pop(k, None)
-    return len(targets)
+    return deleted + len(targets)
 
 
 # ── Redis 클라이언트 (lazy init, 1회만 연결 시도) ─────────────────────────────
@@ -213,15 +249,39 @@ async def cache_get(key: str) -> Optional[Any]:
     return val
 
 
-async def cache_set(key: str, value: Any, ttl: int) -> None:
+async def cache_get_stale(key: str) -> Optional[Any]:
+    """
+    key 의 stale 사본을 조회합니다 (정상 TTL 만료 후에도 STALE_TTL 동안 유지).
+    hit/miss 통계에는 포함하지 않습니다.
+    """
+    stale_key = STALE_PREFIX + key
+    r = await _get_redis()
+    if r:
+        try:
+            raw = await r.get(stale_key)
+            if raw:
+                return json.loads(raw)
+        except Exception as e:
+            logger.debug(f"[cache] redis stale get 오류: {e}")
+    return _local_get(stale_key)
+
+
+async def cache_set(key: str, value: Any, ttl: int, keep_stale: bool = False) -> None:
     """
     캐시에 값을 저장합니다.
 
     Args:
-        key:   make_cache_key() 로 생성한 키
-        value: JSON 직렬화 가능한 Python 객체 (Pydantic .model_dump() 결과)
-        ttl:   만료 시간 (초)
+        key:        make_cache_key() 로 생성한 키
+        value:      JSON 직렬화 가능한 Python 객체 (Pydantic .model_dump() 결과)
+        ttl:        만료 시간 (초)
+        keep_stale: True 면 stale 사본(STALE_TTL)도 저장 — serve_stale_or_503 을 쓰는 엔드포인트만
     """
+    await _store(key, value, ttl)
+    if keep_stale:
+        await _store(STALE_PREFIX + key, value, STALE_TTL)
+
+
+async def _store(key: str, value: Any, ttl: int) -> None:
     r = await _get_redis()
     if r:
         try:
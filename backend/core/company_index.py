@@ -0,0 +1,262 @@
+"""
+backend/core/company_index.py
+=============================
+기업명/종목코드 자동완성용 in-memory prefix 인덱스.
+
+dart_corp_codes 전체(수천 행)를 프로세스 메모리에 정렬 배열로 올려두고
+bisect 로 prefix 범위를 찾습니다. 요청마다 DB ilike 쿼리를 치는
+DARTDBClient.search_by_name 대비 타이핑 1회당 DB 왕복이 0회입니다.
+
+인덱싱 대상 키:
+  - 한글 기업명        "삼성전자"            (공백 제거, 소문자)
+  - 한글 초성          "ㅅㅅㅈㅈ"            (Hangul 음절 → 초성 자모)
+  - 영문 기업명        "samsungelectronics"  + 단어별 시작 위치 ("electronics...")
+  - 종목코드           "005930"
+
+재빌드:
+  빌드 시 캐시에 센티넬 키(INDEX_SENTINEL_KEY)를 심어두고, 조회 시
+  SENTINEL_CHECK_INTERVAL 초마다 센티넬 존재 여부를 확인합니다.
+  fetch_corp_name_en.py / fetch_corp_basic_info.py 는 저장 후
+  cache_delete_pattern("v1:companies:*") 로 센티넬을 지우므로,
+  다음 조회에서 인덱스가 재빌드됩니다. (Redis 미사용 시에는 센티넬 TTL 만료로 재빌드)
+  DB 조회(수 페이지)와 인덱스 구성은 워커 스레드에서 실행하고(이벤트 루프 비차단),
+  asyncio.Lock 으로 동시에 1회만 돌립니다. 재빌드 중에는 기존 인덱스를 그대로 서빙하며,
+  최초 빌드만 요청이 완료를 기다립니다.
+
+공개 API:
+  lookup_companies(q, limit)  -> list[dict]   (async, 필요 시 재빌드)
+  get_company_index()         -> CompanyIndex (async, 필요 시 재빌드)
+"""
+
+import asyncio
+import bisect
+import logging
+import re
+import time
+from typing import Optional
+
+from backend.core.cache import cache_get, cache_set
+
+logger = logging.getLogger(__name__)
+
+
+# ── 설정 ──────────────────────────────────────────────────────────────────────
+
+INDEX_SENTINEL_KEY      = "v1:companies:index"
+INDEX_TTL               = 21600   # 6 h — 센티넬 만료 시 강제 재빌드
+SENTINEL_CHECK_INTERVAL = 30      # 센티넬 확인 주기 (초) — 매 요청 캐시 왕복 방지
+_PAGE_SIZE              = 1000    # Supabase 기본 1000행 제한 → pagination
+
+
+# ── 한글 초성 ─────────────────────────────────────────────────────────────────
+
+_CHOSEONG = (
+    "ㄱ", "ㄲ", "ㄴ", "ㄷ", "ㄸ", "ㄹ", "ㅁ", "ㅂ", "ㅃ", "ㅅ",
+    "ㅆ", "ㅇ", "ㅈ", "ㅉ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ",
+)
+_CHOSEONG_SET = frozenset(_CHOSEONG)
+_HANGUL_BASE  = 0xAC00
+_HANGUL_LAST  = 0xD7A3
+
+_NON_WORD_RE = re.compile(r"[^0-9a-z가-힣ㄱ-ㅎ]+")
+
+
+def to_choseong(text: str) -> str:
+    """한글 음절을 초성 자모로 변환. 한글 외 문자는 그대로 둡니다. ("삼성전자" → "ㅅㅅㅈㅈ")"""
+    out = []
+    for ch in text:
+        code = ord(ch)
+        if _HANGUL_BASE <= code <= _HANGUL_LAST:
+            out.append(_CHOSEONG[(code - _HANGUL_BASE) // 588])
+        else:
+            out.append(ch)
+    return "".join(out)
+
+
+def normalize(text: str) -> str:
+    """비교용 정규화: 소문자 + 공백/구두점 제거. (주) 등 괄호 표기도 제거됩니다."""
+    return _NON_WORD_RE.sub("", (text or "").lower())
+
+
+def _is_choseong_query(q: str) -> bool:
+    return bool(q) and all(ch in _CHOSEONG_SET for ch in q)
+
+
+# ── 인덱스 ────────────────────────────────────────────────────────────────────
+
+class CompanyIndex:
+    """
+    정렬 배열 기반 prefix 인덱스.
+
+    _keys[i] 는 정규화된 검색 키, _refs[i] 는 (_rows 인덱스, 매칭 종류).
+    prefix p 에 대한 범위는 [bisect_left(p), bisect_left(p + '\\uffff')) 입니다.
+    """
+
+    def __init__(self, rows: list[dict]):
+        self._rows: list[dict] = []
+        pairs: list[tuple[str, int, str]] = []
+
+        for row in rows:
+            stock_code = (row.get("stock_code") or "").strip()
+            corp_name  = (row.get("corp_name") or "").strip()
+            if not stock_code or not corp_name:
+                continue
+
+            idx = len(self._rows)
+            self._rows.append({
+                "stock_code":   stock_code,
+                "corp_code":    row.get("corp_code"),
+                "corp_name":    corp_name,
+                "corp_name_en": row.get("corp_name_en") or None,
+            })
+
+            name_key = normalize(corp_name)
+            pairs.append((stock_code, idx, "stock_code"))
+            if name_key:
+                pairs.append((name_key, idx, "corp_name"))
+                pairs.append((to_choseong(name_key), idx, "choseong"))
+
+            name_en = row.get("corp_name_en") or ""
+            if name_en:
+                # 단어 시작 위치마다 키 생성: "Samsung Electronics" → samsungelectronics, electronics
+                words = [normalize(w) for w in name_en.split()]
+                words = [w for w in words if w]
+                for i in range(len(words)):
+                    pairs.append(("".join(words[i:]), idx, "corp_name_en"))
+
+        pairs.sort()
+        self._keys: list[str] = [p[0] for p in pairs]
+        self._refs: list[tuple[int, str]] = [(p[1], p[2]) for p in pairs]
+        self.built_at = time.time()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def search(self, query: str, limit: int = 10) -> list[dict]:
+        """
+        prefix 매칭 결과를 관련도 순으로 반환합니다.
+
+        정렬 기준: 정확 일치 → 종목코드 매칭 → 짧은 기업명 → 기업명 가나다순
+        """
+        q = normalize(query)
+        if not q:
+            return []
+
+        # 범위 전체를 순위 매김 — 앞에서 잘라내면 뒤쪽의 정확 일치·짧은 기업명이 빠짐
+        # (1글자 초성 질의도 수천 엔트리 수준)
+        lo = bisect.bisect_left(self._keys, q)
+        hi = bisect.bisect_left(self._keys, q + "\uffff", lo)
+
+        # 초성 전용 질의("ㅅㅅ")는 초성 키만, 그 외에는 초성 키 제외
+        choseong_only = _is_choseong_query(q)
+
+        best: dict[int, tuple[tuple, str]] = {}
+        for i in range(lo, hi):
+            row_idx, kind = self._refs[i]
+            if (kind == "choseong") != choseong_only:
+                continue
+            row = self._rows[row_idx]
+            rank = (
+                0 if self._keys[i] == q else 1,
+                0 if kind == "stock_code" else 1,
+                len(row["corp_name"]),
+                row["corp_name"],
+            )
+            prev = best.get(row_idx)
+            if prev is None or rank < prev[0]:
+                best[row_idx] = (rank, kind)
+
+        ranked = sorted(best.items(), key=lambda kv: kv[1][0])[:limit]
+        return [{**self._rows[row_idx], "matched_on": kind} for row_idx, (_, kind) in ranked]
+
+
+# ── 싱글톤 + 재빌드 ───────────────────────────────────────────────────────────
+
+_index: Optional[CompanyIndex] = None
+_last_sentinel_check: float = 0.0
+_rebuild_lock: Optional[asyncio.Lock] = None
+_rebuild_task: Optional[asyncio.Task] = None
+
+
+def _get_rebuild_lock() -> asyncio.Lock:
+    # 이벤트 루프 생성 이후에 만들어야 하므로 lazy init
+    global _rebuild_lock
+    if _rebuild_lock is None:
+        _rebuild_lock = asyncio.Lock()
+    return _rebuild_lock
+
+
+def _load_rows() -> list[dict]:
+    """dart_corp_codes 전체 조회 (pagination)."""
+    from backend.core.db import get_supabase
+
+    sb = get_supabase()
+    rows: list[dict] = []
+    offset = 0
+    while True:
+        resp = (
+            sb.table("dart_corp_codes")
+            .select("stock_code, corp_code, corp_name, corp_name_en")
+            .order("stock_code")
+            .range(offset, offset + _PAGE_SIZE - 1)
+            .execute()
+        )
+        batch = resp.data or []
+        rows.extend(batch)
+        if len(batch) < _PAGE_SIZE:
+            break
+        offset += _PAGE_SIZE
+    return rows
+
+
+async def _rebuild() -> CompanyIndex:
+    """재빌드 1회 실행. 이미 진행 중이면 끝나길 기다렸다가 그 결과를 반환합니다."""
+    global _index
+    requested = time.time()
+    async with _get_rebuild_lock():
+        if _index is not None and _index.built_at >= requested:
+            return _index
+        t0 = time.perf_counter()
+        index = await asyncio.to_thread(lambda: CompanyIndex(_load_rows()))
+        _index = index
+        await cache_set(INDEX_SENTINEL_KEY, {"built_at": index.built_at, "size": len(index)}, INDEX_TTL)
+    logger.info(
+        f"[company-index] 빌드 완료: {len(index)}개 기업, "
+        f"{len(index._keys)}개 키 ({(time.perf_counter() - t0) * 1000:.0f}ms)"
+    )
+    return index
+
+
+async def _refresh() -> None:
+    try:
+        await _rebuild()
+    except Exception as e:
+        logger.warning(f"[company-index] 재빌드 실패 (기존 인덱스 유지): {e}")
+
+
+async def get_company_index() -> CompanyIndex:
+    """
+    인덱스 반환. 최초 호출 시 빌드 완료까지 기다리고, 센티넬 소실(스크립트가 무효화) 시
+    백그라운드로 재빌드하며 그동안(실패 시에도) 기존 인덱스를 서빙합니다.
+    """
+    global _last_sentinel_check, _rebuild_task
+    if _index is None:
+        return await _rebuild()
+
+    now = time.monotonic()
+    if now - _last_sentinel_check < SENTINEL_CHECK_INTERVAL:
+        return _index
+    _last_sentinel_check = now
+
+    if await cache_get(INDEX_SENTINEL_KEY) is not None:
+        return _index
+
+    if _rebuild_task is None or _rebuild_task.done():
+        _rebuild_task = asyncio.create_task(_refresh())
+    return _index
+
+
+async def lookup_companies(q: str, limit: int = 10) -> list[dict]:
+    """기업명(한/영) · 초성 · 종목코드 prefix 검색."""
+    index = await get_company_index()
+    return index.search(q, limit)
@@ -34,6 +34,8 @@ def get_supabase():
         return _client
 
     from supabase import create_client
+    from supabase.lib.client_options import ClientOptions
+    from backend.core.admission import DB_DEADLINE
     from backend.core.config import get_supabase_url, get_supabase_service_key
 
     url = get_supabase_url()
@@ -44,6 +46,7 @@ def get_supabase():
             "SUPABASE_URL / SUPABASE_SERVICE_ROLE_KEY 환경변수가 설정되지 않았습니다."
         )
 
-    _client = create_client(url, key)
+    # PostgREST HTTP 타임아웃 = admission deadline → deadline 초과 호출의 스레드도 곧 끝나 슬롯 반납
+    _client = create_client(url, key, options=ClientOptions(postgrest_client_timeout=DB_DEADLINE))
     logger.info("[db] Supabase 클라이언트 초기화 완료")
     return _client
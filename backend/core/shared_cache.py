@@ -0,0 +1,139 @@
+"""
+backend/core/shared_cache.py
+============================
+워커 간 공유 캐시 백엔드 (Redis 없는 단일 호스트용).
+
+`uvicorn --workers N` 으로 띄우면 워커마다 cache.py 의 _LOCAL dict 를 따로 가지므로
+hit ratio 가 1/N 로 떨어지고 같은 응답이 N 번 메모리에 올라갑니다.
+이 모듈은 tmpfs(/dev/shm) 위의 SQLite 파일 하나를 모든 워커가 공유하여
+같은 호스트의 프로세스끼리 캐시를 나눠 씁니다.
+
+  - WAL + synchronous=OFF: 읽기는 락 없이 병렬, 쓰기만 직렬화
+  - tmpfs 위이므로 디스크 I/O 없음 (재부팅 시 소멸 — 캐시 용도로 충분)
+  - 같은 호스트의 배치 스크립트가 cache_delete_pattern() 을 호출하면
+    서버 워커 캐시도 함께 무효화됨 (per-process dict 로는 불가능했던 부분)
+    → 배치 스크립트 쪽에도 SHARED_CACHE_PATH 를 지정해야 합류
+  - 호출은 이벤트 루프에서 동기로 실행되므로 잠금 대기는 BUSY_TIMEOUT(50ms)까지만.
+    다른 워커가 쓰기 중이라 넘기면 예외 → cache.py 가 per-process dict 로 폴백
+
+활성화 조건 (cache.py 에서 Redis 미사용 시에만 확인):
+  SHARED_CACHE_PATH  명시 경로               (예: /dev/shm/stockplatform-cache.db)
+  WEB_CONCURRENCY>1  uvicorn 멀티 워커 감지   → 기본 경로 사용
+  (이전 실행이 남긴 파일 존재만으로는 켜지지 않음)
+
+공개 API (동기, 호출당 수십 µs):
+  get_shared_cache()             -> SharedCache | None
+  SharedCache.get(key)           -> Any | None
+  SharedCache.set(key, value, ttl)
+  SharedCache.delete_pattern(pattern) -> int
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+PURGE_EVERY  = 500    # set N회마다 만료 행 정리
+OPEN_TIMEOUT = 2.0    # 초기화(WAL 전환·테이블 생성) 잠금 대기 초 — 워커 동시 기동 대비
+BUSY_TIMEOUT = 0.05   # 이후 get/set/delete 잠금 대기 초 — 초과 시 sqlite3.OperationalError
+
+
+def default_path() -> str:
+    shm = Path("/dev/shm")
+    base = shm if shm.is_dir() else Path(tempfile.gettempdir())
+    return str(base / "stockplatform-cache.db")
+
+
+def resolve_path() -> Optional[str]:
+    """공유 캐시 파일 경로. 비활성화 조건이면 None."""
+    path = os.getenv("SHARED_CACHE_PATH")
+    if path:
+        return path
+    try:
+        workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+    except ValueError:
+        workers = 1
+    return default_path() if workers > 1 else None
+
+
+class SharedCache:
+    """SQLite(tmpfs) 기반 프로세스 간 TTL 캐시."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._sets = 0
+        self._conn = sqlite3.connect(path, timeout=OPEN_TIMEOUT, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=OFF")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL, expire_at REAL NOT NULL"
+            ") WITHOUT ROWID"
+        )
+        self._conn.execute(f"PRAGMA busy_timeout = {int(BUSY_TIMEOUT * 1000)}")
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM cache WHERE key = ? AND expire_at > ?", (key, time.time())
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, key: str, value: Any, ttl: int) -> None:
+        raw = json.dumps(value, ensure_ascii=False, default=str)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expire_at) VALUES (?, ?, ?)",
+                (key, raw, now + ttl),
+            )
+            self._sets += 1
+            if self._sets % PURGE_EVERY == 0:
+                self._conn.execute("DELETE FROM cache WHERE expire_at <= ?", (now,))
+
+    def delete_pattern(self, pattern: str) -> int:
+        """단순 prefix* 패턴 삭제 (cache._local_delete_pattern 과 동일 의미)."""
+        prefix = pattern.rstrip("*")
+        with self._lock:
+            cur = self._conn.execute(
+                "DELETE FROM cache WHERE key >= ? AND key < ?", (prefix, prefix + "\uffff")
+            )
+        return cur.rowcount
+
+
+# ── 싱글톤 (lazy init, 1회만 시도) ────────────────────────────────────────────
+
+_shared: Optional[SharedCache] = None
+_shared_initialized: bool = False
+
+
+def get_shared_cache() -> Optional[SharedCache]:
+    """
+    공유 캐시 인스턴스 반환.
+    - 활성화 조건 미충족 → None (per-process dict 사용)
+    - 열기 실패          → None (재시도 없음)
+    """
+    global _shared, _shared_initialized
+    if _shared_initialized:
+        return _shared
+
+    _shared_initialized = True
+    path = resolve_path()
+    if not path:
+        return None
+
+    try:
+        _shared = SharedCache(path)
+        logger.info(f"[cache] 공유 캐시 사용: {path}")
+    except Exception as e:
+        logger.warning(f"[cache] 공유 캐시 열기 실패 ({e}) → in-process 캐시 사용")
+    return _shared
+
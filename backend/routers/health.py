@@ -6,6 +6,8 @@ backend/routers/health.py
 
 from fastapi import APIRouter
 from backend.core.config import get_supabase_url, get_supabase_service_key, get_dart_api_key
+from backend.core.cache import get_cache_stats
+from backend.core.admission import get_admission_stats
 
 router = APIRouter(tags=["health"])
 
@@ -25,3 +27,12 @@ async def health_check():
             "dart_api_key":         bool(get_dart_api_key()),
         },
     }
+
+
+@router.get("/metrics")
+async def metrics():
+    """프로세스(워커)별 캐시 hit ratio + v1 입장 제어 대기열/거절 통계."""
+    return {
+        "cache":     get_cache_stats(),
+        "admission": get_admission_stats(),
+    }
@@ -3,20 +3,48 @@ Paddle Webhook Handler (FastAPI)
 
 Paddle 샌드박스 웹훅 수신 엔드포인트
 dev tunnel: https://htnsnhjd-8000.jpe1.devtunnels.ms/paddle-webhook
+
+처리 흐름:
+  1. 서명 검증 → JSON 파싱
+  2. paddle_webhook_events 에 event_id 기준 insert (중복이면 무시) → 즉시 200 응답
+     (Paddle 은 느린 응답을 재시도하므로 요청 경로에서는 DB write 1회만 수행)
+  3. 백그라운드 워커가 큐에서 이벤트를 모아 배치로 처리
+     - status pending → processing 조건부 update 로 선점, 반환된 이벤트만 처리
+       (uvicorn 프로세스가 여럿이어도 한 이벤트는 한 워커만 처리)
+     - subscriptions upsert / users update / payments upsert 를 키별로 합쳐 일괄 실행
+       (payments 는 paddle_event_id 기준 ignore_duplicates — 재처리돼도 1행)
+     - 배치 실패 시 이벤트 단위로 재시도
+     - 이벤트 단위로도 실패하면 attempts 를 올리고 pending 으로 되돌려 백오프 후 재처리
+       (PROCESSING_TIMEOUT × 2^(attempts-1) 초 뒤, MAX_ATTEMPTS 회째 실패하면 failed 로 확정)
+     - 플랜 변경이 있으면 인증·플랜 캐시(v1:auth:*) 무효화 (v1 인증 자체는 캐시하지 않음 —
+       API 키 발급·회전은 프론트엔드 admin API 가 하므로 여기서 무효화할 수 없음)
+  4. 워커는 앱 시작 시(lifespan) 기동하고, PROCESSING_TIMEOUT 초마다 sweep:
+     - PROCESSING_TIMEOUT 초 넘게 processing 인 이벤트 (처리 중 죽은 워커) → 실패와 같은 재시도 경로
+     - 재시도 시각이 된 pending 이벤트 → 큐에 적재
 """
 
+import asyncio
 import hashlib
 import hmac
 import json
 import logging
 import os
+from datetime import datetime, timedelta, timezone
+from typing import Optional
 
 from fastapi import APIRouter, Request, Response
 
+from backend.core.cache import cache_delete_pattern
+
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+BATCH_MAX    = 50    # 워커 1회 처리 최대 이벤트 수
+BATCH_WINDOW = 0.5   # 첫 이벤트 수신 후 추가 이벤트를 모으는 시간 (초)
+PROCESSING_TIMEOUT = 300   # processing 선점 후 이 시간(초) 지나도 끝나지 않으면 재처리 대상 (sweep 주기 겸용)
+MAX_ATTEMPTS = 6           # 처리 실패 허용 횟수 — 넘으면 failed (재시도 간격 5·10·20·40·80분)
+
 
 def verify_paddle_signature(body: str, signature_header: str) -> bool:
     """
@@ -58,8 +86,14 @@ def verify_paddle_signature(body: str, signature_header: str) -> bool:
         return False
 
 
+_supabase = None
+
+
 def get_supabase_client():
-    """런타임에 Supabase 클라이언트 생성 (supabase-py)"""
+    """런타임에 Supabase 클라이언트 생성 (supabase-py). 프로세스 당 1회 생성 후 재사용."""
+    global _supabase
+    if _supabase is not None:
+        return _supabase
     try:
         from supabase import create_client
 
@@ -71,7 +105,8 @@ def get_supabase_client():
         if not url or not key:
             logger.error("Supabase env vars missing")
             return None
-        return create_client(url, key)
+        _supabase = create_client(url, key)
+        return _supabase
     except ImportError:
         logger.warning("supabase-py not installed - DB updates skipped")
         return None
@@ -97,7 +132,86 @@ def _plan_type_from_plan_id(plan_id: str | None) -> str:
     return "pro" if "pro" in plan_id.lower() else "developer"
 
 
-async def handle_subscription_created(event: dict):
+# ── 배치 write 누적기 ─────────────────────────────────────────────────────────
+
+class WriteBatch:
+    """
+    이벤트 핸들러가 남긴 DB write 를 키별로 합칩니다 (이벤트 순서대로 last-write-wins).
+
+    subscription_upserts : paddle_subscription_id → upsert row
+    subscription_updates : paddle_subscription_id → update 필드
+                           (같은 배치에 upsert 가 있으면 upsert row 에 병합)
+    user_updates         : user_id → update 필드
+    payments             : paddle_event_id → insert row (upsert ignore_duplicates — 재처리돼도 1행)
+    """
+
+    def __init__(self):
+        self.subscription_upserts: dict[str, dict] = {}
+        self.subscription_updates: dict[str, dict] = {}
+        self.user_updates: dict[str, dict] = {}
+        self.payments: dict[str, dict] = {}
+        self.event_id: str | None = None
+
+    def begin(self, event_id: str) -> None:
+        """이후 핸들러가 남기는 write 의 출처 이벤트 (payments 멱등 키)."""
+        self.event_id = event_id
+
+    def upsert_subscription(self, row: dict) -> None:
+        sub_id = row["paddle_subscription_id"]
+        merged = {**self.subscription_upserts.get(sub_id, {}), **self.subscription_updates.pop(sub_id, {}), **row}
+        self.subscription_upserts[sub_id] = merged
+
+    def update_subscription(self, sub_id: str, fields: dict) -> None:
+        if sub_id in self.subscription_upserts:
+            self.subscription_upserts[sub_id].update(fields)
+        else:
+            self.subscription_updates[sub_id] = {**self.subscription_updates.get(sub_id, {}), **fields}
+
+    def update_user(self, user_id: str, fields: dict) -> None:
+        self.user_updates[user_id] = {**self.user_updates.get(user_id, {}), **fields}
+
+    def insert_payment(self, row: dict) -> None:
+        self.payments[self.event_id] = {**row, "paddle_event_id": self.event_id}
+
+    @property
+    def plan_changed(self) -> bool:
+        return any("plan" in f for f in self.user_updates.values())
+
+    def flush(self, supabase) -> None:
+        """누적된 write 실행. 예외는 호출부로 전파 (배치 실패 → 이벤트 단위 재시도)."""
+        if self.subscription_upserts:
+            supabase.table("subscriptions").upsert(
+                list(self.subscription_upserts.values()),
+                on_conflict="paddle_subscription_id",
+            ).execute()
+
+        # update 는 값이 같은 키끼리 묶어 in_() 1회로 실행
+        for fields, sub_ids in _group_by_fields(self.subscription_updates).items():
+            supabase.table("subscriptions").update(dict(fields)).in_(
+                "paddle_subscription_id", sub_ids
+            ).execute()
+
+        for fields, user_ids in _group_by_fields(self.user_updates).items():
+            supabase.table("users").update(dict(fields)).in_("id", user_ids).execute()
+
+        if self.payments:
+            supabase.table("payments").upsert(
+                list(self.payments.values()),
+                on_conflict="paddle_event_id",
+                ignore_duplicates=True,
+            ).execute()
+
+
+def _group_by_fields(updates: dict[str, dict]) -> dict[tuple, list[str]]:
+    groups: dict[tuple, list[str]] = {}
+    for key, fields in updates.items():
+        groups.setdefault(tuple(sorted(fields.items())), []).append(key)
+    return groups
+
+
+# ── 이벤트 핸들러 (write 를 WriteBatch 에 누적) ───────────────────────────────
+
+def handle_subscription_created(event: dict, batch: WriteBatch):
     data = event.get("data", event)
     # custom_data 가 null 로 올 수 있으므로 `or {}` 로 None 방어
     custom_data = data.get("custom_data") or {}
@@ -111,33 +225,22 @@ async def handle_subscription_created(event: dict):
 
     logger.info("[OK] Subscription created: %s for user %s (plan=%s)", subscription_id, user_id, plan_type)
 
-    supabase = get_supabase_client()
-    if supabase and user_id:
-        try:
-            supabase.table("subscriptions").upsert(
-                {
-                    "user_id": user_id,
-                    "paddle_subscription_id": subscription_id,
-                    "paddle_plan_id": plan_id,
-                    "plan_type": plan_type,
-                    "status": status,
-                    "next_billing_date": next_bill_date,
-                },
-                on_conflict="paddle_subscription_id",
-            ).execute()
-        except Exception as e:
-            logger.error("[ERROR] subscriptions upsert failed: %s", e)
-
-        try:
-            supabase.table("users").update({
-                "plan": plan_type,
-                "subscription_status": "active",
-            }).eq("id", user_id).execute()
-        except Exception as e:
-            logger.error("[ERROR] users update failed: %s", e)
-
-
-async def handle_subscription_updated(event: dict):
+    if user_id:
+        batch.upsert_subscription({
+            "user_id": user_id,
+            "paddle_subscription_id": subscription_id,
+            "paddle_plan_id": plan_id,
+            "plan_type": plan_type,
+            "status": status,
+            "next_billing_date": next_bill_date,
+        })
+        batch.update_user(user_id, {
+            "plan": plan_type,
+            "subscription_status": "active",
+        })
+
+
+def handle_subscription_updated(event: dict, batch: WriteBatch):
     data = event.get("data", event)
     subscription_id = data.get("subscription_id") or data.get("id")
     status = data.get("status", "active")
@@ -145,18 +248,14 @@ async def handle_subscription_updated(event: dict):
 
     logger.info("[UPDATE] Subscription updated: %s -> %s", subscription_id, status)
 
-    supabase = get_supabase_client()
-    if supabase and subscription_id:
-        try:
-            supabase.table("subscriptions").update({
-                "status": status,
-                "next_billing_date": next_bill_date,
-            }).eq("paddle_subscription_id", subscription_id).execute()
-        except Exception as e:
-            logger.error("[ERROR] subscriptions update failed: %s", e)
+    if subscription_id:
+        batch.update_subscription(subscription_id, {
+            "status": status,
+            "next_billing_date": next_bill_date,
+        })
 
 
-async def handle_subscription_canceled(event: dict):
+def handle_subscription_canceled(event: dict, batch: WriteBatch):
     data = event.get("data", event)
     custom_data = data.get("custom_data") or {}
     user_id = data.get("user_id") or custom_data.get("user_id")
@@ -164,23 +263,16 @@ async def handle_subscription_canceled(event: dict):
 
     logger.info("[CANCEL] Subscription canceled: %s", subscription_id)
 
-    supabase = get_supabase_client()
-    if supabase:
-        try:
-            if subscription_id:
-                supabase.table("subscriptions").update({
-                    "status": "canceled",
-                }).eq("paddle_subscription_id", subscription_id).execute()
-            if user_id:
-                supabase.table("users").update({
-                    "plan": "free",
-                    "subscription_status": "canceled",
-                }).eq("id", user_id).execute()
-        except Exception as e:
-            logger.error("[ERROR] subscription cancel update failed: %s", e)
+    if subscription_id:
+        batch.update_subscription(subscription_id, {"status": "canceled"})
+    if user_id:
+        batch.update_user(user_id, {
+            "plan": "free",
+            "subscription_status": "canceled",
+        })
 
 
-async def handle_payment_succeeded(event: dict):
+def handle_payment_succeeded(event: dict, batch: WriteBatch):
     data = event.get("data", event)
     subscription_id = data.get("subscription_id") or data.get("id")
     amount = data.get("amount") or data.get("details", {}).get("totals", {}).get("total")
@@ -188,33 +280,292 @@ async def handle_payment_succeeded(event: dict):
 
     logger.info("[PAID] Payment succeeded: %s %s for %s", amount, currency, subscription_id)
 
-    supabase = get_supabase_client()
-    if supabase and subscription_id:
-        try:
-            supabase.table("payments").insert({
-                "paddle_subscription_id": subscription_id,
-                "amount": amount,
-                "currency": currency,
-                "status": "succeeded",
-            }).execute()
-        except Exception as e:
-            logger.error("[ERROR] payments insert failed: %s", e)
+    if subscription_id:
+        batch.insert_payment({
+            "paddle_subscription_id": subscription_id,
+            "amount": amount,
+            "currency": currency,
+            "status": "succeeded",
+        })
 
 
-async def handle_payment_failed(event: dict):
+def handle_payment_failed(event: dict, batch: WriteBatch):
     data = event.get("data", event)
     subscription_id = data.get("subscription_id") or data.get("id")
 
     logger.info("[FAIL] Payment failed for %s", subscription_id)
 
+    if subscription_id:
+        batch.update_subscription(subscription_id, {"status": "past_due"})
+
+
+HANDLERS = {
+    "subscription.created": handle_subscription_created,
+    "subscription_created": handle_subscription_created,
+    "subscription.updated": handle_subscription_updated,
+    "subscription_updated": handle_subscription_updated,
+    "subscription.canceled": handle_subscription_canceled,
+    "subscription_cancelled": handle_subscription_canceled,
+    "payment.succeeded": handle_payment_succeeded,
+    "subscription_payment_succeeded": handle_payment_succeeded,
+    "payment.failed": handle_payment_failed,
+    "subscription_payment_failed": handle_payment_failed,
+}
+
+
+def _event_type(event: dict) -> str:
+    return event.get("event_type") or event.get("alert_name", "")
+
+
+def _event_id(event: dict, body_str: str) -> str:
+    """Billing v2: event_id / Classic: alert_id / 둘 다 없으면 본문 해시"""
+    return str(
+        event.get("event_id")
+        or event.get("alert_id")
+        or hashlib.sha256(body_str.encode("utf-8")).hexdigest()
+    )
+
+
+# ── 멱등성 저장소 (paddle_webhook_events) ─────────────────────────────────────
+
+def _record_event(event_id: str, event: dict) -> Optional[bool]:
+    """
+    이벤트 insert (event_id 중복 시 무시).
+    반환: True(신규) / False(중복) / None(DB 없음 — 인메모리 처리만)
+    """
+    supabase = get_supabase_client()
+    if not supabase:
+        return None
+    resp = supabase.table("paddle_webhook_events").upsert(
+        {
+            "event_id": event_id,
+            "event_type": _event_type(event),
+            "payload": event,
+            "status": "pending",
+        },
+        on_conflict="event_id",
+        ignore_duplicates=True,
+    ).execute()
+    return bool(resp.data)
+
+
+def _mark_processed(supabase, event_ids: list[str]) -> None:
+    """processed 표시. 실패하면 예외 전파 — 호출부가 재시도 경로로 넘긴다."""
+    supabase.table("paddle_webhook_events").update({
+        "status": "processed",
+        "error": None,
+        "processed_at": datetime.now(timezone.utc).isoformat(),
+    }).in_("event_id", event_ids).eq("status", "processing").execute()
+
+
+def _retry_or_fail(supabase, event_ids: list[str], error: str) -> None:
+    """
+    processing 이벤트의 처리 실패 기록: attempts + 1, MAX_ATTEMPTS 미만이면 백오프 후 pending,
+    아니면 failed. 이 update 마저 실패하면 processing 으로 남고 sweep 이 다시 이 경로로 보낸다.
+    """
+    try:
+        resp = (
+            supabase.table("paddle_webhook_events")
+            .select("event_id, attempts")
+            .in_("event_id", event_ids)
+            .eq("status", "processing")
+            .execute()
+        )
+        for r in resp.data or []:
+            attempts = (r.get("attempts") or 0) + 1
+            fields = {"attempts": attempts, "error": error[:500]}
+            if attempts >= MAX_ATTEMPTS:
+                fields["status"] = "failed"
+                logger.error("[ERROR] 이벤트 %s %d회 실패 → failed: %s", r["event_id"], attempts, error)
+            else:
+                delay = PROCESSING_TIMEOUT * 2 ** (attempts - 1)
+                fields["status"] = "pending"
+                fields["next_attempt_at"] = (datetime.now(timezone.utc) + timedelta(seconds=delay)).isoformat()
+                logger.warning("[WEBHOOK] 이벤트 %s %d회 실패 → %d초 후 재시도: %s",
+                               r["event_id"], attempts, delay, error)
+            supabase.table("paddle_webhook_events").update(fields) \
+                .eq("event_id", r["event_id"]).eq("status", "processing").execute()
+    except Exception as e:
+        logger.error("[ERROR] paddle_webhook_events 재시도 표시 실패 (sweep 에서 복구): %s", e)
+
+
+def _claim_events(events: list[tuple[str, dict]]) -> list[tuple[str, dict]]:
+    """
+    pending → processing 조건부 update 로 선점. 반환: 이 워커가 선점한 이벤트 (DB payload 기준).
+    다른 프로세스가 먼저 선점했거나 이미 처리된 이벤트는 반환되지 않는다.
+    """
+    supabase = get_supabase_client()
+    if not supabase or not events:
+        return events
+    resp = (
+        supabase.table("paddle_webhook_events")
+        .update({"status": "processing", "claimed_at": datetime.now(timezone.utc).isoformat()})
+        .in_("event_id", [eid for eid, _ in events])
+        .eq("status", "pending")
+        .execute()
+    )
+    claimed = {r["event_id"]: r["payload"] for r in (resp.data or [])}
+    return [(eid, claimed[eid]) for eid, _ in events if eid in claimed]
+
+
+def _sweep() -> list[tuple[str, dict]]:
+    """
+    주기 점검 (PROCESSING_TIMEOUT 초마다):
+      1. PROCESSING_TIMEOUT 초 넘게 processing 인 이벤트 (처리 도중 죽은 워커) → _retry_or_fail
+      2. 재시도 시각이 된 pending 이벤트 반환 (큐에 적재 → _claim_events 로 선점)
+    """
+    supabase = get_supabase_client()
+    if not supabase:
+        return []
+    now = datetime.now(timezone.utc)
+    try:
+        cutoff = now - timedelta(seconds=PROCESSING_TIMEOUT)
+        stale = (
+            supabase.table("paddle_webhook_events")
+            .select("event_id")
+            .eq("status", "processing")
+            .lt("claimed_at", cutoff.isoformat())
+            .execute()
+        )
+        stale_ids = [r["event_id"] for r in (stale.data or [])]
+        if stale_ids:
+            _retry_or_fail(supabase, stale_ids, f"processing {PROCESSING_TIMEOUT}초 초과 (워커 중단)")
+
+        resp = (
+            supabase.table("paddle_webhook_events")
+            .select("event_id, payload")
+            .eq("status", "pending")
+            .or_(f"next_attempt_at.is.null,next_attempt_at.lte.{now.isoformat()}")
+            .order("received_at")
+            .limit(500)
+            .execute()
+        )
+        return [(r["event_id"], r["payload"]) for r in (resp.data or [])]
+    except Exception as e:
+        logger.error("[ERROR] pending 이벤트 점검 실패 (다음 주기에 재시도): %s", e)
+        return []
+
+
+# ── 비동기 워커 큐 ────────────────────────────────────────────────────────────
+
+_queue: Optional[asyncio.Queue] = None
+_worker_task: Optional[asyncio.Task] = None
+
+
+def _ensure_worker() -> asyncio.Queue:
+    """큐 + 워커 태스크 생성 (앱 시작 시 start_worker, 워커가 죽었으면 웹훅 수신 시 재기동)."""
+    global _queue, _worker_task
+    if _queue is None:
+        _queue = asyncio.Queue()
+    if _worker_task is None or _worker_task.done():
+        _worker_task = asyncio.create_task(_worker(_queue))
+    return _queue
+
+
+def start_worker() -> None:
+    """앱 lifespan 시작 시 호출 — 배포 직후 웹훅을 기다리지 않고 밀린 이벤트부터 처리."""
+    _ensure_worker()
+
+
+async def stop_worker() -> None:
+    """앱 lifespan 종료 시 호출. 처리 중이던 이벤트는 processing 으로 남아 다음 sweep 이 재처리."""
+    global _worker_task
+    if _worker_task is not None and not _worker_task.done():
+        _worker_task.cancel()
+        try:
+            await _worker_task
+        except asyncio.CancelledError:
+            pass
+    _worker_task = None
+
+
+def _apply(events: list[tuple[str, dict]]) -> WriteBatch:
+    batch = WriteBatch()
+    for event_id, event in events:
+        batch.begin(event_id)
+        handler = HANDLERS.get(_event_type(event))
+        if handler:
+            handler(event, batch)
+        else:
+            logger.info("[INFO] Unhandled event type: %s", _event_type(event))
+    return batch
+
+
+def _process_batch(events: list[tuple[str, dict]]) -> bool:
+    """
+    배치 처리 (워커 스레드에서 실행). 반환: 플랜 변경 여부.
+    선점(_claim_events)에 성공한 이벤트만 처리합니다.
+    배치(핸들러 실행 · write · processed 표시) 실패 시 이벤트 단위로 재시도하고,
+    그래도 실패한 이벤트는 _retry_or_fail (백오프 후 재처리 / MAX_ATTEMPTS 초과 시 failed).
+    """
     supabase = get_supabase_client()
-    if supabase and subscription_id:
+    if not supabase:
+        for event_id, event in events:
+            try:
+                _apply([(event_id, event)])
+            except Exception as e:
+                logger.error("[ERROR] 이벤트 처리 실패 %s: %s", event_id, e)
+        return False
+
+    events = _claim_events(events)
+    if not events:
+        return False
+
+    try:
+        batch = _apply(events)
+        batch.flush(supabase)
+        _mark_processed(supabase, [eid for eid, _ in events])
+        return batch.plan_changed
+    except Exception as e:
+        logger.error("[ERROR] 배치 처리 실패 (%d건) → 개별 재시도: %s", len(events), e)
+
+    plan_changed = False
+    for event_id, event in events:
         try:
-            supabase.table("subscriptions").update({
-                "status": "past_due",
-            }).eq("paddle_subscription_id", subscription_id).execute()
+            single = _apply([(event_id, event)])
+            single.flush(supabase)
+            _mark_processed(supabase, [event_id])
+            plan_changed |= single.plan_changed
         except Exception as e:
-            logger.error("[ERROR] subscriptions past_due update failed: %s", e)
+            logger.error("[ERROR] 이벤트 처리 실패 %s: %s", event_id, e)
+            _retry_or_fail(supabase, [event_id], str(e))
+    return plan_changed
+
+
+async def _worker(queue: asyncio.Queue) -> None:
+    loop = asyncio.get_running_loop()
+    next_sweep = loop.time()
+    while True:
+        if loop.time() >= next_sweep:
+            for item in await asyncio.to_thread(_sweep):
+                queue.put_nowait(item)
+            next_sweep = loop.time() + PROCESSING_TIMEOUT
+        try:
+            first = await asyncio.wait_for(queue.get(), max(0.0, next_sweep - loop.time()))
+        except asyncio.TimeoutError:
+            continue
+
+        events = [first]
+        deadline = loop.time() + BATCH_WINDOW
+        while len(events) < BATCH_MAX:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                events.append(await asyncio.wait_for(queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        # 같은 이벤트가 복구 + 신규로 두 번 들어온 경우 제거 (프로세스 간 중복은 _claim_events 가 거름)
+        events = list(dict(events).items())
+        try:
+            plan_changed = await asyncio.to_thread(_process_batch, events)
+            logger.info("[WEBHOOK] 배치 처리 완료: %d건", len(events))
+            if plan_changed:
+                deleted = await cache_delete_pattern("v1:auth:*")
+                logger.info("[cache] 플랜 변경 → v1:auth:* 무효화 (%d개)", deleted)
+        except Exception as e:
+            logger.exception("[ERROR] 웹훅 배치 처리 오류: %s", e)
 
 
 @router.post("/paddle-webhook")
@@ -238,26 +589,22 @@ async def paddle_webhook(request: Request):
         logger.error("❌ JSON parse error: %s", e)
         return Response(content='{"error":"Invalid JSON"}', status_code=400, media_type="application/json")
 
-    event_type = event.get("event_type") or event.get("alert_name", "")
-    logger.info("[WEBHOOK] Paddle webhook received: %s", event_type)
-
-    handlers = {
-        "subscription.created": handle_subscription_created,
-        "subscription_created": handle_subscription_created,
-        "subscription.updated": handle_subscription_updated,
-        "subscription_updated": handle_subscription_updated,
-        "subscription.canceled": handle_subscription_canceled,
-        "subscription_cancelled": handle_subscription_canceled,
-        "payment.succeeded": handle_payment_succeeded,
-        "subscription_payment_succeeded": handle_payment_succeeded,
-        "payment.failed": handle_payment_failed,
-        "subscription_payment_failed": handle_payment_failed,
-    }
-
-    handler = handlers.get(event_type)
-    if handler:
-        await handler(event)
-    else:
-        logger.info("[INFO] Unhandled event type: %s", event_type)
+    event_type = _event_type(event)
+    event_id = _event_id(event, body_str)
+    logger.info("[WEBHOOK] Paddle webhook received: %s (%s)", event_type, event_id)
+
+    queue = _ensure_worker()
+
+    # 멱등성: event_id 기록 실패 시 500 → Paddle 재시도에 맡김
+    try:
+        is_new = await asyncio.to_thread(_record_event, event_id, event)
+    except Exception as e:
+        logger.error("[ERROR] paddle_webhook_events insert failed: %s", e)
+        return Response(content='{"error":"Temporary failure"}', status_code=500, media_type="application/json")
+
+    if is_new is False:
+        logger.info("[WEBHOOK] 중복 이벤트 무시: %s", event_id)
+        return {"received": True, "duplicate": True}
 
+    queue.put_nowait((event_id, event))
     return {"received": True}
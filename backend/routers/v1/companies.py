@@ -0,0 +1,74 @@
+"""
+backend/routers/v1/companies.py
+=================================
+GET /v1/companies/lookup
+
+기업명 / 영문명 / 초성 / 종목코드 자동완성.
+dart_corp_codes 를 in-memory prefix 인덱스(backend/core/company_index.py)로 서빙하며,
+요청 시 DB 조회는 없습니다.
+
+플랜 접근:
+    developer, pro
+
+캐시:
+    응답 캐시 없음 — 인덱스 자체가 메모리 상주.
+    fetch_corp_name_en / fetch_corp_basic_info 저장 후 "v1:companies:*" 무효화 시 재빌드
+"""
+
+import logging
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel
+
+from backend.routers.v1.auth import require_plan
+from backend.core.company_index import lookup_companies
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/v1", tags=["v1 - Companies"])
+
+
+# ── 응답 스키마 ───────────────────────────────────────────────────────────────
+
+class CompanyItem(BaseModel):
+    """
+    matched_on: 매칭된 키 종류 (corp_name / corp_name_en / choseong / stock_code)
+    """
+    stock_code:   str
+    corp_code:    Optional[str] = None
+    corp_name:    str
+    corp_name_en: Optional[str] = None
+    matched_on:   str
+
+
+class CompaniesLookupResponse(BaseModel):
+    data:  list[CompanyItem]
+    total: int
+    query: str
+
+
+# ── 엔드포인트 ────────────────────────────────────────────────────────────────
+
+@router.get(
+    "/companies/lookup",
+    response_model=CompaniesLookupResponse,
+    summary="기업 자동완성 조회",
+    description=(
+        "기업명(한글/영문) · 한글 초성 · 종목코드 prefix 로 기업을 검색합니다.\n\n"
+        "예: `삼성`, `ㅅㅅㅈㅈ`, `samsung`, `0059`\n\n"
+        "**플랜**: developer, pro"
+    ),
+)
+async def get_companies_lookup(
+    q:     str = Query(..., min_length=1, max_length=50, description="검색어 (기업명 / 초성 / 종목코드 prefix)"),
+    limit: int = Query(10, ge=1, le=50, description="최대 반환 건수"),
+    user: dict = Depends(require_plan(["developer", "pro"])),
+):
+    try:
+        rows = await lookup_companies(q, limit)
+    except Exception as e:
+        logger.error(f"[companies] 인덱스 조회 오류: {e}")
+        raise HTTPException(status_code=500, detail="데이터 조회 중 오류가 발생했습니다.")
+
+    items = [CompanyItem(**row) for row in rows]
+    return CompaniesLookupResponse(data=items, total=len(items), query=q)
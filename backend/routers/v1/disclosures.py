@@ -12,6 +12,7 @@ disclosure_insights 테이블 데이터를 반환합니다.
 
 캐시:
     TTL 300 초 (5 min)  —  키: plan + 쿼리 파라미터 전체 해시
+    DB 과부하 시 stale 사본 반환, 없으면 503 (backend/core/admission.py)
 """
 
 import json
@@ -19,12 +20,13 @@ import logging
 from datetime import date, timedelta
 from typing import Any, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from pydantic import BaseModel, field_validator
 
 from backend.routers.v1.auth import require_plan, PLAN_HISTORY_DAYS
 from backend.core.cache import make_cache_key, cache_get, cache_set, TTL_DISCLOSURES
 from backend.core.db import get_supabase
+from backend.core.admission import run_db, Overloaded, serve_stale_or_503
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/v1", tags=["v1 - Disclosures"])
@@ -106,6 +108,7 @@ _PRO_COLUMNS = _DEV_COLUMNS + (
     ),
 )
 async def get_disclosures(
+    response:   Response,
     date_from:  Optional[str] = Query(None, description="조회 시작일 (YYYY-MM-DD)"),
     date_to:    Optional[str] = Query(None, description="조회 종료일 (YYYY-MM-DD). 기본값: 오늘"),
     stock_code: Optional[str] = Query(None, description="종목코드 필터 (예: 005930)"),
@@ -202,8 +205,9 @@ async def get_disclosures(
         if event_type:
             query = query.eq("event_type", event_type)
 
-        resp = query.limit(limit).execute()
-        rows = resp.data or []
+        rows = await run_db(lambda: query.limit(limit).execute().data or [])
+    except Overloaded:
+        return await serve_stale_or_503(cache_key, DisclosuresResponse, response)
     except Exception as e:
         logger.error(f"[disclosures] DB 조회 오류: {e}")
         raise HTTPException(status_code=500, detail="데이터 조회 중 오류가 발생했습니다.")
@@ -217,6 +221,6 @@ async def get_disclosures(
     )
 
     # ── 캐시 저장 ──────────────────────────────────────────────────────────────
-    await cache_set(cache_key, result.model_dump(), TTL_DISCLOSURES)
+    await cache_set(cache_key, result.model_dump(), TTL_DISCLOSURES, keep_stale=True)
 
     return result
@@ -15,18 +15,20 @@ event_stats + disclosure_insights 테이블 데이터를 반환합니다.
 
 캐시:
     TTL 3600 초 (60 min)  —  event_stats 는 backfill_prices --stats-only 후 갱신됨
+    DB 과부하 시 stale 사본 반환, 없으면 503 (backend/core/admission.py)
 """
 
 import logging
 from datetime import date, timedelta
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from pydantic import BaseModel
 
 from backend.routers.v1.auth import require_plan, PLAN_HISTORY_DAYS
 from backend.core.cache import make_cache_key, cache_get, cache_set, TTL_EVENTS
 from backend.core.db import get_supabase
+from backend.core.admission import run_db, Overloaded, serve_stale_or_503
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/v1", tags=["v1 - Corporate Events"])
@@ -85,6 +87,7 @@ class EventsResponse(BaseModel):
     ),
 )
 async def get_events(
+    response:   Response,
     date_from:  Optional[str] = Query(None, description="최근 이벤트 시작일 (YYYY-MM-DD)"),
     date_to:    Optional[str] = Query(None, description="최근 이벤트 종료일 (YYYY-MM-DD)"),
     stock_code: Optional[str] = Query(None, description="종목코드 필터"),
@@ -144,9 +147,6 @@ async def get_events(
         if event_type:
             stat_query = stat_query.eq("event_type", event_type)
 
-        stat_resp = stat_query.execute()
-        statistics = [EventStatItem(**row) for row in (stat_resp.data or [])]
-
         # ② 최근 이벤트 목록 — disclosure_insights (실시간 파이프라인)
         # rcept_dt 는 YYYYMMDD TEXT → 문자열 대소비교로 날짜 필터
         dt_from_str = dt_from.strftime("%Y%m%d")
@@ -166,7 +166,13 @@ async def get_events(
         if event_type:
             ev_query = ev_query.eq("event_type", event_type)
 
-        ev_resp = ev_query.limit(limit).execute()
+        # 두 쿼리를 하나의 입장 슬롯 / deadline 안에서 실행
+        def _fetch():
+            return stat_query.execute().data or [], ev_query.limit(limit).execute().data or []
+
+        stat_rows, ev_rows = await run_db(_fetch)
+
+        statistics = [EventStatItem(**row) for row in stat_rows]
         recent_events = [
             RecentEventItem(
                 stock_code=row["stock_code"],
@@ -176,9 +182,11 @@ async def get_events(
                 final_score=row.get("final_score"),
                 signal_tag=row.get("signal_tag"),
             )
-            for row in (ev_resp.data or [])
+            for row in ev_rows
         ]
 
+    except Overloaded:
+        return await serve_stale_or_503(cache_key, EventsResponse, response)
     except Exception as e:
         logger.error(f"[events] DB 조회 오류: {e}")
         raise HTTPException(status_code=500, detail="데이터 조회 중 오류가 발생했습니다.")
@@ -191,6 +199,6 @@ async def get_events(
     )
 
     # ── 캐시 저장 ──────────────────────────────────────────────────────────────
-    await cache_set(cache_key, result.model_dump(), TTL_EVENTS)
+    await cache_set(cache_key, result.model_dump(), TTL_EVENTS, keep_stale=True)
 
     return result
@@ -11,18 +11,20 @@ market_radar 테이블 데이터를 반환합니다.
 
 캐시:
     TTL 900 초 (15 min)  —  market_radar 는 EOD 배치에서 1회 갱신
+    DB 과부하 시 stale 사본 반환, 없으면 503 (backend/core/admission.py)
 """
 
 import logging
 from datetime import date, timedelta
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from pydantic import BaseModel
 
 from backend.routers.v1.auth import require_plan, PLAN_HISTORY_DAYS
 from backend.core.cache import make_cache_key, cache_get, cache_set, TTL_MARKET_RADAR
 from backend.core.db import get_supabase
+from backend.core.admission import run_db, Overloaded, serve_stale_or_503
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/v1", tags=["v1 - Market Radar"])
@@ -62,6 +64,7 @@ class MarketRadarResponse(BaseModel):
     ),
 )
 async def get_market_radar(
+    response:  Response,
     date_from: Optional[str] = Query(None, description="조회 시작일 (YYYY-MM-DD)"),
     date_to:   Optional[str] = Query(None, description="조회 종료일 (YYYY-MM-DD). 기본값: 오늘"),
     limit:     int            = Query(30, ge=1, le=90, description="최대 반환 건수"),
@@ -110,7 +113,7 @@ async def get_market_radar(
     # ── Supabase 쿼리 ──────────────────────────────────────────────────────────
     try:
         sb = get_supabase()
-        resp = (
+        query = (
             sb.table("market_radar")
             .select(
                 "date, market_signal, top_sector, top_sector_en, foreign_flow, "
@@ -120,9 +123,10 @@ async def get_market_radar(
             .lte("date", dt_to.isoformat())
             .order("date", desc=True)
             .limit(limit)
-            .execute()
         )
-        rows = resp.data or []
+        rows = await run_db(lambda: query.execute().data or [])
+    except Overloaded:
+        return await serve_stale_or_503(cache_key, MarketRadarResponse, response)
     except Exception as e:
         logger.error(f"[market-radar] DB 조회 오류: {e}")
         raise HTTPException(status_code=500, detail="데이터 조회 중 오류가 발생했습니다.")
@@ -136,6 +140,6 @@ async def get_market_radar(
     )
 
     # ── 캐시 저장 ──────────────────────────────────────────────────────────────
-    await cache_set(cache_key, result.model_dump(), TTL_MARKET_RADAR)
+    await cache_set(cache_key, result.model_dump(), TTL_MARKET_RADAR, keep_stale=True)
 
     return result
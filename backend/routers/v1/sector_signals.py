@@ -11,18 +11,20 @@ sector_signals 테이블 데이터를 반환합니다.
 
 캐시:
     TTL 600 초 (10 min)  —  compute_sector_signals 가 EOD 배치에서 1회 갱신
+    DB 과부하 시 stale 사본 반환, 없으면 503 (backend/core/admission.py)
 """
 
 import logging
 from datetime import date, timedelta
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from pydantic import BaseModel
 
 from backend.routers.v1.auth import require_plan, PLAN_HISTORY_DAYS
 from backend.core.cache import make_cache_key, cache_get, cache_set, TTL_SECTOR_SIGNALS
 from backend.core.db import get_supabase
+from backend.core.admission import run_db, Overloaded, serve_stale_or_503
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/v1", tags=["v1 - Sector Signals"])
@@ -63,6 +65,7 @@ class SectorSignalsResponse(BaseModel):
     ),
 )
 async def get_sector_signals(
+    response:  Response,
     date_from: Optional[str] = Query(None, description="조회 시작일 (YYYY-MM-DD)"),
     date_to:   Optional[str] = Query(None, description="조회 종료일 (YYYY-MM-DD). 기본값: 오늘"),
     sector:    Optional[str] = Query(None, description="특정 섹터 필터 (예: 반도체와 반도체장비)"),
@@ -135,8 +138,9 @@ async def get_sector_signals(
         if signal:
             query = query.eq("signal", signal)
 
-        resp = query.limit(limit).execute()
-        rows = resp.data or []
+        rows = await run_db(lambda: query.limit(limit).execute().data or [])
+    except Overloaded:
+        return await serve_stale_or_503(cache_key, SectorSignalsResponse, response)
     except Exception as e:
         logger.error(f"[sector-signals] DB 조회 오류: {e}")
         raise HTTPException(status_code=500, detail="데이터 조회 중 오류가 발생했습니다.")
@@ -150,6 +154,6 @@ async def get_sector_signals(
     )
 
     # ── 캐시 저장 ──────────────────────────────────────────────────────────────
-    await cache_set(cache_key, result.model_dump(), TTL_SECTOR_SIGNALS)
+    await cache_set(cache_key, result.model_dump(), TTL_SECTOR_SIGNALS, keep_stale=True)
 
     return result
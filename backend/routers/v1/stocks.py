@@ -0,0 +1,134 @@
+"""
+backend/routers/v1/stocks.py
+==============================
+GET /v1/stocks/{code}/timeline
+
+종목별 공시 이벤트 타임라인.
+공시(disclosure_insights) + 사후 수익률/MDD(scores_log) + 종가(price_history)를
+EOD 배치(scripts/build_stock_timelines.py)가 미리 합쳐 둔
+stock_timelines 문서 1행을 그대로 반환합니다. (요청 시 조인 없음)
+
+플랜 접근:
+    pro
+
+캐시:
+    TTL 3600 초 (60 min)  —  stock_timelines 는 EOD 배치에서 1회 갱신
+    DB 과부하 시 stale 사본 반환, 없으면 503 (backend/core/admission.py)
+"""
+
+import logging
+import re
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Path, Response
+from pydantic import BaseModel
+
+from backend.routers.v1.auth import require_plan
+from backend.core.cache import make_cache_key, cache_get, cache_set, TTL_TIMELINE
+from backend.core.db import get_supabase
+from backend.core.admission import run_db, Overloaded, serve_stale_or_503
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/v1", tags=["v1 - Stocks"])
+
+_STOCK_CODE_RE = re.compile(r"^[0-9A-Z]{6}$")
+
+
+# ── 응답 스키마 ───────────────────────────────────────────────────────────────
+
+class TimelineEvent(BaseModel):
+    """
+    공시 1건 + 사후 성과.
+    close_t0:          공시일(또는 직후 첫 거래일) 종가
+    future_return_*d:  공시일 대비 T+N 영업일 종가 수익률 (%)
+    mdd_20d:           공시 후 20영업일 최대 낙폭 (%)
+    """
+    disclosure_id:     str
+    rcept_no:          str
+    date:              str
+    report_nm:         Optional[str]   = None
+    event_type:        Optional[str]   = None
+    headline:          Optional[str]   = None
+    sentiment_score:   Optional[float] = None
+    final_score:       Optional[float] = None
+    signal_tag:        Optional[str]   = None
+    close_t0:          Optional[float] = None
+    future_return_3d:  Optional[float] = None
+    future_return_5d:  Optional[float] = None
+    future_return_20d: Optional[float] = None
+    mdd_20d:           Optional[float] = None
+
+
+class PricePoint(BaseModel):
+    date:  str
+    close: float
+
+
+class TimelineResponse(BaseModel):
+    stock_code: str
+    corp_name:  Optional[str] = None
+    events:     list[TimelineEvent]
+    prices:     list[PricePoint]
+    updated_at: Optional[str] = None
+
+
+# ── 엔드포인트 ────────────────────────────────────────────────────────────────
+
+@router.get(
+    "/stocks/{code}/timeline",
+    response_model=TimelineResponse,
+    summary="종목 이벤트 타임라인 조회",
+    description=(
+        "종목의 공시 이벤트별 AI 스코어, 사후 수익률(T+3/T+5/T+20), 20일 MDD와 "
+        "종가 시계열을 한 번에 반환합니다. EOD 배치에서 사전 계산됩니다.\n\n"
+        "**플랜**: pro"
+    ),
+)
+async def get_stock_timeline(
+    response: Response,
+    code: str = Path(..., description="종목코드 (예: 005930)"),
+    user: dict = Depends(require_plan(["pro"])),
+):
+    code = code.upper()
+    if not _STOCK_CODE_RE.match(code):
+        raise HTTPException(status_code=400, detail="종목코드 형식 오류: 6자리 (예: 005930)")
+
+    # ── 캐시 조회 ──────────────────────────────────────────────────────────────
+    cache_key = make_cache_key("v1:stocks:timeline", code=code)
+    cached = await cache_get(cache_key)
+    if cached:
+        return TimelineResponse(**cached)
+
+    # ── Supabase 쿼리 (사전 계산 문서 1행) ─────────────────────────────────────
+    try:
+        sb = get_supabase()
+        query = (
+            sb.table("stock_timelines")
+            .select("stock_code, corp_name, doc, updated_at")
+            .eq("stock_code", code)
+            .maybe_single()
+        )
+        resp = await run_db(query.execute)
+        row = resp.data if resp else None
+    except Overloaded:
+        return await serve_stale_or_503(cache_key, TimelineResponse, response)
+    except Exception as e:
+        logger.error(f"[stocks] DB 조회 오류: {e}")
+        raise HTTPException(status_code=500, detail="데이터 조회 중 오류가 발생했습니다.")
+
+    if not row:
+        raise HTTPException(status_code=404, detail=f"타임라인 데이터가 없습니다: {code}")
+
+    doc = row.get("doc") or {}
+    result = TimelineResponse(
+        stock_code=row["stock_code"],
+        corp_name=row.get("corp_name"),
+        events=[TimelineEvent(**ev) for ev in doc.get("events", [])],
+        prices=[PricePoint(date=d, close=c) for d, c in doc.get("prices", [])],
+        updated_at=row.get("updated_at"),
+    )
+
+    # ── 캐시 저장 ──────────────────────────────────────────────────────────────
+    await cache_set(cache_key, result.model_dump(), TTL_TIMELINE, keep_stale=True)
+
+    return result
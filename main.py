@@ -11,6 +11,7 @@ main.py 는 앱 초기화와 라우터 등록만 담당합니다.
 
 import sys
 import logging
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 # ── 프로젝트 루트를 Python path 에 추가 ─────────────────────────────────────
@@ -35,6 +36,18 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# ── 라우터 모듈 ───────────────────────────────────────────────────────────
+from backend.routers import paddle
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Paddle 웹훅 워커: 배포 직후 밀린 이벤트 처리 + 주기 sweep (첫 웹훅을 기다리지 않음)
+    paddle.start_worker()
+    yield
+    await paddle.stop_worker()
+
+
 # ── 앱 생성 ───────────────────────────────────────────────────────────────
 app = FastAPI(
     title="Stock Platform API",
@@ -42,6 +55,7 @@ app = FastAPI(
     version="2.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 # ── 라우터 등록 ───────────────────────────────────────────────────────────
@@ -55,6 +69,8 @@ from backend.routers.v1.market_radar    import router as v1_market_radar_router
 from backend.routers.v1.sector_signals  import router as v1_sector_signals_router
 from backend.routers.v1.disclosures     import router as v1_disclosures_router
 from backend.routers.v1.events          import router as v1_events_router
+from backend.routers.v1.companies       import router as v1_companies_router
+from backend.routers.v1.stocks          import router as v1_stocks_router
 
 app.include_router(health_router)
 app.include_router(dart_router)
@@ -66,6 +82,8 @@ app.include_router(v1_market_radar_router)
 app.include_router(v1_sector_signals_router)
 app.include_router(v1_disclosures_router)
 app.include_router(v1_events_router)
+app.include_router(v1_companies_router)
+app.include_router(v1_stocks_router)
 
 logger.info("[OK] Stock Platform API 초기화 완료 (v1 B2B 라우터 포함)")
 
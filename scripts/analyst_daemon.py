@@ -0,0 +1,341 @@
+"""
+scripts/analyst_daemon.py
+=========================
+AI 분석 상주 워커 — pending 공시를 들어오는 대로 분석.
+
+run_daily_batch.py --analyze 의 `auto_analyst.py --single-pass` 는 cron 주기마다
+프로세스 기동 · Gemini/Supabase 클라이언트 생성 · event_stats 로드를 반복했고,
+새 공시는 다음 cron 까지 기다렸습니다. 이 워커는 한 번 띄워 두고 계속 돕니다.
+
+동작:
+  유지      auto_analyst 모듈(클라이언트) · AIAnalyst(결과 캐시 · 배치 상한) · event_stats · 유사 중복 인덱스
+  대기열    claim_pending_disclosures RPC (migration 064) 로 ANALYSIS_CLAIM_BATCH 건씩 claim.
+            비어 있으면 ANALYST_POLL_MIN_SEC 부터 ANALYST_POLL_MAX_SEC 까지 간격을 늘려 다시 조회
+            (claim 1회 = 왕복 1회, 새 공시가 들어오면 다시 최소 간격으로)
+  분석      auto_analyst.process_rows — 공용 엔진의 RPM/TPM 제한 그대로
+  재시도    실패해 pending 으로 돌아간 건은 ANALYST_RETRY_COOLDOWN_SEC 동안 다시 claim 하지 않음
+  갱신      ANALYST_REF_CHECK_SEC 마다 event_stats.updated_at 확인 → EOD 재집계(backfill_prices)가
+            반영되면 event_stats · 유사 중복 인덱스를 다시 로드. 날짜가 바뀔 때도 인덱스 재로드
+  원장      LLM 호출 원장(llm_ledger) 버퍼는 대기열이 빌 때마다 flush
+  상태      ANALYST_HEALTH_FILE 에 JSON 기록 (루프마다), ANALYST_HEALTH_PORT 지정 시 GET /health
+            (정상 200 / 루프가 lease 시간 넘게 멈췄으면 503). ANALYST_PROGRESS_SEC 마다 진행 로그
+  종료      SIGINT/SIGTERM → 진행 중인 분석만 마치고 종료 (미시작 claim 은 pending 으로 반환)
+
+환경변수:
+  ANALYST_POLL_MIN_SEC        빈 대기열 재조회 최소 간격 (기본 2)
+  ANALYST_POLL_MAX_SEC        빈 대기열 재조회 최대 간격 (기본 15)
+  ANALYST_RETRY_COOLDOWN_SEC  실패 건 재claim 대기     (기본 600)
+  ANALYST_REF_CHECK_SEC       참조 데이터 변경 확인 주기 (기본 600)
+  ANALYST_PROGRESS_SEC        진행 로그 주기            (기본 300)
+  ANALYST_HEALTH_FILE         상태 JSON 경로            (기본 scripts/data/analyst_daemon.json)
+  ANALYST_HEALTH_PORT         상태 HTTP 포트            (기본 0 — 끔)
+  ANALYST_HEALTH_HOST         상태 HTTP 바인드 주소      (기본 127.0.0.1)
+  그 외 auto_analyst 설정 (ANALYSIS_CLAIM_BATCH, ANALYSIS_LEASE_SECONDS, ANALYST_WORKER_ID, LLM_RPM ...)
+
+사용 예시:
+  python scripts/analyst_daemon.py
+  python scripts/analyst_daemon.py --batch --days 3
+  ANALYST_HEALTH_PORT=8765 nohup python scripts/analyst_daemon.py > analyst.log 2>&1 &
+  curl -s localhost:8765/health
+
+워커를 여러 개 띄워도 claim 이 겹치지 않습니다. LLM_RPM / LLM_TPM 은 워커 수로 나눠 설정하세요.
+"""
+
+import argparse
+import json
+import logging
+import os
+import signal
+import sys
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+_ROOT = Path(__file__).resolve().parent.parent
+if str(_ROOT / "scripts") not in sys.path:
+    sys.path.insert(0, str(_ROOT / "scripts"))
+
+from auto_analyst import (
+    AIAnalyst, ANALYSIS_CLAIM_BATCH, ANALYSIS_LEASE_SECONDS, ANALYST_WORKER_ID,
+    claim_pending, process_rows, reload_event_stats, supabase, _log_latency,
+)
+from llm_engine import get_engine
+from near_dup import get_detector
+
+logger = logging.getLogger("analyst_daemon")
+
+KST = timezone(timedelta(hours=9))
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+ANALYST_POLL_MIN_SEC       = _env_float("ANALYST_POLL_MIN_SEC", 2)
+ANALYST_POLL_MAX_SEC       = _env_float("ANALYST_POLL_MAX_SEC", 15)
+ANALYST_RETRY_COOLDOWN_SEC = _env_float("ANALYST_RETRY_COOLDOWN_SEC", 600)
+ANALYST_REF_CHECK_SEC      = _env_float("ANALYST_REF_CHECK_SEC", 600)
+ANALYST_PROGRESS_SEC       = _env_float("ANALYST_PROGRESS_SEC", 300)
+ANALYST_HEALTH_FILE        = os.environ.get("ANALYST_HEALTH_FILE") or str(_ROOT / "scripts" / "data" / "analyst_daemon.json")
+ANALYST_HEALTH_PORT        = int(_env_float("ANALYST_HEALTH_PORT", 0))
+ANALYST_HEALTH_HOST        = os.environ.get("ANALYST_HEALTH_HOST", "127.0.0.1")
+
+_EXCLUDE_MAX = 1000   # claim 제외 목록 상한 (RPC 인자 크기)
+
+
+class AnalystDaemon:
+
+    def __init__(self, batch: bool = False, days: int = 5,
+                 date_from: str | None = None, date_to: str | None = None):
+        self.batch = batch
+        self.days = days
+        self.date_from = date_from
+        self.date_to = date_to
+        self.analyst = AIAnalyst()
+        self.stop_event = threading.Event()
+        self.started_at = time.time()
+        # done / failed / skipped 는 엔진 단위 (--batch 면 요청 단위, 제목 skip 은 건 단위)
+        self.totals = {"claimed": 0, "started": 0, "done": 0, "failed": 0, "skipped": 0, "unstarted": 0}
+        self.last_loop_at = self.started_at
+        self.last_claim_at: float | None = None
+        self.idle_sec = ANALYST_POLL_MIN_SEC
+        self.latency: dict[int, list[float]] = {}
+        self._recent: OrderedDict[str, float] = OrderedDict()   # id → 시도 시각 (재claim 대기)
+        self._ref_version: str | None = None
+        self._ref_types = 0
+        self._ref_checked_at = 0.0
+        self._ref_reloaded_at: float | None = None
+        self._ref_day = datetime.now(KST).date()
+        self._progress_at = self.started_at
+        self._progress_done = 0
+        self._lock = threading.Lock()
+
+    # ── 메인 루프 ────────────────────────────────────────────────────────────
+
+    def serve(self) -> None:
+        logger.info(f"🚀 analyst daemon 시작 — worker={ANALYST_WORKER_ID} claim={ANALYSIS_CLAIM_BATCH} "
+                    f"lease={ANALYSIS_LEASE_SECONDS}s poll={ANALYST_POLL_MIN_SEC:g}~{ANALYST_POLL_MAX_SEC:g}s "
+                    f"batch={self.batch}")
+        self._ref_types = reload_event_stats()
+        get_detector(supabase)
+        self._check_reference(force=True)
+
+        while not self._stopping():
+            self.last_loop_at = time.time()
+            self._check_reference()
+            rows = claim_pending(ANALYSIS_CLAIM_BATCH, self._date_from(), self.date_to, self._exclude())
+            if rows:
+                self._process(rows)
+                self.idle_sec = ANALYST_POLL_MIN_SEC
+            else:
+                if self.analyst.ledger:
+                    self.analyst.ledger.flush()   # 한가할 때 호출 원장 버퍼 비우기
+                self.stop_event.wait(self.idle_sec)
+                self.idle_sec = min(ANALYST_POLL_MAX_SEC, self.idle_sec * 2)
+            self._maybe_log_progress()
+            self.write_health()
+
+        self._log_progress()
+        if self.analyst.ledger:
+            self.analyst.ledger.close()
+        self.write_health()
+        logger.info("🛑 analyst daemon 종료")
+
+    def stop(self) -> None:
+        self.stop_event.set()
+
+    def _stopping(self) -> bool:
+        return self.stop_event.is_set() or get_engine().stopping
+
+    def _date_from(self) -> str:
+        # 지정이 없으면 cron 과 같은 rolling window (구 backlog 차단) — 날짜가 바뀌면 같이 이동
+        return self.date_from or (datetime.now() - timedelta(days=self.days)).strftime("%Y%m%d")
+
+    def _exclude(self) -> list[str]:
+        cutoff = time.time() - ANALYST_RETRY_COOLDOWN_SEC
+        while self._recent and next(iter(self._recent.values())) < cutoff:
+            self._recent.popitem(last=False)
+        while len(self._recent) > _EXCLUDE_MAX:
+            self._recent.popitem(last=False)
+        return list(self._recent)
+
+    def _process(self, rows: list[dict]) -> None:
+        now = time.time()
+        self.last_claim_at = now
+        for r in rows:
+            self._recent[r["id"]] = now
+            self._recent.move_to_end(r["id"])
+        started, stats = process_rows(self.analyst, rows, False, self.batch, self.latency)
+        with self._lock:
+            self.totals["claimed"] += len(rows)
+            self.totals["started"] += started
+            self.totals["done"] += stats.done
+            self.totals["failed"] += stats.failed
+            self.totals["skipped"] += stats.skipped
+            self.totals["unstarted"] += len(rows) - started
+
+    # ── 참조 데이터 갱신 ─────────────────────────────────────────────────────
+
+    def _check_reference(self, force: bool = False) -> None:
+        """event_stats 가 EOD 에 재집계됐거나 날짜가 바뀌면 event_stats · 유사 중복 인덱스 재로드."""
+        now = time.time()
+        if not force and now - self._ref_checked_at < ANALYST_REF_CHECK_SEC:
+            return
+        self._ref_checked_at = now
+        try:
+            res = supabase.table("event_stats").select("updated_at") \
+                .order("updated_at", desc=True).limit(1).execute()
+            version = (res.data or [{}])[0].get("updated_at")
+        except Exception as e:
+            logger.warning(f"[reference] event_stats 버전 확인 실패 (무시): {e}")
+            return
+
+        today = datetime.now(KST).date()
+        if force:
+            self._ref_version = version
+            self._ref_reloaded_at = now
+            return
+        if version == self._ref_version and today == self._ref_day:
+            return
+
+        reason = "event_stats 갱신" if version != self._ref_version else "날짜 변경"
+        try:
+            n = reload_event_stats()
+            self._ref_types = n
+            detector = get_detector(supabase)
+            sigs = detector.reload() if detector else 0
+        except Exception as e:
+            logger.warning(f"[reference] 재로드 실패 → 기존 데이터 유지: {e}")
+            return
+        self._ref_version = version
+        self._ref_day = today
+        self._ref_reloaded_at = now
+        logger.info(f"♻️  [reference] {reason} → event_stats {n}개 유형 · 유사 중복 서명 {sigs}건 재로드")
+
+    # ── 상태 / 진행 ──────────────────────────────────────────────────────────
+
+    def health(self) -> dict:
+        now = time.time()
+        stale = now - self.last_loop_at > ANALYSIS_LEASE_SECONDS
+        status = "stopping" if self._stopping() else ("stale" if stale else "ok")
+        with self._lock:
+            totals = dict(self.totals)
+        uptime = now - self.started_at
+        detector = get_detector(supabase)
+
+        def iso(ts):
+            return datetime.fromtimestamp(ts, KST).isoformat(timespec="seconds") if ts else None
+
+        return {
+            "status":        status,
+            "worker":        ANALYST_WORKER_ID,
+            "started_at":    iso(self.started_at),
+            "uptime_sec":    round(uptime),
+            "last_loop_at":  iso(self.last_loop_at),
+            "last_claim_at": iso(self.last_claim_at),
+            "idle_poll_sec": self.idle_sec,
+            "totals":        totals,
+            "done_per_min":  round(totals["done"] / uptime * 60, 2) if uptime else 0.0,
+            "engine":        {"rate_limited": get_engine().rate_limited},
+            "usage":         dict(self.analyst.usage),
+            "cache":         self.analyst.cache.summary() if self.analyst.cache else None,
+            "ledger":        self.analyst.ledger.summary() if self.analyst.ledger else None,
+            "reference": {
+                "event_stats_types":      self._ref_types,
+                "event_stats_updated_at": self._ref_version,
+                "reloaded_at":            iso(self._ref_reloaded_at),
+                "near_dup_signatures":    len(detector.index) if detector else None,
+            },
+        }
+
+    def write_health(self) -> None:
+        if not ANALYST_HEALTH_FILE:
+            return
+        try:
+            path = Path(ANALYST_HEALTH_FILE)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(path.suffix + ".tmp")
+            tmp.write_text(json.dumps(self.health(), ensure_ascii=False, indent=2), encoding="utf-8")
+            os.replace(tmp, path)
+        except Exception as e:
+            logger.debug(f"[health] 상태 파일 기록 실패: {e}")
+
+    def _maybe_log_progress(self) -> None:
+        if time.time() - self._progress_at >= ANALYST_PROGRESS_SEC:
+            self._log_progress()
+
+    def _log_progress(self) -> None:
+        now = time.time()
+        with self._lock:
+            t = dict(self.totals)
+        window = max(1.0, now - self._progress_at)
+        recent = t["done"] - self._progress_done
+        logger.info(
+            f"[progress] 완료 {t['done']} / 실패 {t['failed']} / skip {t['skipped']} / 반환 {t['unstarted']} "
+            f"(claim {t['claimed']}) — 최근 {window / 60:.0f}분 {recent}건 ({recent / window * 60:.1f}건/분)"
+        )
+        if self.analyst.cache:
+            logger.info(f"[llm-cache] {self.analyst.cache.summary()}")
+        if self.analyst.ledger:
+            logger.info(f"[llm-ledger] {self.analyst.ledger.summary()}")
+        _log_latency(self.latency)
+        self.latency.clear()
+        self._progress_at = now
+        self._progress_done = t["done"]
+
+
+def _serve_health(daemon: AnalystDaemon) -> None:
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.rstrip("/") not in ("/health", ""):
+                self.send_error(404)
+                return
+            body = daemon.health()
+            data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            self.send_response(200 if body["status"] == "ok" else 503)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, fmt, *args):   # 접근 로그는 남기지 않음
+            pass
+
+    server = ThreadingHTTPServer((ANALYST_HEALTH_HOST, ANALYST_HEALTH_PORT), Handler)
+    threading.Thread(target=server.serve_forever, name="health", daemon=True).start()
+    logger.info(f"[health] http://{ANALYST_HEALTH_HOST}:{ANALYST_HEALTH_PORT}/health")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AI 분석 상주 워커 (pending 공시 연속 처리)")
+    parser.add_argument("--batch", action="store_true",
+                        help="짧은 공시를 묶어 한 요청으로 분석 (LLM_BATCH_MAX_ITEMS / LLM_BATCH_TOKENS)")
+    parser.add_argument("--days", type=int, default=5,
+                        help="--from 미지정 시 최근 N일 공시만 (기본 5 — cron 과 동일한 rolling window)")
+    parser.add_argument("--from", dest="date_from", type=str, default=None, help="시작 날짜 YYYYMMDD")
+    parser.add_argument("--to", dest="date_to", type=str, default=None, help="종료 날짜 YYYYMMDD")
+    args = parser.parse_args()
+
+    daemon = AnalystDaemon(batch=args.batch, days=args.days, date_from=args.date_from, date_to=args.date_to)
+
+    def on_signal(signum, frame):
+        daemon.stop()
+        get_engine().shutdown()
+
+    # 분석 중에는 엔진이 자체 핸들러를 설치했다가 되돌림 — 그 사이 신호도 engine.stopping 으로 감지
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, on_signal)
+
+    if ANALYST_HEALTH_PORT:
+        _serve_health(daemon)
+    daemon.serve()
+
+
+if __name__ == "__main__":
+    main()
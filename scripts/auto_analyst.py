@@ -1,16 +1,16 @@
 import os
 import re
 import json
+import socket
 import logging
+import threading
 import time
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 # ── Groq (주석 처리 — Groq Dev 플랜 복구 시 활성화) ──────────────────────────
 # from groq import Groq
 # ── Cerebras (주석 처리 — 브릿지 완료) ───────────────────────────────────────
 # from cerebras.cloud.sdk import Cerebras
 # ─────────────────────────────────────────────────────────────────────────────
-from google import genai
-from google.genai import types as genai_types
 from supabase import create_client, Client
 from dotenv import load_dotenv
 
@@ -26,6 +26,30 @@ try:
 except ImportError:
     _SCORE_AVAILABLE = False
 
+# ── 처리 우선순위 (dart_crawler 와 공유) ──────────────────────────────────────
+from disclosure_priority import priority_score, priority_tier, TOP_TIER
+
+# ── 공시 제목 규칙 (스킵 / 유형 힌트 — dart_crawler · reprocess_db 와 공유) ─────
+from disclosure_rules import SKIP_EXACT, classify_title, hint_types
+
+# ── 동시 분석 엔진 (RPM/TPM 제한 + 429 백오프, backfill_scores / reprocess_db 와 공유) ──
+from llm_engine import EngineStats, get_engine, estimate_tokens, is_rate_limited
+
+# ── LLM 백엔드 (Gemini / 오프라인 대체 — LLM_BACKEND 환경변수) ─────────────────
+from llm_backends import LLMBackend, LLMResponse, get_backend
+
+# ── LLM 호출 원장 (모델·토큰·지연·재시도·결과·최종 상태 → llm_call_ledger, migration 065) ──
+from llm_ledger import LlmCall, get_ledger
+
+# ── 분석 결과 영속 캐시 (모델·프롬프트·입력이 같으면 재호출 없이 재사용) ─────────
+from llm_cache import get_llm_cache, cache_key, prompt_fingerprint
+
+# ── 유사 중복 공시 감지 ([기재정정]·자회사·반복 공정공시 → 원본 분석 결과 복사) ──────
+from near_dup import get_detector, to_signed
+
+# ── 본문 압축 (상용구·반복 행 제거 + 유형별 토큰 예산) ────────────────────────
+from content_compactor import compact, COMPACT_VERSION, LLM_COMPACT
+
 # 로깅 설정
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -49,158 +73,44 @@ SUPABASE_KEY = os.environ.get("SUPABASE_SERVICE_ROLE_KEY")
 # _CEREBRAS_MODEL = "qwen-3-235b-a22b-instruct-2507"
 # ─────────────────────────────────────────────────────────────────────────────
 
-# ── Gemini 클라이언트 (google-genai SDK, 유료) ────────────────────────────────
-GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY")
-_gemini_client = genai.Client(api_key=GEMINI_API_KEY)
-_GEMINI_MODEL = "gemini-2.5-flash"
+# ── Gemini 호출은 llm_backends.GeminiBackend (google-genai SDK, 유료) ───────────
+# LLM_BACKEND=standin 이면 오프라인 대체 응답 (부하 시험·벤치마크용, scripts/bench_analyst.py)
+_OUTPUT_TOKEN_EST = 1000   # 응답 JSON 예상 토큰 (TPM 선차감용, 실제 사용량으로 정산)
+
+
+# ── 배치 분석 (짧은 공시 여러 건을 한 요청으로 — 긴 시스템 프롬프트를 건마다 내지 않도록) ──
+LLM_BATCH_MAX_ITEMS   = int(os.environ.get("LLM_BATCH_MAX_ITEMS", 8))       # 응답 8192 토큰 / 건당 ~800
+LLM_BATCH_TOKENS      = int(os.environ.get("LLM_BATCH_TOKENS", 12000))      # 배치당 본문 토큰 예산
+LLM_BATCH_ITEM_TOKENS = int(os.environ.get("LLM_BATCH_ITEM_TOKENS", 3000))  # 이보다 긴 공시는 단건 분석
+_BATCH_OUTPUT_TOKEN_EST = 800   # 배치 내 건당 응답 예상 토큰
+# ─────────────────────────────────────────────────────────────────────────────
+
+# ── 대기열 claim (claim_pending_disclosures RPC, migration 064) ─────────────────
+# 워커마다 겹치지 않는 pending 묶음을 FOR UPDATE SKIP LOCKED 로 1회 왕복에 가져감.
+# processing 행은 lease 가 지나면 다음 claim 이 다시 가져감 (reap_stuck_processing 대체).
+# 처리 중인 묶음은 lease 의 1/3 주기로 연장하고, 결과 저장은 claimed_by 가 자신인 행에만 한다
+# (lease 가 끊겨 다른 워커가 다시 가져간 행의 결과를 덮어쓰지 않도록).
+ANALYSIS_CLAIM_BATCH   = int(os.environ.get("ANALYSIS_CLAIM_BATCH", 50))     # claim 1회 건수
+ANALYSIS_LEASE_SECONDS = int(os.environ.get("ANALYSIS_LEASE_SECONDS", 900))  # 연장 없이 버티는 시간
+ANALYST_WORKER_ID      = os.environ.get("ANALYST_WORKER_ID") or f"{socket.gethostname()}:{os.getpid()}"
+_claim_rpc_available = True   # RPC 가 없으면 False → 기존 SELECT + 건별 락
+_CLAIM_COLUMNS = ("id, corp_name, stock_code, rcept_dt, report_nm, content, rcept_no, analysis_retry_count, "
+                  "fetch_priority, created_at")
 # ─────────────────────────────────────────────────────────────────────────────
 
 supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
 
 # ── AI 분석 스킵 필터 (비용 절감 + 저시그널 제거) ────────────────────────────
-# 목표: DART 일 ~2,300건 → 필터 후 300~500건 → AI 분석 100~250건
-# 분석 대상: CONTRACT, DILUTION, BUYBACK, DIVIDEND, MNA, CAPEX, EARNINGS(결정류), LEGAL(중요)
-
-_SKIP_EXACT: frozenset[str] = frozenset({
-    # ① 지분/의결권 변동 — 정형화된 신고, 트레이딩 시그널 없음
-    "주식등의대량보유상황보고서(일반)",
-    "주식등의대량보유상황보고서(약식)",
-    "임원ㆍ주요주주특정증권등소유상황보고서",
-    "최대주주등소유주식변동신고서",
-    "소속부변경",
-    "주주명부폐쇄기간또는기준일설정",
-    "주권매매거래정지(주식의 병합, 분할 등 전자등록 변경, 말소)",
-    "주주총회소집결의(임시주주총회)",
-    "주주총회소집결의",
-    "주주총회결과",
-
-    # ② 정기보고서 — 토큰 비용 과다, 실시간 시그널 없음 (이미 알려진 정보)
-    # ※ DART는 "분기보고서 (2026.03)" 형식으로 날짜 suffix를 붙임 → prefix로 처리
-    "연결재무제표기준영업(잠정)실적(공정공시)",  # 잠정실적 공정공시 — 별도 결산공시로 커버
-
-    # ③ 임원 변동 — 뉴스 가치 있으나 단기 트레이딩 시그널 미미
-    "임원의변동",
-    "대표이사의변동",
-
-    # ④ 주식매수선택권 — 행사/취득은 이미 주가 반영, 부여 신고는 저시그널
-    "주식매수선택권행사",
-    "주식매수선택권취득",
-    "주식매수선택권부여에관한신고",
-    "[기재정정]주식매수선택권부여에관한신고",
-
-    # ⑤ 소급/결과 보고 — 이미 주가 반응 완료
-    "자기주식처분결과보고서",
-    "자기주식취득결과보고서",
-    "전환청구권행사",
-    "결산실적공시예고(안내공시)",
-
-    # ⑥ 의무/형식 공시 — 정보 가치 없음
-    "타인에대한채무보증결정",
-    "채권자이의제출공고",
-    "공정공시",
-    "기업설명회(IR) 개최",
-
-    # ⑦ ELS/DLS 파생결합 — 주식 희석 아님, 시그널 없음
-    "일괄신고추가서류(파생결합사채-주가연계파생결합사채)",
-    "일괄신고추가서류(파생결합증권-주가연계증권)",
-    "일괄신고추가서류",
-})
-
-# prefix 패턴: startswith 확인 (변형 이름 다수 존재)
-_SKIP_PREFIXES: tuple[str, ...] = (
-    # 소급 보고 — 발행 결과 (이미 주가 반응 완료)
-    "증권발행결과",
-    "[기재정정]증권발행결과",
-
-    # 정기보고서 — "사업보고서 (2025.12)" 등 날짜 suffix 형식 대응
-    "사업보고서 ",
-    "반기보고서 ",
-    "분기보고서 ",
-    "[첨부추가]사업보고서",
-    "[첨부추가]반기보고서",
-    "[첨부추가]분기보고서",
-
-    # IR 개최 안내 변형 ("기업설명회(IR) 개최(안내공시)" 등)
-    "기업설명회(IR)",
-
-    # 기재정정 — 원공시 이미 분석, 대부분 오탈자·첨부 수정
-    # 단, 고시그널 유형(유상증자·CB·BW·합병·분할)은 아래 화이트리스트로 예외 처리
-    "[기재정정]사업보고서",
-    "[기재정정]반기보고서",
-    "[기재정정]분기보고서",
-    "[기재정정]임원의변동",
-    "[기재정정]주주총회",
-    "[기재정정]주식등의대량보유",
-    "[기재정정]임원ㆍ주요주주",
-
-    # ELS/DLS 변형
-    "일괄신고추가서류(기타파생결합사채)",
-    "[기재정정]일괄신고추가서류(기타파생결합사채)",
-    "일괄신고서(기타파생결합사채)",
-    "[기재정정]일괄신고서(기타파생결합사채)",
-
-    # 채무증권 발행조건확정 — 소급성 강함, 주식 희석 없음
-    "[발행조건확정]증권신고서(채무증권)",
-
-    # 정기보고서 정정
-    "[기재정정]사업보고서",
-    "[기재정정]반기보고서",
-    "[기재정정]분기보고서",
-
-    # ETF/집합투자 관련
-    "집합투자업자변경",
-    "투자신탁재산운용보고서",
-)
-
-# 키워드 포함 패턴: 제목에 해당 문자열 포함 시 스킵
-_SKIP_CONTAINS: tuple[str, ...] = (
-    "소송등의판결",       # 소송 진행 업데이트 (결정이 아닌 경과 보고)
-    "소송취하",
-    "집합투자기구",       # 펀드/ETF 관련
-    "투자신탁",
-    "수익증권",
-    "부동산투자회사",     # 리츠 정기보고 (리츠 배당결정은 별도 처리)
-)
-
-# [기재정정] 중 분석 가치 있는 고시그널 유형 화이트리스트
-_AMENDMENT_WHITELIST: tuple[str, ...] = (
-    "[기재정정]유상증자",
-    "[기재정정]전환사채권",
-    "[기재정정]신주인수권부사채",
-    "[기재정정]합병",
-    "[기재정정]분할",
-    "[기재정정]주요사항보고서(유상증자",
-    "[기재정정]주요사항보고서(전환사채",
-    "[기재정정]주요사항보고서(신주인수권",
-    "[기재정정]주요사항보고서(합병",
-    "[기재정정]주요사항보고서(분할",
-)
-
+# 규칙 목록(정확히 일치 / 접두어 / 포함 / [기재정정] 화이트리스트)은 disclosure_rules 에 있음.
+# 제목 1회 순회로 skip·유형 힌트를 함께 판정 (결과 캐시 → classify_disclosure 와 중복 계산 없음)
 
 def _should_skip_report(report_nm: str) -> bool:
     """report_nm이 AI 분석 불필요 공시인지 판단."""
-    nm = report_nm.strip()
-
-    # [기재정정] 화이트리스트 우선 통과
-    if nm.startswith("[기재정정]") and any(nm.startswith(w) for w in _AMENDMENT_WHITELIST):
-        return False
-
-    if nm in _SKIP_EXACT:
-        return True
-    if any(nm.startswith(p) for p in _SKIP_PREFIXES):
-        return True
-    if any(kw in nm for kw in _SKIP_CONTAINS):
-        return True
-
-    # [기재정정] 나머지 전체 스킵 (화이트리스트 미해당)
-    if nm.startswith("[기재정정]"):
-        return True
-
-    return False
+    return classify_title(report_nm).skip
 
 
 # 하위호환: 기존 코드가 SKIP_REPORT_NM_TYPES 를 참조하는 경우를 위한 alias
-SKIP_REPORT_NM_TYPES = _SKIP_EXACT
+SKIP_REPORT_NM_TYPES = SKIP_EXACT
 
 # ── event_type 허용 값 (스키마 강제) ─────────────────────────────────────────
 # Groq가 NEUTRAL, DEBT, STRUCTURAL, IPO 등 임의 값을 생성하는 문제 방지
@@ -212,21 +122,40 @@ _VALID_EVENT_TYPES: frozenset[str] = frozenset({
 
 # ── 스코어 인라인 계산 헬퍼 ───────────────────────────────────────────────────
 
-_event_stats_cache: dict | None = None   # 프로세스당 1회 로드
+_event_stats_cache: dict | None = None   # 프로세스당 1회 로드 (reload_event_stats 로 교체)
+_event_stats_lock = threading.Lock()     # 여러 엔진 스레드의 최초 동시 로드 방지
+
+
+def _load_event_stats() -> dict:
+    if not _SCORE_AVAILABLE:
+        return {}
+    stats = load_event_stats(supabase)
+    logging.getLogger(__name__).info(f"[score] event_stats 로드: {len(stats)}개 이벤트 유형")
+    return stats
 
 
 def _get_event_stats() -> dict:
     """event_stats 테이블을 프로세스 내 1회만 조회해 캐시."""
     global _event_stats_cache
-    if _event_stats_cache is None:
-        if _SCORE_AVAILABLE:
-            _event_stats_cache = load_event_stats(supabase)
-            logging.getLogger(__name__).info(
-                f"[score] event_stats 로드: {len(_event_stats_cache)}개 이벤트 유형"
-            )
-        else:
-            _event_stats_cache = {}
-    return _event_stats_cache
+    stats = _event_stats_cache
+    if stats is None:
+        with _event_stats_lock:
+            if _event_stats_cache is None:
+                _event_stats_cache = _load_event_stats()
+            stats = _event_stats_cache
+    return stats
+
+
+def reload_event_stats() -> int:
+    """
+    event_stats 다시 로드 (장기 실행 워커 — EOD 재집계 반영). 반환: 이벤트 유형 수.
+    새로 읽은 뒤에만 교체하므로, 로드 실패 시 예외가 전파되고 기존 캐시는 그대로 유지됩니다.
+    """
+    global _event_stats_cache
+    stats = _load_event_stats()
+    with _event_stats_lock:
+        _event_stats_cache = stats
+    return len(stats)
 
 
 def _fetch_lps(stock_code: str, rcept_dt: str) -> float | None:
@@ -310,7 +239,7 @@ def validate_numbers(text: str) -> bool:
 
 class AIAnalyst:
 
-    def __init__(self):
+    def __init__(self, compact_content: bool | None = None, backend: LLMBackend | None = None):
 
         # ✅ Core Prompt (공통 규칙)
         self.core_prompt = """
@@ -478,6 +407,28 @@ In ai_summary:
 """
         }
 
+        # 호출·토큰 누적 (여러 워커 스레드 공유) — 배치/단건 비교, 비용 집계용
+        self._lock = threading.Lock()
+        self.usage = {"calls": 0, "prompt_tokens": 0, "output_tokens": 0, "batch_fallback": 0,
+                      "content_tokens_raw": 0, "content_tokens_sent": 0}
+        self._batch_cap = max(1, LLM_BATCH_MAX_ITEMS)   # 적응형 배치 크기 상한
+
+        # 본문 압축 (기본: LLM_COMPACT 환경변수) — 비교 측정 시 인스턴스별로 지정
+        self.compact_content = LLM_COMPACT if compact_content is None else compact_content
+
+        # LLM 백엔드 (기본: LLM_BACKEND 환경변수 — gemini / standin)
+        self.backend = backend or get_backend()
+
+        # 결과 캐시 — 프롬프트 템플릿·압축 규칙을 고치면 prompt_version 이 바뀌어 자동으로 miss
+        self.cache = get_llm_cache() if self.backend.cacheable else None
+
+        # 호출 원장 — 최종 analysis_status 는 저장 단계(_apply_result)에서 채움
+        self.ledger = get_ledger(supabase, worker=ANALYST_WORKER_ID)
+        self.prompt_version = prompt_fingerprint(
+            self.core_prompt, json.dumps(self.type_rules, sort_keys=True), self._BATCH_RULES,
+            COMPACT_VERSION if self.compact_content else "raw",
+        )
+
     # ✅ 공시 유형 힌트 분류 (복수 매칭 허용 — Groq에 분석 지침 제공용)
     def classify_disclosure(self, title: str) -> list[str]:
         """
@@ -485,60 +436,43 @@ In ai_summary:
         복수 매칭 가능 (e.g. "유상증자 + 합병" → [DILUTION, MNA]).
         최종 event_type 결정은 Groq가 content 기반으로 수행.
         """
-        t = title.lower()
-        matched: list[str] = []
-
-        if "전환사채" in t or "bw" in t or "cb" in t or "유상증자" in t:
-            matched.append("DILUTION")
-        if "단일판매" in t or "공급계약" in t or "수주" in t or "mou" in t:
-            matched.append("CONTRACT")
-        if "자기주식" in t:
-            # 자기주식 처분(매도) → DISPOSAL, 취득/소각 → BUYBACK
-            if "처분" in t or "disposal" in t:
-                matched.append("DISPOSAL")
-            else:
-                matched.append("BUYBACK")
-        if ("배당" in t or "dividend" in t or "기준일설정" in t
-                or "배당결정" in t or "현금·현물" in t):
-            matched.append("DIVIDEND")
-        # 유형자산취득 → CAPEX (물리적 자산: 공장·설비·토지, 항상 CAPEX)
-        if "유형자산취득" in t:
-            matched.append("CAPEX")
-        # 타법인주식취득·합병·인수·분할·지분취득 → MNA
-        if "합병" in t or "인수" in t or "분할" in t or ("지분" in t and "취득" in t) or "타법인주식" in t:
-            matched.append("MNA")
-        if "소송" in t or "횡령" in t or "배임" in t or "과징금" in t or "수사" in t:
-            matched.append("LEGAL")
-        if "분기" in t or "사업보고서" in t or "잠정" in t or "실적" in t or "결산" in t:
-            matched.append("EARNINGS")
-        if "임원의변동" in t or "대표이사의변동" in t:
-            matched.append("EXECUTIVE_CHANGE")
-        if any(kw in title for kw in [
-            "시설투자", "설비투자", "CAPEX", "투자 결정", "신규 투자",
-            "증설", "공장 신설", "라인 증설",
-        ]):
-            matched.append("CAPEX")
-
-        return matched if matched else ["OTHER"]
+        # 규칙 원본은 disclosure_rules (수집 allowlist · 분석 스킵 · 우선순위 점수와 공유)
+        return hint_types(title)
 
     # ✅ 프롬프트 생성
-    def build_prompt(self, corp_name, report_nm, content):
-        # 복수 유형 힌트 → 해당 분석 규칙 모두 포함 (content 기반 최종 분류는 Groq 담당)
-        hint_types = self.classify_disclosure(report_nm)
-        type_rules_text = ""
+    def _type_rules_text(self, hint_types) -> str:
+        text = ""
         for ht in hint_types:
             rule = self.type_rules.get(ht, "")
             if rule:
-                type_rules_text += f"\n[Analysis guidance for potential {ht}]:{rule}"
+                text += f"\n[Analysis guidance for potential {ht}]:{rule}"
+        return text
 
+    def _input_text(self, report_nm, content, hint_types=None, record: bool = False) -> str:
+        """
+        제목 + 본문. compact_content 면 유형별 토큰 예산으로 압축 (content_compactor).
+        record=True (실제 프롬프트 생성) 일 때만 압축 전후 토큰을 usage 에 누적.
+        """
         is_empty = not content or str(content).strip() == ""
         is_not_available = str(content) == "CONTENT_NOT_AVAILABLE"
 
         if is_empty or is_not_available:
-            input_text = f"Title: {report_nm}\n(Note: Content not available. Analyze based on title.)"
-        else:
-            clean_content = str(content).replace('\x00', '').replace('\u0000', '')
-            input_text = f"Title: {report_nm}\n\nContent:\n{clean_content}"
+            return f"Title: {report_nm}\n(Note: Content not available. Analyze based on title.)"
+        clean_content = str(content).replace('\x00', '').replace('\u0000', '')
+        if self.compact_content:
+            hints = hint_types if hint_types is not None else self.classify_disclosure(report_nm)
+            clean_content, stats = compact(clean_content, hints)
+            if record:
+                with self._lock:
+                    self.usage["content_tokens_raw"] += stats.tokens_before
+                    self.usage["content_tokens_sent"] += stats.tokens_after
+        return f"Title: {report_nm}\n\nContent:\n{clean_content}"
+
+    def build_prompt(self, corp_name, report_nm, content):
+        # 복수 유형 힌트 → 해당 분석 규칙 모두 포함 (content 기반 최종 분류는 Groq 담당)
+        hint_types = self.classify_disclosure(report_nm)
+        type_rules_text = self._type_rules_text(hint_types)
+        input_text = self._input_text(report_nm, content, hint_types, record=True)
 
         # event_type은 반드시 content 내용 기준으로 판단 (title 키워드에 종속 금지)
         type_hint_note = (
@@ -551,27 +485,29 @@ In ai_summary:
         return final_system_prompt, f"Company: {corp_name}\n\n{input_text}"
 
     # ✅ 분석 실행
-    def analyze_content(self, corp_name, report_nm, content):
+    def analyze_content(self, corp_name, report_nm, content, ref=None):
+        """ref: 공시 ID (호출 원장에 최종 analysis_status 를 연결할 때만 사용)."""
+        key = self._cache_key(corp_name, report_nm, content)
+        cached = self.cache.get(key) if self.cache else None
+        if cached is not None:
+            return cached
+
+        call = self._start_call("single", [ref])
         try:
             system_prompt, user_prompt = self.build_prompt(corp_name, report_nm, content)
 
-            # ── Gemini 호출 (google-genai SDK, 유료) ─────────────────────────
-            # thinking_budget=0: 2.5 Flash 기본 thinking 비활성화
-            #   → thinking 토큰이 output 예산 소진하는 문제 방지
-            #   → JSON 구조화 출력에는 thinking 불필요 (비용 절감 효과도 있음)
-            # max_output_tokens=8192: 장문 DART 본문 대응 (기존 2400 → truncation 발생)
-            response = _gemini_client.models.generate_content(
-                model=_GEMINI_MODEL,
-                contents=user_prompt,
-                config=genai_types.GenerateContentConfig(
-                    system_instruction=system_prompt,
-                    response_mime_type="application/json",
-                    temperature=0.2,
-                    max_output_tokens=8192,
-                    thinking_config=genai_types.ThinkingConfig(thinking_budget=0),
-                ),
-            )
-            return json.loads(response.text)
+            # ── LLM 호출 (기본 Gemini — 모델 설정은 llm_backends.GeminiBackend) ──
+            # 속도 제한·429 재시도는 공용 엔진이 담당 (llm_engine.py)
+            response = self._generate(system_prompt, user_prompt, _OUTPUT_TOKEN_EST, call)
+            try:
+                result = json.loads(response.text)
+            except ValueError:
+                call.outcome = "parse_error"
+                raise
+            if not self.validate_result(result):
+                call.outcome = "invalid"
+            self._cache_put(key, result, response.prompt_tokens, response.output_tokens)
+            return result
             # ─────────────────────────────────────────────────────────────────
 
             # ── Groq 호출 (주석 처리 — Groq Dev 복구 시 활성화) ──────────────
@@ -590,15 +526,217 @@ In ai_summary:
         except Exception as e:
             logger.error(f"❌ [{corp_name}] 분석 에러: {e}")
             return None
+        finally:
+            self._record_call(call)
+
+    def _generate(self, system_prompt: str, user_prompt: str, output_est: int,
+                  call: LlmCall | None = None) -> LLMResponse:
+        """
+        LLM 호출 (공용 엔진 경유 — 속도 제한·429 재시도) + 사용 토큰 누적.
+        call 이 있으면 지연(마지막 시도 / 대기 포함 전체)·재시도·토큰·오류를 채운다.
+        """
+        attempts = 0
+        attempt_at = started = time.monotonic()
+
+        def attempt():
+            nonlocal attempts, attempt_at
+            attempts += 1
+            attempt_at = time.monotonic()
+            return self.backend.generate(system_prompt, user_prompt)
+
+        try:
+            response = get_engine().call(
+                attempt,
+                est_tokens=estimate_tokens(system_prompt + user_prompt) + output_est,
+                usage=lambda r: r.total_tokens or None,
+            )
+        except Exception as e:
+            if call is not None:
+                call.outcome = "rate_limited" if is_rate_limited(e) else "error"
+                call.error = str(e)
+            raise
+        finally:
+            if call is not None and attempts:
+                now = time.monotonic()
+                call.latency_ms = int((now - attempt_at) * 1000)
+                call.wall_ms = int((now - started) * 1000)
+                call.retries = attempts - 1
+        if call is not None:
+            call.prompt_tokens, call.output_tokens = response.prompt_tokens, response.output_tokens
+        with self._lock:
+            self.usage["calls"] += 1
+            self.usage["prompt_tokens"] += response.prompt_tokens
+            self.usage["output_tokens"] += response.output_tokens
+        return response
+
+    # ✅ 호출 원장
+    def _start_call(self, mode: str, refs) -> LlmCall:
+        return LlmCall.start(self.backend.model, self.prompt_version, mode, refs)
+
+    def _record_call(self, call: LlmCall) -> None:
+        if self.ledger:
+            self.ledger.record(call)
+
+    # ✅ 결과 캐시
+    def _cache_key(self, corp_name, report_nm, content) -> str:
+        return cache_key(self.backend.model, self.prompt_version, corp_name, report_nm, content)
+
+    def _cache_put(self, key: str, result, prompt_tokens: int, output_tokens: int) -> None:
+        """스키마 검증을 통과한 결과만 저장 (실패·잘린 응답은 다음 실행에서 다시 분석)."""
+        if self.cache and self.validate_result(result):
+            self.cache.put(key, self.backend.model, self.prompt_version, result, prompt_tokens, output_tokens)
+
+    # ✅ 배치 분석 — 짧은 공시 여러 건을 한 요청으로
+    _REQUIRED_FIELDS = ("headline", "key_numbers", "event_type", "sentiment_score", "ai_summary")
+
+    _BATCH_RULES = """
+BATCH MODE:
+- The user message contains several independent disclosures. Each starts with a line "=== ITEM <id> ===".
+- Analyze every item on its own. Never mix companies, figures or context between items.
+- Each item may carry a "Title-based hint" line — reference only; set event_type from that item's CONTENT.
+- Return exactly: {"results": [{"id": "<id>", <all fields of the JSON format above>}, ...]}
+  with one entry per item, using the ids exactly as given.
+"""
+
+    def validate_result(self, result) -> bool:
+        """단건 결과 스키마 검증 (배치 응답 항목별 확인용)."""
+        if not isinstance(result, dict):
+            return False
+        if any(result.get(f) in (None, "", []) for f in self._REQUIRED_FIELDS):
+            return False
+        try:
+            float(result.get("sentiment_score"))
+        except (TypeError, ValueError):
+            return False
+        return isinstance(result.get("key_numbers"), list)
+
+    def item_tokens(self, item: dict) -> int:
+        return estimate_tokens(self._input_text(item.get("report_nm"), item.get("content")))
+
+    def plan_batches(self, items: list[dict]) -> list[list[dict]]:
+        """
+        items → 배치 목록. 짧은 공시는 LLM_BATCH_TOKENS 예산과 현재 배치 크기 상한 안에서 묶고,
+        LLM_BATCH_ITEM_TOKENS 보다 긴 공시는 단건 배치로 둔다 (입력 순서 = 우선순위 유지).
+        """
+        cap = self._batch_cap
+        batches: list[list[dict]] = []
+        cur: list[dict] = []
+        cur_tokens = 0
+        for item in items:
+            t = self.item_tokens(item)
+            if t > LLM_BATCH_ITEM_TOKENS:
+                batches.append([item])
+                continue
+            if cur and (len(cur) >= cap or cur_tokens + t > LLM_BATCH_TOKENS):
+                batches.append(cur)
+                cur, cur_tokens = [], 0
+            cur.append(item)
+            cur_tokens += t
+        if cur:
+            batches.append(cur)
+        return batches
+
+    def build_batch_prompt(self, items: list[dict]) -> tuple[str, str]:
+        """items: [{"id", "corp_name", "report_nm", "content", "ref"}] → (system, user) 프롬프트."""
+        hints: list[str] = []
+        blocks: list[str] = []
+        for it in items:
+            item_hints = self.classify_disclosure(it.get("report_nm"))
+            hints.extend(h for h in item_hints if h not in hints)
+            hint_line = (
+                f"\nTitle-based hint: {', '.join(item_hints)}" if item_hints != ["OTHER"] else ""
+            )
+            blocks.append(
+                f"=== ITEM {it['id']} ===\nCompany: {it.get('corp_name')}{hint_line}\n"
+                f"{self._input_text(it.get('report_nm'), it.get('content'), item_hints, record=True)}"
+            )
+        system_prompt = self.core_prompt + self._type_rules_text(hints) + self._BATCH_RULES
+        return system_prompt, "\n\n".join(blocks)
+
+    def analyze_batch(self, items: list[dict]) -> dict[str, dict | None]:
+        """
+        여러 공시를 한 요청으로 분석. 반환: {id: 결과 | None}
+        결과 캐시에 있는 항목은 요청에서 빼고, 남은 항목이 1건이면 단건 분석으로 처리한다.
+        응답에서 빠졌거나 스키마가 맞지 않는 항목은 analyze_content 로 단건 재분석한다.
+        배치 결과가 절반 이상 무효(잘림·파싱 실패 포함)면 이후 배치 크기를 절반으로,
+        전부 유효하면 1씩 늘린다 (LLM_BATCH_MAX_ITEMS 상한).
+        """
+        out: dict[str, dict | None] = {}
+        keys: dict[str, str] = {}
+        pending: list[dict] = []
+        for it in items:
+            keys[str(it["id"])] = self._cache_key(it.get("corp_name"), it.get("report_nm"), it.get("content"))
+            cached = self.cache.get(keys[str(it["id"])]) if self.cache else None
+            if cached is not None:
+                out[it["id"]] = cached
+            else:
+                pending.append(it)
+        items = pending
+
+        if len(items) <= 1:
+            for it in items:
+                out[it["id"]] = self.analyze_content(
+                    it.get("corp_name"), it.get("report_nm"), it.get("content"), ref=it.get("ref"),
+                )
+            return out
+
+        results: dict[str, dict | None] = {}
+        prompt_tokens = output_tokens = 0
+        call = self._start_call("batch", [it.get("ref") for it in items])
+        try:
+            system_prompt, user_prompt = self.build_batch_prompt(items)
+            response = self._generate(system_prompt, user_prompt, _BATCH_OUTPUT_TOKEN_EST * len(items), call)
+            prompt_tokens, output_tokens = response.prompt_tokens, response.output_tokens
+            try:
+                parsed = json.loads(response.text)
+            except ValueError:
+                call.outcome = "parse_error"
+                raise
+            entries = parsed.get("results") if isinstance(parsed, dict) else parsed
+            for entry in entries or []:
+                if isinstance(entry, dict) and str(entry.get("id")) in keys:
+                    results[str(entry.pop("id"))] = entry
+        except Exception as e:
+            logger.warning(f"⚠️ 배치 분석 실패 ({len(items)}건) → 단건 재분석: {e}")
+
+        valid = {k: v for k, v in results.items() if self.validate_result(v)}
+        self._adapt_batch_cap(len(valid), len(items))
+        if call.outcome == "ok" and len(valid) < len(items):
+            call.outcome = "partial" if valid else "invalid"
+        self._record_call(call)
+
+        for it in items:
+            key = str(it["id"])
+            if key in valid:
+                out[it["id"]] = valid[key]
+                # 배치 토큰은 건수로 나눠 기록 (hit 시 절약분 집계용)
+                self._cache_put(keys[key], valid[key], prompt_tokens // len(items), output_tokens // len(items))
+                continue
+            with self._lock:
+                self.usage["batch_fallback"] += 1
+            out[it["id"]] = self.analyze_content(
+                it.get("corp_name"), it.get("report_nm"), it.get("content"), ref=it.get("ref"),
+            )
+        return out
+
+    def _adapt_batch_cap(self, valid: int, total: int) -> None:
+        with self._lock:
+            if valid * 2 < total:
+                self._batch_cap = max(2, self._batch_cap // 2)
+                logger.warning(f"[batch] 유효 {valid}/{total} → 배치 크기 상한 {self._batch_cap}")
+            elif valid == total:
+                self._batch_cap = min(max(1, LLM_BATCH_MAX_ITEMS), self._batch_cap + 1)
 
 
 def run(backfill: bool = False, limit: int = 200,
-        date_from: str = None, date_to: str = None):
+        date_from: str = None, date_to: str = None, batch: bool = False):
     """
     backfill=True  : 이미 completed 이지만 sentiment_score 가 없는 항목 재분석
                      (기존 DB 백테스트용)
     backfill=False : 기본 모드 - analysis_status='pending' 항목만 처리
+                     ANALYSIS_CLAIM_BATCH 건씩 claim (워커 여러 개가 겹치지 않게 나눠 가져감)
     date_from/date_to : 'YYYYMMDD' 형식, 지정 시 rcept_dt 범위 필터
+    batch=True     : 짧은 공시를 묶어 한 요청으로 분석 (AIAnalyst.analyze_batch)
     """
     analyst = AIAnalyst()
 
@@ -606,6 +744,9 @@ def run(backfill: bool = False, limit: int = 200,
     if date_from or date_to:
         range_label = f" [{date_from or '...'} ~ {date_to or '...'}]"
 
+    latency: dict[int, list[float]] = {}   # 티어 → 수집 저장 ~ 분석 완료 (초)
+    get_detector(supabase)                  # 첫 실행 시 최근 공시 서명 인덱스 로드
+
     if backfill:
         logger.info(f"🔁 [BACKFILL]{range_label} sentiment_score 없는 completed 항목 재분석 시작")
         q = supabase.table("disclosure_insights") \
@@ -618,18 +759,160 @@ def run(backfill: bool = False, limit: int = 200,
         if date_to:
             q = q.lte("rcept_dt", date_to)
         res = q.order("rcept_dt", desc=True).limit(limit).execute()
+        rows = res.data or []
+        if not rows:
+            logger.info("✅ 분석할 데이터가 없습니다.")
+            return 0
+        processed = process_rows(analyst, rows, backfill, batch, latency)[0]
     else:
-        logger.info(f"🔍 [분석]{range_label} pending 항목 처리 시작 (limit={limit})")
-        q = supabase.table("disclosure_insights") \
-            .select("id, corp_name, stock_code, rcept_dt, report_nm, content, rcept_no, analysis_retry_count") \
-            .eq("analysis_status", "pending") \
-            .or_("analysis_retry_count.is.null,analysis_retry_count.lt.3")
-        if date_from:
-            q = q.gte("rcept_dt", date_from)
-        if date_to:
-            q = q.lte("rcept_dt", date_to)
-        res = q.order("rcept_dt", desc=True).limit(limit).execute()
+        logger.info(f"🔍 [분석]{range_label} pending 항목 처리 시작 (limit={limit}, worker={ANALYST_WORKER_ID})")
+        # ANALYSIS_CLAIM_BATCH 건씩 claim → 분석 → 다음 claim (lease 는 묶음 단위로만 유지하면 됨)
+        processed = 0
+        attempted: list[str] = []   # 이번 실행에서 이미 시도한 행 — 실패로 pending 복귀해도 다시 가져가지 않음
+        while len(attempted) < limit and not get_engine().stopping:
+            rows = claim_pending(min(ANALYSIS_CLAIM_BATCH, limit - len(attempted)), date_from, date_to, attempted)
+            if not rows:
+                break
+            attempted += [r["id"] for r in rows]
+            processed += process_rows(analyst, rows, backfill, batch, latency)[0]
+        if not attempted:
+            logger.info("✅ 분석할 데이터가 없습니다.")
+            return 0
+
+    if batch:
+        logger.info(f"[batch] usage {analyst.usage}")
+    raw_tokens = analyst.usage["content_tokens_raw"]
+    if raw_tokens:
+        sent = analyst.usage["content_tokens_sent"]
+        logger.info(f"[compact] 본문 토큰 {raw_tokens:,} → {sent:,} ({(1 - sent / raw_tokens) * 100:.0f}% 절감)")
+    if analyst.cache:
+        logger.info(f"[llm-cache] {analyst.cache.summary()}")
+    if get_detector(supabase):
+        logger.info(f"[near-dup] {get_detector(supabase).summary()}")
+    if analyst.ledger:
+        analyst.ledger.flush()
+        logger.info(f"[llm-ledger] {analyst.ledger.summary()}")
+
+    logger.info(f"{'[BACKFILL] ' if backfill else ''}처리 완료: {processed}건")
+    _log_latency(latency)
+    return processed
+
+
+def process_rows(
+    analyst: AIAnalyst,
+    rows: list[dict],
+    backfill: bool,
+    batch: bool,
+    latency: dict[int, list[float]],
+) -> tuple[int, EngineStats]:
+    """
+    가져온(claim 한) 행 묶음 처리 (run / analyst_daemon 공용). 처리하는 동안 claim lease 를 연장.
+    반환: (시작한 건수 — skipped 포함, 미시작 제외, 엔진 통계)
+    """
+    keeper = None
+    if not backfill and _claim_rpc_available:
+        keeper = _LeaseKeeper([r["id"] for r in rows])
+        keeper.start()
+    try:
+        return _process_rows(analyst, rows, backfill, batch, latency)
+    finally:
+        if keeper:
+            keeper.stop()
+
+
+def _process_rows(
+    analyst: AIAnalyst,
+    rows: list[dict],
+    backfill: bool,
+    batch: bool,
+    latency: dict[int, list[float]],
+) -> tuple[int, EngineStats]:
+    # stock_code → corp_name_en 맵 (일괄 조회)
+    stock_codes = list({d['stock_code'] for d in rows if d.get('stock_code')})
+    corp_name_en_map: dict = {}
+    if stock_codes:
+        try:
+            en_res = supabase.table("dart_corp_codes") \
+                .select("stock_code, corp_name_en") \
+                .in_("stock_code", stock_codes) \
+                .execute()
+            for row in (en_res.data or []):
+                if row.get("corp_name_en"):
+                    corp_name_en_map[row["stock_code"]] = row["corp_name_en"]
+        except Exception as e:
+            logger.warning(f"[corp_name_en] 조회 실패 (무시): {e}")
+
+    # ── no-signal 확정 공시 유형 → AI 호출 없이 skipped 처리 (비용 절감, 1회 UPDATE)
+    targets = []
+    skipped = []
+    for item in rows:
+        if _should_skip_report(item.get('report_nm') or ''):
+            skipped.append(item)
+            logger.debug(f"  ⏭️  skipped (no-signal type): {item.get('report_nm')}")
+        else:
+            targets.append(item)
+    if skipped:
+        _set_status([item['id'] for item in skipped], "skipped", owned=not backfill)
+
+    # 분석은 공용 엔진이 RPM/TPM 한도 안에서 동시 처리 (기존: 건당 time.sleep(4.0) 순차)
+    if batch:
+        batches = analyst.plan_batches(targets)
+        logger.info(f"[batch] {len(targets)}건 → {len(batches)}개 요청")
+        stats = get_engine().map(
+            lambda group: _analyze_group(analyst, group, corp_name_en_map, backfill, latency),
+            batches,
+            label="analyst",
+        )
+    else:
+        stats = get_engine().map(
+            lambda item: _analyze_item(analyst, item, corp_name_en_map, backfill, latency),
+            targets,
+            label="analyst",
+        )
+    logger.info(f"[engine] {stats.summary()}")
+    stats.skipped += len(skipped)   # 제목으로 skip 처리한 건도 '분석 불필요' 로 집계
+
+    # map 은 순서대로 시작 → 뒤쪽 항목이 미시작. claim 한 행은 lease 만료를 기다리지 않고 바로 반환
+    unstarted: list[dict] = []
+    if stats.unstarted:
+        unstarted = [it for g in batches[-stats.unstarted:] for it in g] if batch else targets[-stats.unstarted:]
+    if unstarted and not backfill:
+        _set_status([item['id'] for item in unstarted], "pending", owned=True)
+    return len(rows) - len(unstarted), stats
+
 
+def claim_pending(limit: int, date_from: str | None, date_to: str | None, exclude: list[str]) -> list[dict]:
+    """
+    pending(또는 lease 만료 processing) 공시를 limit 건 processing 으로 claim 하고 반환.
+    RPC 가 없으면 (migration 064 미적용) 기존 방식 — SELECT 후 건별 낙관적 락.
+    """
+    global _claim_rpc_available
+    if _claim_rpc_available:
+        try:
+            res = supabase.rpc("claim_pending_disclosures", {
+                "p_worker":        ANALYST_WORKER_ID,
+                "p_limit":         limit,
+                "p_lease_seconds": ANALYSIS_LEASE_SECONDS,
+                "p_date_from":     date_from,
+                "p_date_to":       date_to,
+                "p_exclude":       exclude or None,
+            }).execute()
+            rows = res.data or []
+            # RETURNING 은 순서 보장 없음 → 고시그널 먼저
+            rows.sort(key=lambda r: (r.get("fetch_priority") or 0, r.get("rcept_dt") or ""), reverse=True)
+            if rows:
+                logger.info(f"[claim] {len(rows)}건 claim (lease {ANALYSIS_LEASE_SECONDS}초)")
+            return rows
+        except Exception as e:
+            if "PGRST202" not in str(e):   # 함수 없음 외의 오류(네트워크 등) → 이번 조회만 건너뜀
+                logger.warning(f"[claim] claim 실패 (다음 조회에서 재시도): {e}")
+                return []
+            _claim_rpc_available = False
+            logger.warning(f"[claim] claim_pending_disclosures RPC 없음 → 건별 락으로 대체 (migration 064 확인): {e}")
+    return _claim_pending_legacy(limit, date_from, date_to, exclude)
+
+
+def _claim_pending_legacy(limit: int, date_from: str | None, date_to: str | None, exclude: list[str]) -> list[dict]:
     # ── processing 상태 stuck 행 복구 (2시간 이상 멈춘 행 → pending으로 되돌림) ──
     try:
         reap_res = supabase.rpc("reap_stuck_processing", {}).execute()
@@ -649,131 +932,333 @@ def run(backfill: bool = False, limit: int = 200,
         except Exception as re:
             logger.warning(f"[reaper] stuck 복구 실패 (무시): {re}")
 
-    if not res.data:
-        logger.info("✅ 분석할 데이터가 없습니다.")
-        return 0
+    q = supabase.table("disclosure_insights") \
+        .select(_CLAIM_COLUMNS) \
+        .eq("analysis_status", "pending") \
+        .or_("analysis_retry_count.is.null,analysis_retry_count.lt.3")
+    if date_from:
+        q = q.gte("rcept_dt", date_from)
+    if date_to:
+        q = q.lte("rcept_dt", date_to)
+    if exclude:
+        q = q.not_.in_("id", exclude)
+    # 고시그널(유상증자·합병·공급계약) 먼저 — fetch_priority 는 dart_crawler 가 저장
+    res = q.order("fetch_priority", desc=True).order("rcept_dt", desc=True).limit(limit).execute()
+    return [item for item in (res.data or []) if _lock_item(item)]
+
+
+def _set_status(ids: list[str], status: str, owned: bool = False) -> None:
+    """
+    여러 행의 analysis_status 를 UPDATE 1회로 변경 (skip 표시 / 미시작 claim 반환).
+    owned=True: 이 워커가 claim 해 processing 인 행만 (_owned).
+    """
+    q = supabase.table("disclosure_insights").update({
+        "analysis_status": status,
+        "updated_at": datetime.now().isoformat(),
+    }).in_("id", ids)
+    if owned:
+        q = _owned(q)
+    q.execute()
 
-    # stock_code → corp_name_en 맵 (일괄 조회)
-    stock_codes = list({d['stock_code'] for d in res.data if d.get('stock_code')})
-    corp_name_en_map: dict = {}
-    if stock_codes:
+
+def _owned(q):
+    """
+    이 워커가 claim 해 아직 processing 인 행만 남기는 필터.
+    lease 가 끊겨 다른 워커가 다시 claim 한 행은 claimed_by 가 바뀌어 빠진다
+    (RPC 없는 기존 방식은 claimed_by 컬럼이 없으므로 상태만 확인).
+    """
+    q = q.eq("analysis_status", "processing")
+    if _claim_rpc_available:
+        q = q.eq("claimed_by", ANALYST_WORKER_ID)
+    return q
+
+
+class _LeaseKeeper:
+    """
+    claim 한 행의 lease_expires_at 을 ANALYSIS_LEASE_SECONDS / 3 주기로 연장하는 스레드.
+    묶음 처리(429 백오프 포함)가 lease 보다 길어져도 다른 워커가 다시 claim 하지 않는다.
+    끝난 행(processing 아님)·다른 워커가 가져간 행은 _owned 필터로 자연히 빠진다.
+    """
+
+    def __init__(self, ids: list[str]):
+        self.ids = ids
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="lease-keeper", daemon=True)
+
+    def start(self) -> None:
+        if self.ids:
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout=5)
+
+    def _run(self) -> None:
+        while not self._stop.wait(max(1.0, ANALYSIS_LEASE_SECONDS / 3)):
+            self.renew()
+
+    def renew(self) -> None:
+        until = datetime.now(timezone.utc) + timedelta(seconds=ANALYSIS_LEASE_SECONDS)
         try:
-            en_res = supabase.table("dart_corp_codes") \
-                .select("stock_code, corp_name_en") \
-                .in_("stock_code", stock_codes) \
-                .execute()
-            for row in (en_res.data or []):
-                if row.get("corp_name_en"):
-                    corp_name_en_map[row["stock_code"]] = row["corp_name_en"]
+            res = _owned(
+                supabase.table("disclosure_insights")
+                .update({"lease_expires_at": until.isoformat()})
+                .in_("id", self.ids)
+            ).execute()
+            logger.debug(f"[lease] {len(res.data or [])}/{len(self.ids)}건 연장")
         except Exception as e:
-            logger.warning(f"[corp_name_en] 조회 실패 (무시): {e}")
+            logger.warning(f"[lease] 연장 실패 (다음 주기에 재시도): {e}")
 
-    for item in res.data:
-
-        # ── no-signal 확정 공시 유형 → Groq 호출 없이 skipped 처리 (비용 절감)
-        item_report_nm = (item.get('report_nm') or '').strip()
-        if _should_skip_report(item_report_nm):
-            supabase.table("disclosure_insights").update({
-                "analysis_status": "skipped",
-                "updated_at": "now()",
-            }).eq("id", item['id']).execute()
-            logger.debug(f"  ⏭️  skipped (no-signal type): {item_report_nm}")
-            continue
-
-        # 낙관적 락: pending 상태일 때만 processing으로 변경
-        # 두 인스턴스가 동시에 같은 item을 SELECT 했더라도,
-        # 먼저 update한 쪽만 rows가 반환됨 → 나머지는 skip → Groq 중복 호출 방지
-        lock_res = supabase.table("disclosure_insights").update({
-            "analysis_status": "processing"
-        }).eq("id", item['id']).eq("analysis_status", "pending").execute()
-
-        if not lock_res.data:
-            logger.debug(f"  ⏭️  skip (already processing by another instance): {item['id'][:8]}")
-            continue
-
-        # 영문 기업명 우선 사용 → AI가 한국어 번역에 토큰 낭비 방지
-        corp_name_for_ai = corp_name_en_map.get(item.get('stock_code', '')) or item['corp_name']
-
-        result = analyst.analyze_content(
-            corp_name_for_ai,
-            item['report_nm'],
-            item.get('content')
-        )
 
-        if result:
-            # ── event_type 스키마 검증 — Groq가 임의 값 생성 시 OTHER로 강제 ──────
-            raw_et = (result.get("event_type") or "").strip().upper()
-            if raw_et not in _VALID_EVENT_TYPES:
-                logger.warning(
-                    f"  ⚠️ 비허용 event_type '{raw_et}' → OTHER 강제 ({item['corp_name']})"
-                )
-                result["event_type"] = "OTHER"
-            else:
-                result["event_type"] = raw_et
+_latency_lock = threading.Lock()
 
-            # sentiment_score: float -1.0~+1.0 파싱 (AI가 문자열로 줄 수도 있으므로 방어 처리)
-            raw_score = result.get("sentiment_score")
-            try:
-                sentiment_score = float(raw_score) if raw_score is not None else None
-                if sentiment_score is not None:
-                    sentiment_score = max(-1.0, min(1.0, sentiment_score))
-            except (TypeError, ValueError):
-                sentiment_score = None
-
-            # AI 분석 완료 직후 스코어 인라인 계산
-            scores = _compute_scores_inline(item, result, sentiment_score)
-
-            # 숫자 검증: ai_summary + key_numbers 합쳐서 판단
-            ai_summary_text = result.get("ai_summary") or ""
-            key_numbers_text = " ".join(result.get("key_numbers") or [])
-            has_numbers = validate_numbers(ai_summary_text + " " + key_numbers_text)
-            content_available = item.get("content") and item.get("content") != "CONTENT_NOT_AVAILABLE"
-            # 본문이 있는데도 숫자가 없으면 low_quality
-            analysis_result_status = "completed" if (has_numbers or not content_available) else "low_quality"
-            if analysis_result_status == "low_quality":
-                logger.warning(f"  ⚠️ 숫자 부족 → low_quality: {item['corp_name']}")
-
-            update_data = {
-                "headline": result.get("headline"),
-                "corp_name_en": corp_name_en_map.get(item.get('stock_code', '')) or None,
-                "report_nm_en": result.get("report_nm") or None,  # Groq 번역 영문 공시 제목
-                "key_numbers": result.get("key_numbers"),
-                "event_type": result.get("event_type"),
-                "financial_impact": result.get("financial_impact"),
-                "short_term_impact_score": result.get("short_term_impact_score"),
-                "sentiment_score": sentiment_score,
-                "ai_summary": result.get("ai_summary"),
-                "risk_factors": result.get("risk_factors"),
-                "analysis_status": analysis_result_status,
-                "is_visible": bool(item.get("stock_code", "").strip()),
-                "updated_at": datetime.now().isoformat(),
-                **scores,   # base_score_raw, base_score, final_score, signal_tag
-            }
-
-            supabase.table("disclosure_insights") \
-                .update(update_data) \
-                .eq("id", item['id']) \
-                .execute()
 
-            logger.info(f"✅ 완료: {item['corp_name']}")
+def _analyze_item(
+    analyst: AIAnalyst,
+    item: dict,
+    corp_name_en_map: dict,
+    backfill: bool,
+    latency: dict[int, list[float]],
+) -> bool | None:
+    """
+    공시 1건 분석 + 저장 (엔진 워커 스레드에서 실행).
+    반환: True 완료 / False 분석 실패 / None 다른 인스턴스가 이미 처리 중
+    pending 행은 claim_pending 에서 이미 잡았고, backfill 행만 여기서 락을 건다.
+    """
+    if backfill and not _lock_item(item):
+        return None
+
+    copied = _near_dup_copy(item)
+    if copied is not None:
+        return _apply_result(item, copied, corp_name_en_map, backfill, latency)
+
+    # 영문 기업명 우선 사용 → AI가 한국어 번역에 토큰 낭비 방지
+    corp_name_for_ai = corp_name_en_map.get(item.get('stock_code', '')) or item['corp_name']
+
+    result = analyst.analyze_content(
+        corp_name_for_ai,
+        item['report_nm'],
+        item.get('content'),
+        ref=item['id'],
+    )
+    return _apply_result(item, result, corp_name_en_map, backfill, latency)
+
+
+def _analyze_group(
+    analyst: AIAnalyst,
+    group: list[dict],
+    corp_name_en_map: dict,
+    backfill: bool,
+    latency: dict[int, list[float]],
+) -> bool | None:
+    """
+    배치 1개 분석 + 저장 (엔진 워커 스레드). claim(또는 락)을 잡은 건만 한 요청으로 묶어 보낸다.
+    반환: 한 건이라도 실패하면 False, 전부 다른 인스턴스 처리 중이면 None
+    """
+    locked = [item for item in group if not backfill or _lock_item(item)]
+    if not locked:
+        return None
 
+    outcomes = []
+    remaining = []
+    for item in locked:
+        copied = _near_dup_copy(item)
+        if copied is not None:
+            outcomes.append(_apply_result(item, copied, corp_name_en_map, backfill, latency))
         else:
-            if not backfill:
-                retry_count = (item.get('analysis_retry_count') or 0) + 1
-                new_status = "failed" if retry_count >= 3 else "pending"
-                supabase.table("disclosure_insights").update({
-                    "analysis_status": new_status,
-                    "analysis_retry_count": retry_count,
-                    "updated_at": datetime.now().isoformat()
-                }).eq("id", item['id']).execute()
+            remaining.append(item)
+    locked = remaining
+    if not locked:
+        return _group_outcome(outcomes)
+
+    results = analyst.analyze_batch([
+        {
+            "id":        str(n),
+            "corp_name": corp_name_en_map.get(item.get('stock_code', '')) or item['corp_name'],
+            "report_nm": item['report_nm'],
+            "content":   item.get('content'),
+            "ref":       item['id'],
+        }
+        for n, item in enumerate(locked, 1)
+    ])
+    outcomes += [
+        _apply_result(item, results.get(str(n)), corp_name_en_map, backfill, latency)
+        for n, item in enumerate(locked, 1)
+    ]
+    return _group_outcome(outcomes)
+
+
+def _group_outcome(outcomes: list[bool | None]) -> bool | None:
+    """배치 결과 합산: 실패가 하나라도 있으면 False, 전부 None(다른 워커가 가져감)이면 None."""
+    if all(o is None for o in outcomes):
+        return None
+    return all(o is not False for o in outcomes)
 
-            logger.warning(f"⚠️ 실패: {item['corp_name']}")
 
-        time.sleep(4.0)  # Gemini 유료 Tier1: 정상 운영 throttle
+def _near_dup_copy(item: dict) -> dict | None:
+    """최근 분석 완료 공시와 거의 같은 본문이면 그 분석 결과 (item["_simhash"] 도 기록)."""
+    detector = get_detector(supabase)
+    if detector is None:
+        return None
+    try:
+        return detector.find_copy(item)
+    except Exception as e:
+        logger.warning(f"[near-dup] 검사 실패 → 새로 분석: {e}")
+        return None
 
-    processed = len(res.data)
-    logger.info(f"{'[BACKFILL] ' if backfill else ''}처리 완료: {processed}건")
-    return processed
+
+def _lock_item(item: dict) -> bool:
+    # 낙관적 락: pending 상태일 때만 processing으로 변경
+    # 두 인스턴스가 동시에 같은 item을 SELECT 했더라도,
+    # 먼저 update한 쪽만 rows가 반환됨 → 나머지는 skip → Groq 중복 호출 방지
+    lock_res = supabase.table("disclosure_insights").update({
+        "analysis_status": "processing"
+    }).eq("id", item['id']).eq("analysis_status", "pending").execute()
+
+    if not lock_res.data:
+        logger.debug(f"  ⏭️  skip (already processing by another instance): {item['id'][:8]}")
+        return False
+    return True
+
+
+def _apply_result(
+    item: dict,
+    result: dict | None,
+    corp_name_en_map: dict,
+    backfill: bool,
+    latency: dict[int, list[float]],
+) -> bool | None:
+    """
+    분석 결과 검증·스코어 계산 후 저장. 결과 없으면 재시도 카운트 증가.
+    반환: True 저장 / False 분석 실패 / None 그사이 lease 가 끊겨 다른 워커가 가져감 (결과 버림)
+    """
+    if result:
+        # ── event_type 스키마 검증 — Groq가 임의 값 생성 시 OTHER로 강제 ──────
+        raw_et = (result.get("event_type") or "").strip().upper()
+        if raw_et not in _VALID_EVENT_TYPES:
+            logger.warning(
+                f"  ⚠️ 비허용 event_type '{raw_et}' → OTHER 강제 ({item['corp_name']})"
+            )
+            result["event_type"] = "OTHER"
+        else:
+            result["event_type"] = raw_et
+
+        # sentiment_score: float -1.0~+1.0 파싱 (AI가 문자열로 줄 수도 있으므로 방어 처리)
+        raw_score = result.get("sentiment_score")
+        try:
+            sentiment_score = float(raw_score) if raw_score is not None else None
+            if sentiment_score is not None:
+                sentiment_score = max(-1.0, min(1.0, sentiment_score))
+        except (TypeError, ValueError):
+            sentiment_score = None
+
+        # AI 분석 완료 직후 스코어 인라인 계산
+        scores = _compute_scores_inline(item, result, sentiment_score)
+
+        # 숫자 검증: ai_summary + key_numbers 합쳐서 판단
+        ai_summary_text = result.get("ai_summary") or ""
+        key_numbers_text = " ".join(result.get("key_numbers") or [])
+        has_numbers = validate_numbers(ai_summary_text + " " + key_numbers_text)
+        content_available = item.get("content") and item.get("content") != "CONTENT_NOT_AVAILABLE"
+        # 본문이 있는데도 숫자가 없으면 low_quality
+        analysis_result_status = "completed" if (has_numbers or not content_available) else "low_quality"
+        if analysis_result_status == "low_quality":
+            logger.warning(f"  ⚠️ 숫자 부족 → low_quality: {item['corp_name']}")
+
+        update_data = {
+            "headline": result.get("headline"),
+            "corp_name_en": corp_name_en_map.get(item.get('stock_code', '')) or None,
+            "report_nm_en": result.get("report_nm") or None,  # Groq 번역 영문 공시 제목
+            "key_numbers": result.get("key_numbers"),
+            "event_type": result.get("event_type"),
+            "financial_impact": result.get("financial_impact"),
+            "short_term_impact_score": result.get("short_term_impact_score"),
+            "sentiment_score": sentiment_score,
+            "ai_summary": result.get("ai_summary"),
+            "risk_factors": result.get("risk_factors"),
+            "analysis_status": analysis_result_status,
+            "is_visible": bool(item.get("stock_code", "").strip()),
+            "updated_at": datetime.now().isoformat(),
+            **scores,   # base_score_raw, base_score, final_score, signal_tag
+        }
+        sig = item.get("_simhash")
+        if sig is not None:
+            update_data["content_simhash"] = to_signed(sig)
+
+        q = supabase.table("disclosure_insights") \
+            .update(update_data) \
+            .eq("id", item['id'])
+        res = (q if backfill else _owned(q)).execute()
+        if not backfill and not res.data:
+            return _lost_claim(item)
+
+        if sig is not None and analysis_result_status == "completed":
+            get_detector(supabase).register(item["id"], sig)   # 같은 실행의 뒤쪽 공시도 매칭되도록
+        _ledger_resolve(item["id"], analysis_result_status)
+
+        logger.info(f"✅ 완료: {item['corp_name']}")
+        if not backfill:
+            with _latency_lock:
+                _record_latency(latency, item)
+        return True
+
+    else:
+        new_status = None   # backfill: 상태 변경 없음
+        if not backfill:
+            retry_count = (item.get('analysis_retry_count') or 0) + 1
+            new_status = "failed" if retry_count >= 3 else "pending"
+            res = _owned(supabase.table("disclosure_insights").update({
+                "analysis_status": new_status,
+                "analysis_retry_count": retry_count,
+                "updated_at": datetime.now().isoformat()
+            }).eq("id", item['id'])).execute()
+            if not res.data:
+                return _lost_claim(item)
+        _ledger_resolve(item["id"], new_status)
+
+        logger.warning(f"⚠️ 실패: {item['corp_name']}")
+        return False
+
+
+def _lost_claim(item: dict) -> None:
+    """저장 시점에 claim 을 잃은 행 (lease 만료 후 다른 워커가 claim) — 그 워커의 결과를 덮어쓰지 않음."""
+    logger.warning(f"  ⏭️  claim 만료 — 다른 워커가 처리 중이라 결과 저장 안 함: {item['id'][:8]}")
+    _ledger_resolve(item["id"], None)
+    return None
+
+
+def _ledger_resolve(item_id: str, status: str | None) -> None:
+    """호출 원장에 공시의 최종 analysis_status 전달 (분석 호출이 없었던 공시는 무시됨)."""
+    ledger = get_ledger(supabase)
+    if ledger:
+        ledger.resolve(item_id, status)
+
+
+def _record_latency(latency: dict[int, list[float]], item: dict) -> None:
+    """created_at(크롤러 저장 시각) ~ 분석 완료까지 걸린 시간을 우선순위 티어별로 기록."""
+    created = item.get("created_at")
+    if not created:
+        return
+    try:
+        created_at = datetime.fromisoformat(created.replace("Z", "+00:00"))
+    except ValueError:
+        return
+    now = datetime.now(created_at.tzinfo) if created_at.tzinfo else datetime.now()
+    score = item.get("fetch_priority")
+    tier = priority_tier(score if score is not None else priority_score(item.get("report_nm") or ""))
+    latency.setdefault(tier, []).append((now - created_at).total_seconds())
+
+
+def _log_latency(latency: dict[int, list[float]]) -> None:
+    """티어별 end-to-end 지연 (top 티어는 별도 라인으로 강조)."""
+    for tier in sorted(latency):
+        vals = sorted(latency[tier])
+        p50 = vals[len(vals) // 2]
+        label = "⏱️  [latency][TOP]" if tier == TOP_TIER else f"⏱️  [latency][tier {tier}]"
+        logger.info(
+            f"{label} 수집→분석 완료 {len(vals)}건: p50 {p50 / 60:.1f}분 / 최대 {vals[-1] / 60:.1f}분"
+        )
 
 
 if __name__ == "__main__":
@@ -792,6 +1277,8 @@ if __name__ == "__main__":
                         help="시작 날짜 YYYYMMDD (미지정 시 오늘 기준 5일 이전 자동 적용 — 구 backlog 차단)")
     parser.add_argument("--to",   dest="date_to",   type=str, default=None,
                         help="종료 날짜 YYYYMMDD (예: 20260428)")
+    parser.add_argument("--batch", action="store_true",
+                        help="짧은 공시를 묶어 한 요청으로 분석 (LLM_BATCH_MAX_ITEMS / LLM_BATCH_TOKENS)")
     args = parser.parse_args()
 
     # --from 미지정이면 오늘 기준 5일 이전 rolling window 적용
@@ -811,9 +1298,10 @@ if __name__ == "__main__":
             limit=args.limit,
             date_from=effective_date_from,
             date_to=args.date_to,
+            batch=args.batch,
         )
         total += processed
-        if processed == 0 or args.single_pass:
+        if processed == 0 or args.single_pass or get_engine().stopping:
             break
         if args.max_total > 0 and total >= args.max_total:
             logger.info(f"⛔ max-total {args.max_total}건 도달 → 종료 (누적 {total}건)")
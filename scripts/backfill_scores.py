@@ -17,14 +17,18 @@ auto_analyst.py 의 backfill 로직을 분리한 독립 스크립트.
   python scripts/backfill_scores.py --limit 500      # 500건 처리
   python scripts/backfill_scores.py --dry-run        # 분석 결과만 출력, DB 저장 안 함
   python scripts/backfill_scores.py --all            # 전체 미처리 (limit 없음)
+
+속도: scripts/llm_engine.py 공용 엔진 (LLM_WORKERS 동시 분석, LLM_RPM / LLM_TPM 제한, 429 백오프).
+      Ctrl+C 1회 → 진행 중인 건만 마무리하고 종료.
+캐시: 같은 프롬프트·본문으로 이미 분석한 공시는 scripts/llm_cache.py 결과 캐시에서 재사용 (LLM_CACHE=0 으로 끔).
 """
 
 import os
 import sys
 import json
-import time
 import argparse
 import logging
+import threading
 from datetime import datetime
 from pathlib import Path
 
@@ -43,14 +47,17 @@ if str(_ROOT) not in sys.path:
 from utils.env_loader import load_env
 load_env()
 
+from scripts.llm_engine import get_engine, estimate_tokens
+from scripts.llm_cache import get_llm_cache, cache_key, prompt_fingerprint
+
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 logger = logging.getLogger("backfill_scores")
 
 # ── 설정 ──────────────────────────────────────────────────────────────────────
 
-DEFAULT_LIMIT    = 100
-API_SLEEP_SEC    = 4.0   # Gemini Tier1 throttle (auto_analyst.py 동일)
-BATCH_FETCH_SIZE = 200
+DEFAULT_LIMIT     = 100
+BATCH_FETCH_SIZE  = 200
+OUTPUT_TOKEN_EST  = 1000   # 응답 JSON 예상 토큰 (TPM 선차감용)
 
 # ── Gemini 클라이언트 ─────────────────────────────────────────────────────────
 
@@ -105,8 +112,17 @@ Must be a JSON number, NOT a string.
 """
 
 
+PROMPT_VERSION = prompt_fingerprint("backfill_scores", SYSTEM_PROMPT)
+
+
 def analyze_one(corp_name: str, report_nm: str, content: str) -> dict | None:
-    """단일 공시 Gemini AI 분석. 실패 시 None 반환."""
+    """단일 공시 Gemini AI 분석 (결과 캐시 우선). 실패 시 None 반환."""
+    cache = get_llm_cache()
+    key = cache_key(_GEMINI_MODEL, PROMPT_VERSION, corp_name, report_nm, content)
+    cached = cache.get(key) if cache else None
+    if cached is not None:
+        return cached
+
     if not content or content == "CONTENT_NOT_AVAILABLE":
         user_prompt = f"Company: {corp_name}\nTitle: {report_nm}\n(Content not available. Analyze based on title.)"
     else:
@@ -115,18 +131,30 @@ def analyze_one(corp_name: str, report_nm: str, content: str) -> dict | None:
 
     try:
         client = _get_gemini()
-        response = client.models.generate_content(
-            model=_GEMINI_MODEL,
-            contents=user_prompt,
-            config=genai_types.GenerateContentConfig(
-                system_instruction=SYSTEM_PROMPT,
-                response_mime_type="application/json",
-                temperature=0.2,
-                max_output_tokens=8192,
-                thinking_config=genai_types.ThinkingConfig(thinking_budget=0),
+        response = get_engine().call(
+            lambda: client.models.generate_content(
+                model=_GEMINI_MODEL,
+                contents=user_prompt,
+                config=genai_types.GenerateContentConfig(
+                    system_instruction=SYSTEM_PROMPT,
+                    response_mime_type="application/json",
+                    temperature=0.2,
+                    max_output_tokens=8192,
+                    thinking_config=genai_types.ThinkingConfig(thinking_budget=0),
+                ),
             ),
+            est_tokens=estimate_tokens(SYSTEM_PROMPT + user_prompt) + OUTPUT_TOKEN_EST,
+            usage=lambda r: getattr(getattr(r, "usage_metadata", None), "total_token_count", None),
         )
-        return json.loads(response.text)
+        result = json.loads(response.text)
+        if cache and isinstance(result, dict) and parse_sentiment_score(result.get("sentiment_score")) is not None:
+            meta = getattr(response, "usage_metadata", None)
+            cache.put(
+                key, _GEMINI_MODEL, PROMPT_VERSION, result,
+                getattr(meta, "prompt_token_count", None) or 0,
+                getattr(meta, "candidates_token_count", None) or 0,
+            )
+        return result
     except Exception as e:
         logger.warning(f"  Gemini 오류 [{corp_name}]: {e}")
         return None
@@ -234,32 +262,36 @@ def main():
     logger.info(f"  → {len(targets)}건 대상")
     logger.info("\n  [2/2] AI 분석 중...")
 
-    success = failure = 0
+    progress = {"n": 0}
+    progress_lock = threading.Lock()
 
-    for i, item in enumerate(targets, 1):
+    def process(item: dict) -> bool:
         corp    = item.get("corp_name") or "Unknown"
         report  = item.get("report_nm") or ""
         content = item.get("content") or ""
 
         result = analyze_one(corp, report, content)
-
-        if result:
-            ok = save_one(sb, item["id"], result, args.dry_run)
-            if ok:
-                success += 1
-                logger.info(f"  [{i}/{len(targets)}] ✅ {corp} | {result.get('event_type')} | s={result.get('sentiment_score')}")
-            else:
-                failure += 1
-        else:
-            failure += 1
+        ok = bool(result) and save_one(sb, item["id"], result, args.dry_run)
+        with progress_lock:
+            progress["n"] += 1
+            i = progress["n"]
+        if ok:
+            logger.info(f"  [{i}/{len(targets)}] ✅ {corp} | {result.get('event_type')} | s={result.get('sentiment_score')}")
+        elif not result:
             logger.warning(f"  [{i}/{len(targets)}] ⚠️  분석 실패: {corp}")
+        return ok
 
-        time.sleep(API_SLEEP_SEC)
+    stats = get_engine().map(process, targets, label="backfill")
+    success, failure = stats.done, stats.failed
 
     logger.info("\n" + "=" * 55)
-    logger.info(f"  완료: 성공 {success}건 / 실패 {failure}건")
+    logger.info(f"  완료: 성공 {success}건 / 실패 {failure}건" + (f" / 미처리 {stats.unstarted}건" if stats.unstarted else ""))
+    logger.info(f"  [engine] {stats.summary()}")
+    if get_llm_cache():
+        logger.info(f"  [llm-cache] {get_llm_cache().summary()}")
     logger.info("=" * 55)
-    fail_rate = failure / len(targets) if targets else 0
+    attempted = success + failure
+    fail_rate = failure / attempted if attempted else 0
     sys.exit(1 if fail_rate >= 0.5 else 0)
 
 
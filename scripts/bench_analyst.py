@@ -0,0 +1,261 @@
+"""
+scripts/bench_analyst.py
+========================
+auto_analyst 오프라인 처리량 벤치마크 (LLM 대체 백엔드 + 인메모리 Supabase).
+
+저장된 공시 N건을 pending 으로 FakeSupabase 에 넣고 auto_analyst.run() 을 그대로 돌립니다
+(claim → 프롬프트 → LLM → 파싱 → 스코어 → 저장). LLM 은 llm_backends.StandInBackend 라
+Gemini 크레딧이 들지 않고, 운영 DB 에도 쓰지 않습니다.
+
+출력:
+  - items/sec        completed + low_quality 건수 / 전체 경과 시간
+  - 단계별 시간      claim / prompt / llm / engine_wait / parse / near_dup / score / write / status
+                     prompt 이후는 엔진 워커 스레드 누적 시간 (병렬이라 경과 시간보다 클 수 있음)
+                     engine_wait = 제한기 대기 + 429 백오프 (AIAnalyst._generate - llm)
+                     write       = _apply_result - score (결과 검증·UPDATE·near-dup 등록)
+  - 최종 상태 분포, LLM 호출·429 재시도 횟수, DB 호출 횟수 (FakeSupabase 테이블·동작별)
+
+공시 출처 (하나 이상, 없으면 합성 공시):
+  --days N     운영 DB 최근 N일 본문 있는 공시 (읽기 전용 조회)
+  --input F    JSON 파일 (--save 로 저장한 것) — 네트워크 없이 같은 표본 재사용
+
+설정:
+  LLM_BACKEND=standin 고정, 결과 캐시 끔(LLM_CACHE=0).
+  LLM_RPM / LLM_TPM 은 기본 사실상 무제한 — 파이프라인 자체 처리량을 재기 위해.
+  운영 한도에서의 처리량은 --rpm 60 처럼 지정. 대체 응답 지연·오류 비율은 LLM_STANDIN_* 환경변수.
+
+사용법:
+  python scripts/bench_analyst.py --days 3 --limit 300 --save /tmp/analyst_sample.json
+  python scripts/bench_analyst.py --input /tmp/analyst_sample.json --workers 8 --latency 1.2
+  python scripts/bench_analyst.py --input /tmp/analyst_sample.json --batch --db-latency 0.03
+  LLM_STANDIN_429_RATE=0.05 python scripts/bench_analyst.py --limit 200 --rpm 60
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from pathlib import Path
+
+_ROOT = Path(__file__).resolve().parent.parent
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+if str(_ROOT / "scripts") not in sys.path:
+    sys.path.insert(0, str(_ROOT / "scripts"))
+
+from scripts.fake_supabase import FakeSupabase
+
+STAGES = ("claim", "prompt", "llm", "engine_wait", "parse", "near_dup", "score", "write", "status")
+_COLUMNS = ("id, corp_name, stock_code, rcept_dt, report_nm, content, rcept_no, "
+            "fetch_priority, created_at")
+
+
+class _StageTimer:
+    def __init__(self):
+        self.seconds: dict[str, float] = defaultdict(float)
+        self.calls: dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def add(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self.seconds[stage] += seconds
+            self.calls[stage] += 1
+
+    def wrap(self, stage: str, fn):
+        def timed(*a, **kw):
+            t0 = time.perf_counter()
+            try:
+                return fn(*a, **kw)
+            finally:
+                self.add(stage, time.perf_counter() - t0)
+        return timed
+
+
+class _TimedJson:
+    """auto_analyst 의 json 모듈 자리에 넣어 json.loads(응답 파싱) 시간만 잰다."""
+
+    def __init__(self, timer: _StageTimer):
+        self.loads = timer.wrap("parse", json.loads)
+
+    def __getattr__(self, name):
+        return getattr(json, name)
+
+
+# ── 공시 표본 ─────────────────────────────────────────────────────────────────
+
+def _db_rows(days: int, limit: int) -> list[dict]:
+    from supabase import create_client
+    from utils.env_loader import load_env
+    load_env()
+    sb = create_client(os.environ["NEXT_PUBLIC_SUPABASE_URL"], os.environ["SUPABASE_SERVICE_ROLE_KEY"])
+    since = (datetime.now() - timedelta(days=days)).strftime("%Y%m%d")
+    res = sb.table("disclosure_insights") \
+        .select(_COLUMNS) \
+        .gte("rcept_dt", since) \
+        .not_.is_("content", "null") \
+        .order("rcept_dt", desc=True) \
+        .limit(limit) \
+        .execute()
+    return res.data or []
+
+
+def _synthetic_rows(limit: int) -> list[dict]:
+    from scripts.check_disclosure_rules import _REAL_TITLES
+    rng = random.Random(7)
+    titles = [t.strip() for t in _REAL_TITLES if t.strip()]
+    today = datetime.now().strftime("%Y%m%d")
+    rows = []
+    for i in range(limit):
+        figures = " | ".join(f"항목{j} | {rng.randint(1, 99_999):,}백만원 | {rng.uniform(-50, 50):.1f}%"
+                             for j in range(rng.randint(3, 40)))
+        rows.append({
+            "corp_name": f"합성기업{i % 97}", "stock_code": f"{100000 + i % 97}",
+            "rcept_dt": today, "report_nm": titles[i % len(titles)],
+            "content": f"1. 결정 내용\n{figures}\n2. 기타 투자판단에 참고할 사항\n해당사항 없음",
+            "rcept_no": f"{today}{900000 + i}", "fetch_priority": rng.randint(0, 100),
+        })
+    return rows
+
+
+def _seed(sink: FakeSupabase, rows: list[dict]) -> None:
+    """표본을 pending 으로 적재 + claim_pending_disclosures RPC (migration 064) 흉내."""
+    created = datetime.now().isoformat()
+    sink.tables["disclosure_insights"] = [
+        {**r, "id": str(uuid.uuid4()), "analysis_status": "pending", "analysis_retry_count": 0,
+         "created_at": created, "content_simhash": None}
+        for r in rows
+    ]
+
+    def claim(params: dict) -> list[dict]:
+        exclude = set(params.get("p_exclude") or [])
+        date_from = (params.get("p_date_from") or "").replace("-", "")
+        date_to = (params.get("p_date_to") or "").replace("-", "")
+        with sink._lock:
+            pool = [
+                r for r in sink.tables["disclosure_insights"]
+                if r["analysis_status"] == "pending" and (r.get("analysis_retry_count") or 0) < 3
+                and r["id"] not in exclude
+                and (not date_from or str(r.get("rcept_dt")) >= date_from)
+                and (not date_to or str(r.get("rcept_dt")) <= date_to)
+            ]
+            pool.sort(key=lambda r: (r.get("fetch_priority") or 0, r.get("rcept_dt") or ""), reverse=True)
+            claimed = pool[: params["p_limit"]]
+            for r in claimed:
+                r.update(analysis_status="processing", claimed_by=params["p_worker"])
+            return [dict(r) for r in claimed]
+
+    sink.rpc_handlers["claim_pending_disclosures"] = claim
+
+
+# ── 계측 ──────────────────────────────────────────────────────────────────────
+
+def _instrument(analyst_mod, timer: _StageTimer) -> None:
+    cls = analyst_mod.AIAnalyst
+    cls.build_prompt       = timer.wrap("prompt", cls.build_prompt)
+    cls.build_batch_prompt = timer.wrap("prompt", cls.build_batch_prompt)
+    cls._generate          = timer.wrap("generate", cls._generate)
+    backend = analyst_mod.get_backend()
+    backend.generate = timer.wrap("llm", backend.generate)
+    analyst_mod.json = _TimedJson(timer)
+
+    analyst_mod.claim_pending          = timer.wrap("claim", analyst_mod.claim_pending)
+    analyst_mod._near_dup_copy         = timer.wrap("near_dup", analyst_mod._near_dup_copy)
+    analyst_mod._compute_scores_inline = timer.wrap("score", analyst_mod._compute_scores_inline)
+    analyst_mod._apply_result          = timer.wrap("apply", analyst_mod._apply_result)
+    analyst_mod._set_status            = timer.wrap("status", analyst_mod._set_status)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="auto_analyst 오프라인 벤치마크 (LLM 대체 + 인메모리 DB)")
+    parser.add_argument("--limit", type=int, default=200, help="분석할 공시 수 (기본 200)")
+    parser.add_argument("--days", type=int, default=0, help="운영 DB 최근 N일 공시를 표본으로 (읽기 전용)")
+    parser.add_argument("--input", help="표본 JSON 파일 (--save 로 저장한 것)")
+    parser.add_argument("--save", help="표본을 JSON 파일로 저장 (다음 실행에서 --input 으로 재사용)")
+    parser.add_argument("--batch", action="store_true", help="짧은 공시 묶음 분석 (run(batch=True))")
+    parser.add_argument("--workers", type=int, help="엔진 동시 스레드 수 (LLM_WORKERS)")
+    parser.add_argument("--rpm", type=float, help="분당 요청 상한 (기본 무제한)")
+    parser.add_argument("--latency", type=float, help="대체 LLM 평균 지연 초 (LLM_STANDIN_LATENCY)")
+    parser.add_argument("--db-latency", dest="db_latency", type=float, default=0.0, help="DB execute() 당 지연 초")
+    parser.add_argument("--verbose", action="store_true", help="auto_analyst INFO 로그 출력")
+    args = parser.parse_args()
+
+    rows: list[dict] = []
+    if args.days:
+        rows += _db_rows(args.days, args.limit)
+    if args.input:
+        rows += json.loads(Path(args.input).read_text(encoding="utf-8"))
+    source = "db/file" if rows else "synthetic"
+    rows = rows[: args.limit] or _synthetic_rows(args.limit)
+    if args.save:
+        Path(args.save).write_text(json.dumps(rows, ensure_ascii=False), encoding="utf-8")
+        print(f"  저장: {args.save} ({len(rows)}건)")
+
+    os.environ["LLM_BACKEND"] = "standin"
+    os.environ["LLM_CACHE"] = "0"
+    os.environ.setdefault("NEXT_PUBLIC_SUPABASE_URL", "http://localhost:54321")
+    os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "offline.bench.key")
+    os.environ["LLM_RPM"] = str(args.rpm or 1_000_000)
+    os.environ.setdefault("LLM_TPM", str(1_000_000_000))
+    if args.workers:
+        os.environ["LLM_WORKERS"] = str(args.workers)
+    if args.latency is not None:
+        os.environ["LLM_STANDIN_LATENCY"] = str(args.latency)
+
+    import auto_analyst                      # 환경변수 설정 후 import (백엔드·엔진 설정)
+    from llm_engine import get_engine
+    if not args.verbose:
+        logging.getLogger().setLevel(logging.WARNING)
+
+    sink = FakeSupabase(latency=args.db_latency)
+    _seed(sink, rows)
+    auto_analyst.supabase = sink
+    timer = _StageTimer()
+    _instrument(auto_analyst, timer)
+    engine = get_engine()
+    backend = auto_analyst.get_backend()
+
+    t0 = time.perf_counter()
+    auto_analyst.run(limit=len(rows), batch=args.batch)
+    wall = time.perf_counter() - t0
+
+    timer.seconds["engine_wait"] = max(0.0, timer.seconds.pop("generate", 0.0) - timer.seconds["llm"])
+    timer.calls["engine_wait"] = timer.calls.pop("generate", 0)
+    timer.seconds["write"] = max(0.0, timer.seconds.pop("apply", 0.0) - timer.seconds["score"])
+    timer.calls["write"] = timer.calls.pop("apply", 0)
+
+    status = Counter(r["analysis_status"] for r in sink.tables["disclosure_insights"])
+    analyzed = status["completed"] + status["low_quality"]
+
+    print()
+    print("=" * 72)
+    print(f"auto_analyst 오프라인 벤치마크  {len(rows)}건 ({source})  "
+          f"{'batch' if args.batch else 'single'}  workers={engine.workers}")
+    print(f"  LLM 대체 지연 {backend.latency}s ±{backend.jitter * 100:.0f}%  "
+          f"429 {backend.rate_limit_rate:.0%} / 5xx {backend.error_rate:.0%} / 잘린 JSON {backend.bad_json_rate:.0%}  "
+          f"RPM {engine.limiter.rpm:,.0f}  db-latency={args.db_latency}s")
+    print("=" * 72)
+    print(f"  경과            {wall:8.2f} s")
+    print(f"  분석 저장       {analyzed:8d} 건   ({analyzed / wall:,.2f} items/s, {analyzed / wall * 60:,.0f}건/분)")
+    print(f"  LLM 호출        {timer.calls['llm']:8d} 회   (429 재시도 {engine.rate_limited}회)")
+    print(f"  최종 상태       " + "  ".join(f"{k} {v}" for k, v in sorted(status.items())))
+    print()
+    print(f"  {'단계':12s} {'호출':>7s} {'누적 초':>9s} {'경과 대비':>9s} {'건당 ms':>9s}")
+    for stage in STAGES:
+        sec = timer.seconds.get(stage, 0.0)
+        per_item = sec / len(rows) * 1000 if rows else 0.0
+        print(f"  {stage:12s} {timer.calls.get(stage, 0):7d} {sec:9.2f} {sec / wall * 100:8.0f}% {per_item:9.1f}")
+    print()
+    print("  DB 호출 (FakeSupabase)")
+    for name, n in sorted(sink.calls.items()):
+        print(f"    {name:40s} {n:6d}")
+
+
+if __name__ == "__main__":
+    main()
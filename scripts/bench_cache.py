@@ -0,0 +1,180 @@
+"""
+scripts/bench_cache.py
+=======================
+캐시 백엔드별 hit 지연 비교 벤치마크.
+
+비교 대상:
+  local   per-process dict  (backend.core.cache._LOCAL)
+  shared  워커 간 공유 캐시  (backend.core.shared_cache, tmpfs SQLite)
+  redis   KV_URL / REDIS_URL 설정 시에만
+
+페이로드는 /v1/disclosures 응답과 비슷한 크기(기본 50건)로 생성합니다.
+멀티 워커 hit ratio 는 --workers 로 N 개 프로세스가 같은 키 집합을
+조회하는 시나리오를 돌려 local(1/N) vs shared 를 비교합니다.
+
+사용법:
+  python scripts/bench_cache.py
+  python scripts/bench_cache.py --iterations 20000 --items 200
+  python scripts/bench_cache.py --workers 4
+"""
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+import statistics
+import tempfile
+import multiprocessing
+from pathlib import Path
+
+_ROOT = Path(__file__).resolve().parent.parent
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
+from backend.core.shared_cache import SharedCache
+
+
+def make_payload(items: int) -> dict:
+    row = {
+        "id": "00000000-0000-0000-0000-000000000000",
+        "rcept_no": "20260301000123",
+        "corp_name": "삼성전자",
+        "stock_code": "005930",
+        "report_nm": "주요사항보고서(유상증자결정)",
+        "rcept_dt": "20260301",
+        "sentiment_score": 0.42,
+        "event_type": "CAPITAL_RAISE",
+        "ai_summary": "유상증자 결정으로 단기 희석 우려가 있으나 신규 투자 재원 확보." * 2,
+        "final_score": 61.3,
+        "key_numbers": {"Amount": "1.2T KRW", "Ratio": "8.5%"},
+    }
+    return {"data": [dict(row) for _ in range(items)], "total": items}
+
+
+def _summary(name: str, samples: list[float]) -> str:
+    samples.sort()
+    p50 = statistics.median(samples) * 1e6
+    p99 = samples[int(len(samples) * 0.99) - 1] * 1e6
+    return f"  {name:8s} p50 {p50:9.1f} µs   p99 {p99:9.1f} µs   ({len(samples)} hits)"
+
+
+def bench_local(payload: dict, iterations: int) -> list[float]:
+    from backend.core import cache
+    cache._LOCAL.clear()
+    cache._LOCAL["bench:key"] = (payload, time.monotonic() + 3600)
+    out = []
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        entry = cache._LOCAL.get("bench:key")
+        assert entry and time.monotonic() < entry[1]
+        out.append(time.perf_counter() - t0)
+    return out
+
+
+def bench_shared(payload: dict, iterations: int, path: str) -> list[float]:
+    sc = SharedCache(path)
+    sc.set("bench:key", payload, 3600)
+    out = []
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        assert sc.get("bench:key") is not None
+        out.append(time.perf_counter() - t0)
+    return out
+
+
+async def bench_redis(payload: dict, iterations: int, url: str) -> list[float]:
+    import json
+    import redis.asyncio as aioredis  # type: ignore[import]
+
+    r = aioredis.from_url(url, decode_responses=True)
+    await r.setex("bench:key", 3600, json.dumps(payload, ensure_ascii=False))
+    out = []
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        raw = await r.get("bench:key")
+        assert json.loads(raw)
+        out.append(time.perf_counter() - t0)
+    await r.delete("bench:key")
+    await r.aclose()
+    return out
+
+
+# ── 멀티 워커 hit ratio ──────────────────────────────────────────────────────
+
+def _worker(mode: str, path: str, keys: int, requests_per_worker: int, seed: int, q) -> None:
+    import random
+    rnd = random.Random(seed)
+    local: dict = {}
+    sc = SharedCache(path) if mode == "shared" else None
+    hit = 0
+    for _ in range(requests_per_worker):
+        k = f"bench:k{rnd.randrange(keys)}"
+        if sc:
+            if sc.get(k) is not None:
+                hit += 1
+            else:
+                sc.set(k, {"v": k}, 3600)
+        else:
+            if k in local:
+                hit += 1
+            else:
+                local[k] = {"v": k}
+    q.put(hit)
+
+
+def bench_hit_ratio(workers: int, keys: int, requests_per_worker: int, path: str) -> dict:
+    result = {}
+    for mode in ("local", "shared"):
+        if mode == "shared" and os.path.exists(path):
+            os.remove(path)
+        q = multiprocessing.Queue()
+        procs = [
+            multiprocessing.Process(target=_worker, args=(mode, path, keys, requests_per_worker, i, q))
+            for i in range(workers)
+        ]
+        for p in procs:
+            p.start()
+        hits = sum(q.get() for _ in procs)
+        for p in procs:
+            p.join()
+        result[mode] = hits / (workers * requests_per_worker) * 100
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="캐시 백엔드 hit 지연 벤치마크")
+    parser.add_argument("--iterations", type=int, default=10000, help="hit 반복 횟수")
+    parser.add_argument("--items",      type=int, default=50,    help="페이로드 행 수")
+    parser.add_argument("--workers",    type=int, default=4,     help="hit ratio 시뮬레이션 워커 수")
+    parser.add_argument("--keys",       type=int, default=500,   help="hit ratio 시뮬레이션 키 수")
+    args = parser.parse_args()
+
+    payload = make_payload(args.items)
+    path = str(Path(tempfile.mkdtemp()) / "bench-cache.db")
+
+    print("=" * 60)
+    print(f"캐시 hit 지연 (payload {args.items}건, {args.iterations}회)")
+    print("=" * 60)
+    print(_summary("local", bench_local(payload, args.iterations)))
+    print(_summary("shared", bench_shared(payload, args.iterations, path)))
+
+    url = os.getenv("KV_URL") or os.getenv("REDIS_URL")
+    if url and not url.startswith("https://"):
+        try:
+            samples = asyncio.run(bench_redis(payload, min(args.iterations, 2000), url))
+            print(_summary("redis", samples))
+        except Exception as e:
+            print(f"  redis    건너뜀 ({e})")
+    else:
+        print("  redis    건너뜀 (KV_URL / REDIS_URL 미설정)")
+
+    print()
+    print(f"멀티 워커 hit ratio (workers={args.workers}, keys={args.keys})")
+    ratios = bench_hit_ratio(args.workers, args.keys, args.keys * 4, path)
+    for mode, ratio in ratios.items():
+        print(f"  {mode:8s} {ratio:5.1f}%")
+
+
+if __name__ == "__main__":
+    main()
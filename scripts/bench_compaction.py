@@ -0,0 +1,161 @@
+"""
+scripts/bench_compaction.py
+===========================
+본문 압축(content_compactor) 효과 측정 — 토큰 수 / 분류 정확도 / 지연.
+
+1) 토큰 분포 (기본, AI 호출 없음)
+   eval_quality.py 의 TARGET_SAMPLES (또는 --recent N 최근 completed 공시) 본문을
+   압축 전후로 토큰 추정해 힌트 유형별 p50 / p90 / 최대, 절감률, 예산 초과 건수를 출력합니다.
+
+2) 품질·지연 비교 (--analyze, Gemini 호출 비용 발생, DB 쓰기 없음)
+   같은 샘플을 압축 끔 / 켬 두 AIAnalyst 로 각각 분석해 아래를 출력합니다.
+     - eval_quality 정답(expected) 대비 event_type 정확도  (--recent 는 두 모드 일치율만)
+     - 호출당 입력 토큰 (Gemini usage_metadata 기준), 건당 비용
+     - 호출 지연 p50 / p90 / 최대
+   결과 캐시는 끄고 실행합니다 (두 모드 모두 실제 호출).
+
+사용법:
+  python scripts/bench_compaction.py
+  python scripts/bench_compaction.py --recent 300
+  python scripts/bench_compaction.py --analyze --limit 40
+  LLM_COMPACT_SCALE=0.5 python scripts/bench_compaction.py --analyze --limit 40
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+_ROOT = Path(__file__).resolve().parent.parent
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+if str(_ROOT / "scripts") not in sys.path:
+    sys.path.insert(0, str(_ROOT / "scripts"))
+
+os.environ["LLM_CACHE"] = "0"   # 두 모드 모두 실제 호출
+
+import auto_analyst
+from auto_analyst import AIAnalyst, _VALID_EVENT_TYPES
+from content_compactor import compact, budget_for
+from disclosure_priority import hint_types
+from eval_quality import TARGET_SAMPLES, fetch_by_ids
+from llm_cache import estimate_cost
+from llm_engine import get_engine
+
+
+def _pct(vals: list[float], q: float) -> float:
+    vals = sorted(vals)
+    return vals[min(len(vals) - 1, int(len(vals) * q))] if vals else 0.0
+
+
+def _load(args) -> list[dict]:
+    if not args.recent:
+        rows = fetch_by_ids(TARGET_SAMPLES[:args.limit])
+        return [r for r in rows if r.get("content")]
+    res = auto_analyst.supabase.table("disclosure_insights") \
+        .select("id, corp_name, report_nm, content, event_type") \
+        .eq("analysis_status", "completed") \
+        .not_.is_("content", "null") \
+        .order("rcept_dt", desc=True) \
+        .limit(args.recent) \
+        .execute()
+    return res.data or []
+
+
+def _token_report(rows: list[dict]) -> None:
+    groups: dict[str, list[tuple[int, int, bool]]] = defaultdict(list)
+    for r in rows:
+        hints = hint_types(r.get("report_nm"))
+        _, st = compact(r["content"], hints)
+        groups["/".join(hints)].append((st.tokens_before, st.tokens_after, st.over_budget > 0))
+
+    print(f"  {'유형':24s} {'건수':>5s} {'압축 전 p50/p90/최대':>22s} {'압축 후 p50/p90/최대':>22s} "
+          f"{'절감':>6s} {'예산초과':>8s} {'예산':>6s}")
+    all_before = all_after = 0
+    for name in sorted(groups, key=lambda g: -len(groups[g])):
+        vals = groups[name]
+        before = [v[0] for v in vals]
+        after = [v[1] for v in vals]
+        all_before += sum(before)
+        all_after += sum(after)
+        print(f"  {name[:24]:24s} {len(vals):5d} "
+              f"{_pct(before, .5):7.0f}/{_pct(before, .9):6.0f}/{max(before):7.0f} "
+              f"{_pct(after, .5):7.0f}/{_pct(after, .9):6.0f}/{max(after):7.0f} "
+              f"{(1 - sum(after) / max(1, sum(before))) * 100:5.0f}% "
+              f"{sum(1 for v in vals if v[2]):8d} {budget_for(name.split('/')):6d}")
+    print(f"\n  전체 본문 토큰 {all_before:,} → {all_after:,} "
+          f"({(1 - all_after / max(1, all_before)) * 100:.0f}% 절감)")
+
+
+def _analyze(rows: list[dict], compact_content: bool) -> tuple[AIAnalyst, dict, list[float]]:
+    analyst = AIAnalyst(compact_content=compact_content)
+    out: dict = {}
+    latencies: list[float] = []
+
+    def one(r):
+        t0 = time.perf_counter()
+        result = analyst.analyze_content(r.get("corp_name"), r.get("report_nm"), r.get("content"))
+        latencies.append(time.perf_counter() - t0)
+        et = (result or {}).get("event_type", "")
+        out[r["id"]] = et.strip().upper() if et and et.strip().upper() in _VALID_EVENT_TYPES else ("OTHER" if result else None)
+        return result is not None
+
+    get_engine().map(one, rows, label="bench-compact")
+    return analyst, out, latencies
+
+
+def _quality_report(rows: list[dict]) -> None:
+    modes = {}
+    for name, flag in (("raw", False), ("compact", True)):
+        modes[name] = _analyze(rows, flag)
+
+    has_label = any(r.get("_expected") for r in rows)
+    print(f"\n  {'모드':8s} {'정확도':>8s} {'입력/호출':>10s} {'출력/호출':>10s} {'$/건':>9s} "
+          f"{'지연 p50':>9s} {'p90':>7s} {'최대':>7s}")
+    for name, (analyst, out, lat) in modes.items():
+        u = analyst.usage
+        calls = max(1, u["calls"])
+        acc = ""
+        if has_label:
+            labeled = [r for r in rows if r.get("_expected") and out.get(r["id"])]
+            ok = sum(1 for r in labeled if out[r["id"]] == r["_expected"])
+            acc = f"{ok}/{len(labeled)}"
+        print(f"  {name:8s} {acc:>8s} {u['prompt_tokens'] / calls:10.0f} {u['output_tokens'] / calls:10.0f} "
+              f"{estimate_cost(u['prompt_tokens'], u['output_tokens']) / calls:9.5f} "
+              f"{_pct(lat, .5):8.1f}s {_pct(lat, .9):6.1f}s {max(lat or [0]):6.1f}s")
+
+    raw_out, comp_out = modes["raw"][1], modes["compact"][1]
+    both = [k for k in raw_out if raw_out.get(k) and comp_out.get(k)]
+    agree = sum(1 for k in both if raw_out[k] == comp_out[k])
+    if both:
+        print(f"\n  event_type 일치 (raw vs compact)  {agree}/{len(both)} ({agree / len(both) * 100:.0f}%)")
+    diff = [r for r in rows if r["id"] in both and raw_out[r["id"]] != comp_out[r["id"]]]
+    for r in diff[:20]:
+        print(f"    {r.get('corp_name', '')[:14]:14s} {(r.get('report_nm') or '')[:30]:30s} "
+              f"raw={raw_out[r['id']]:<16s} compact={comp_out[r['id']]:<16s} expected={r.get('_expected', '-')}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="본문 압축 효과 측정 (토큰 / 정확도 / 지연)")
+    parser.add_argument("--limit", type=int, default=100, help="eval_quality 샘플 수 (기본 100)")
+    parser.add_argument("--recent", type=int, default=0, help="eval 샘플 대신 최근 completed 공시 N건")
+    parser.add_argument("--analyze", action="store_true", help="압축 끔/켬 Gemini 분석 비교 (비용 발생)")
+    args = parser.parse_args()
+
+    rows = _load(args)
+    if not rows:
+        print("[ERROR] 대상 공시 없음")
+        sys.exit(1)
+
+    print("=" * 100)
+    print(f"본문 압축 벤치마크  {len(rows)}건  ({'최근 공시' if args.recent else 'eval_quality 샘플'})")
+    print("=" * 100)
+    _token_report(rows)
+    if args.analyze:
+        _quality_report(rows)
+
+
+if __name__ == "__main__":
+    main()
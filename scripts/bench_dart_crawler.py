@@ -0,0 +1,166 @@
+"""
+scripts/bench_dart_crawler.py
+=============================
+dart_crawler 오프라인 처리량 벤치마크 (녹화 응답 재생 + 인메모리 Supabase).
+
+1) 녹화 (1회, 네트워크·DART_API_KEY 필요)
+   실제 DART 에서 하루치 목록·ZIP·뷰어 응답을 cassette 디렉터리에 저장합니다.
+   DB 쓰기는 FakeSupabase 로 보내므로 운영 DB 에 영향 없음.
+
+2) 재생 (네트워크 없음)
+   같은 날짜를 cassette 로 다시 수집해 아래를 출력합니다.
+     - items/sec        저장 건수 / 전체 경과 시간
+     - parse MB/s       html_to_markdown 입력 바이트 기준 (파서 누적 시간 / 전체 경과 시간)
+     - 단계별 시간      list / dedup / content(다운로드+파싱) / parse / db_write / watermark
+                        content·parse 는 워커 스레드 누적 시간 (병렬이라 경과 시간보다 클 수 있음)
+     - DB 호출 횟수     FakeSupabase 테이블·동작별 execute() 횟수
+
+   재생 시 설정:
+     DART 속도 제한 해제, 디스크 캐시 비활성화(매번 파싱), 쿼터 DB 는 임시 파일,
+     --latency 로 요청당 네트워크 지연, --db-latency 로 DB 왕복 지연을 흉내낼 수 있음.
+
+사용법:
+  python scripts/bench_dart_crawler.py --record --date 20260415
+  python scripts/bench_dart_crawler.py --date 20260415
+  python scripts/bench_dart_crawler.py --date 20260415 --workers 8 --latency 0.05 --db-latency 0.03
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+
+_ROOT = Path(__file__).resolve().parent.parent
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
+from scripts.fake_supabase import FakeSupabase
+
+CASSETTE_ROOT = _ROOT / "scripts" / "data" / "dart_cassettes"
+STAGES = ("list", "dedup", "content", "parse", "db_write", "watermark")
+
+
+def _disable_shared_cache() -> None:
+    # run_crawler 끝의 v1:disclosures:* 무효화가 운영 Redis 로 가지 않도록
+    for name in ("KV_URL", "REDIS_URL"):
+        os.environ.pop(name, None)
+
+
+def _prepare_env(mode: str, cassette: Path, args) -> None:
+    os.environ["DART_CASSETTE"] = f"{mode}:{cassette}"
+    os.environ.setdefault("NEXT_PUBLIC_SUPABASE_URL", "http://localhost:54321")
+    os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "offline.bench.key")
+    os.environ.pop("TELEGRAM_BOT_TOKEN", None)
+    _disable_shared_cache()
+    os.environ["DART_QUOTA_DB"] = str(Path(tempfile.mkdtemp(prefix="dart-bench-")) / "quota.db")
+    if mode == "replay":
+        os.environ.setdefault("DART_API_KEY", "replay")
+        os.environ["DART_CASSETTE_LATENCY"] = str(args.latency)
+        os.environ["DART_DOC_CACHE_MB"] = "0"
+        os.environ["DART_RATE_PER_SEC"] = "1000000"
+        os.environ["DART_VIEWER_RATE_PER_SEC"] = "1000000"
+        os.environ["DART_DAILY_QUOTA"] = "1000000000"
+
+
+class _StageTimer:
+    def __init__(self):
+        self.seconds: dict[str, float] = defaultdict(float)
+        self.calls: dict[str, int] = defaultdict(int)
+        self.parse_bytes = 0
+        self._lock = threading.Lock()
+
+    def wrap(self, stage: str, fn, measure=None):
+        def timed(*a, **kw):
+            size = measure(a) if measure else 0
+            t0 = time.perf_counter()
+            try:
+                return fn(*a, **kw)
+            finally:
+                dt = time.perf_counter() - t0
+                with self._lock:
+                    self.seconds[stage] += dt
+                    self.calls[stage] += 1
+                    self.parse_bytes += size
+        return timed
+
+
+def _instrument(crawler, timer: _StageTimer) -> None:
+    crawler._fetch_dart_page      = timer.wrap("list", crawler._fetch_dart_page)
+    crawler._batch_fetch_existing = timer.wrap("dedup", crawler._batch_fetch_existing)
+    crawler.get_clean_content     = timer.wrap("content", crawler.get_clean_content)
+    crawler.html_to_markdown      = timer.wrap(
+        "parse", crawler.html_to_markdown, measure=lambda a: len(a[0].encode("utf-8", errors="ignore"))
+    )
+    crawler._upsert_rows    = timer.wrap("db_write", crawler._upsert_rows)
+    crawler._load_watermark = timer.wrap("watermark", crawler._load_watermark)
+    crawler._save_watermark = timer.wrap("watermark", crawler._save_watermark)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="dart_crawler 오프라인 벤치마크 (cassette 재생)")
+    parser.add_argument("--date", required=True, help="수집일 YYYYMMDD")
+    parser.add_argument("--cassette", help=f"cassette 디렉터리 (기본: {CASSETTE_ROOT.relative_to(_ROOT)}/<date>)")
+    parser.add_argument("--record", action="store_true", help="실제 DART 에서 녹화 (네트워크 필요)")
+    parser.add_argument("--workers", type=int, default=4, help="본문 동시 수집 스레드 수")
+    parser.add_argument("--latency", type=float, default=0.0, help="재생 시 요청당 지연 초")
+    parser.add_argument("--db-latency", dest="db_latency", type=float, default=0.0, help="DB execute() 당 지연 초")
+    args = parser.parse_args()
+
+    cassette = Path(args.cassette) if args.cassette else CASSETTE_ROOT / args.date
+    mode = "record" if args.record else "replay"
+    if mode == "replay" and not (cassette / "index.json").exists():
+        print(f"[ERROR] cassette 없음: {cassette} — 먼저 --record 로 녹화하세요")
+        sys.exit(1)
+
+    _prepare_env(mode, cassette, args)
+    import scripts.dart_crawler as crawler   # 환경변수 설정 후 import (세션·제한기 초기화)
+    _disable_shared_cache()                  # import 시 load_env() 가 .env.local 을 다시 읽으므로 한 번 더
+
+    sink = FakeSupabase(latency=args.db_latency)
+    crawler.supabase = sink
+    timer = _StageTimer()
+    _instrument(crawler, timer)
+
+    t0 = time.perf_counter()
+    crawler.run_crawler(start_date=args.date, end_date=args.date, workers=args.workers, full=True)
+    wall = time.perf_counter() - t0
+
+    saved = len(sink.tables.get("disclosure_insights", []))
+    stats = crawler.session.stats
+    if mode == "record":
+        (cassette / "meta.json").write_text(
+            json.dumps({"date": args.date, "requests": stats["recorded"], "bytes": stats["bytes"]}, indent=1),
+            encoding="utf-8",
+        )
+        print(f"\n녹화 완료: {cassette} ({stats['recorded']}건, {stats['bytes'] / 1e6:.1f}MB, 저장 {saved}건)")
+        return
+
+    print()
+    print("=" * 64)
+    print(f"dart_crawler 오프라인 벤치마크  {args.date}  workers={args.workers}  "
+          f"latency={args.latency}s  db-latency={args.db_latency}s")
+    print("=" * 64)
+    print(f"  경과            {wall:8.2f} s")
+    print(f"  저장            {saved:8d} 건   ({saved / wall:,.1f} items/s)")
+    print(f"  재생 응답       {stats['hit']:8d} 건   {stats['bytes'] / 1e6:,.1f}MB  (miss {stats['miss']})")
+    parse_s = timer.seconds["parse"] or 1e-9
+    print(f"  파싱 입력       {timer.parse_bytes / 1e6:8.1f} MB   "
+          f"(파서 {timer.parse_bytes / 1e6 / parse_s:,.1f} MB/s, 전체 {timer.parse_bytes / 1e6 / wall:,.1f} MB/s)")
+    print()
+    print(f"  {'단계':10s} {'호출':>7s} {'누적 초':>9s} {'경과 대비':>9s}")
+    for stage in STAGES:
+        sec = timer.seconds.get(stage, 0.0)
+        print(f"  {stage:10s} {timer.calls.get(stage, 0):7d} {sec:9.2f} {sec / wall * 100:8.0f}%")
+    print()
+    print("  DB 호출 (FakeSupabase)")
+    for name, n in sorted(sink.calls.items()):
+        print(f"    {name:40s} {n:6d}")
+
+
+if __name__ == "__main__":
+    main()
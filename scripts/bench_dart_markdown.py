@@ -0,0 +1,139 @@
+"""
+scripts/bench_dart_markdown.py
+==============================
+DART 원문 → 마크다운 변환기(scripts/dart_markdown.py) golden 검증 + 처리량 벤치마크.
+
+1) golden 검증
+   scripts/data/dart_golden/ 의 원문(*.xml / *.html)을 변환해
+   같은 이름의 *.md 와 글자 단위로 비교합니다. (*.md 는 기존 정규식 변환기 출력)
+   변환 규칙을 의도적으로 바꿨다면 --update 로 *.md 를 갱신하고
+   dart_markdown.PARSER_VERSION 을 올리세요.
+
+2) 처리량 (MB/s)
+   golden 원문을 이어 붙여 --size-mb 크기의 사업보고서급 문서를 만든 뒤
+   기존 정규식 변환기(_legacy_clean_html_text) vs html_to_markdown,
+   extract_key_sections 를 비교합니다.
+
+사용법:
+  python scripts/bench_dart_markdown.py
+  python scripts/bench_dart_markdown.py --size-mb 8 --repeat 5
+  python scripts/bench_dart_markdown.py --update
+"""
+
+import re
+import sys
+import time
+import argparse
+from pathlib import Path
+
+_ROOT = Path(__file__).resolve().parent.parent
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
+from scripts.dart_markdown import html_to_markdown, extract_key_sections
+
+GOLDEN_DIR = _ROOT / "scripts" / "data" / "dart_golden"
+
+
+def _legacy_clean_html_text(raw_html):
+    """기존 dart_crawler._clean_html_text (정규식 다중 패스) — 비교 기준."""
+    clean = re.sub(r'<(script|style|head)[^>]*>.*?</\1>', '', raw_html, flags=re.DOTALL | re.IGNORECASE)
+
+    def table_to_md(html):
+        rows = re.findall(r'<tr[^>]*>(.*?)</tr>', html, flags=re.DOTALL | re.IGNORECASE)
+        md_rows = []
+        for row in rows:
+            cells = re.findall(r'<t[dh][^>]*>(.*?)</t[dh]>', row, flags=re.DOTALL | re.IGNORECASE)
+            cells = [re.sub(r'<[^>]+>', '', c).strip() for c in cells]
+            cells = [re.sub(r'\s+', ' ', c) for c in cells if c]
+            if cells:
+                md_rows.append('| ' + ' | '.join(cells) + ' |')
+        return '\n'.join(md_rows)
+
+    clean = re.sub(
+        r'<table[^>]*>(.*?)</table>',
+        lambda m: '\n' + table_to_md(m.group(0)) + '\n',
+        clean, flags=re.DOTALL | re.IGNORECASE
+    )
+    clean = re.sub(r'<h[1-3][^>]*>(.*?)</h[1-3]>', lambda m: '\n## ' + re.sub(r'<[^>]+>', '', m.group(1)).strip() + '\n', clean, flags=re.DOTALL | re.IGNORECASE)
+    clean = re.sub(r'<br\s*/?>', '\n', clean, flags=re.IGNORECASE)
+    clean = re.sub(r'</p>', '\n', clean, flags=re.IGNORECASE)
+    clean = re.sub(r'<[^>]+>', ' ', clean)
+    clean = clean.replace('\x00', '').replace('\u0000', '')
+    clean = re.sub(r'[ \t]+', ' ', clean)
+    clean = re.sub(r'\n{3,}', '\n\n', clean)
+    return clean.strip()
+
+
+def _golden_sources() -> list[Path]:
+    return sorted(p for p in GOLDEN_DIR.iterdir() if p.suffix in (".xml", ".html"))
+
+
+def check_golden(update: bool) -> bool:
+    ok = True
+    for src in _golden_sources():
+        raw = src.read_text(encoding="utf-8")
+        out = html_to_markdown(raw)
+        expected_path = src.with_suffix(".md")
+        if update:
+            expected_path.write_text(out, encoding="utf-8")
+            print(f"  갱신  {expected_path.name}")
+            continue
+        expected = expected_path.read_text(encoding="utf-8")
+        same = out == expected
+        legacy_same = _legacy_clean_html_text(raw) == expected
+        ok &= same
+        print(f"  {'OK  ' if same else 'FAIL'}  {src.name:36s} ({len(out):,}자, legacy 일치={legacy_same})")
+        if not same:
+            for i, (a, b) in enumerate(zip(out, expected)):
+                if a != b:
+                    print(f"        첫 차이 @{i}: got {out[i:i+40]!r} / expected {expected[i:i+40]!r}")
+                    break
+    return ok
+
+
+def _throughput(fn, doc: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(doc)
+        best = min(best, time.perf_counter() - t0)
+    return len(doc.encode("utf-8")) / 1e6 / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DART 마크다운 변환기 golden 검증 + 벤치마크")
+    parser.add_argument("--size-mb", type=float, default=4.0, help="벤치마크 문서 크기 (MB)")
+    parser.add_argument("--repeat",  type=int,   default=3,   help="반복 횟수 (최고 기록 사용)")
+    parser.add_argument("--update",  action="store_true",    help="golden *.md 를 현재 출력으로 갱신")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print(f"golden 검증 ({GOLDEN_DIR.relative_to(_ROOT)})")
+    print("=" * 60)
+    ok = check_golden(args.update)
+    if args.update:
+        return
+
+    corpus = "\n".join(p.read_text(encoding="utf-8") for p in _golden_sources())
+    reps = max(1, int(args.size_mb * 1e6 / len(corpus.encode("utf-8"))))
+    doc = corpus * reps
+    size_mb = len(doc.encode("utf-8")) / 1e6
+    assert html_to_markdown(doc) == _legacy_clean_html_text(doc), "대형 문서 출력 불일치"
+
+    print()
+    print(f"처리량 (문서 {size_mb:.1f}MB, {args.repeat}회 중 최고)")
+    legacy = _throughput(_legacy_clean_html_text, doc, args.repeat)
+    stream = _throughput(html_to_markdown, doc, args.repeat)
+    print(f"  legacy regex      {legacy:8.1f} MB/s")
+    print(f"  html_to_markdown  {stream:8.1f} MB/s   (x{stream / legacy:.1f})")
+
+    text = html_to_markdown(doc)
+    extract = _throughput(extract_key_sections, text, args.repeat)
+    print(f"  extract_key_sections {extract:8.1f} MB/s   (변환 결과 {len(text) / 1e6:.1f}M자 기준, 조기 종료)")
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
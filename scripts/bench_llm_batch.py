@@ -0,0 +1,137 @@
+"""
+scripts/bench_llm_batch.py
+==========================
+AIAnalyst 단건 분석 vs 배치 분석(analyze_batch) 처리량·비용 비교.
+
+같은 공시 N건을 두 모드로 각각 분석해 아래를 출력합니다 (DB 쓰기 없음, Gemini 호출 비용 발생).
+  - 경과 시간 / 건당 처리 속도 (건/분)
+  - 요청 수, 건당 입력·출력 토큰, 건당 비용 (GEMINI_PRICE_IN / GEMINI_PRICE_OUT, USD per 1M tokens)
+  - 유효 결과 비율, 배치 → 단건 재분석(fallback) 건수
+  - 두 모드의 event_type 일치율 (배치가 분류 품질을 떨어뜨리는지 확인)
+
+대상: 최근 completed 공시 중 본문이 LLM_BATCH_ITEM_TOKENS 이하인 것 (배치 대상이 되는 짧은 공시).
+
+사용법:
+  python scripts/bench_llm_batch.py --limit 40
+  python scripts/bench_llm_batch.py --limit 40 --dry-run     # 배치 구성·예상 토큰만 (AI 호출 없음)
+  LLM_BATCH_MAX_ITEMS=4 python scripts/bench_llm_batch.py --limit 40
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+_ROOT = Path(__file__).resolve().parent.parent
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+if str(_ROOT / "scripts") not in sys.path:
+    sys.path.insert(0, str(_ROOT / "scripts"))
+
+os.environ["LLM_CACHE"] = "0"   # 두 모드가 서로의 결과 캐시를 재사용하지 않도록
+
+import auto_analyst
+from auto_analyst import AIAnalyst, LLM_BATCH_ITEM_TOKENS
+from llm_engine import get_engine, estimate_tokens
+from llm_cache import estimate_cost
+
+
+def _load_samples(limit: int) -> list[dict]:
+    res = auto_analyst.supabase.table("disclosure_insights") \
+        .select("id, corp_name, report_nm, content") \
+        .eq("analysis_status", "completed") \
+        .not_.is_("content", "null") \
+        .order("rcept_dt", desc=True) \
+        .limit(limit * 4) \
+        .execute()
+    probe = AIAnalyst()
+    rows = [r for r in (res.data or []) if probe.item_tokens(r) <= LLM_BATCH_ITEM_TOKENS]
+    # 프롬프트의 항목 ID 는 run() 과 같이 짧은 순번 사용 (UUID 는 토큰 낭비)
+    return [
+        {"id": str(i), "corp_name": r["corp_name"], "report_nm": r["report_nm"], "content": r.get("content")}
+        for i, r in enumerate(rows[:limit], 1)
+    ]
+
+
+def _run_single(items: list[dict]) -> tuple[AIAnalyst, dict, float]:
+    analyst = AIAnalyst()
+    out: dict = {}
+
+    def one(it):
+        out[it["id"]] = analyst.analyze_content(it["corp_name"], it["report_nm"], it["content"])
+        return out[it["id"]] is not None
+
+    t0 = time.perf_counter()
+    get_engine().map(one, items, label="bench-single")
+    return analyst, out, time.perf_counter() - t0
+
+
+def _run_batch(items: list[dict]) -> tuple[AIAnalyst, dict, float, int]:
+    analyst = AIAnalyst()
+    out: dict = {}
+    batches = analyst.plan_batches(items)
+
+    def group(g):
+        out.update(analyst.analyze_batch(g))
+        return True
+
+    t0 = time.perf_counter()
+    get_engine().map(group, batches, label="bench-batch")
+    return analyst, out, time.perf_counter() - t0, len(batches)
+
+
+def _report(name: str, analyst: AIAnalyst, out: dict, wall: float, n: int) -> None:
+    u = analyst.usage
+    valid = sum(1 for v in out.values() if analyst.validate_result(v))
+    cost = estimate_cost(u["prompt_tokens"], u["output_tokens"])
+    print(f"  [{name}]")
+    print(f"    경과            {wall:8.1f} s   ({n / wall * 60:,.1f}건/분)")
+    print(f"    요청            {u['calls']:8d} 회  (fallback {u['batch_fallback']}건)")
+    print(f"    유효 결과       {valid:8d} / {n}")
+    print(f"    건당 입력 토큰  {u['prompt_tokens'] / n:8.0f}")
+    print(f"    건당 출력 토큰  {u['output_tokens'] / n:8.0f}")
+    print(f"    건당 비용       ${cost / n:.5f}   (전체 ${cost:.4f})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AIAnalyst 단건 vs 배치 분석 벤치마크")
+    parser.add_argument("--limit", type=int, default=40, help="비교할 공시 수 (기본 40)")
+    parser.add_argument("--dry-run", action="store_true", help="배치 구성·예상 토큰만 출력 (AI 호출 없음)")
+    args = parser.parse_args()
+
+    items = _load_samples(args.limit)
+    if not items:
+        print("[ERROR] 대상 공시 없음")
+        sys.exit(1)
+
+    probe = AIAnalyst()
+    batches = probe.plan_batches(items)
+    single_est = sum(estimate_tokens("".join(probe.build_prompt(i["corp_name"], i["report_nm"], i["content"])))
+                     for i in items)
+    batch_est = sum(estimate_tokens("".join(probe.build_batch_prompt(g))) for g in batches)
+    print("=" * 64)
+    print(f"LLM 배치 벤치마크  {len(items)}건  배치 {len(batches)}개 "
+          f"(평균 {len(items) / len(batches):.1f}건/요청)")
+    print(f"  예상 입력 토큰   단건 {single_est:,}  /  배치 {batch_est:,}  "
+          f"({(1 - batch_est / single_est) * 100:.0f}% 절감)")
+    print("=" * 64)
+    if args.dry_run:
+        return
+
+    s_analyst, s_out, s_wall = _run_single(items)
+    b_analyst, b_out, b_wall, _ = _run_batch(items)
+    _report("single", s_analyst, s_out, s_wall, len(items))
+    _report("batch", b_analyst, b_out, b_wall, len(items))
+
+    both = [k for k in s_out if s_out.get(k) and b_out.get(k)]
+    agree = sum(
+        1 for k in both
+        if str(s_out[k].get("event_type", "")).upper() == str(b_out[k].get("event_type", "")).upper()
+    )
+    if both:
+        print(f"\n  event_type 일치  {agree}/{len(both)} ({agree / len(both) * 100:.0f}%)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,390 @@
+"""
+scripts/build_stock_timelines.py
+=================================
+종목별 이벤트 타임라인 문서를 사전 계산하여 stock_timelines 테이블에 저장.
+
+GET /v1/stocks/{code}/timeline 은 이 문서 1개만 읽습니다 (요청 시 조인 없음).
+
+문서 구성:
+  events : disclosure_insights(completed) + scores_log(future_return_3d/5d/20d, mdd_20d)
+           공시일 종가(close_t0) 포함, 최신순 최대 MAX_EVENTS 건
+  prices : price_history 종가 [[YYYY-MM-DD, close], ...]
+           (가장 오래된 이벤트 - PRICE_PAD_DAYS 부터, 최대 PRICE_LOOKBACK_DAYS)
+
+증분 갱신:
+  - 대상 종목: 최근 --days 일 내 공시(rcept_dt) 또는 scores_log(date)가 있는 종목
+    (forward return / MDD / 종가가 아직 변하는 구간)
+    + 이미 문서가 있고 마지막 빌드(updated_at) 이후 price_history 에 새 종가가 들어온 종목
+    (공시가 뜸한 종목의 prices 가 예전 빌드 시점에서 멈추지 않도록) — --all 이면 전 종목
+  - 문서 입력값 해시(source_hash)가 기존과 같으면 upsert 생략
+
+선행 작업:
+  backfill_prices.py (scores_log 수익률 / MDD 백필) 이후 실행
+
+사용법:
+  python scripts/build_stock_timelines.py                  # 최근 30일 변동 종목
+  python scripts/build_stock_timelines.py --days 60
+  python scripts/build_stock_timelines.py --codes 005930,000660
+  python scripts/build_stock_timelines.py --all            # 전 종목 재계산
+  python scripts/build_stock_timelines.py --dry-run
+"""
+
+import os
+import sys
+import json
+import bisect
+import asyncio
+import hashlib
+import argparse
+import logging
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+try:
+    from supabase import create_client as _supabase_create_client
+except ImportError:
+    _supabase_create_client = None
+
+_ROOT = Path(__file__).resolve().parent.parent
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
+from utils.env_loader import load_env
+load_env()
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+logger = logging.getLogger("build_stock_timelines")
+
+# ── 설정 ──────────────────────────────────────────────────────────────────────
+
+MAX_EVENTS          = 100    # 종목당 최대 이벤트 수 (최신순)
+PRICE_LOOKBACK_DAYS = 400    # 종가 시계열 최대 길이 (달력일)
+PRICE_PAD_DAYS      = 10     # 가장 오래된 이벤트 이전 여유 구간 (달력일)
+CODE_CHUNK          = 50     # in_() 필터 1회당 종목 수 (URL 길이 제한)
+ID_CHUNK            = 200    # in_() 필터 1회당 disclosure_id 수
+BATCH_SIZE          = 100    # Supabase upsert 배치
+
+_EVENT_COLUMNS = (
+    "id, rcept_no, stock_code, corp_name, report_nm, rcept_dt, "
+    "event_type, sentiment_score, final_score, signal_tag, headline"
+)
+
+
+# ── Supabase 연결 ─────────────────────────────────────────────────────────────
+
+def get_supabase():
+    create_client = _supabase_create_client
+    if create_client is None:
+        logger.error("supabase 패키지가 설치되지 않았습니다. pip install supabase")
+        sys.exit(1)
+    url = os.environ.get("NEXT_PUBLIC_SUPABASE_URL")
+    key = os.environ.get("SUPABASE_SERVICE_ROLE_KEY")
+    if not url or not key:
+        logger.error("Supabase 환경변수 누락 (NEXT_PUBLIC_SUPABASE_URL / SUPABASE_SERVICE_ROLE_KEY)")
+        sys.exit(1)
+    return create_client(url, key)
+
+
+def _paginate(sb, table: str, filters_fn, page_size: int = 1000) -> list[dict]:
+    """
+    Supabase 기본 max_rows=1000 캡 우회용 페이지네이션.
+    filters_fn 은 유일한 정렬 키로 끝나야 한다 — 순서가 겹치면 range 페이지 사이에서 행이 빠지거나 중복됨.
+    """
+    rows = []
+    offset = 0
+    while True:
+        q = filters_fn(sb.table(table))
+        resp = q.range(offset, offset + page_size - 1).execute()
+        page = resp.data or []
+        rows.extend(page)
+        if len(page) < page_size:
+            break
+        offset += page_size
+    return rows
+
+
+def _chunks(items: list, size: int):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+# ── 대상 종목 선정 ────────────────────────────────────────────────────────────
+
+def fetch_candidate_codes(sb, days: int) -> set[str]:
+    """최근 days 일 내 공시 또는 scores_log 가 있는 종목."""
+    since = date.today() - timedelta(days=days)
+
+    ins = _paginate(
+        sb, "disclosure_insights",
+        lambda q: (q.select("stock_code")
+                   .gte("rcept_dt", since.strftime("%Y%m%d"))
+                   .eq("analysis_status", "completed")
+                   .not_.is_("stock_code", "null")
+                   .order("id")),
+    )
+    logs = _paginate(
+        sb, "scores_log",
+        lambda q: q.select("stock_code").gte("date", since.isoformat()).order("id"),
+    )
+    return {r["stock_code"] for r in ins + logs if r.get("stock_code")}
+
+
+def fetch_price_stale_codes(sb) -> set[str]:
+    """
+    stock_timelines 문서가 있고, 마지막 빌드일(updated_at) 이후 날짜의 price_history 종가가 있는 종목.
+    빌드일이 비슷한 종목끼리 CODE_CHUNK 개씩 묶어 chunk 의 가장 이른 빌드일 이후 종가만 조회한다
+    (거래정지 등으로 오래 갱신되지 않은 종목은 새 종가가 없어 조회량이 늘지 않음).
+    """
+    docs = _paginate(
+        sb, "stock_timelines",
+        lambda q: q.select("stock_code, updated_at").order("stock_code"),
+    )
+    built = {r["stock_code"]: str(r["updated_at"])[:10] for r in docs if r.get("updated_at")}
+    by_built = sorted(built, key=lambda c: built[c])
+
+    stale: set[str] = set()
+    for chunk in _chunks(by_built, CODE_CHUNK):
+        since = min(built[c] for c in chunk)
+        rows = _paginate(
+            sb, "price_history",
+            lambda q, c=chunk, d=since: (q.select("stock_code, date")
+                                         .in_("stock_code", c)
+                                         .gt("date", d)
+                                         .not_.is_("close", "null")
+                                         .order("stock_code")
+                                         .order("date")),
+        )
+        stale.update(r["stock_code"] for r in rows if str(r["date"]) > built[r["stock_code"]])
+    return stale
+
+
+def fetch_all_codes(sb) -> set[str]:
+    rows = _paginate(
+        sb, "disclosure_insights",
+        lambda q: (q.select("stock_code")
+                   .eq("analysis_status", "completed")
+                   .not_.is_("stock_code", "null")
+                   .order("id")),
+    )
+    return {r["stock_code"] for r in rows if r.get("stock_code")}
+
+
+# ── 입력 데이터 조회 (종목 chunk 단위) ────────────────────────────────────────
+
+def fetch_events(sb, codes: list[str]) -> dict[str, list[dict]]:
+    """종목별 completed 공시 (최신순, 최대 MAX_EVENTS)."""
+    rows = _paginate(
+        sb, "disclosure_insights",
+        lambda q: (q.select(_EVENT_COLUMNS)
+                   .in_("stock_code", codes)
+                   .eq("analysis_status", "completed")
+                   .order("rcept_dt", desc=True)
+                   .order("rcept_no", desc=True)),
+    )
+    by_code: dict[str, list[dict]] = defaultdict(list)
+    for r in rows:
+        if len(by_code[r["stock_code"]]) < MAX_EVENTS:
+            by_code[r["stock_code"]].append(r)
+    return by_code
+
+
+def fetch_scores(sb, disclosure_ids: list[str]) -> dict[str, dict]:
+    """disclosure_id → scores_log forward return / MDD."""
+    out: dict[str, dict] = {}
+    for chunk in _chunks(disclosure_ids, ID_CHUNK):
+        rows = _paginate(
+            sb, "scores_log",
+            lambda q, c=chunk: (q.select(
+                "disclosure_id, future_return_3d, future_return_5d, future_return_20d, mdd_20d"
+            ).in_("disclosure_id", c).order("id")),
+        )
+        for r in rows:
+            out[r["disclosure_id"]] = r
+    return out
+
+
+def fetch_prices(sb, codes: list[str], since: date) -> dict[str, list[tuple[str, float]]]:
+    """종목별 [(YYYY-MM-DD, close)] 오름차순."""
+    rows = _paginate(
+        sb, "price_history",
+        lambda q: (q.select("stock_code, date, close")
+                   .in_("stock_code", codes)
+                   .gte("date", since.isoformat())
+                   .not_.is_("close", "null")
+                   .order("stock_code")
+                   .order("date")),
+    )
+    by_code: dict[str, list[tuple[str, float]]] = defaultdict(list)
+    for r in rows:
+        by_code[r["stock_code"]].append((r["date"], float(r["close"])))
+    return by_code
+
+
+# ── 문서 생성 ─────────────────────────────────────────────────────────────────
+
+def _iso(rcept_dt: str) -> str:
+    """YYYYMMDD → YYYY-MM-DD"""
+    return f"{rcept_dt[:4]}-{rcept_dt[4:6]}-{rcept_dt[6:8]}"
+
+
+def build_doc(events: list[dict], scores: dict[str, dict],
+              prices: list[tuple[str, float]]) -> dict:
+    """
+    종목 1개의 타임라인 문서 생성.
+    close_t0: 공시일 당일(또는 직후 첫 거래일) 종가.
+    """
+    price_dates = [p[0] for p in prices]
+
+    doc_events = []
+    for ev in events:
+        ev_date = _iso(ev["rcept_dt"])
+        i = bisect.bisect_left(price_dates, ev_date)
+        close_t0 = prices[i][1] if i < len(prices) else None
+        sc = scores.get(ev["id"], {})
+        doc_events.append({
+            "disclosure_id":     ev["id"],
+            "rcept_no":          ev["rcept_no"],
+            "date":              ev_date,
+            "report_nm":         ev.get("report_nm"),
+            "event_type":        ev.get("event_type"),
+            "headline":          ev.get("headline"),
+            "sentiment_score":   ev.get("sentiment_score"),
+            "final_score":       ev.get("final_score"),
+            "signal_tag":        ev.get("signal_tag"),
+            "close_t0":          close_t0,
+            "future_return_3d":  sc.get("future_return_3d"),
+            "future_return_5d":  sc.get("future_return_5d"),
+            "future_return_20d": sc.get("future_return_20d"),
+            "mdd_20d":           sc.get("mdd_20d"),
+        })
+
+    # 종가 시계열은 가장 오래된 이벤트 - PRICE_PAD_DAYS 부터
+    if doc_events:
+        oldest = date.fromisoformat(doc_events[-1]["date"]) - timedelta(days=PRICE_PAD_DAYS)
+        start = bisect.bisect_left(price_dates, oldest.isoformat())
+    else:
+        start = len(prices)
+
+    return {
+        "events": doc_events,
+        "prices": [[d, c] for d, c in prices[start:]],
+    }
+
+
+def source_hash(doc: dict) -> str:
+    raw = json.dumps(doc, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def fetch_existing_hashes(sb, codes: list[str]) -> dict[str, str]:
+    resp = (
+        sb.table("stock_timelines")
+        .select("stock_code, source_hash")
+        .in_("stock_code", codes)
+        .execute()
+    )
+    return {r["stock_code"]: r["source_hash"] for r in (resp.data or [])}
+
+
+# ── 저장 ──────────────────────────────────────────────────────────────────────
+
+def save_rows(sb, rows: list[dict]) -> tuple[int, int]:
+    ok = fail = 0
+    for batch in _chunks(rows, BATCH_SIZE):
+        try:
+            sb.table("stock_timelines").upsert(batch, on_conflict="stock_code").execute()
+            ok += len(batch)
+        except Exception as e:
+            fail += len(batch)
+            logger.error(f"  stock_timelines upsert 실패 ({len(batch)}건): {e}")
+    return ok, fail
+
+
+# ── 메인 ──────────────────────────────────────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description="종목별 이벤트 타임라인 사전 계산 (→ stock_timelines)")
+    parser.add_argument("--days",    type=int, default=30, help="최근 N일 내 변동 종목만 갱신 (기본 30)")
+    parser.add_argument("--codes",   help="특정 종목코드만 (콤마 구분)")
+    parser.add_argument("--all",     action="store_true", help="전 종목 재계산")
+    parser.add_argument("--dry-run", action="store_true", help="DB 저장 없이 출력만")
+    args = parser.parse_args()
+
+    sb = get_supabase()
+
+    logger.info("=" * 60)
+    logger.info("종목 타임라인 사전 계산")
+    logger.info("=" * 60)
+
+    if args.codes:
+        codes = {c.strip() for c in args.codes.split(",") if c.strip()}
+    elif args.all:
+        codes = fetch_all_codes(sb)
+    else:
+        codes = fetch_candidate_codes(sb, args.days)
+        price_stale = fetch_price_stale_codes(sb) - codes
+        logger.info(f"  새 종가만 반영할 종목: {len(price_stale)}개")
+        codes |= price_stale
+    codes_sorted = sorted(codes)
+    logger.info(f"  대상 종목: {len(codes_sorted)}개")
+
+    price_since = date.today() - timedelta(days=PRICE_LOOKBACK_DAYS)
+    now_iso = datetime.now().isoformat()
+
+    changed_rows: list[dict] = []
+    unchanged = 0
+    for chunk in _chunks(codes_sorted, CODE_CHUNK):
+        events_by_code = fetch_events(sb, chunk)
+        ids = [ev["id"] for evs in events_by_code.values() for ev in evs]
+        scores = fetch_scores(sb, ids) if ids else {}
+        prices_by_code = fetch_prices(sb, chunk, price_since)
+        existing = fetch_existing_hashes(sb, chunk)
+
+        for code in chunk:
+            events = events_by_code.get(code, [])
+            if not events:
+                continue
+            doc = build_doc(events, scores, prices_by_code.get(code, []))
+            h = source_hash(doc)
+            if existing.get(code) == h:
+                unchanged += 1
+                continue
+            changed_rows.append({
+                "stock_code":      code,
+                "corp_name":       events[0].get("corp_name"),
+                "doc":             doc,
+                "event_count":     len(doc["events"]),
+                "last_event_date": doc["events"][0]["date"],
+                "source_hash":     h,
+                "updated_at":      now_iso,
+            })
+
+    logger.info(f"  변경: {len(changed_rows)}개 / 변경 없음: {unchanged}개")
+
+    if args.dry_run:
+        for r in changed_rows[:3]:
+            logger.info(f"  [DRY] {r['stock_code']} {r['corp_name']}: "
+                        f"이벤트 {r['event_count']}건, 종가 {len(r['doc']['prices'])}일")
+        logger.info("[DRY-RUN] DB 저장 생략.")
+        sys.exit(0)
+
+    ok, fail = save_rows(sb, changed_rows)
+    logger.info("=" * 60)
+    logger.info(f"완료: stock_timelines {ok}건 저장 / {fail}건 실패")
+    logger.info("=" * 60)
+
+    # 캐시 무효화 — 갱신된 종목의 타임라인 응답 캐시 삭제
+    if ok > 0:
+        try:
+            from backend.core.cache import cache_delete_pattern
+            deleted = asyncio.run(cache_delete_pattern("v1:stocks:*"))
+            logger.info(f"[cache] 무효화 완료: v1:stocks:* ({deleted}개 삭제)")
+        except Exception as e:
+            logger.warning(f"[cache] 무효화 실패 (무시): {e}")
+
+    sys.exit(0 if fail == 0 else 1)
+
+
+if __name__ == "__main__":
+    main()
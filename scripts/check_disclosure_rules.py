@@ -0,0 +1,253 @@
+"""
+scripts/check_disclosure_rules.py
+=================================
+disclosure_rules 일관성 검사 + 속도 비교.
+
+1) 일관성 (기본)
+   disclosure_rules.classify_title (Aho-Corasick 1회 순회) 결과를
+   기존 선형 구현(아래 _legacy_* — auto_analyst._should_skip_report / dart_crawler.is_signal_disclosure /
+   reprocess_db NOISE_KEYWORDS ilike / disclosure_priority.hint_types 를 그대로 옮긴 것)과 비교합니다.
+   대상 제목:
+     - 규칙 목록으로 만든 합성 제목 (모든 키워드 × 접두/접미/공백/대소문자/두 키워드 결합)
+     - --days N    disclosure_insights 최근 N일 report_nm
+     - --titles F  파일 (한 줄에 제목 하나, 예: DART 목록 export)
+   하나라도 다르면 차이를 출력하고 종료 코드 1.
+
+2) 속도 (--bench)
+   같은 제목들로 기존 선형 구현 4종 vs classify_title (캐시 없음 / 캐시) 처리량(titles/sec) 비교.
+
+사용법:
+  python scripts/check_disclosure_rules.py
+  python scripts/check_disclosure_rules.py --days 365 --bench
+  python scripts/check_disclosure_rules.py --days 365 --save /tmp/report_nm_1y.txt
+  python scripts/check_disclosure_rules.py --titles /tmp/report_nm_1y.txt --bench
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+_ROOT = Path(__file__).resolve().parent.parent
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
+from scripts.disclosure_rules import (
+    AMENDMENT_PREFIX, AMENDMENT_WHITELIST, NOISE_CORP_KEYWORDS, NOISE_KEYWORDS,
+    SIGNAL_ALLOWLIST, SKIP_CONTAINS, SKIP_EXACT, SKIP_PREFIXES,
+    _HINT_CASED, _HINT_SLOTS, classify_title, is_noise_corp,
+)
+
+
+# ── 기존 선형 구현 (오라클) ───────────────────────────────────────────────────
+
+def _legacy_skip(report_nm: str) -> bool:
+    nm = (report_nm or "").strip()
+    if nm.startswith("[기재정정]") and any(nm.startswith(w) for w in AMENDMENT_WHITELIST):
+        return False
+    if nm in SKIP_EXACT:
+        return True
+    if any(nm.startswith(p) for p in SKIP_PREFIXES):
+        return True
+    if any(kw in nm for kw in SKIP_CONTAINS):
+        return True
+    if nm.startswith("[기재정정]"):
+        return True
+    return False
+
+
+def _legacy_signal(report_nm: str) -> bool:
+    t = (report_nm or "")
+    return any(kw in t for kw in SIGNAL_ALLOWLIST)
+
+
+def _legacy_noise(report_nm: str) -> bool:
+    t = (report_nm or "").lower()
+    return any(kw.lower() in t for kw in NOISE_KEYWORDS)
+
+
+def _legacy_hints(title: str) -> list[str]:
+    t = (title or "").lower()
+    matched: list[str] = []
+
+    if "전환사채" in t or "bw" in t or "cb" in t or "유상증자" in t:
+        matched.append("DILUTION")
+    if "단일판매" in t or "공급계약" in t or "수주" in t or "mou" in t:
+        matched.append("CONTRACT")
+    if "자기주식" in t:
+        if "처분" in t or "disposal" in t:
+            matched.append("DISPOSAL")
+        else:
+            matched.append("BUYBACK")
+    if ("배당" in t or "dividend" in t or "기준일설정" in t
+            or "배당결정" in t or "현금·현물" in t):
+        matched.append("DIVIDEND")
+    if "유형자산취득" in t:
+        matched.append("CAPEX")
+    if "합병" in t or "인수" in t or "분할" in t or ("지분" in t and "취득" in t) or "타법인주식" in t:
+        matched.append("MNA")
+    if "소송" in t or "횡령" in t or "배임" in t or "과징금" in t or "수사" in t:
+        matched.append("LEGAL")
+    if "분기" in t or "사업보고서" in t or "잠정" in t or "실적" in t or "결산" in t:
+        matched.append("EARNINGS")
+    if "임원의변동" in t or "대표이사의변동" in t:
+        matched.append("EXECUTIVE_CHANGE")
+    if any(kw in (title or "") for kw in [
+        "시설투자", "설비투자", "CAPEX", "투자 결정", "신규 투자",
+        "증설", "공장 신설", "라인 증설",
+    ]):
+        matched.append("CAPEX")
+
+    return matched if matched else ["OTHER"]
+
+
+def _legacy_noise_corp(corp_name: str) -> bool:
+    t = (corp_name or "").lower()
+    return any(kw.lower() in t for kw in NOISE_CORP_KEYWORDS)
+
+
+# ── 대상 제목 ─────────────────────────────────────────────────────────────────
+
+_REAL_TITLES = [
+    "유상증자결정", "주요사항보고서(유상증자결정)", "[기재정정]주요사항보고서(유상증자결정)",
+    "[기재정정]유상증자결정", "[기재정정]단일판매ㆍ공급계약체결", "[기재정정]사업보고서 (2025.12)",
+    "사업보고서 (2025.12)", "분기보고서 (2026.03)", "반기보고서 (2025.06)", "[첨부추가]사업보고서 (2025.12)",
+    "단일판매ㆍ공급계약체결(자율공시)", "전환사채권발행결정(제3회차)", "주요사항보고서(자기주식처분결정)",
+    "자기주식취득신탁계약체결결정", "현금ㆍ현물배당결정", "주식등의대량보유상황보고서(일반)",
+    "임원ㆍ주요주주특정증권등소유상황보고서", "기업설명회(IR) 개최(안내공시)", "기업설명회(IR) 개최",
+    "연결재무제표기준영업(잠정)실적(공정공시)", "영업(잠정)실적(공정공시)", "증권발행결과(자율공시)",
+    "소송등의판결ㆍ결정", "소송등의제기ㆍ신청(일정금액 이상의 청구)", "횡령ㆍ배임혐의발생",
+    "타법인주식및출자증권취득결정", "유형자산취득결정", "신규시설투자등", "투자판단관련주요경영사항",
+    "임원의변동", "대표이사의변동", "[기재정정]임원의변동", "주주총회소집공고", "주주총회소집결의",
+    "투자설명서(일괄신고)", "일괄신고추가서류(파생결합사채-주가연계파생결합사채)",
+    "[발행조건확정]증권신고서(채무증권)", "집합투자업자변경", "부동산투자회사 투자보고서",
+    "MOU 체결", "mou체결", "CB 발행", "BW발행결정", "Dividend notice", "자기주식 disposal",
+    "지분 취득", "지분 처분", "공장 신설 및 라인 증설", "CAPEX 계획", "capex 계획", "",
+    "  유상증자결정  ", " 사업보고서 (2025.12)", "사업보고서", "İ 유상증자", "ﬁ 배당",
+]
+_DECORATIONS = ("{}", "[기재정정]{}", "{} (2025.12)", "주요사항보고서({})", " {} ", "{}(자율공시)", "{}ㆍ결정")
+
+
+def _all_keywords() -> list[str]:
+    words = set(SIGNAL_ALLOWLIST) | set(SKIP_EXACT) | set(SKIP_PREFIXES) | set(SKIP_CONTAINS)
+    words |= set(AMENDMENT_WHITELIST) | {AMENDMENT_PREFIX} | set(NOISE_KEYWORDS) | set(_HINT_CASED)
+    for _, kws in _HINT_SLOTS:
+        words |= set(kws)
+    words |= {"처분", "disposal", "지분", "취득"}
+    return sorted(words)
+
+
+def synthetic_titles() -> list[str]:
+    words = _all_keywords()
+    titles = list(_REAL_TITLES)
+    for w in words:
+        for fmt in _DECORATIONS:
+            titles.append(fmt.format(w))
+        titles += [w.upper(), w.lower(), w[:-1], w[1:]]
+    for i, a in enumerate(words):
+        b = words[(i * 7 + 3) % len(words)]
+        titles += [a + b, f"{a} {b}", b + a]
+    return titles
+
+
+def _db_titles(days: int) -> list[str]:
+    from supabase import create_client
+    from utils.env_loader import load_env
+    load_env()
+    sb = create_client(os.environ["NEXT_PUBLIC_SUPABASE_URL"], os.environ["SUPABASE_SERVICE_ROLE_KEY"])
+    since = (datetime.now() - timedelta(days=days)).strftime("%Y%m%d")
+    titles: list[str] = []
+    last_id = None
+    while True:
+        q = sb.table("disclosure_insights").select("id, report_nm").gte("rcept_dt", since).order("id").limit(1000)
+        if last_id:
+            q = q.gt("id", last_id)
+        rows = q.execute().data or []
+        if not rows:
+            break
+        titles += [r.get("report_nm") or "" for r in rows]
+        last_id = rows[-1]["id"]
+    return titles
+
+
+# ── 검사 / 벤치 ───────────────────────────────────────────────────────────────
+
+def check(titles: list[str]) -> int:
+    mismatches = 0
+    for t in dict.fromkeys(titles):
+        v = classify_title(t)
+        expected = (_legacy_skip(t), _legacy_signal(t), _legacy_noise(t), tuple(_legacy_hints(t)))
+        got = (v.skip, v.signal, v.noise, v.hints)
+        if got != expected:
+            mismatches += 1
+            if mismatches <= 30:
+                print(f"  [MISMATCH] {t!r}\n      legacy    {expected}\n      automaton {got}")
+        if is_noise_corp(t) != _legacy_noise_corp(t):
+            mismatches += 1
+            if mismatches <= 30:
+                print(f"  [MISMATCH] corp {t!r}")
+    return mismatches
+
+
+def _rate(fn, titles: list[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for t in titles:
+            fn(t)
+        best = min(best, time.perf_counter() - t0)
+    return len(titles) / best if best else 0.0
+
+
+def bench(titles: list[str], repeat: int) -> None:
+    def legacy(t):
+        return _legacy_skip(t), _legacy_signal(t), _legacy_noise(t), _legacy_hints(t)
+
+    uncached = classify_title.__wrapped__
+    classify_title.cache_clear()
+    rates = [
+        ("기존 선형 4종",            _rate(legacy, titles, repeat)),
+        ("classify_title (캐시 없음)", _rate(uncached, titles, repeat)),
+        ("classify_title (캐시)",     _rate(classify_title, titles, repeat)),
+    ]
+    base = rates[0][1]
+    print(f"\n  제목 {len(titles):,}건 (고유 {len(set(titles)):,}), 평균 {sum(map(len, titles)) / max(1, len(titles)):.1f}자, "
+          f"{repeat}회 중 최고")
+    for name, rate in rates:
+        print(f"  {name:28s} {rate:12,.0f} titles/sec  ×{rate / base if base else 0:5.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="disclosure_rules 일관성 검사 + 속도 비교")
+    parser.add_argument("--days", type=int, default=0, help="disclosure_insights 최근 N일 report_nm 추가")
+    parser.add_argument("--titles", help="제목 파일 (한 줄에 하나) 추가")
+    parser.add_argument("--save", help="수집한 DB 제목을 파일로 저장 (다음 실행에서 --titles 로 재사용)")
+    parser.add_argument("--bench", action="store_true", help="기존 구현 vs 자동자 처리량 비교")
+    parser.add_argument("--repeat", type=int, default=3, help="벤치 반복 횟수 (기본 3)")
+    args = parser.parse_args()
+
+    titles = synthetic_titles()
+    real: list[str] = []
+    if args.days:
+        real += _db_titles(args.days)
+        if args.save:
+            Path(args.save).write_text("\n".join(real), encoding="utf-8")
+            print(f"  저장: {args.save} ({len(real):,}건)")
+    if args.titles:
+        real += Path(args.titles).read_text(encoding="utf-8").splitlines()
+    titles += real
+
+    mismatches = check(titles)
+    print(f"[check] 제목 {len(set(titles)):,}건 (합성 {len(titles) - len(real):,} / 실제 {len(real):,}) "
+          f"— 불일치 {mismatches}건")
+
+    if args.bench:
+        bench(real or titles, args.repeat)
+
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
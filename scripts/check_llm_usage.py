@@ -0,0 +1,223 @@
+"""
+scripts/check_llm_usage.py
+==========================
+LLM 호출 비용·지연 모니터링 (llm_call_ledger 일별 집계, migration 065).
+
+측정 항목:
+  1. 일별 × 단건/배치: 호출 수, 요청당 공시 수, 실패율, 429 재시도, 공시당 입력·출력 토큰,
+     모델 응답 지연 P50/P90, 대기 포함 P90, 비용 · 공시당 비용
+     - LLM_WORKERS / LLM_RPM 조정: 대기 포함(wall) P90 이 모델 지연보다 크게 벌어지면 제한기 대기·429 백오프가 병목
+     - LLM_BATCH_* 조정: 단건 vs 배치의 공시당 토큰·비용, 배치 partial 비율
+     - LLM_COMPACT 조정: 공시당 입력 토큰 추이
+  2. 기간 합계: 토큰·비용, 결과(outcome) 분포, 분석 공시 최종 상태(analysis_status) 분포,
+     단건 vs 배치 공시당 토큰·비용
+
+사용법:
+  python scripts/check_llm_usage.py              # 최근 14일
+  python scripts/check_llm_usage.py --days 30
+  python scripts/check_llm_usage.py --today
+  python scripts/check_llm_usage.py --model gemini-2.5-flash
+  python scripts/check_llm_usage.py --alert      # 임계치 초과 시 비정상 종료 (CI/CD용)
+"""
+
+import os
+import sys
+import argparse
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+_ROOT = Path(__file__).resolve().parent.parent
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
+from utils.env_loader import load_env
+load_env()
+
+try:
+    from supabase import create_client
+except ImportError:
+    print("[ERROR] supabase 패키지 필요: pip install supabase")
+    sys.exit(1)
+
+
+# ── 임계치 (--alert 모드) ────────────────────────────────────────────────────
+ALERT_FAIL_RATE       = 10    # 실패(parse_error / invalid / error / rate_limited) 호출 10% 초과 → 경고
+ALERT_RETRY_PER_CALL  = 0.2   # 호출당 429 재시도 0.2회 초과 → 경고 (LLM_RPM / LLM_WORKERS 과다)
+ALERT_P90_LATENCY_SEC = 30    # 모델 응답 P90 30초 초과 → 경고
+
+KST = timezone(timedelta(hours=9))
+_OK_OUTCOMES = ("ok", "partial")
+
+
+def get_supabase():
+    url = os.environ.get("NEXT_PUBLIC_SUPABASE_URL")
+    key = os.environ.get("SUPABASE_SERVICE_ROLE_KEY")
+    if not url or not key:
+        print("[ERROR] Supabase 환경변수 누락")
+        sys.exit(1)
+    return create_client(url, key)
+
+
+def load_rollup(sb, since_date: str, model: str | None) -> list[dict]:
+    """llm_call_daily RPC (일별 × 모델 × 단건/배치). model 지정 시 해당 모델만."""
+    try:
+        rows = sb.rpc("llm_call_daily", {"p_since": since_date}).execute().data or []
+    except Exception as e:
+        print(f"[ERROR] llm_call_daily 조회 실패 (migration 065 확인): {e}")
+        sys.exit(1)
+    return [r for r in rows if not model or r.get("model") == model]
+
+
+def _fail_calls(outcomes: dict) -> int:
+    return sum(n for k, n in (outcomes or {}).items() if k not in _OK_OUTCOMES)
+
+
+def compute_daily_stats(rows: list[dict]) -> list[dict]:
+    """날짜 × 단건/배치 집계 (모델은 합침)."""
+    by_key: dict[tuple, dict] = {}
+    for r in rows:
+        key = (str(r["day"]), r["mode"])
+        d = by_key.setdefault(key, {
+            "date": key[0], "mode": key[1], "calls": 0, "items": 0, "retries": 0,
+            "prompt_tokens": 0, "output_tokens": 0, "cost": 0.0,
+            "p50": 0.0, "p90": 0.0, "p90_wall": 0.0, "outcomes": Counter(), "statuses": Counter(),
+        })
+        calls = r.get("calls") or 0
+        d["calls"] += calls
+        d["items"] += r.get("items") or 0
+        d["retries"] += r.get("retries") or 0
+        d["prompt_tokens"] += r.get("prompt_tokens") or 0
+        d["output_tokens"] += r.get("output_tokens") or 0
+        d["cost"] += float(r.get("cost_usd") or 0)
+        # 모델별 분위수 → 가장 느린 모델 기준 (근사값)
+        d["p50"] = max(d["p50"], float(r.get("p50_latency_ms") or 0))
+        d["p90"] = max(d["p90"], float(r.get("p90_latency_ms") or 0))
+        d["p90_wall"] = max(d["p90_wall"], float(r.get("p90_wall_ms") or 0))
+        d["outcomes"].update(r.get("outcomes") or {})
+        d["statuses"].update(r.get("statuses") or {})
+
+    result = []
+    for key in sorted(by_key):
+        d = by_key[key]
+        items = d["items"] or 1
+        d["fail_rate"] = round(_fail_calls(d["outcomes"]) / d["calls"] * 100, 1) if d["calls"] else 0.0
+        d["retry_per_call"] = d["retries"] / d["calls"] if d["calls"] else 0.0
+        d["in_per_item"] = d["prompt_tokens"] / items
+        d["out_per_item"] = d["output_tokens"] / items
+        d["cost_per_item"] = d["cost"] / items
+        result.append(d)
+    return result
+
+
+def _violations(s: dict) -> list[str]:
+    out = []
+    if s["fail_rate"] > ALERT_FAIL_RATE and s["calls"] >= 10:
+        out.append(f"실패 {s['fail_rate']}%")
+    if s["retry_per_call"] > ALERT_RETRY_PER_CALL:
+        out.append(f"429 재시도 {s['retry_per_call']:.2f}회/호출")
+    if s["p90"] / 1000 > ALERT_P90_LATENCY_SEC:
+        out.append(f"P90 {s['p90'] / 1000:.1f}s")
+    return out
+
+
+def print_table(stats: list[dict]):
+    header = (
+        f"{'Date':12s}  {'Mode':6s}  {'Calls':>5}  {'Item/C':>6}  {'Fail%':>6}  {'Retry':>5}  "
+        f"{'In/item':>7}  {'Out/item':>8}  {'P50':>6}  {'P90':>6}  {'P90wall':>7}  {'Cost$':>8}  {'$/item':>8}"
+    )
+    sep = "-" * len(header)
+    print(header)
+    print(sep)
+
+    for s in stats:
+        flag = " !" if _violations(s) else "  "
+        print(
+            f"{s['date']:12s}  {s['mode']:6s}  {s['calls']:5d}  {s['items'] / max(1, s['calls']):6.1f}  "
+            f"{s['fail_rate']:5.1f}%  {s['retries']:5d}  "
+            f"{s['in_per_item']:7.0f}  {s['out_per_item']:8.0f}  "
+            f"{s['p50'] / 1000:5.1f}s  {s['p90'] / 1000:5.1f}s  {s['p90_wall'] / 1000:6.1f}s  "
+            f"{s['cost']:8.4f}  {s['cost_per_item']:8.5f}{flag}"
+        )
+
+    print(sep)
+
+
+def print_summary(stats: list[dict]):
+    calls = sum(s["calls"] for s in stats)
+    items = sum(s["items"] for s in stats)
+    cost = sum(s["cost"] for s in stats)
+    prompt_tokens = sum(s["prompt_tokens"] for s in stats)
+    output_tokens = sum(s["output_tokens"] for s in stats)
+    outcomes: Counter = Counter()
+    statuses: Counter = Counter()
+    for s in stats:
+        outcomes.update(s["outcomes"])
+        statuses.update(s["statuses"])
+
+    print(f"\n  기간 합계: 호출 {calls:,}회 / 공시 {items:,}건 / 토큰 입력 {prompt_tokens:,} · 출력 {output_tokens:,}")
+    print(f"  비용: ${cost:,.4f}  (공시당 ${cost / max(1, items):.5f})")
+    print("  결과: " + "  ".join(f"{k} {v}" for k, v in outcomes.most_common()))
+    print("  최종 상태 (호출 기준): " + "  ".join(f"{k} {v}" for k, v in statuses.most_common()))
+
+    for mode in ("single", "batch"):
+        ms = [s for s in stats if s["mode"] == mode]
+        m_items = sum(s["items"] for s in ms)
+        if not m_items:
+            continue
+        print(
+            f"  [{mode:6s}] 공시당 입력 {sum(s['prompt_tokens'] for s in ms) / m_items:,.0f} · "
+            f"출력 {sum(s['output_tokens'] for s in ms) / m_items:,.0f} 토큰, "
+            f"${sum(s['cost'] for s in ms) / m_items:.5f}"
+        )
+    print()
+    print(f"  [!] = 임계치 초과 (실패 > {ALERT_FAIL_RATE}%, 429 재시도 > {ALERT_RETRY_PER_CALL}회/호출, "
+          f"P90 > {ALERT_P90_LATENCY_SEC}s)")
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LLM 호출 비용·지연 모니터링")
+    parser.add_argument("--days",  type=int, default=14, help="조회 기간 (일, default=14)")
+    parser.add_argument("--today", action="store_true",  help="오늘 하루만 조회")
+    parser.add_argument("--model", help="모델 이름으로 필터 (예: gemini-2.5-flash)")
+    parser.add_argument("--alert", action="store_true",  help="임계치 초과 시 exit(1) (CI/CD용)")
+    args = parser.parse_args()
+
+    if args.today:
+        since = datetime.now(KST).strftime("%Y-%m-%d")
+    else:
+        since = (datetime.now(KST) - timedelta(days=args.days)).strftime("%Y-%m-%d")
+
+    sb = get_supabase()
+
+    print("=" * 72)
+    print("  LLM 호출 비용·지연 메트릭")
+    print(f"  기간: {since} ~ 오늘 (KST)  |  모델: {args.model or '전체'}")
+    print("  P50/P90 = 모델 응답 (마지막 시도), P90wall = 제한기 대기 + 429 백오프 포함")
+    print("=" * 72)
+    print()
+
+    rows = load_rollup(sb, since, args.model)
+    if not rows:
+        print("  [정보] 해당 기간 LLM 호출 기록 없음")
+        sys.exit(0)
+
+    stats = compute_daily_stats(rows)
+    print_table(stats)
+    print_summary(stats)
+
+    # --alert 모드: 최근 3일 중 임계치 초과가 있으면 exit(1)
+    if args.alert:
+        days = sorted({s["date"] for s in stats})[-3:]
+        violations = [(s, _violations(s)) for s in stats if s["date"] in days and _violations(s)]
+        if violations:
+            print("[ALERT] LLM 호출 임계치 초과:")
+            for s, reasons in violations:
+                print(f"  {s['date']} {s['mode']}: {', '.join(reasons)}")
+            sys.exit(1)
+        print("[OK] LLM 호출 정상 범위")
+
+
+if __name__ == "__main__":
+    main()
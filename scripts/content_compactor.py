@@ -0,0 +1,163 @@
+"""
+scripts/content_compactor.py
+============================
+AI 분석 프롬프트용 공시 본문 압축 (토큰 예산 기반).
+
+dart_crawler 가 저장한 content(extract_key_sections 결과)는 표가 많은 공시에서 수만 토큰까지 커져
+건당 지연·비용 편차가 컸습니다. AIAnalyst 가 프롬프트를 만들기 직전에 아래 순서로 줄입니다.
+
+  1) 상용구 제거     서명·연락처·수신처(금융위원회 귀중 등) 같은 짧은 줄, 값이 비어 있는 표 행
+  2) 반복 행 제거    공백만 다른 같은 줄·같은 표 행은 첫 번째만
+  3) 예산 적용       유형별 토큰 예산(TYPE_BUDGETS, 힌트 중 최대값) 을 넘으면 줄마다 점수를 매겨
+                     높은 순으로 예산까지 채우고 원래 순서로 출력
+                       5  숫자 + 힌트 유형 키워드 (예: DILUTION → 발행가액·전환가액·주식수)
+                       3  숫자 + 일반 재무 키워드 / 제목(## ...)
+                       2  숫자만 있는 줄
+                       1  그 외 텍스트
+                     잘라낸 줄 수는 본문 끝에 한 줄로 표시 (AI 가 누락을 인지하도록)
+
+예산 안이면 1)·2) 만 적용합니다. 상용구 규칙은 80자 이하 줄에만 적용합니다.
+
+환경변수:
+  LLM_COMPACT          0 이면 압축하지 않음 (기본 1)
+  LLM_COMPACT_SCALE    유형별 예산 배율    (기본 1.0)
+
+COMPACT_VERSION 은 출력 규칙이 바뀌면 올릴 것 (AIAnalyst.prompt_version → LLM 결과 캐시 키).
+효과 측정: scripts/bench_compaction.py (토큰 분포 / eval_quality 샘플 정확도·지연 비교)
+"""
+
+import os
+import re
+from dataclasses import dataclass
+
+from llm_engine import estimate_tokens
+
+COMPACT_VERSION = "compact-1"
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+LLM_COMPACT       = os.environ.get("LLM_COMPACT", "1").strip().lower() not in ("0", "false", "no", "off")
+LLM_COMPACT_SCALE = _env_float("LLM_COMPACT_SCALE", 1.0)
+
+# 유형별 본문 토큰 예산 — 정기보고서(EARNINGS)는 표가 길어 넉넉히, 단순 결정 공시는 작게
+TYPE_BUDGETS: dict[str, int] = {
+    "EARNINGS":         6000,
+    "DILUTION":         4000,
+    "MNA":              4000,
+    "CONTRACT":         2500,
+    "BUYBACK":          2000,
+    "DISPOSAL":         2000,
+    "DIVIDEND":         1500,
+    "LEGAL":            2500,
+    "CAPEX":            2500,
+    "EXECUTIVE_CHANGE": 1500,
+    "OTHER":            3000,
+}
+
+# 힌트 유형별로 남길 숫자 행 키워드
+TYPE_KEYWORDS: dict[str, tuple[str, ...]] = {
+    "EARNINGS":         ("매출", "영업이익", "순이익", "법인세", "전년", "전기", "증감", "누적", "분기"),
+    "DILUTION":         ("발행", "주식수", "전환가", "행사가", "발행가", "증자", "자금", "희석", "권면", "납입", "이율"),
+    "MNA":              ("취득", "양수", "양도", "합병", "분할", "지분", "비율", "금액", "자기자본", "자산총액"),
+    "CONTRACT":         ("계약금액", "매출액", "대비", "계약기간", "계약상대", "시작일", "종료일", "수주"),
+    "BUYBACK":          ("취득", "주식수", "금액", "기간", "소각", "발행주식", "신탁"),
+    "DISPOSAL":         ("처분", "주식수", "금액", "기간", "처분가", "발행주식"),
+    "DIVIDEND":         ("배당", "주당", "배당률", "배당금", "기준일", "지급"),
+    "LEGAL":            ("청구", "소송", "금액", "자기자본", "판결", "과징금"),
+    "CAPEX":            ("투자금액", "투자", "자기자본", "자산총액", "대비", "기간", "취득가액"),
+    "EXECUTIVE_CHANGE": ("성명", "직위", "선임", "사임", "해임", "임기", "생년"),
+    "OTHER":            (),
+}
+
+_GENERAL_KEYWORDS = (
+    "매출", "이익", "손실", "금액", "억원", "백만원", "천원", "KRW", "%", "주식", "자본",
+)
+
+# 상용구: 이 머리말로 시작하는 짧은 줄 (숫자가 있어도 정보 가치 없음)
+_BOILERPLATE = re.compile(
+    r"^(?:\|\s*)?(?:금융위원회|한국거래소|코스닥시장본부|유가증권시장본부|증권선물위원회)\s*(?:귀중|귀하)"
+    r"|^(?:\|\s*)?(?:공시책임자|공시담당자|작성책임자|작성자|담당자|전화번호|전\s*화|팩스|홈페이지|e-?mail|이메일)\b"
+    r"|^(?:\|\s*)?(?:회사명|본점소재지|주\s*소)\s*[:|]?\s*[^\d]*$"
+    r"|^(?:\|\s*)?(?:※\s*)?(?:관련\s*공시|정정\s*전|정정\s*후)?\s*[:|]?\s*-?\s*\|?\s*$"
+)
+_EMPTY_ROW  = re.compile(r"^\|(?:\s*[-–—]?\s*\|)+$")
+_DIGIT      = re.compile(r"\d")
+_BOILER_MAX = 80     # 이보다 긴 줄은 상용구로 보지 않음
+
+
+@dataclass
+class CompactStats:
+    tokens_before: int = 0
+    tokens_after: int = 0
+    boilerplate: int = 0      # 상용구로 제거한 줄
+    duplicates: int = 0       # 반복으로 제거한 줄
+    over_budget: int = 0      # 예산 초과로 제거한 줄
+
+
+def budget_for(hint_types: list[str]) -> int:
+    """힌트 유형 중 가장 큰 예산 × LLM_COMPACT_SCALE."""
+    base = max((TYPE_BUDGETS.get(h, TYPE_BUDGETS["OTHER"]) for h in hint_types or ["OTHER"]),
+               default=TYPE_BUDGETS["OTHER"])
+    return int(base * LLM_COMPACT_SCALE)
+
+
+def _line_score(line: str, type_keywords: tuple[str, ...]) -> int:
+    has_digit = bool(_DIGIT.search(line))
+    if line.startswith("##"):
+        return 3
+    if has_digit and any(k in line for k in type_keywords):
+        return 5
+    if has_digit and any(k in line for k in _GENERAL_KEYWORDS):
+        return 3
+    return 2 if has_digit else 1
+
+
+def compact(content: str, hint_types: list[str]) -> tuple[str, CompactStats]:
+    """본문 → (압축 본문, 통계). 빈 본문·CONTENT_NOT_AVAILABLE 은 그대로."""
+    stats = CompactStats()
+    if not content or content == "CONTENT_NOT_AVAILABLE":
+        return content, stats
+
+    stats.tokens_before = estimate_tokens(content)
+    lines: list[str] = []
+    seen: set[str] = set()
+    for raw in str(content).split("\n"):
+        line = raw.strip()
+        if not line:
+            continue
+        if _EMPTY_ROW.match(line) or (len(line) <= _BOILER_MAX and _BOILERPLATE.search(line)):
+            stats.boilerplate += 1
+            continue
+        key = " ".join(line.split())
+        if key in seen:
+            stats.duplicates += 1
+            continue
+        seen.add(key)
+        lines.append(line)
+
+    budget = budget_for(hint_types)
+    costs = [estimate_tokens(line) + 1 for line in lines]   # +1: 줄바꿈
+    if sum(costs) > budget:
+        keywords = tuple(k for h in hint_types or [] for k in TYPE_KEYWORDS.get(h, ()))
+        order = sorted(range(len(lines)), key=lambda i: (-_line_score(lines[i], keywords), i))
+        keep: set[int] = set()
+        used = 0
+        for i in order:
+            if used + costs[i] > budget:
+                continue
+            keep.add(i)
+            used += costs[i]
+        stats.over_budget = len(lines) - len(keep)
+        lines = [line for i, line in enumerate(lines) if i in keep]
+        if stats.over_budget:
+            lines.append(f"(… {stats.over_budget} lower-priority lines omitted to fit the token budget)")
+
+    text = "\n".join(lines)
+    stats.tokens_after = estimate_tokens(text)
+    return text, stats
@@ -0,0 +1,142 @@
+"""
+scripts/dart_cassette.py
+========================
+dart_crawler 의 requests.Session 응답 녹화/재생 (cassette).
+
+실제 DART 엔드포인트 없이 크롤러 전체 경로(목록 → ZIP/뷰어 → 파싱 → 저장)를 돌려
+파서·동시성 변경을 네트워크 없이 측정하기 위한 도구입니다 (scripts/bench_dart_crawler.py).
+
+모드:
+  record   실제 세션으로 요청하고 응답을 디렉터리에 저장
+  replay   저장된 응답만 반환 (네트워크 사용 안 함). 없는 요청은 CassetteMiss
+           (requests ConnectionError 하위 클래스 → 크롤러의 연결 오류 경로로 처리)
+
+저장 구조 (<dir>/):
+  index.json        요청 키 → {file, status, content_type, size}
+  <sha1>.bin        응답 본문 (ZIP / JSON / HTML 원본 바이트)
+
+요청 키: "GET <url>" — crtfc_key(API 키)는 제거하고 쿼리 파라미터는 정렬.
+         → 녹화 파일에 키가 남지 않고, 다른 키로도 재생 가능
+
+환경변수 (dart_crawler 가 import 시 확인):
+  DART_CASSETTE            record:<dir> 또는 replay:<dir>
+  DART_CASSETTE_LATENCY    재생 시 요청당 지연 초 (기본 0 — 네트워크 지연 흉내)
+
+사용 예시:
+  DART_CASSETTE=record:scripts/data/dart_cassettes/20260415 \\
+      python scripts/dart_crawler.py --start 20260415 --end 20260415 --full
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+
+_SECRET_PARAMS = {"crtfc_key"}
+
+
+class CassetteMiss(requests.exceptions.ConnectionError):
+    """replay 모드에서 녹화되지 않은 요청."""
+
+
+def request_key(method: str, url: str) -> str:
+    parts = urlsplit(url)
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k not in _SECRET_PARAMS)
+    return f"{method.upper()} {urlunsplit(parts._replace(query=urlencode(query)))}"
+
+
+class CassetteSession:
+    """
+    requests.Session 래퍼. get() 만 녹화/재생하고 나머지 속성은 원래 세션으로 위임.
+    스레드 안전 (크롤러 워커 스레드가 공유).
+    """
+
+    def __init__(self, session: requests.Session, mode: str, directory: str | Path, latency: float = 0.0):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"unknown cassette mode: {mode}")
+        self._session = session
+        self.mode = mode
+        self.dir = Path(directory)
+        self.latency = latency
+        self._lock = threading.Lock()
+        self._index_path = self.dir / "index.json"
+        if mode == "record":
+            self.dir.mkdir(parents=True, exist_ok=True)
+        self._index: dict[str, dict] = (
+            json.loads(self._index_path.read_text(encoding="utf-8")) if self._index_path.exists() else {}
+        )
+        self.stats = {"hit": 0, "miss": 0, "recorded": 0, "bytes": 0}
+
+    def __getattr__(self, name):
+        return getattr(self._session, name)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        key = request_key("GET", url)
+        if self.mode == "replay":
+            return self._replay(key, url)
+
+        resp = self._session.get(url, **kwargs)
+        self._record(key, resp)
+        return resp
+
+    # ── 녹화 ──────────────────────────────────────────────────────────────────
+
+    def _record(self, key: str, resp: requests.Response) -> None:
+        body = resp.content
+        name = hashlib.sha1(key.encode("utf-8")).hexdigest() + ".bin"
+        (self.dir / name).write_bytes(body)
+        with self._lock:
+            self._index[key] = {
+                "file":         name,
+                "status":       resp.status_code,
+                "content_type": resp.headers.get("Content-Type", ""),
+                "size":         len(body),
+            }
+            self.stats["recorded"] += 1
+            self.stats["bytes"] += len(body)
+            # 녹화 중단돼도 그때까지 분량은 재생 가능하도록 매번 기록
+            tmp = self._index_path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(self._index, ensure_ascii=False, indent=1), encoding="utf-8")
+            os.replace(tmp, self._index_path)
+
+    # ── 재생 ──────────────────────────────────────────────────────────────────
+
+    def _replay(self, key: str, url: str) -> requests.Response:
+        entry = self._index.get(key)
+        if entry is None:
+            with self._lock:
+                self.stats["miss"] += 1
+            raise CassetteMiss(f"cassette 에 없는 요청: {key}")
+
+        if self.latency:
+            time.sleep(self.latency)
+        body = (self.dir / entry["file"]).read_bytes()
+        resp = requests.Response()
+        resp.status_code = entry["status"]
+        resp._content = body
+        resp.url = url
+        if entry.get("content_type"):
+            resp.headers["Content-Type"] = entry["content_type"]
+        resp.encoding = requests.utils.get_encoding_from_headers(resp.headers) or "utf-8"
+        with self._lock:
+            self.stats["hit"] += 1
+            self.stats["bytes"] += len(body)
+        return resp
+
+
+def cassette_from_env(session: requests.Session):
+    """DART_CASSETTE 가 설정돼 있으면 CassetteSession, 아니면 session 그대로."""
+    spec = os.environ.get("DART_CASSETTE", "").strip()
+    if not spec:
+        return session
+    mode, _, directory = spec.partition(":")
+    try:
+        latency = float(os.environ.get("DART_CASSETTE_LATENCY", 0))
+    except ValueError:
+        latency = 0.0
+    return CassetteSession(session, mode, directory, latency)
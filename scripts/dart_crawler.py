@@ -6,8 +6,11 @@ import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, date as date_type
 from pathlib import Path
+from typing import Callable
 from supabase import create_client, Client
 import urllib3
 import logging
@@ -27,6 +30,13 @@ try:
 except Exception:
     pass
 
+from scripts.dart_doc_cache import get_doc_cache
+from scripts.dart_markdown import html_to_markdown, extract_key_sections, PARSER_VERSION
+from scripts.dart_quota import get_dart_limiter, QuotaExceeded
+from scripts.disclosure_priority import priority_score, priority_tier, TOP_TIER
+from scripts.disclosure_rules import is_signal_disclosure, is_noise_corp, is_executive_noise
+from scripts.dart_cassette import cassette_from_env
+
 # SSL 경고 비활성화
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
@@ -34,10 +44,6 @@ urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-# ── 뷰어 폴백 실패 카운터 (run_crawler 종료 시 Telegram 경고용) ───────────────
-_viewer_fail_count = 0   # dcmNo 추출 실패 횟수
-_viewer_try_count  = 0   # 뷰어 폴백 시도 횟수 (014 에러 건수)
-
 # DART API 세션 (연결 재사용 + 헤더 + HTTP 레벨 재시도)
 session = requests.Session()
 session.headers.update({
@@ -58,142 +64,106 @@ retry_strategy = Retry(
     backoff_factor=2,
     status_forcelist=[429, 500, 502, 503, 504],
 )
-adapter = HTTPAdapter(max_retries=retry_strategy)
+# pool_maxsize: 동시 본문 수집 워커 수보다 커야 커넥션 재사용이 됨
+adapter = HTTPAdapter(max_retries=retry_strategy, pool_connections=4, pool_maxsize=16)
 session.mount("https://", adapter)
 session.mount("http://", adapter)
+# DART_CASSETTE=record:<dir>|replay:<dir> → 응답 녹화/재생 (scripts/bench_dart_crawler.py)
+session = cassette_from_env(session)
+
+
+# ── DART 요청 속도 제한 (토큰 버킷) ──────────────────────────────────────────
+# 기존에는 본문 요청마다 time.sleep(3.0) 고정 대기 → 300건이면 15분 이상 sleep.
+# 워커 스레드가 공유하는 토큰 버킷 하나로 전체 요청 속도만 제한하고,
+# 020(요청 제한 초과) 응답 시 속도를 절반으로 낮춘 뒤 성공이 이어지면 서서히 복구한다.
+#
+# DART OpenAPI 한도: 일 20,000건 / 분당 약 1,000건 초과 시 020 또는 IP 차단.
+# 기본값(초당 5건)은 분당 300건 — 한도의 1/3 수준으로 여유를 둔다.
+# opendart API 는 프로세스 간 공유 제한기(scripts/dart_quota.py)를 쓰고,
+# 이 클래스는 웹 뷰어(dart.fss.or.kr) 요청에만 사용한다.
+
+class TokenBucket:
+    """스레드 안전 토큰 버킷 + 020 적응형 backoff."""
+
+    def __init__(self, rate: float, burst: int = 1, min_rate: float = 0.2):
+        self.base_rate = rate
+        self.rate      = rate
+        self.min_rate  = min_rate
+        self.burst     = max(1, burst)
+        self._tokens   = float(self.burst)
+        self._last     = time.monotonic()
+        self._paused_until = 0.0
+        self._ok_streak    = 0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """토큰 1개 확보까지 대기."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now >= self._paused_until:
+                    self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+                    self._last = now
+                    if self._tokens >= 1.0:
+                        self._tokens -= 1.0
+                        return
+                    wait = (1.0 - self._tokens) / self.rate
+                else:
+                    self._last = self._paused_until
+                    wait = self._paused_until - now
+            time.sleep(wait)
+
+    def backoff(self, pause: float) -> None:
+        """020 수신: 전체 요청을 pause 초 멈추고 속도를 절반으로."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + pause)
+            self._tokens = 0.0
+            self._ok_streak = 0
+            self.rate = max(self.min_rate, self.rate / 2)
+        logger.warning(f"[rate] DART 020 → {pause:.0f}초 정지, 속도 {self.rate:.2f} req/s")
+
+    def success(self) -> None:
+        """정상 응답: 20회 연속 성공마다 속도 25% 복구 (base_rate 상한)."""
+        with self._lock:
+            if self.rate >= self.base_rate:
+                return
+            self._ok_streak += 1
+            if self._ok_streak >= 20:
+                self._ok_streak = 0
+                self.rate = min(self.base_rate, self.rate * 1.25)
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+VIEWER_RATE_PER_SEC = _env_float("DART_VIEWER_RATE_PER_SEC", 1.0)  # dart.fss.or.kr 웹 뷰어
+FETCH_WORKERS = int(_env_float("DART_FETCH_WORKERS", 4))    # 본문 동시 수집 스레드 수
+SAVE_BATCH = int(_env_float("DART_SAVE_BATCH", 50))         # DB upsert 배치 크기
+SAVE_FLUSH_SEC = _env_float("DART_SAVE_FLUSH_SEC", 10.0)    # 배치가 덜 차도 이 시간 지나면 flush
+CHECKPOINT_SETTLE_DAYS = 2   # 완료 체크포인트를 믿고 skip 하는 최소 경과일 (그 이내는 지연 공시 재확인)
+
+# opendart API(list/document)는 같은 키를 쓰는 다른 스크립트와 속도·일일 쿼터를 공유
+# (scripts/dart_quota.py, DART_RATE_PER_SEC). 우선순위는 run_crawler 에서 live/backfill 로 지정.
+_dart_limiter   = get_dart_limiter("dart_crawler", priority="live")
+_viewer_limiter = TokenBucket(VIEWER_RATE_PER_SEC, burst=1)
+_crawl_latency: dict[int, list[float]] = {}   # 우선순위 티어 → 목록 조회 ~ DB 저장 (초)
+_seen_lock      = threading.Lock()   # backfill 병렬 모드 공유 dedup 집합 갱신용
 
 url = os.environ.get("NEXT_PUBLIC_SUPABASE_URL") # URL 환경변수 사용 권장
 key = os.environ.get("SUPABASE_SERVICE_ROLE_KEY")
 supabase: Client = create_client(url, key)
 
-# ── 시그널 allowlist (포지티브 필터) ─────────────────────────────────────────
-# report_nm 에 아래 키워드 중 하나라도 포함되면 수집 대상.
-# 포함되지 않는 공시는 본문 파싱·AI 분석 없이 즉시 skip.
-#
-# 설계 원칙:
-#   - DART 30초 갱신으로 일 2,300건+ 급증 → 전수 수집은 Groq 토큰/크롤러 시간 낭비
-#   - event_type 은 AI 분석 후에야 확정 → 분석 전 필터 불가
-#   - report_nm 은 DART API 응답에서 즉시 획득 — AI 없이 유형 판별 가능
-#   - 네거티브(_NOISE_KEYWORDS) 방식 → 포지티브(allowlist) 방식으로 전환
-#   - 예상 효과: 수집 대상 2,300건 → 100~200건 (90% 감소)
-_SIGNAL_REPORT_NM_ALLOWLIST = [
-    # EARNINGS — 정기보고서
-    "사업보고서", "반기보고서", "분기보고서",
-
-    # CONTRACT — 단일판매·공급계약 / 수주
-    "단일판매ㆍ공급계약체결",   # DART 공식 표기 (ㆍ 사용)
-    "단일판매·공급계약체결",    # 일부 문서 중점(·) 표기
-    "공급계약체결",             # 기타 계약 변형 캐치
-    "수주공시",
-
-    # DILUTION — 유상증자·CB·BW·EB
-    "유상증자결정",
-    "전환사채권발행결정",
-    "신주인수권부사채권발행결정",
-    "교환사채권발행결정",
-
-    # BUYBACK — 자사주 취득·처분
-    "자기주식취득결정",
-    "자기주식처분결정",
-    "자기주식취득신탁계약체결결정",
-
-    # DIVIDEND — 배당 결정
-    "현금ㆍ현물배당결정",
-    "현금배당결정",
-    "주식배당결정",
-
-    # MNA — 합병·분할·포괄 교환
-    "합병결정",
-    "분할결정",
-    "분할합병결정",
-    "주식의포괄적교환",
-    "주식의포괄적이전",
-
-    # LEGAL — 소송 판결
-    "소송등의판결",
-
-    # CAPEX / acquisition — 타법인 취득·유형자산 취득
-    "타법인주식및출자증권취득결정",
-    "타법인주식및출자증권처분결정",
-    "유형자산취득결정",
-    "유형자산처분결정",
-
-    # EXECUTIVE_CHANGE — CEO·임원 변동 (is_executive_noise() 2차 필터 적용)
-    "임원의변동",
-    "대표이사의변동",
-]
-
-# 종목명 필터 — 스팩/펀드/부동산리츠 등 투자 시그널 무의미 종목 제외
-_NOISE_CORP_KEYWORDS = [
-    "전문유한회사", "부동산투자회사", "스팩", "자산운용", "자산운영", "펀드",
-    "기업인수목적", "투자증권", "투자자문",
-]
-
-def is_signal_disclosure(report_nm: str) -> bool:
-    """allowlist 키워드 중 하나라도 포함되면 True — 수집 대상."""
-    t = (report_nm or "")
-    return any(kw in t for kw in _SIGNAL_REPORT_NM_ALLOWLIST)
-
-
-# ── 임원 변동 2차 필터 ────────────────────────────────────────────────────────
-# "임원의변동" / "대표이사의변동" 공시 중 사외이사·감사만 언급 → 노이즈
-# CEO / C-Level 포함 공시 → 신호로 통과
-
-_EXEC_SIGNAL_KEYWORDS = [
-    "대표이사", "CEO", "사장", "부사장",
-    "CFO", "COO", "CTO", "CSO", "CCO",
-    "전무이사", "전무", "상무이사", "상무",
-]
-_EXEC_CHANGE_REPORT_NMS = ("임원의변동", "대표이사의변동")
-
-def is_executive_noise(report_nm: str, content: str = "") -> bool:
-    """
-    임원 변동 공시 중 CEO/C-Level 신호가 없는 경우 True(노이즈) 반환.
-    - report_nm이 임원변동 계열이 아니면 False (해당 없음)
-    - 본문 없으면 일단 통과(False) — 내용 확인 불가
-    - CEO/C-Level 키워드 존재 → False (신호, 통과)
-    - 없으면 True (사외이사/감사만 → 노이즈)
-    """
-    if not any(nm in (report_nm or "") for nm in _EXEC_CHANGE_REPORT_NMS):
-        return False
-    if not content:
-        return False
-    return not any(kw in content for kw in _EXEC_SIGNAL_KEYWORDS)
-
-
-def is_noise_corp(corp_name: str) -> bool:
-    t = (corp_name or "").lower()
-    return any(kw.lower() in t for kw in _NOISE_CORP_KEYWORDS)
-
-
-# ── 핵심 섹션 추출 (truncate 대신 사용) ──────────────────────────────────────
-_IMPORTANT_KEYWORDS = [
-    "매출", "영업이익", "당기순이익", "순이익",
-    "계약", "금액", "발행", "증자", "취득", "처분",
-    "손실", "감소", "증가", "%", "억원", "백만원", "KRW",
-    "보증", "채무", "주식수", "주당", "전환가",
-    "수주", "납품", "공급", "투자", "배당", "자본금",
-]
-
-def extract_key_sections(text: str) -> str:
-    """키워드 포함 줄 + 마크다운 테이블/헤딩만 추출 (truncate 금지)"""
-    if not text:
-        return text
-    lines = text.split("\n")
-    filtered = []
-    for line in lines:
-        stripped = line.strip()
-        if not stripped:
-            continue
-        if any(k in stripped for k in _IMPORTANT_KEYWORDS):
-            filtered.append(stripped)
-        elif stripped.startswith("|") or stripped.startswith("##"):
-            filtered.append(stripped)
-    result = "\n".join(filtered[:300])
-    # 키워드 매칭 결과가 너무 적으면 원본 앞부분 fallback
-    if len(result) < 200 and len(text) > 200:
-        return text[:6000]
-    return result
+# ── 시그널 allowlist · 종목명 · 임원 변동 필터 ────────────────────────────────
+# 규칙 목록은 scripts/disclosure_rules.py 에 있음 (auto_analyst 스킵 필터 · reprocess_db 와 공유).
+#   is_signal_disclosure  report_nm 에 allowlist 키워드 포함 → 수집 대상 (미포함은 본문 파싱 없이 skip)
+#   is_noise_corp         스팩/펀드/부동산리츠 등 투자 시그널 무의미 종목 제외
+#   is_executive_noise    임원 변동 공시 중 CEO/C-Level 언급 없는 건 (본문 기준 2차 필터)
+# 제목 판정 결과는 캐시되어 priority_score(report_nm) 에서 다시 훑지 않음.
+
 
 def generate_hash_key(corp_code: str, rcept_no: str) -> str:
     """공시 hash key 생성"""
@@ -213,116 +183,216 @@ def is_disclosure_processed(corp_code: str, rcept_no: str) -> bool:
         logger.warning(f"해시 확인 실패 (처리 진행): {e}")
         return False
 
-def _clean_html_text(raw_html):
-    """HTML → 투자 분석용 마크다운 텍스트 변환
-
-    테이블은 | 구분자로, 제목은 ## 으로 변환해 AI가 구조를 파악하기 쉽게 처리.
-    script/style 블록 제거 후 의미 있는 텍스트만 추출.
-    """
-    # 1) script/style/head 블록 전체 제거
-    clean = re.sub(r'<(script|style|head)[^>]*>.*?</\1>', '', raw_html, flags=re.DOTALL | re.IGNORECASE)
-
-    # 2) 테이블 → 마크다운 변환 (tr/td/th 구조)
-    def table_to_md(html):
-        rows = re.findall(r'<tr[^>]*>(.*?)</tr>', html, flags=re.DOTALL | re.IGNORECASE)
-        md_rows = []
-        for row in rows:
-            cells = re.findall(r'<t[dh][^>]*>(.*?)</t[dh]>', row, flags=re.DOTALL | re.IGNORECASE)
-            cells = [re.sub(r'<[^>]+>', '', c).strip() for c in cells]
-            cells = [re.sub(r'\s+', ' ', c) for c in cells if c]
-            if cells:
-                md_rows.append('| ' + ' | '.join(cells) + ' |')
-        return '\n'.join(md_rows)
-
-    # 테이블 블록을 MD로 교체
-    clean = re.sub(
-        r'<table[^>]*>(.*?)</table>',
-        lambda m: '\n' + table_to_md(m.group(0)) + '\n',
-        clean, flags=re.DOTALL | re.IGNORECASE
-    )
 
-    # 3) 제목 태그 → ## 마크다운
-    clean = re.sub(r'<h[1-3][^>]*>(.*?)</h[1-3]>', lambda m: '\n## ' + re.sub(r'<[^>]+>', '', m.group(1)).strip() + '\n', clean, flags=re.DOTALL | re.IGNORECASE)
+_DCM_NO_HINT = "dcm"   # 정상 뷰어 메인 페이지에는 dcmNo / dcm_no 가 항상 포함됨
+
+# dcmNo 추출 — 한 번 훑어서 우선순위가 가장 높은 매칭 사용 (이전 6개 정규식의 순차 시도와 같은 결과)
+#   js   : dcmNo = "123" / dcmNo:"123" / rcpNo=...&dcmNo=123 (<option> 태그 포함)
+#   node : node1['dcmNo'] = "123"  ← 일부 문서 전용 포맷 (node1 우선)
+#   snake: dcm_no=123 / viewer.do?...dcm_no=123 형식 fallback
+_DCM_NO_SCANNER = re.compile(
+    r"dcmNo['\"]?\s*[=:]\s*['\"]?(?P<js>\d+)"
+    r"|node(?P<node_idx>\d+)\['dcmNo'\]\s*=\s*\"(?P<node>\d+)\""
+    r"|(?i:dcm_no)[=:](?P<snake>\d+)"
+)
+
+
+def _scan_dcm_no(html: str) -> str | None:
+    """뷰어 메인 HTML → dcmNo. js 형식은 첫 매칭에서 바로 반환."""
+    node = snake = None
+    for m in _DCM_NO_SCANNER.finditer(html):
+        if m.group("js"):
+            return m.group("js")
+        if m.group("node"):
+            if m.group("node_idx") == "1":
+                node = m.group("node")
+            elif node is None:
+                node = m.group("node")
+        elif snake is None:
+            snake = m.group("snake")
+    return node or snake
+
+
+class ViewerMetrics:
+    """
+    뷰어 폴백 실행별 집계 (run_crawler 가 실행마다 새로 만들어 수집 스레드에 전달).
+      tries          014 → 뷰어 폴백 시도
+      dcm_cached     dcmNo 를 저장된 매핑에서 찾음 (메인 페이지 요청 생략)
+      dcm_scanned    메인 페이지에서 dcmNo 추출
+      main_text      dcmNo 없이 메인 HTML 텍스트로 대체 (부분 성공)
+      fail           dcmNo·텍스트 모두 없음 (차단·CAPTCHA·세션만료 의심) — 경고 기준
+      body_fail      viewer.do 본문 실패 (HTTP 오류 / 본문 짧음)
+      ok             본문 수집 성공
+      requests       뷰어 HTTP 요청 수 (디스크 캐시 hit 제외)
+    """
+
+    FIELDS = ("tries", "dcm_cached", "dcm_scanned", "main_text", "fail", "body_fail", "ok", "requests")
 
-    # 4) <br> / <p> → 줄바꿈
-    clean = re.sub(r'<br\s*/?>', '\n', clean, flags=re.IGNORECASE)
-    clean = re.sub(r'</p>', '\n', clean, flags=re.IGNORECASE)
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts = dict.fromkeys(self.FIELDS, 0)
 
-    # 5) 나머지 HTML 태그 제거
-    clean = re.sub(r'<[^>]+>', ' ', clean)
+    def inc(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self.counts[name] += n
 
-    # 6) null 바이트 제거
-    clean = clean.replace('\x00', '').replace('\u0000', '')
+    def snapshot(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self.counts)
 
-    # 7) 과도한 공백/줄바꿈 정리
-    clean = re.sub(r'[ \t]+', ' ', clean)
-    clean = re.sub(r'\n{3,}', '\n\n', clean)
-    clean = clean.strip()
+    @property
+    def fail_rate(self) -> float:
+        snap = self.snapshot()
+        return snap["fail"] / snap["tries"] if snap["tries"] else 0.0
 
-    return clean
 
+# ── rcept_no → dcmNo 매핑 (dart_viewer_documents) ────────────────────────────
+# 재수집·재실행 시 메인 페이지(main.do) 요청 없이 viewer.do 로 바로 간다.
+_dcm_no_memo: dict[str, str] = {}
+_dcm_no_lock = threading.Lock()
 
-def _fetch_from_viewer(rcept_no):
-    """document.xml 014 시 DART 웹 뷰어에서 본문 직접 스크래핑 (폴백)"""
+
+def _load_dcm_no(rcept_no: str) -> str | None:
+    with _dcm_no_lock:
+        if rcept_no in _dcm_no_memo:
+            return _dcm_no_memo[rcept_no]
     try:
-        # 1단계: 메인 페이지 접근 (DART 뷰어 파라미터명은 rcpNo)
-        main_url = f"https://dart.fss.or.kr/dsaf001/main.do?rcpNo={rcept_no}"
-        resp = session.get(main_url, timeout=15)
-        if resp.status_code != 200:
-            logger.warning(f"{rcept_no} 뷰어 메인 접근 실패: HTTP {resp.status_code}")
-            return None
+        res = supabase.table("dart_viewer_documents") \
+            .select("dcm_no") \
+            .eq("rcept_no", rcept_no) \
+            .execute()
+    except Exception as e:
+        logger.warning(f"[viewer] dcmNo 매핑 조회 실패 (메인 페이지로 진행): {e}")
+        return None
+    dcm_no = res.data[0]["dcm_no"] if res.data else None
+    if dcm_no:
+        with _dcm_no_lock:
+            _dcm_no_memo[rcept_no] = dcm_no
+    return dcm_no
 
-        # dcmNo 추출 (여러 패턴 시도)
-        # pat1: dcmNo = "123" / dcmNo:"123"
-        # pat2: node1['dcmNo'] = "123"  ← 일부 문서 전용 포맷
-        # pat3: <option value="rcpNo=...&dcmNo=123">  ← HTML option 태그
-        # pat4/5: dcm_no=123 형식 fallback
-        dcm_match = (
-            re.search(r"dcmNo['\"]?\s*[=:]\s*['\"]?(\d+)", resp.text) or
-            re.search(r"node1\['dcmNo'\]\s*=\s*\"(\d+)\"", resp.text) or
-            re.search(r"rcpNo=" + rcept_no + r"&(?:amp;)?dcmNo=(\d+)", resp.text) or
-            re.search(r"node\d+\['dcmNo'\]\s*=\s*\"(\d+)\"", resp.text) or
-            re.search(r"dcm_no[=:](\d+)", resp.text, re.IGNORECASE) or
-            re.search(r"viewer\.do[^'\"]*dcm_no=(\d+)", resp.text, re.IGNORECASE)
-        )
 
-        if not dcm_match:
+def _save_dcm_no(rcept_no: str, dcm_no: str) -> None:
+    with _dcm_no_lock:
+        _dcm_no_memo[rcept_no] = dcm_no
+    try:
+        supabase.table("dart_viewer_documents").upsert(
+            {"rcept_no": rcept_no, "dcm_no": dcm_no, "updated_at": datetime.now().isoformat()},
+            on_conflict="rcept_no",
+        ).execute()
+    except Exception as e:
+        logger.warning(f"[viewer] dcmNo 매핑 저장 실패 (무시): {e}")
+
+
+def _clean_cached(raw_text: str) -> str:
+    """
+    HTML/XML → 투자 분석용 마크다운 (scripts/dart_markdown.py) + 디스크 캐시.
+    캐시 키: 원문 해시 + PARSER_VERSION
+    """
+    cache = get_doc_cache()
+    if cache is None:
+        return html_to_markdown(raw_text)
+    return cache.get_text(PARSER_VERSION, raw_text, lambda: html_to_markdown(raw_text))
+
+
+def _viewer_get(
+    url: str, cache_key: str, keep: Callable[[str], bool], metrics: ViewerMetrics,
+) -> tuple[int, str]:
+    """
+    뷰어 페이지 GET (디스크 캐시 우선). 반환: (HTTP status, HTML)
+    keep(html) 이 True 인 응답만 캐시 — 차단/CAPTCHA 페이지가 캐시에 남지 않도록.
+    """
+    cache = get_doc_cache()
+    if cache is not None:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return 200, cached.decode("utf-8", errors="ignore")
+
+    _viewer_limiter.acquire()
+    metrics.inc("requests")
+    resp = session.get(url, timeout=15)
+    if resp.status_code == 200 and cache is not None and keep(resp.text):
+        cache.put(cache_key, resp.text.encode("utf-8"))
+    return resp.status_code, resp.text
+
+
+def _resolve_dcm_no(rcept_no: str, metrics: ViewerMetrics) -> tuple[str | None, str | None]:
+    """
+    1단계: dcmNo 확보 — 저장된 매핑 우선, 없으면 메인 페이지(main.do)에서 추출 후 저장.
+    반환: (dcmNo, 메인 HTML) — 매핑 hit 면 메인 HTML 은 None, 메인 접근 실패면 (None, None)
+    """
+    dcm_no = _load_dcm_no(rcept_no)
+    if dcm_no:
+        metrics.inc("dcm_cached")
+        return dcm_no, None
+
+    # DART 뷰어 파라미터명은 rcpNo
+    main_url = f"https://dart.fss.or.kr/dsaf001/main.do?rcpNo={rcept_no}"
+    status, main_html = _viewer_get(
+        main_url, f"viewer:{rcept_no}", keep=lambda h: _DCM_NO_HINT in h, metrics=metrics,
+    )
+    if status != 200:
+        logger.warning(f"{rcept_no} 뷰어 메인 접근 실패: HTTP {status}")
+        return None, None
+
+    dcm_no = _scan_dcm_no(main_html)
+    if dcm_no:
+        metrics.inc("dcm_scanned")
+        _save_dcm_no(rcept_no, dcm_no)
+    return dcm_no, main_html
+
+
+def _fetch_from_viewer(rcept_no, metrics: ViewerMetrics | None = None):
+    """
+    document.xml 014 시 DART 웹 뷰어에서 본문 직접 스크래핑 (폴백).
+    본문 수집 스레드(_process_items 의 pool)에서 그대로 실행되며, 두 단계 요청 모두
+    _viewer_limiter 속도를 공유한다. dcmNo 매핑이 저장돼 있으면 요청 1회로 끝난다.
+    """
+    metrics = metrics or ViewerMetrics()
+    metrics.inc("tries")
+    try:
+        dcm_no, main_html = _resolve_dcm_no(rcept_no, metrics)
+        if dcm_no is None and main_html is None:
+            return None
+
+        if not dcm_no:
             # 진단용: 페이지 크기 + 앞 200자 로그 (DART 차단/세션만료/CAPTCHA 판별)
-            snippet = resp.text[:200].replace("\n", " ").strip()
+            snippet = main_html[:200].replace("\n", " ").strip()
             logger.warning(
                 f"{rcept_no} dcmNo 추출 실패 "
-                f"(page_len={len(resp.text)}, snippet={snippet!r})"
+                f"(page_len={len(main_html)}, snippet={snippet!r})"
             )
             # dcmNo 없어도 HTML 본문에서 텍스트 추출 가능한 경우 (구조적 차이, 서버 장애 아님)
-            # → 부분 성공으로 처리하고 _viewer_fail_count 미증가
-            text = _clean_html_text(resp.text)
+            # → 부분 성공으로 처리하고 fail 미집계
+            text = _clean_cached(main_html)
             if len(text) > 100:
                 logger.info(f"{rcept_no} dcmNo 없음 → 메인 HTML 텍스트 폴백 ({len(text)}자)")
+                metrics.inc("main_text")
                 return extract_key_sections(text)
             # 텍스트도 없으면 실질적 실패 (CAPTCHA·차단·세션만료 등)
-            global _viewer_fail_count
-            _viewer_fail_count += 1
+            metrics.inc("fail")
             return None
 
-        dcm_no = dcm_match.group(1)
-
         # 2단계: 뷰어 페이지에서 본문 가져오기
-        time.sleep(1.5)
         viewer_url = (
             f"https://dart.fss.or.kr/report/viewer.do"
             f"?rcept_no={rcept_no}&dcm_no={dcm_no}"
             f"&eleId=0&offset=0&length=0&dtd=dart3.xsd"
         )
-        resp2 = session.get(viewer_url, timeout=15)
-        if resp2.status_code != 200:
-            logger.warning(f"{rcept_no} 뷰어 본문 접근 실패: HTTP {resp2.status_code}")
+        status, body_html = _viewer_get(
+            viewer_url, f"viewer:{rcept_no}:{dcm_no}", keep=lambda h: len(h) > 1000, metrics=metrics,
+        )
+        if status != 200:
+            logger.warning(f"{rcept_no} 뷰어 본문 접근 실패: HTTP {status}")
+            metrics.inc("body_fail")
             return None
 
-        text = _clean_html_text(resp2.text)
+        text = _clean_cached(body_html)
         if len(text) > 100:
             logger.info(f"{rcept_no} 뷰어 폴백 성공 ({len(text)}자)")
+            metrics.inc("ok")
             return extract_key_sections(text)
 
+        metrics.inc("body_fail")
         return None
 
     except Exception as e:
@@ -330,8 +400,38 @@ def _fetch_from_viewer(rcept_no):
         return None
 
 
-def get_clean_content(rcept_no, max_retries=2):
-    """본문 수집: document.xml 우선 → 014 시 뷰어 폴백"""
+def _parse_zip(rcept_no: str, zip_bytes: bytes) -> str:
+    """document.xml ZIP → 정제 텍스트 (핵심 섹션)."""
+    try:
+        with zipfile.ZipFile(io.BytesIO(zip_bytes)) as z:
+            xml_name = z.namelist()[0]
+            with z.open(xml_name) as f:
+                raw_bytes = f.read()
+        # XML 선언부에서 인코딩 감지 (EUC-KR / UTF-8 등)
+        enc_match = re.search(rb'encoding=["\']([^"\']+)["\']', raw_bytes[:500])
+        encoding = enc_match.group(1).decode('ascii').lower() if enc_match else 'utf-8'
+        if encoding in ('euc-kr', 'ks_c_5601-1987', 'ms949', 'cp949'):
+            encoding = 'euc-kr'
+        raw_text = raw_bytes.decode(encoding, errors='ignore')
+        text = _clean_cached(raw_text)
+        logger.info(f"{rcept_no} ZIP 추출 성공 (인코딩: {encoding}, {len(text)}자)")
+        return extract_key_sections(text)
+    except Exception as zip_err:
+        logger.error(f"ZIP 처리 중 오류 ({rcept_no}): {zip_err}")
+        return "CONTENT_NOT_AVAILABLE"
+
+
+def get_clean_content(rcept_no, max_retries=2, viewer_metrics: ViewerMetrics | None = None):
+    """
+    본문 수집: 디스크 캐시 → document.xml → 014 시 뷰어 폴백
+    viewer_metrics: 뷰어 폴백 집계 대상 (run_crawler 실행 단위, 없으면 집계 안 함)
+    """
+    cache = get_doc_cache()
+    cached_zip = cache.get(f"zip:{rcept_no}") if cache else None
+    if cached_zip is not None:
+        logger.info(f"{rcept_no} ZIP 디스크 캐시 hit")
+        return _parse_zip(rcept_no, cached_zip)
+
     dart_key = os.environ.get("DART_API_KEY")
     if not dart_key:
         logger.error("DART_API_KEY가 설정되지 않았습니다.")
@@ -340,7 +440,7 @@ def get_clean_content(rcept_no, max_retries=2):
     content_url = f"https://opendart.fss.or.kr/api/document.xml?crtfc_key={dart_key}&rcept_no={rcept_no}"
 
     for attempt in range(1, max_retries + 1):
-        time.sleep(3.0)
+        _dart_limiter.acquire()
 
         try:
             response = session.get(content_url, timeout=30)
@@ -348,23 +448,10 @@ def get_clean_content(rcept_no, max_retries=2):
             if response.status_code == 200:
                 # 정상 ZIP 응답
                 if response.content.startswith(b'PK'):
-                    try:
-                        with zipfile.ZipFile(io.BytesIO(response.content)) as z:
-                            xml_name = z.namelist()[0]
-                            with z.open(xml_name) as f:
-                                raw_bytes = f.read()
-                        # XML 선언부에서 인코딩 감지 (EUC-KR / UTF-8 등)
-                        enc_match = re.search(rb'encoding=["\']([^"\']+)["\']', raw_bytes[:500])
-                        encoding = enc_match.group(1).decode('ascii').lower() if enc_match else 'utf-8'
-                        if encoding in ('euc-kr', 'ks_c_5601-1987', 'ms949', 'cp949'):
-                            encoding = 'euc-kr'
-                        raw_text = raw_bytes.decode(encoding, errors='ignore')
-                        text = _clean_html_text(raw_text)
-                        logger.info(f"{rcept_no} ZIP 추출 성공 (인코딩: {encoding}, {len(text)}자)")
-                        return extract_key_sections(text)
-                    except Exception as zip_err:
-                        logger.error(f"ZIP 처리 중 오류 ({rcept_no}): {zip_err}")
-                        return "CONTENT_NOT_AVAILABLE"
+                    _dart_limiter.success()
+                    if cache is not None and zipfile.is_zipfile(io.BytesIO(response.content)):
+                        cache.put(f"zip:{rcept_no}", response.content)
+                    return _parse_zip(rcept_no, response.content)
 
                 # DART 에러 XML 응답
                 dart_status, dart_message = None, None
@@ -378,18 +465,16 @@ def get_clean_content(rcept_no, max_retries=2):
 
                 # 014: 파일 미존재 → 재시도 없이 즉시 뷰어 폴백
                 if dart_status == "014":
-                    global _viewer_try_count
-                    _viewer_try_count += 1
                     logger.info(f"{rcept_no} document.xml 없음(014) -> 뷰어 스크래핑 폴백 시도")
-                    return _fetch_from_viewer(rcept_no) # ✅ 단순히 마킹하지 말고 바로 스크래핑 함수 호출
+                    return _fetch_from_viewer(rcept_no, viewer_metrics) # ✅ 단순히 마킹하지 말고 바로 스크래핑 함수 호출
                     
                     #return "CONTENT_NOT_AVAILABLE"
 
-                # 020: 요청 제한 초과 → 재시도
+                # 020: 요청 제한 초과 → 전체 워커 속도 하향 후 재시도
                 if dart_status == "020" and attempt < max_retries:
                     wait_time = 5.0 * attempt
                     logger.warning(f"[시도 {attempt}/{max_retries}] {rcept_no} 요청 제한(020) -> {wait_time}초 후 재시도")
-                    time.sleep(wait_time)
+                    _dart_limiter.backoff(wait_time)
                     continue
 
                 logger.warning(f"{rcept_no} 수집 불가 - DART [상태: {dart_status}] [메시지: {dart_message}]")
@@ -417,14 +502,16 @@ def _fetch_dart_page(dart_key: str, bgnde: str, endde: str, page_no: int) -> dic
         f"?crtfc_key={dart_key}&bgn_de={bgnde}&end_de={endde}"
         f"&page_count=100&page_no={page_no}"
     )
+    _dart_limiter.acquire()
     res = session.get(api_url, timeout=30)
     return res.json()
 
 
-def _fetch_all_dart_items(dart_key: str, bgnde: str, endde: str) -> list[dict]:
+def _fetch_all_dart_items(dart_key: str, bgnde: str, endde: str) -> tuple[list[dict], bool]:
     """
     DART list API 전체 페이지 순회.
     page_count=100 기준으로 total_count 초과까지 반복.
+    반환: (공시 목록, 끝까지 조회 완료 여부 — API 오류로 중단되면 False)
     """
     all_items: list[dict] = []
     page_no = 1
@@ -432,16 +519,18 @@ def _fetch_all_dart_items(dart_key: str, bgnde: str, endde: str) -> list[dict]:
     while True:
         try:
             data = _fetch_dart_page(dart_key, bgnde, endde, page_no)
+        except QuotaExceeded:
+            raise
         except Exception as e:
             logger.error(f"DART API 호출 실패 (page {page_no}): {e}")
-            break
+            return all_items, False
 
         status = data.get("status")
         if status == "013":  # 조회 결과 없음
             break
         if status != "000":
             logger.warning(f"DART API 오류 [{bgnde}~{endde} p{page_no}]: {status} {data.get('message', '')}")
-            break
+            return all_items, False
 
         items = data.get("list", [])
         if not items:
@@ -454,9 +543,105 @@ def _fetch_all_dart_items(dart_key: str, bgnde: str, endde: str) -> list[dict]:
             break
 
         page_no += 1
-        time.sleep(0.5)   # DART API 부하 방지
 
-    return all_items
+    return all_items, True
+
+
+# ── 증분 조회 워터마크 (dart_list_watermarks) ─────────────────────────────────
+# 15분 주기 prod 배치가 매번 당일 전체 페이지를 다시 훑고 전 건을 중복 체크하던 것을,
+# 날짜별 마지막 total_count 와 완료 여부를 저장해 두고 목록이 바뀐 날만 다시 읽도록 바꾼다.
+#   - 변경 없음 (total_count 동일 + completed): API 1회
+#   - 변경 있음: 전체 페이지 재조회 → 모든 건을 후보로 _batch_fetch_existing 에서 중복 제거
+# rcept_no 는 단조 증가가 아니고 (거래소 수리 80xxxxx / 금감원 접수 00xxxxx 계열이 섞임)
+# 새 공시가 목록 끝에만 붙는다는 보장도 없으므로, rcept_no 최대값이나 페이지 위치로 거르지 않는다.
+# max_rcept_no 는 마지막으로 본 최대 접수번호 (참고용 — 필터에 쓰지 않음).
+# DB 저장 실패 건이 있으면 completed=false 로 남겨 다음 실행이 다시 전체를 읽게 한다.
+
+def _load_watermark(ds: str) -> dict | None:
+    try:
+        res = supabase.table("dart_list_watermarks") \
+            .select("max_rcept_no, total_count, completed") \
+            .eq("list_date", ds) \
+            .execute()
+        return res.data[0] if res.data else None
+    except Exception as e:
+        logger.warning(f"[watermark] 조회 실패 (전체 조회로 진행): {e}")
+        return None
+
+
+def _save_watermark(ds: str, max_rcept_no: str, total_count: int, completed: bool = False) -> None:
+    """completed: 목록 끝까지 조회 + 저장 실패 없음 (backfill 재개 시 지난 날짜 skip 기준)."""
+    try:
+        supabase.table("dart_list_watermarks").upsert(
+            {
+                "list_date":    ds,
+                "max_rcept_no": max_rcept_no,
+                "total_count":  total_count,
+                "completed":    completed,
+                "updated_at":   datetime.now().isoformat(),
+            },
+            on_conflict="list_date",
+        ).execute()
+    except Exception as e:
+        logger.warning(f"[watermark] 저장 실패 (다음 실행은 전체 조회): {e}")
+
+
+def _load_completed_days(start_ds: str, end_ds: str) -> set[str]:
+    """start~end 중 completed 체크포인트가 있는 날짜 (YYYYMMDD)."""
+    try:
+        res = supabase.table("dart_list_watermarks") \
+            .select("list_date") \
+            .eq("completed", True) \
+            .gte("list_date", start_ds) \
+            .lte("list_date", end_ds) \
+            .execute()
+        return {str(r["list_date"]).replace("-", "") for r in (res.data or [])}
+    except Exception as e:
+        logger.warning(f"[checkpoint] 조회 실패 (전 구간 처리): {e}")
+        return set()
+
+
+def _fetch_changed_dart_items(dart_key: str, ds: str, wm: dict) -> tuple[list[dict], int, bool]:
+    """
+    워터마크 이후 목록이 바뀐 경우에만 전체 페이지를 다시 조회.
+    반환: (공시 목록 — 변경 없으면 빈 목록, 현재 total_count, 끝까지 조회 완료 여부)
+    """
+    prev_total = int(wm.get("total_count") or 0)
+    unchanged_ok = bool(wm.get("completed"))
+    all_items: list[dict] = []
+    total = prev_total
+    page_no = 1
+
+    while True:
+        try:
+            data = _fetch_dart_page(dart_key, ds, ds, page_no)
+        except QuotaExceeded:
+            raise
+        except Exception as e:
+            logger.error(f"DART API 호출 실패 (page {page_no}): {e}")
+            return all_items, total, False
+
+        status = data.get("status")
+        if status == "013":  # 조회 결과 없음
+            return all_items, len(all_items), True
+        if status != "000":
+            logger.warning(f"DART API 오류 [{ds} p{page_no}]: {status} {data.get('message', '')}")
+            return all_items, total, False
+
+        total = int(data.get("total_count", 0))
+        if page_no == 1 and unchanged_ok and total == prev_total:
+            return [], total, True
+
+        items = data.get("list", [])
+        all_items.extend(items)
+        if not items or len(all_items) >= total:
+            return all_items, total, True
+        page_no += 1
+
+
+def _max_saved_rcept_no(mark: str, items: list[dict], failed: set[str]) -> str:
+    """저장 실패 건을 뺀 최대 rcept_no (참고용 기록 — 필터에 쓰지 않음)."""
+    return max([mark] + [r for i in items if (r := i.get("rcept_no") or "") not in failed])
 
 
 def _batch_fetch_existing(rcept_nos: list[str]) -> set[str]:
@@ -479,13 +664,29 @@ def _batch_fetch_existing(rcept_nos: list[str]) -> set[str]:
     return existing
 
 
-def _process_items(items: list[dict], date_label: str) -> tuple[int, set[str]]:
+def _process_items(
+    items: list[dict],
+    date_label: str,
+    workers: int = FETCH_WORKERS,
+    writer: "_SaveBuffer | None" = None,
+    pool: ThreadPoolExecutor | None = None,
+    seen: set[str] | None = None,
+    viewer_metrics: ViewerMetrics | None = None,
+) -> tuple[int, set[str], set[str]]:
     """
     공시 목록 → 필터링 → 본문 수집 → DB 저장.
-    반환: (저장 건수, 저장된 stock_code 집합)
+    반환: (저장 건수, 저장된 stock_code 집합, DB 저장 실패 rcept_no 집합)
+
+    본문 수집(다운로드 + 파싱)은 workers 개 스레드가 _dart_limiter 속도 안에서 병렬로 수행하고,
+    호출 스레드는 결과를 원래 순서대로 받아 _SaveBuffer 에 쌓고 SAVE_BATCH 건 단위로 upsert 한다
+    (수집 ↔ 저장 파이프라인). 저장 순서·결과는 순차 처리(workers=1)와 동일하다.
+
+    backfill 병렬 모드에서는 여러 날짜가 writer(DB 배치) / pool(본문 수집 스레드) /
+    seen(이번 실행에서 이미 맡은 rcept_no) 을 공유한다. 없으면 호출마다 새로 만든다.
     """
-    count = 0
-    saved_codes: set[str] = set()
+    if writer is None:
+        writer = _SaveBuffer()
+    writer.begin(date_label)
 
     # ── 1차: 인메모리 필터 (공짜) ─────────────────────────────────────────────
     candidates = []
@@ -519,86 +720,210 @@ def _process_items(items: list[dict], date_label: str) -> tuple[int, set[str]]:
     )
 
     if not candidates:
-        return 0, set()
+        return writer.take(date_label)
 
     # ── 2차: 배치 중복 체크 — Supabase 1회 호출 ────────────────────────────────
     candidate_rcept_nos = [i.get("rcept_no") for i in candidates]
     existing = _batch_fetch_existing(candidate_rcept_nos)
     new_candidates = [i for i in candidates if i.get("rcept_no") not in existing]
+    if seen is not None:
+        # 다른 날짜 워커가 이미 맡은 건 제외 + 이번 건 선점
+        with _seen_lock:
+            new_candidates = [i for i in new_candidates if i.get("rcept_no") not in seen]
+            seen.update(i.get("rcept_no") for i in new_candidates)
     logger.info(f"  [{date_label}] 신규 처리 대상: {len(new_candidates)}건 (기존 {len(existing)}건 skip)")
 
-    # ── 3차: DART ZIP 다운로드 + DB 저장 ─────────────────────────────────────
-    for item in new_candidates:
-        rcept_no       = item.get("rcept_no")
-        corp_code      = item.get("corp_code", "").strip()
-        report_nm      = item.get("report_nm", "")
-        corp_name_val  = item.get("corp_name", "")
-        stock_code_val = item.get("stock_code", "").strip()
+    # 고시그널(유상증자·합병·공급계약 등) 먼저 수집·저장 — 같은 점수 안에서는 목록 순서 유지
+    new_candidates.sort(key=lambda i: -priority_score(i.get("report_nm", "")))
+    tiers = [priority_tier(priority_score(i.get("report_nm", ""))) for i in new_candidates]
+    if new_candidates:
+        logger.info(
+            f"  [{date_label}] 우선순위: "
+            + " / ".join(f"tier{t} {tiers.count(t)}건" for t in sorted(set(tiers)))
+        )
 
-        content = get_clean_content(rcept_no)
+    # ── 3차: DART ZIP 다운로드(병렬) + DB 저장(배치) ──────────────────────────
+    # executor.map 은 제출 순서대로 결과를 돌려주므로, 앞 건을 버퍼에 쌓는 동안
+    # 뒤 건들의 다운로드가 이미 진행된다. DB 왕복은 건수가 아니라 배치 수에 비례.
+    # QuotaExceeded 등으로 중단돼도 이미 수집한 건은 저장한다.
+    # top 티어가 끝나면 배치가 덜 찼어도 바로 flush → auto_analyst 가 먼저 집어 가도록.
+    own_pool = pool is None
+    if own_pool:
+        pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="dart-fetch")
+    try:
+        contents = pool.map(
+            lambda it: get_clean_content(it.get("rcept_no"), viewer_metrics=viewer_metrics), new_candidates
+        )
+        for idx, (item, content) in enumerate(zip(new_candidates, contents)):
+            rows = _build_rows(item, content)
+            if rows:
+                writer.add(date_label, *rows)
+            if tiers[idx] == TOP_TIER and (idx + 1 == len(tiers) or tiers[idx + 1] != TOP_TIER):
+                writer.flush()
+    finally:
+        writer.flush()
+        if own_pool:
+            pool.shutdown()
 
-        # 임원 변동 2차 필터 (content 필요)
-        if is_executive_noise(report_nm, content):
-            logger.info(f"skip exec noise: {report_nm} / {corp_name_val}")
-            continue
+    return writer.take(date_label)
 
-        payload = {
-            "is_visible":      True,
-            "rcept_no":        rcept_no,
-            "corp_code":       corp_code,
-            "corp_name":       item.get("corp_name"),
-            "stock_code":      stock_code_val,
-            "rcept_dt":        item.get("rcept_dt"),
-            "report_nm":       item.get("report_nm"),
-            "content":         content,
-            "analysis_status": "pending",
-            "created_at":      datetime.now().isoformat(),
-        }
 
-        try:
-            supabase.table("disclosure_insights").upsert(payload, on_conflict="rcept_no").execute()
-            count += 1
-            saved_codes.add(stock_code_val)
-            logger.info(f"[{date_label}][{count}] {corp_name_val} saved")
+def _build_rows(item: dict, content) -> tuple[dict, dict] | None:
+    """
+    본문 수집 결과 1건 → (disclosure_insights 행, disclosure_hashes 행).
+    임원 변동 노이즈면 None (skip).
+    """
+    rcept_no       = item.get("rcept_no")
+    corp_code      = item.get("corp_code", "").strip()
+    report_nm      = item.get("report_nm", "")
+    corp_name_val  = item.get("corp_name", "")
+    stock_code_val = item.get("stock_code", "").strip()
+
+    # 임원 변동 2차 필터 (content 필요)
+    if is_executive_noise(report_nm, content):
+        logger.info(f"skip exec noise: {report_nm} / {corp_name_val}")
+        return None
 
-            # disclosure_hashes 에도 기록 — 다음 실행 시 is_disclosure_processed() 활용
-            try:
-                hash_key = generate_hash_key(corp_code, rcept_no)
-                expires = (datetime.now() + timedelta(days=730)).isoformat()
-                supabase.table("disclosure_hashes").upsert(
-                    {
-                        "hash_key":   hash_key,
-                        "corp_code":  corp_code,
-                        "rcept_no":   rcept_no,
-                        "corp_name":  corp_name_val,
-                        "report_name": report_nm,
-                        "expires_at": expires,
-                        "created_at": datetime.now().isoformat(),
-                    },
-                    on_conflict="hash_key",
-                ).execute()
-            except Exception as hash_err:
-                logger.warning(f"[hash] disclosure_hashes 저장 실패 (무시, disclosure_insights 저장 우선): {hash_err}")
+    now = datetime.now()
+    payload = {
+        "is_visible":      True,
+        "rcept_no":        rcept_no,
+        "corp_code":       corp_code,
+        "corp_name":       item.get("corp_name"),
+        "stock_code":      stock_code_val,
+        "rcept_dt":        item.get("rcept_dt"),
+        "report_nm":       item.get("report_nm"),
+        "content":         content,
+        "analysis_status": "pending",
+        "fetch_priority":  priority_score(report_nm),
+        "created_at":      now.isoformat(),
+    }
+    # disclosure_hashes 에도 기록 — 다음 실행 시 is_disclosure_processed() 활용
+    hash_row = {
+        "hash_key":    generate_hash_key(corp_code, rcept_no),
+        "corp_code":   corp_code,
+        "rcept_no":    rcept_no,
+        "corp_name":   corp_name_val,
+        "report_name": report_nm,
+        "expires_at":  (now + timedelta(days=730)).isoformat(),
+        "created_at":  now.isoformat(),
+    }
+    return payload, hash_row
+
+
+class _SaveBuffer:
+    """
+    disclosure_insights / disclosure_hashes 배치 upsert 버퍼.
 
-        except Exception as e:
-            logger.error(f"DB 저장 실패: {e}")
+    - SAVE_BATCH 건이 모이거나 첫 건 이후 SAVE_FLUSH_SEC 가 지나면 flush
+    - 테이블별 on_conflict upsert 1회 (disclosure_hashes 는 insights 저장 성공 건만)
+    - 배치가 실패하면 해당 배치만 1건씩 재시도 → 문제 행만 실패 처리
+    - disclosure_hashes 실패는 기존과 같이 경고만 (disclosure_insights 저장 우선)
+
+    backfill 병렬 모드에서 여러 날짜가 한 버퍼를 공유하므로 스레드 안전하며
+    (flush 는 한 번에 하나 — 단일 DB writer), 결과는 날짜별로 집계한다.
+    begin(날짜) → add(날짜, ...) → flush() → take(날짜) = (저장 건수, stock_code 집합, 저장 실패 rcept_no 집합)
+    """
+
+    def __init__(self, batch_size: int = SAVE_BATCH):
+        self.batch_size = max(1, batch_size)
+        self._lock   = threading.RLock()
+        self._rows:   list[tuple[str, dict, dict]] = []   # (날짜, insights 행, hashes 행)
+        self._results: dict[str, dict] = {}
+        self._first_at = 0.0
+
+    def begin(self, date_label: str) -> None:
+        with self._lock:
+            self._results[date_label] = {
+                "count": 0, "codes": set(), "failed": set(), "started": time.monotonic(),
+            }
+
+    def add(self, date_label: str, payload: dict, hash_row: dict) -> None:
+        with self._lock:
+            if not self._rows:
+                self._first_at = time.monotonic()
+            self._rows.append((date_label, payload, hash_row))
+            if len(self._rows) >= self.batch_size or time.monotonic() - self._first_at >= SAVE_FLUSH_SEC:
+                self.flush()
+
+    def take(self, date_label: str) -> tuple[int, set[str], set[str]]:
+        with self._lock:
+            res = self._results.pop(date_label)
+        return res["count"], res["codes"], res["failed"]
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._rows:
+                self._flush()
+
+    def _flush(self) -> None:
+        batch, self._rows = self._rows, []
+        rows   = [p for _, p, _ in batch]
+        hashes = [h for _, _, h in batch]
+
+        ok_rcept = _upsert_rows("disclosure_insights", rows, "rcept_no")
+        for date_label, r, _ in batch:
+            res = self._results[date_label]
+            if r["rcept_no"] not in ok_rcept:
+                res["failed"].add(r["rcept_no"])
+                continue
+            res["count"] += 1
+            res["codes"].add(r["stock_code"])
+            _crawl_latency.setdefault(priority_tier(r["fetch_priority"]), []).append(
+                time.monotonic() - res["started"]
+            )
+            logger.info(f"[{date_label}][{res['count']}] {r['corp_name']} saved")
 
-    return count, saved_codes
+        hashes = [h for h in hashes if h["rcept_no"] in ok_rcept]
+        if hashes:
+            ok_hash = _upsert_rows("disclosure_hashes", hashes, "hash_key", level=logging.WARNING)
+            if len(ok_hash) < len(hashes):
+                logger.warning(
+                    f"[hash] disclosure_hashes 저장 실패 {len(hashes) - len(ok_hash)}건 "
+                    f"(무시, disclosure_insights 저장 우선)"
+                )
 
 
-def _check_viewer_fail_rate(fail_threshold: float = 0.5):
+def _upsert_rows(table: str, rows: list[dict], conflict: str, level: int = logging.ERROR) -> set[str]:
     """
-    뷰어 폴백 실패율이 threshold 초과 시 Telegram 경고.
-    - 실패율 = _viewer_fail_count / _viewer_try_count
-    - _viewer_try_count < 5 이면 샘플 부족으로 판단 보류
+    rows 를 on_conflict upsert 1회로 저장. 실패 시 1건씩 재시도.
+    반환: 저장 성공한 행의 conflict 키 집합
     """
-    if _viewer_try_count < 5:
+    try:
+        supabase.table(table).upsert(rows, on_conflict=conflict).execute()
+        return {r[conflict] for r in rows}
+    except Exception as e:
+        if len(rows) == 1:
+            logger.log(level, f"DB 저장 실패 [{table}] {rows[0][conflict]}: {e}")
+            return set()
+        logger.warning(f"[{table}] 배치 upsert 실패 ({len(rows)}건) → 1건씩 재시도: {e}")
+
+    ok: set[str] = set()
+    for r in rows:
+        try:
+            supabase.table(table).upsert(r, on_conflict=conflict).execute()
+            ok.add(r[conflict])
+        except Exception as e:
+            logger.log(level, f"DB 저장 실패 [{table}] {r[conflict]}: {e}")
+    return ok
+
+
+def _check_viewer_fail_rate(metrics: ViewerMetrics, fail_threshold: float = 0.5):
+    """
+    뷰어 폴백 실행 집계 로그 + 실패율이 threshold 초과 시 Telegram 경고.
+    - 실패율 = fail / tries (dcmNo·텍스트 모두 못 얻은 건)
+    - tries < 5 이면 샘플 부족으로 판단 보류
+    """
+    snap = metrics.snapshot()
+    if snap["tries"]:
+        logger.info("[viewer] " + " ".join(f"{k}={v}" for k, v in snap.items()))
+    if snap["tries"] < 5:
         return  # 시도 건수 적으면 무시
 
-    fail_rate = _viewer_fail_count / _viewer_try_count
+    fail_rate = metrics.fail_rate
     logger.info(
-        f"[뷰어 폴백] 시도={_viewer_try_count}건 "
-        f"실패={_viewer_fail_count}건 ({fail_rate*100:.0f}%)"
+        f"[뷰어 폴백] 시도={snap['tries']}건 "
+        f"실패={snap['fail']}건 ({fail_rate*100:.0f}%)"
     )
 
     if fail_rate < fail_threshold:
@@ -613,7 +938,7 @@ def _check_viewer_fail_rate(fail_threshold: float = 0.5):
 
     msg = (
         f"⚠️ *DART 뷰어 폴백 실패율 급등*\n"
-        f"시도 {_viewer_try_count}건 중 {_viewer_fail_count}건 실패 "
+        f"시도 {snap['tries']}건 중 {snap['fail']}건 실패 "
         f"({fail_rate*100:.0f}%)\n"
         f"DART 서버 일시 장애 또는 IP 차단 가능성\n"
         f"GitHub Actions 로그의 `snippet=` 확인 필요"
@@ -632,13 +957,134 @@ def _check_viewer_fail_rate(fail_threshold: float = 0.5):
         logger.warning(f"[뷰어 폴백 경고] Telegram 예외: {e}")
 
 
-def run_crawler(start_date: str | None = None, end_date: str | None = None):
+def _fetch_day_items(dart_key: str, ds: str, full: bool) -> tuple[list[dict], dict | None]:
+    """
+    하루치 처리 대상 공시 조회.
+    반환: (공시 목록, 워터마크 기준 {"mark", "total", "prev_total"} — 조회가 중간에 끊기면 None)
+    """
+    wm = None if full else _load_watermark(ds)
+    if wm:
+        items, total, complete = _fetch_changed_dart_items(dart_key, ds, wm)
+        prev_total = int(wm.get("total_count") or 0)
+        if items or not complete:
+            logger.info(f"  {ds} 목록 변경 (total {prev_total} → {total}) → 재조회 {len(items)}건")
+        base = {
+            "mark":       wm.get("max_rcept_no") or "",
+            "total":      total,
+            "prev_total": prev_total,
+        }
+        return items, base if complete else None
+
+    items, complete = _fetch_all_dart_items(dart_key, ds, ds)
+    return items, {"mark": "", "total": len(items), "prev_total": 0} if complete else None
+
+
+def _crawl_day(
+    dart_key: str,
+    ds: str,
+    full: bool,
+    workers: int,
+    writer: "_SaveBuffer | None" = None,
+    pool: ThreadPoolExecutor | None = None,
+    seen: set[str] | None = None,
+    viewer_metrics: ViewerMetrics | None = None,
+) -> tuple[int, set[str]]:
+    """
+    하루치 수집 → 저장 → 워터마크(체크포인트) 갱신. 반환: (저장 건수, 저장된 stock_code 집합)
+    QuotaExceeded 는 호출자로 전달 (워터마크 미갱신 → 다음 실행에서 이어서 처리).
+    """
+    items, base = _fetch_day_items(dart_key, ds, full)
+    if not items:
+        logger.info(f"  {ds} 신규 데이터 없음 (공휴일 또는 무공시)")
+        if base:
+            _save_watermark(ds, base["mark"], base["total"], completed=True)
+        return 0, set()
+
+    logger.info(f"  {ds} API 응답: {len(items)}건")
+    saved, codes, failed = _process_items(
+        items, ds, workers=workers, writer=writer, pool=pool, seen=seen, viewer_metrics=viewer_metrics,
+    )
+    logger.info(f"  {ds} 저장: {saved}건" + (f" (실패 {len(failed)}건)" if failed else ""))
+
+    # 목록을 끝까지 받은 경우에만 워터마크 갱신.
+    # 저장 실패 건이 있으면 completed=false → 다음 실행이 total_count 와 무관하게 전체를 다시 읽는다.
+    if base:
+        mark = _max_saved_rcept_no(base["mark"], items, failed)
+        _save_watermark(ds, mark, base["total"], completed=not failed)
+    return saved, codes
+
+
+def _crawl_days_parallel(
+    dart_key: str,
+    day_strs: list[str],
+    full: bool,
+    workers: int,
+    day_workers: int,
+    viewer_metrics: ViewerMetrics,
+) -> tuple[int, set[str]]:
+    """
+    backfill 병렬 모드: 날짜를 day_workers 개 스레드에 나눠 동시에 처리.
+
+    공유 자원
+      - DART 요청 속도: _dart_limiter (프로세스 간 공용 토큰 버킷 + 일일 쿼터)
+      - 본문 수집 스레드: workers 개 한 풀 → 날짜 수와 무관하게 동시 다운로드 수 고정
+      - DB 저장: _SaveBuffer 하나 (SAVE_BATCH 단위 배치, flush 는 한 번에 하나)
+      - 중복 제거: 이번 실행에서 맡은 rcept_no 집합 (정정 공시 등 날짜 경계 중복 방지)
+    날짜별 워터마크가 체크포인트 — QuotaExceeded 면 남은 날짜는 시작하지 않고,
+    진행 중이던 날짜는 completed=false 로 남아 다음 실행에서 이어서 처리된다.
+    """
+    writer = _SaveBuffer()
+    seen: set[str] = set()
+    stop = threading.Event()
+
+    def crawl(ds: str) -> tuple[int, set[str]]:
+        if stop.is_set():
+            return 0, set()
+        logger.info(f"[{threading.current_thread().name}] {ds} 수집 중...")
+        try:
+            return _crawl_day(
+                dart_key, ds, full, workers,
+                writer=writer, pool=fetch_pool, seen=seen, viewer_metrics=viewer_metrics,
+            )
+        except QuotaExceeded as e:
+            stop.set()
+            logger.error(f"  {ds} 중단: {e}")
+        except Exception as e:
+            # 한 날짜 실패가 다른 날짜를 막지 않도록 — 체크포인트가 없으니 다음 실행에서 재시도
+            logger.error(f"  {ds} 처리 실패 (다음 실행에서 재시도): {e}")
+        return 0, set()
+
+    total_saved = 0
+    all_codes: set[str] = set()
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="dart-fetch") as fetch_pool, \
+            ThreadPoolExecutor(max_workers=day_workers, thread_name_prefix="dart-day") as day_pool:
+        for saved, codes in day_pool.map(crawl, day_strs):
+            total_saved += saved
+            all_codes |= codes
+    return total_saved, all_codes
+
+
+def run_crawler(
+    start_date: str | None = None,
+    end_date: str | None = None,
+    workers: int = FETCH_WORKERS,
+    full: bool = False,
+    day_workers: int = 1,
+):
     """
     DART 공시 수집.
 
     start_date / end_date : YYYYMMDD 문자열.
       - 둘 다 None  → 오늘 하루만 수집 (기존 동작)
       - 범위 지정   → start ~ end 를 하루씩 루프 (backfill 용)
+    workers : 본문 동시 수집 스레드 수 (요청 속도는 공용 제한기 DART_RATE_PER_SEC 로 별도 제한)
+    full    : True 면 워터마크를 무시하고 당일 목록 전체를 다시 조회
+              (기본은 dart_list_watermarks 기준 증분 조회 — 신규 없으면 API 1회)
+    day_workers : 범위 수집 시 동시에 처리할 날짜 수 (기본 1 = 순차, _crawl_days_parallel 참고)
+
+    범위 수집은 재개 가능: 목록을 끝까지 받고 저장 실패가 없던 날짜는 워터마크에
+    completed 로 기록되고, 다음 실행에서 CHECKPOINT_SETTLE_DAYS 일 이전 날짜는 건너뛴다
+    (full=True 면 전부 다시 처리).
 
     날짜별 루프를 쓰는 이유:
       DART list API의 bgnde~endde 범위가 넓을수록 누락이 발생할 수 있어
@@ -658,6 +1104,9 @@ def run_crawler(start_date: str | None = None, end_date: str | None = None):
         d_start = today
         d_end   = today
 
+    # 당일 수집은 live, 과거 구간은 backfill — 동시 실행 시 당일 수집이 토큰을 먼저 가져간다
+    _dart_limiter.priority = "live" if d_start == d_end == datetime.now().date() else "backfill"
+
     # 순회할 영업일 목록 (주말 제외 — 공휴일은 API가 빈 결과로 자연 처리)
     days: list[date_type] = []
     d = d_start
@@ -666,32 +1115,63 @@ def run_crawler(start_date: str | None = None, end_date: str | None = None):
             days.append(d)
         d += timedelta(days=1)
 
-    logger.info(f"DART 수집 시작: {d_start} ~ {d_end} ({len(days)}일)")
+    day_strs = [d.strftime("%Y%m%d") for d in days]
 
-    total_saved  = 0
-    all_saved_codes: set[str] = set()
-
-    for idx, day in enumerate(days, 1):
-        ds = day.strftime("%Y%m%d")
-        logger.info(f"[{idx}/{len(days)}] {ds} 수집 중...")
+    # 체크포인트: 이미 끝난 지난 날짜 skip (최근 날짜는 지연 공시가 붙을 수 있어 항상 재확인)
+    if len(day_strs) > 1 and not full:
+        settled = (datetime.now().date() - timedelta(days=CHECKPOINT_SETTLE_DAYS)).strftime("%Y%m%d")
+        done = _load_completed_days(day_strs[0], day_strs[-1])
+        skipped = [ds for ds in day_strs if ds in done and ds <= settled]
+        if skipped:
+            day_strs = [ds for ds in day_strs if ds not in skipped]
+            logger.info(f"[checkpoint] 완료된 {len(skipped)}일 skip ({skipped[0]} ~ {skipped[-1]})")
 
-        items = _fetch_all_dart_items(dart_key, ds, ds)
-        if not items:
-            logger.info(f"  {ds} 데이터 없음 (공휴일 또는 무공시)")
-            continue
+    parallel = day_workers > 1 and len(day_strs) > 1
+    logger.info(
+        f"DART 수집 시작: {d_start} ~ {d_end} ({len(day_strs)}일, "
+        f"workers={workers}{f', day_workers={day_workers}' if parallel else ''}, "
+        f"{_dart_limiter.rate:.1f} req/s 공유, {_dart_limiter.priority})"
+    )
 
-        logger.info(f"  {ds} API 응답: {len(items)}건")
-        saved, codes = _process_items(items, ds)
-        total_saved += saved
-        all_saved_codes |= codes
-        logger.info(f"  {ds} 저장: {saved}건")
+    total_saved  = 0
+    all_saved_codes: set[str] = set()
+    viewer_metrics = ViewerMetrics()
 
-        time.sleep(1.0)  # 날짜 간 DART API 부하 방지
+    if parallel:
+        total_saved, all_saved_codes = _crawl_days_parallel(
+            dart_key, day_strs, full, workers, day_workers, viewer_metrics,
+        )
+    else:
+        for idx, ds in enumerate(day_strs, 1):
+            logger.info(f"[{idx}/{len(day_strs)}] {ds} 수집 중...")
+            try:
+                saved, codes = _crawl_day(dart_key, ds, full, workers, viewer_metrics=viewer_metrics)
+            except QuotaExceeded as e:
+                # 워터마크는 갱신하지 않음 → 다음 실행에서 이어서 처리
+                logger.error(f"  {ds} 중단: {e}")
+                break
+            total_saved += saved
+            all_saved_codes |= codes
 
     logger.info(f"[DONE] 총 저장: {total_saved}건 / 종목: {len(all_saved_codes)}개")
+    for tier in sorted(_crawl_latency):
+        vals = sorted(_crawl_latency[tier])
+        label = "TOP" if tier == TOP_TIER else f"tier {tier}"
+        logger.info(
+            f"[latency][{label}] 목록 조회→DB 저장 {len(vals)}건: "
+            f"p50 {vals[len(vals) // 2]:.1f}초 / 최대 {vals[-1]:.1f}초"
+        )
 
     # ── 뷰어 폴백 실패율 체크 → Telegram 경고 ────────────────────────────────
-    _check_viewer_fail_rate()
+    _check_viewer_fail_rate(viewer_metrics)
+
+    doc_cache = get_doc_cache()
+    if doc_cache is not None:
+        st = doc_cache.stats()
+        logger.info(
+            f"[doc-cache] hit={st['hit']} miss={st['miss']} put={st['put']} "
+            f"evicted={st['evicted']} / {st['keys']}키 {st['bytes'] / 1e6:.0f}MB"
+        )
 
     # 캐시 무효화 (신규 공시 저장된 경우)
     if all_saved_codes:
@@ -707,6 +1187,15 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="DART 공시 수집")
     parser.add_argument("--start", help="시작일 YYYYMMDD (기본: 오늘)")
     parser.add_argument("--end",   help="종료일 YYYYMMDD (기본: 오늘)")
+    parser.add_argument("--workers", type=int, default=FETCH_WORKERS,
+                        help=f"본문 동시 수집 스레드 수 (기본: {FETCH_WORKERS}, 1 = 순차)")
+    parser.add_argument("--full", action="store_true",
+                        help="워터마크 무시, 날짜별 목록 전체 재조회 (완료 체크포인트도 무시)")
+    parser.add_argument("--day-workers", dest="day_workers", type=int, default=1,
+                        help="범위 수집 시 동시에 처리할 날짜 수 (기본: 1 = 순차)")
     args = parser.parse_args()
 
-    run_crawler(start_date=args.start, end_date=args.end)
+    run_crawler(
+        start_date=args.start, end_date=args.end, workers=args.workers,
+        full=args.full, day_workers=args.day_workers,
+    )
@@ -0,0 +1,228 @@
+"""
+scripts/dart_doc_cache.py
+=========================
+DART 원문(document.xml ZIP / 웹 뷰어 HTML) 로컬 디스크 캐시.
+
+재수집(dart_crawler.py), refetch_empty_content.py, 파서 변경 후 재처리 때마다
+같은 ZIP·뷰어 페이지를 DART 에서 다시 내려받던 것을 디스크에서 재사용합니다.
+
+구조:
+  <dir>/index.db          SQLite 인덱스  key → sha256, 크기, 마지막 접근 시각
+  <dir>/blobs/ab/<sha>.z  zlib 압축 본문 (content-addressed: 같은 내용은 1개만 저장)
+
+키 규칙:
+  zip:<rcept_no>                    document.xml ZIP 원본 바이트
+  viewer:<rcept_no>                 뷰어 메인 페이지 HTML (dcmNo 추출용)
+  viewer:<rcept_no>:<dcm_no>        뷰어 본문 HTML
+  text:<parser>:<raw_sha256>        정제 텍스트 (원문 해시 + 파서 버전)
+                                    → 파서 버전이 바뀌면 miss 되어 디스크 원문에서 재파싱
+
+용량 관리:
+  압축 후 총 크기가 max_bytes 를 넘으면 마지막 접근이 오래된 키부터 삭제 (LRU).
+  참조하는 키가 없어진 blob 파일도 함께 삭제합니다.
+
+환경변수:
+  DART_DOC_CACHE_DIR   캐시 디렉터리   (기본 scripts/data/dart_cache)
+  DART_DOC_CACHE_MB    최대 용량 MB    (기본 2048, 0 이면 캐시 비활성화)
+
+사용 예시:
+  from scripts.dart_doc_cache import get_doc_cache
+
+  cache = get_doc_cache()
+  raw = cache.get(f"zip:{rcept_no}") if cache else None
+  if raw is None:
+      raw = download(...)
+      if cache:
+          cache.put(f"zip:{rcept_no}", raw)
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DIR = Path(__file__).resolve().parent / "data" / "dart_cache"
+EVICT_EVERY = 50     # put N회마다 용량 확인
+TOUCH_EVERY = 60.0   # 접근 시각 갱신 최소 간격 (초) — 읽기마다 write 하지 않도록
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def text_key(parser: str, raw: bytes | str) -> str:
+    """정제 텍스트 캐시 키: 원문 해시 + 파서 버전."""
+    if isinstance(raw, str):
+        raw = raw.encode("utf-8", errors="ignore")
+    return f"text:{parser}:{_sha256(raw)}"
+
+
+class DocCache:
+    """content-addressed + LRU 디스크 캐시 (스레드 안전)."""
+
+    def __init__(self, directory: str | Path, max_bytes: int):
+        self.dir = Path(directory)
+        self.blob_dir = self.dir / "blobs"
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._puts = 0
+        self._stats = {"hit": 0, "miss": 0, "put": 0, "evicted": 0}
+        self._conn = sqlite3.connect(
+            str(self.dir / "index.db"), timeout=10.0, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS docs ("
+            " key TEXT PRIMARY KEY, sha TEXT NOT NULL, size INTEGER NOT NULL, accessed_at REAL NOT NULL"
+            ") WITHOUT ROWID"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_docs_accessed ON docs (accessed_at)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_docs_sha ON docs (sha)")
+
+    def _blob_path(self, sha: str) -> Path:
+        return self.blob_dir / sha[:2] / f"{sha}.z"
+
+    # ── 조회 / 저장 ───────────────────────────────────────────────────────────
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT sha, accessed_at FROM docs WHERE key = ?", (key,)
+            ).fetchone()
+        if not row:
+            self._stats["miss"] += 1
+            return None
+
+        sha, accessed_at = row
+        try:
+            data = zlib.decompress(self._blob_path(sha).read_bytes())
+        except (OSError, zlib.error):
+            # blob 유실/손상 → 인덱스 정리 후 miss 처리
+            with self._lock:
+                self._conn.execute("DELETE FROM docs WHERE key = ?", (key,))
+            self._stats["miss"] += 1
+            return None
+
+        now = time.time()
+        if now - accessed_at > TOUCH_EVERY:
+            with self._lock:
+                self._conn.execute("UPDATE docs SET accessed_at = ? WHERE key = ?", (now, key))
+        self._stats["hit"] += 1
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        sha = _sha256(data)
+        path = self._blob_path(sha)
+        if not path.exists():
+            path.parent.mkdir(exist_ok=True)
+            packed = zlib.compress(data, 6)
+            tmp = path.with_suffix(f".tmp{threading.get_ident()}")
+            tmp.write_bytes(packed)
+            os.replace(tmp, path)
+            size = len(packed)
+        else:
+            size = path.stat().st_size
+
+        with self._lock:
+            old = self._conn.execute("SELECT sha FROM docs WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO docs (key, sha, size, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, sha, size, time.time()),
+            )
+            if old and old[0] != sha:
+                self._drop_blob_if_unreferenced(old[0])
+            self._puts += 1
+            self._stats["put"] += 1
+            if self._puts % EVICT_EVERY == 0:
+                self._evict()
+
+    def get_text(self, parser: str, raw: bytes | str, clean_fn: Callable[[], str]) -> str:
+        """정제 텍스트 캐시: hit 이면 반환, miss 면 clean_fn() 결과를 저장 후 반환."""
+        key = text_key(parser, raw)
+        cached = self.get(key)
+        if cached is not None:
+            return cached.decode("utf-8")
+        text = clean_fn()
+        if text:
+            self.put(key, text.encode("utf-8"))
+        return text
+
+    # ── 용량 관리 (LRU) ───────────────────────────────────────────────────────
+
+    def _drop_blob_if_unreferenced(self, sha: str) -> None:
+        if not self._conn.execute("SELECT 1 FROM docs WHERE sha = ? LIMIT 1", (sha,)).fetchone():
+            try:
+                self._blob_path(sha).unlink()
+            except OSError:
+                pass
+
+    def _evict(self) -> None:
+        """self._lock 보유 상태에서 호출. 총 크기(blob 중복 제외)가 max_bytes 이하가 될 때까지 삭제."""
+        total = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM (SELECT sha, MAX(size) AS size FROM docs GROUP BY sha)"
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        target = int(self.max_bytes * 0.9)   # 매번 경계에서 반복 evict 하지 않도록 10% 여유
+        rows = self._conn.execute("SELECT key, sha, size FROM docs ORDER BY accessed_at").fetchall()
+        for key, sha, size in rows:
+            if total <= target:
+                break
+            self._conn.execute("DELETE FROM docs WHERE key = ?", (key,))
+            if not self._conn.execute("SELECT 1 FROM docs WHERE sha = ? LIMIT 1", (sha,)).fetchone():
+                try:
+                    self._blob_path(sha).unlink()
+                except OSError:
+                    pass
+                total -= size
+            self._stats["evicted"] += 1
+        logger.info(f"[doc-cache] LRU 정리: {self._stats['evicted']}개 키 삭제 (현재 {total / 1e6:.0f}MB)")
+
+    def stats(self) -> dict:
+        with self._lock:
+            keys, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM docs"
+            ).fetchone()
+        return {**self._stats, "keys": keys, "bytes": size}
+
+
+# ── 싱글톤 (lazy init, 1회만 시도) ────────────────────────────────────────────
+
+_cache: Optional[DocCache] = None
+_cache_initialized: bool = False
+
+
+def get_doc_cache() -> Optional[DocCache]:
+    """
+    디스크 캐시 인스턴스 반환.
+    - DART_DOC_CACHE_MB=0 → None (비활성화)
+    - 열기 실패           → None (네트워크만 사용)
+    """
+    global _cache, _cache_initialized
+    if _cache_initialized:
+        return _cache
+
+    _cache_initialized = True
+    try:
+        max_mb = float(os.environ.get("DART_DOC_CACHE_MB", 2048))
+    except ValueError:
+        max_mb = 2048
+    if max_mb <= 0:
+        return None
+
+    directory = os.environ.get("DART_DOC_CACHE_DIR") or str(DEFAULT_DIR)
+    try:
+        _cache = DocCache(directory, int(max_mb * 1024 * 1024))
+        logger.info(f"[doc-cache] 사용: {directory} (최대 {max_mb:.0f}MB)")
+    except Exception as e:
+        logger.warning(f"[doc-cache] 열기 실패 ({e}) → 캐시 없이 진행")
+    return _cache
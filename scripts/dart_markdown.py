@@ -0,0 +1,239 @@
+"""
+scripts/dart_markdown.py
+========================
+DART 원문(document.xml / 웹 뷰어 HTML) → 투자 분석용 마크다운 변환.
+
+기존 _clean_html_text 는 문서 전체에 정규식을 10회 가량 돌리고
+<table>/<tr>/<td> 마다 중첩 findall 을 실행해, 수 MB 짜리 사업보고서에서 느렸습니다.
+여기서는 문서를 앞에서부터 한 번만 훑으며 같은 결과를 만듭니다.
+
+  - 구조 태그(script/style/head, table, h1~h3, br, </p>)만 순서대로 찾아 상태 전이
+  - 그 사이 구간의 일반 태그는 구간 단위로 한 번에 공백 치환 (태그마다 Python 루프 없음)
+  - script/style/head 블록·테이블·제목은 닫는 태그 위치로 바로 건너뜀 (재스캔 없음)
+  - 테이블은 해당 구간 안에서만 행/셀 변환
+  - 공백 정리 2회만 (변환 결과 문자열에 대해 — 원문보다 훨씬 작음)
+
+출력 규칙 (기존 _clean_html_text 와 동일):
+  script/style/head   블록 통째 제거
+  table               셀(td/th)마다 태그 제거·공백 정리 → "| a | b |" 행, 빈 셀/빈 행 생략
+  h1~h3               "\\n## 제목\\n"
+  <br> / </p>         줄바꿈
+  기타 태그           공백 1칸
+  null 바이트 제거, 연속 공백/탭 → 1칸, 3줄 이상 빈 줄 → 2줄
+
+입력은 정상 마크업(본문 텍스트의 '<' 가 &lt; 로 이스케이프됨)을 가정합니다.
+DART document.xml 은 XML 이므로 항상 만족합니다.
+golden 출력 검증 + 처리량 측정: scripts/bench_dart_markdown.py
+
+공개 API:
+  html_to_markdown(raw_html) -> str
+  extract_key_sections(text) -> str
+  PARSER_VERSION             변환 결과가 바뀌면 올릴 것 (dart_doc_cache 텍스트 캐시 키)
+"""
+
+import re
+
+PARSER_VERSION = "md-stream-1"
+
+_TAG = re.compile(r"<[^>]+>")
+
+# 본문(테이블·제목 밖)에서 의미 있는 태그 — 나머지 태그는 구간 단위로 공백 치환
+_MAIN_TAG = re.compile(r"<(?:(script|style|head)|(table)|(h[1-3])|br\s*/?>|/p>)", re.IGNORECASE)
+# 제목 안: 닫는 태그 / 건너뛸 블록 / 테이블
+_HEAD_TAG = re.compile(r"<(?:(/h[1-3]>)|(script|style|head)|(table))", re.IGNORECASE)
+# 테이블 끝 탐색: </table> / 건너뛸 블록
+_TABLE_END = re.compile(r"<(?:(/table>)|(script|style|head))", re.IGNORECASE)
+
+_SKIP_END = {
+    "script": re.compile(r"</script>", re.IGNORECASE),
+    "style":  re.compile(r"</style>", re.IGNORECASE),
+    "head":   re.compile(r"</head>", re.IGNORECASE),
+}
+_SKIP_BLOCK = re.compile(r"<(script|style|head)[^>]*>.*?</\1>", re.DOTALL | re.IGNORECASE)
+_ROW        = re.compile(r"<tr[^>]*>(.*?)</tr>", re.DOTALL | re.IGNORECASE)
+_CELL       = re.compile(r"<t[dh][^>]*>(.*?)</t[dh]>", re.DOTALL | re.IGNORECASE)
+_SPACES     = re.compile(r"[ \t]+")
+_BLANKS     = re.compile(r"\n{3,}")
+
+
+def _untag(segment: str, repl: str) -> str:
+    # 태그 없는 구간은 정규식 호출 생략
+    return _TAG.sub(repl, segment) if "<" in segment else segment
+
+
+def _skip_block(text: str, m: re.Match, name: str) -> int:
+    """
+    script/style/head 여는 태그(m 위치) → 닫는 태그 끝 위치.
+    여는 태그가 닫히지 않았거나 닫는 태그가 없으면 -1 (일반 태그로 취급).
+    """
+    gt = text.find(">", m.end())
+    if gt < 0:
+        return -1
+    close = _SKIP_END[name.lower()].search(text, gt + 1)
+    return close.end() if close else -1
+
+
+def _table(text: str, pos: int) -> tuple[str, int] | None:
+    """
+    <table 태그 시작 위치 → (마크다운 행 문자열, </table> 끝 위치).
+    </table> 이 없으면 None (일반 태그로 취급).
+    """
+    scan = pos
+    has_block = False
+    while True:
+        m = _TABLE_END.search(text, scan)
+        if not m:
+            return None
+        if m.group(1):
+            break
+        skip = _skip_block(text, m, m.group(2))
+        if skip >= 0:
+            has_block = True
+            scan = skip
+        else:
+            scan = m.end()
+
+    end = m.end()
+    region = text[pos:end]
+    if has_block:
+        region = _SKIP_BLOCK.sub("", region)
+
+    rows = []
+    for row in _ROW.findall(region):
+        cells = []
+        for c in _CELL.findall(row):
+            if "<" in c:
+                c = _TAG.sub("", c)
+            c = " ".join(c.split())
+            if c:
+                cells.append(c)
+        if cells:
+            rows.append("| " + " | ".join(cells) + " |")
+    return "\n".join(rows), end
+
+
+def _heading(text: str, pos: int) -> tuple[str, int] | None:
+    """
+    <h1~3> 여는 태그 끝 위치 → (제목 텍스트, </h1~3> 끝 위치).
+    내부 태그는 공백 없이 제거, 테이블은 마크다운으로 변환된 채 포함.
+    닫는 태그가 없으면 None (일반 태그로 취급).
+    """
+    parts: list[str] = []
+    while True:
+        m = _HEAD_TAG.search(text, pos)
+        if not m:
+            return None
+        parts.append(_untag(text[pos:m.start()], ""))
+        if m.group(1):
+            return "".join(parts), m.end()
+        if m.group(2):
+            skip = _skip_block(text, m, m.group(2))
+            if skip >= 0:
+                pos = skip
+                continue
+        else:
+            table = _table(text, m.start())
+            if table:
+                parts.append("\n" + table[0] + "\n")
+                pos = table[1]
+                continue
+        # 닫히지 않은 블록/테이블 → 태그만 제거하고 계속
+        gt = text.find(">", m.end())
+        if gt < 0:
+            parts.append(text[m.start():])
+            return None
+        pos = gt + 1
+
+
+def html_to_markdown(raw_html: str) -> str:
+    """HTML/XML → 마크다운 텍스트 (구조 태그 1회 순회)."""
+    text = raw_html
+    out: list[str] = []
+    pos = 0
+
+    while True:
+        m = _MAIN_TAG.search(text, pos)
+        if not m:
+            out.append(_untag(text[pos:], " "))
+            break
+        out.append(_untag(text[pos:m.start()], " "))
+        block, table, heading = m.group(1), m.group(2), m.group(3)
+
+        if block:
+            skip = _skip_block(text, m, block)
+            if skip >= 0:
+                pos = skip
+                continue
+        elif table:
+            converted = _table(text, m.start())
+            if converted:
+                out.append("\n" + converted[0] + "\n")
+                pos = converted[1]
+                continue
+        elif heading:
+            gt = text.find(">", m.end())
+            found = _heading(text, gt + 1) if gt >= 0 else None
+            if found:
+                out.append("\n## " + found[0].strip() + "\n")
+                pos = found[1]
+                continue
+        else:
+            # <br> / </p>
+            out.append("\n")
+            pos = m.end()
+            continue
+
+        # 닫히지 않은 블록/테이블/제목 → 일반 태그와 같이 공백 1칸
+        gt = text.find(">", m.end())
+        if gt < 0:
+            out.append(text[m.start():])
+            break
+        out.append(" ")
+        pos = gt + 1
+
+    clean = "".join(out).replace("\x00", "")
+    clean = _SPACES.sub(" ", clean)
+    clean = _BLANKS.sub("\n\n", clean)
+    return clean.strip()
+
+
+# ── 핵심 섹션 추출 (truncate 대신 사용) ──────────────────────────────────────
+
+_IMPORTANT_KEYWORDS = [
+    "매출", "영업이익", "당기순이익", "순이익",
+    "계약", "금액", "발행", "증자", "취득", "처분",
+    "손실", "감소", "증가", "%", "억원", "백만원", "KRW",
+    "보증", "채무", "주식수", "주당", "전환가",
+    "수주", "납품", "공급", "투자", "배당", "자본금",
+]
+_KEYWORD_RE = re.compile("|".join(re.escape(k) for k in _IMPORTANT_KEYWORDS))
+
+MAX_KEY_LINES   = 300    # 추출 줄 수 상한 — 채우면 즉시 종료
+FALLBACK_CHARS  = 6000   # 추출 결과가 너무 짧을 때 원문 앞부분 길이
+
+
+def extract_key_sections(text: str) -> str:
+    """
+    키워드 포함 줄 + 마크다운 테이블/헤딩만 추출 (truncate 금지).
+    MAX_KEY_LINES 줄을 모으면 나머지 문서는 읽지 않고 종료.
+    """
+    if not text:
+        return text
+    filtered: list[str] = []
+    pos = 0
+    n = len(text)
+    while pos <= n and len(filtered) < MAX_KEY_LINES:
+        nl = text.find("\n", pos)
+        if nl < 0:
+            nl = n
+        stripped = text[pos:nl].strip()
+        pos = nl + 1
+        if not stripped:
+            continue
+        if stripped[0] == "|" or stripped.startswith("##") or _KEYWORD_RE.search(stripped):
+            filtered.append(stripped)
+    result = "\n".join(filtered)
+    # 키워드 매칭 결과가 너무 적으면 원본 앞부분 fallback
+    if len(result) < 200 and len(text) > 200:
+        return text[:FALLBACK_CHARS]
+    return result
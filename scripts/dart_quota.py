@@ -0,0 +1,477 @@
+"""
+scripts/dart_quota.py
+=====================
+DART Open API 공용 호출 제한기 (프로세스 간 공유) + 일일 쿼터 집계.
+
+dart_crawler.py, industry_classifier(dart_api / dart_db_client), fetch_corp_name_en.py,
+fetch_financials.py 가 각자 sleep 으로 속도를 조절하던 것을 한 곳으로 모읍니다.
+같은 API 키를 쓰는 스크립트가 동시에 돌면 합산 속도가 한도를 넘어 020(요청 제한)과
+일일 쿼터 소진이 발생했고, 혼자 돌 때는 보수적인 sleep 때문에 한도를 다 쓰지 못했습니다.
+
+구조:
+  공유 상태 저장소 2종 — 같은 형태의 상태를 같은 규칙으로 갱신합니다.
+    bucket  토큰 버킷 상태 (tokens, 갱신 시각, 현재 속도, 020 정지 시각)
+    usage   (KST 날짜, 호출자, 우선순위) 별 호출 수
+
+  Redis (KV_URL / REDIS_URL 설정 시 — GitHub Actions 기본)
+    러너가 job 마다 새로 뜨므로 파일로는 job 간 조정이 안 됨 → backend/core/cache.py 와
+    같은 KV 인스턴스에 dart_quota:bucket(hash), dart_quota:usage:<날짜>(hash) 로 저장.
+    acquire()/backoff()/success() 는 Lua 스크립트 1회로 원자적으로 처리.
+    연결 실패·실행 중 Redis 오류 시 SQLite 로 전환 (경고 로그, 그 프로세스만 로컬 제한).
+  SQLite (로컬 개발·KV 미설정 시)
+    파일 1개(기본 scripts/data/dart_quota.db)를 같은 머신의 모든 프로세스가 공유.
+    BEGIN IMMEDIATE 트랜잭션 안에서 토큰을 차감.
+
+  어느 쪽이든 프로세스·스레드 수와 무관하게 합산 속도가 rate 를 넘지 않습니다.
+
+우선순위 (PRIORITIES):
+  live      당일 공시 수집 (dart_crawler 당일 실행)
+  backfill  과거 구간 재수집 (dart_crawler --start/--end)
+  bulk      기업정보·재무제표 일괄 수집
+  - 토큰 확보 조건: live 1개, backfill 2개, bulk 3개 이상 남아 있을 때
+    → 동시에 대기하면 상위 우선순위가 먼저 토큰을 가져가고, 혼자면 전 속도 사용
+  - 일일 쿼터 사용 상한: live 100%, backfill 90%, bulk 80%
+    → 하위 작업이 쿼터를 다 써도 당일 수집 몫은 남음. 상한 도달 시 QuotaExceeded
+
+020(요청 제한) 수신 시 backoff() → 모든 프로세스가 pause 초 정지 + 공유 속도 절반,
+정상 응답 20회마다 success() 로 25%씩 복구 (DART_RATE_PER_SEC 상한).
+
+환경변수:
+  DART_RATE_PER_SEC   전체 합산 초당 요청 수  (기본 5)
+  DART_RATE_BURST     버킷 크기              (기본 3, 최소 3)
+  DART_DAILY_QUOTA    일일 요청 한도          (기본 20000 — OpenDART 키당 한도)
+  KV_URL / REDIS_URL  Redis 공유 저장소      (없으면 SQLite — backend/core/cache.py 와 같은 규칙,
+                      https:// Upstash REST URL 은 REDIS_TOKEN 과 함께 rediss:// 로 변환)
+  DART_QUOTA_DB       SQLite 경로            (기본 scripts/data/dart_quota.db)
+                      열기 실패 시 프로세스 내부 메모리 DB 로 대체 (공유 안 됨, 경고 로그)
+
+사용 예시:
+  from scripts.dart_quota import get_dart_limiter
+
+  limiter = get_dart_limiter("fetch_financials", priority="bulk")
+  limiter.acquire()          # 토큰 확보까지 대기 (쿼터 상한 도달 시 QuotaExceeded)
+  res = requests.get(...)
+
+사용량 확인:
+  python scripts/dart_quota.py            # 오늘 호출자별 사용량
+  python scripts/dart_quota.py --days 7
+"""
+
+import argparse
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+KST = timezone(timedelta(hours=9))
+DEFAULT_DB = Path(__file__).resolve().parent / "data" / "dart_quota.db"
+
+# priority → (토큰 확보 시 남겨 둘 토큰 수, 일일 쿼터 사용 상한 비율)
+PRIORITIES: dict[str, tuple[int, float]] = {
+    "live":     (0, 1.0),
+    "backfill": (1, 0.9),
+    "bulk":     (2, 0.8),
+}
+
+MAX_SLEEP     = 1.0    # 대기 중 상태 재확인 간격 (다른 프로세스의 backoff 반영)
+RECOVER_EVERY = 20     # 연속 성공 N회마다 속도 복구
+KEEP_DAYS     = 30     # usage 보관 일수
+
+REDIS_PREFIX  = "dart_quota"
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def _today() -> str:
+    return datetime.now(KST).strftime("%Y-%m-%d")
+
+
+class QuotaExceeded(Exception):
+    """우선순위별 일일 쿼터 상한 도달."""
+
+
+def _redis_url() -> Optional[str]:
+    """KV_URL → REDIS_URL 순. 구 Upstash REST URL(https://)은 REDIS_TOKEN 으로 rediss:// 변환."""
+    url = os.environ.get("KV_URL") or os.environ.get("REDIS_URL")
+    if url and url.startswith("https://"):
+        token = os.environ.get("REDIS_TOKEN")
+        if not token:
+            logger.warning("[dart-quota] Upstash REST URL이지만 REDIS_TOKEN 없음 → SQLite 사용")
+            return None
+        url = f"rediss://default:{token}@{url.replace('https://', '').rstrip('/')}:6379"
+    return url or None
+
+
+# ── SQLite 저장소 ─────────────────────────────────────────────────────────────
+
+class _SqliteStore:
+    """SQLite 파일 공유 상태 (같은 머신의 프로세스끼리 공유)."""
+
+    errors: tuple = ()
+
+    def __init__(self, path: Path, burst: int, base_rate: float):
+        self.name = str(path)
+        self._base_rate = base_rate
+        self._lock = threading.Lock()
+        self._conn = self._open(path, burst, base_rate)
+
+    def _open(self, path: Path, burst: int, base_rate: float) -> sqlite3.Connection:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(path), timeout=30.0, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+        except sqlite3.Error as e:
+            logger.warning(f"[dart-quota] {path} 열기 실패 ({e}) → 프로세스 내부 제한만 적용")
+            conn = sqlite3.connect(":memory:", isolation_level=None, check_same_thread=False)
+            self.name = ":memory:"
+
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS bucket ("
+            " id INTEGER PRIMARY KEY CHECK (id = 1), tokens REAL NOT NULL, updated REAL NOT NULL,"
+            " rate REAL NOT NULL, paused_until REAL NOT NULL DEFAULT 0, ok_streak INTEGER NOT NULL DEFAULT 0)"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS usage ("
+            " day TEXT NOT NULL, caller TEXT NOT NULL, priority TEXT NOT NULL, calls INTEGER NOT NULL,"
+            " PRIMARY KEY (day, caller, priority)) WITHOUT ROWID"
+        )
+        conn.execute(
+            "INSERT OR IGNORE INTO bucket (id, tokens, updated, rate) VALUES (1, ?, ?, ?)",
+            (float(burst), time.time(), base_rate),
+        )
+        cutoff = (datetime.now(KST) - timedelta(days=KEEP_DAYS)).strftime("%Y-%m-%d")
+        conn.execute("DELETE FROM usage WHERE day < ?", (cutoff,))
+        return conn
+
+    def try_acquire(self, caller: str, priority: str, hold: int, limit: int, burst: int) -> tuple[Optional[float], int]:
+        """(대기 초 — 성공 0, 쿼터 상한이면 None, 오늘 사용량)."""
+        with self._lock:
+            conn = self._conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                day = _today()
+                used = conn.execute("SELECT COALESCE(SUM(calls), 0) FROM usage WHERE day = ?", (day,)).fetchone()[0]
+                if used >= limit:
+                    conn.execute("COMMIT")
+                    return None, used
+
+                tokens, updated, rate, paused_until = conn.execute(
+                    "SELECT tokens, updated, rate, paused_until FROM bucket WHERE id = 1"
+                ).fetchone()
+                now = time.time()
+                if now < paused_until:
+                    conn.execute("UPDATE bucket SET tokens = 0, updated = ? WHERE id = 1", (paused_until,))
+                    conn.execute("COMMIT")
+                    return paused_until - now, used
+
+                tokens = min(burst, tokens + max(0.0, now - updated) * rate)
+                need = 1.0 + hold
+                if tokens < need:
+                    conn.execute("UPDATE bucket SET tokens = ?, updated = ? WHERE id = 1", (tokens, now))
+                    conn.execute("COMMIT")
+                    return (need - tokens) / rate, used
+
+                conn.execute("UPDATE bucket SET tokens = ?, updated = ? WHERE id = 1", (tokens - 1.0, now))
+                conn.execute(
+                    "INSERT INTO usage (day, caller, priority, calls) VALUES (?, ?, ?, 1) "
+                    "ON CONFLICT (day, caller, priority) DO UPDATE SET calls = calls + 1",
+                    (day, caller, priority),
+                )
+                conn.execute("COMMIT")
+                return 0.0, used + 1
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def backoff(self, pause: float, min_rate: float) -> float:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE bucket SET paused_until = MAX(paused_until, ?), tokens = 0, ok_streak = 0,"
+                " rate = MAX(?, rate / 2) WHERE id = 1",
+                (time.time() + pause, min_rate),
+            )
+            return self._conn.execute("SELECT rate FROM bucket WHERE id = 1").fetchone()[0]
+
+    def success(self) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE bucket SET"
+                " rate = CASE WHEN ok_streak + 1 >= ? THEN MIN(?, rate * 1.25) ELSE rate END,"
+                " ok_streak = CASE WHEN ok_streak + 1 >= ? THEN 0 ELSE ok_streak + 1 END"
+                " WHERE id = 1 AND rate < ?",
+                (RECOVER_EVERY, self._base_rate, RECOVER_EVERY, self._base_rate),
+            )
+
+    def state(self) -> tuple[float, float]:
+        """(현재 속도, 020 정지 종료 시각)."""
+        with self._lock:
+            return self._conn.execute("SELECT rate, paused_until FROM bucket WHERE id = 1").fetchone()
+
+    def usage_rows(self, since: str) -> list[tuple[str, str, str, int]]:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT day, caller, priority, calls FROM usage WHERE day >= ? ORDER BY day DESC, calls DESC",
+                (since,),
+            ).fetchall()
+
+
+# ── Redis 저장소 ──────────────────────────────────────────────────────────────
+# 수치는 Lua 에서 정수로 잘리지 않도록 문자열로 저장·반환.
+# 버킷 hash 가 없으면 (tokens=burst, rate=base_rate) 로 시작.
+
+_ACQUIRE_LUA = """
+local used = 0
+for _, v in ipairs(redis.call('HVALS', KEYS[2])) do used = used + tonumber(v) end
+if used >= tonumber(ARGV[3]) then return {'quota', tostring(used)} end
+
+local now, burst = tonumber(ARGV[1]), tonumber(ARGV[4])
+local b = redis.call('HMGET', KEYS[1], 'tokens', 'updated', 'rate', 'paused_until')
+local tokens  = tonumber(b[1]) or burst
+local updated = tonumber(b[2]) or now
+local rate    = tonumber(b[3]) or tonumber(ARGV[5])
+local paused  = tonumber(b[4]) or 0
+if now < paused then
+  redis.call('HSET', KEYS[1], 'tokens', '0', 'updated', tostring(paused), 'rate', tostring(rate))
+  return {'wait', tostring(paused - now), tostring(used)}
+end
+
+tokens = math.min(burst, tokens + math.max(0, now - updated) * rate)
+local need = 1 + tonumber(ARGV[2])
+if tokens < need then
+  redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now), 'rate', tostring(rate))
+  return {'wait', tostring((need - tokens) / rate), tostring(used)}
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens - 1), 'updated', tostring(now), 'rate', tostring(rate))
+redis.call('HINCRBY', KEYS[2], ARGV[6], 1)
+redis.call('EXPIRE', KEYS[2], ARGV[7])
+return {'ok', '0', tostring(used + 1)}
+"""
+
+_BACKOFF_LUA = """
+local b = redis.call('HMGET', KEYS[1], 'rate', 'paused_until')
+local rate   = math.max(tonumber(ARGV[2]), (tonumber(b[1]) or tonumber(ARGV[3])) / 2)
+local paused = math.max(tonumber(b[2]) or 0, tonumber(ARGV[1]))
+redis.call('HSET', KEYS[1], 'rate', tostring(rate), 'paused_until', tostring(paused), 'tokens', '0', 'ok_streak', '0')
+return tostring(rate)
+"""
+
+_SUCCESS_LUA = """
+local b = redis.call('HMGET', KEYS[1], 'rate', 'ok_streak')
+local base = tonumber(ARGV[2])
+local rate = tonumber(b[1]) or base
+if rate >= base then return 0 end
+local streak = (tonumber(b[2]) or 0) + 1
+if streak >= tonumber(ARGV[1]) then
+  redis.call('HSET', KEYS[1], 'rate', tostring(math.min(base, rate * 1.25)), 'ok_streak', '0')
+else
+  redis.call('HSET', KEYS[1], 'ok_streak', tostring(streak))
+end
+return 0
+"""
+
+
+class _RedisStore:
+    """Redis 공유 상태 (머신·job 간 공유). 생성 시 연결 실패면 예외."""
+
+    def __init__(self, url: str, base_rate: float):
+        import redis  # type: ignore[import]
+
+        self.name = "redis"
+        self._base_rate = base_rate
+        self.errors = (redis.RedisError,)
+        self._r = redis.Redis.from_url(
+            url, decode_responses=True, socket_connect_timeout=2, socket_timeout=5,
+        )
+        self._r.ping()
+        self._bucket = f"{REDIS_PREFIX}:bucket"
+        self._acquire = self._r.register_script(_ACQUIRE_LUA)
+        self._backoff = self._r.register_script(_BACKOFF_LUA)
+        self._success = self._r.register_script(_SUCCESS_LUA)
+
+    def _usage_key(self, day: str) -> str:
+        return f"{REDIS_PREFIX}:usage:{day}"
+
+    def try_acquire(self, caller: str, priority: str, hold: int, limit: int, burst: int) -> tuple[Optional[float], int]:
+        status, *vals = self._acquire(
+            keys=[self._bucket, self._usage_key(_today())],
+            args=[time.time(), hold, limit, burst, self._base_rate, f"{caller}|{priority}", KEEP_DAYS * 86400],
+        )
+        if status == "quota":
+            return None, int(vals[0])
+        return float(vals[0]), int(vals[1])
+
+    def backoff(self, pause: float, min_rate: float) -> float:
+        return float(self._backoff(keys=[self._bucket], args=[time.time() + pause, min_rate, self._base_rate]))
+
+    def success(self) -> None:
+        self._success(keys=[self._bucket], args=[RECOVER_EVERY, self._base_rate])
+
+    def state(self) -> tuple[float, float]:
+        rate, paused_until = self._r.hmget(self._bucket, "rate", "paused_until")
+        return float(rate or self._base_rate), float(paused_until or 0)
+
+    def usage_rows(self, since: str) -> list[tuple[str, str, str, int]]:
+        day = datetime.now(KST)
+        rows = []
+        while (d := day.strftime("%Y-%m-%d")) >= since:
+            counts = self._r.hgetall(self._usage_key(d))
+            for field, calls in sorted(counts.items(), key=lambda kv: -int(kv[1])):
+                caller, _, priority = field.rpartition("|")
+                rows.append((d, caller, priority, int(calls)))
+            day -= timedelta(days=1)
+        return rows
+
+
+# ── 공유 제한기 ───────────────────────────────────────────────────────────────
+
+class SharedDartLimiter:
+    """공유 토큰 버킷 + 일일 쿼터 (Redis 또는 SQLite, 프로세스·스레드 안전)."""
+
+    def __init__(
+        self,
+        caller: str,
+        priority: str = "bulk",
+        db_path: str | Path | None = None,
+        rate: float | None = None,
+        burst: int | None = None,
+        daily_quota: int | None = None,
+    ):
+        if priority not in PRIORITIES:
+            raise ValueError(f"unknown priority: {priority} ({', '.join(PRIORITIES)})")
+        self.caller      = caller
+        self.priority    = priority
+        self.base_rate   = rate or _env_float("DART_RATE_PER_SEC", 5.0)
+        self.min_rate    = min(0.2, self.base_rate)
+        self.burst       = max(len(PRIORITIES), int(burst or _env_float("DART_RATE_BURST", 3)))
+        self.daily_quota = int(daily_quota or _env_float("DART_DAILY_QUOTA", 20000))
+        self._db_path = Path(db_path or os.environ.get("DART_QUOTA_DB") or DEFAULT_DB)
+        # db_path 를 직접 넘기면 SQLite 고정 (벤치마크·로컬 점검용)
+        self._store = self._open(use_redis=db_path is None)
+
+    # ── 초기화 ────────────────────────────────────────────────────────────────
+
+    def _open(self, use_redis: bool):
+        url = _redis_url() if use_redis else None
+        if url:
+            try:
+                return _RedisStore(url, self.base_rate)
+            except ImportError:
+                logger.warning("[dart-quota] redis 패키지 없음 (pip install redis) → SQLite 사용")
+            except Exception as e:
+                logger.warning(f"[dart-quota] Redis 연결 실패 ({e}) → SQLite 사용 (job 간 공유 안 됨)")
+        return _SqliteStore(self._db_path, self.burst, self.base_rate)
+
+    def _call(self, method: str, *args):
+        """저장소 호출. Redis 오류면 SQLite 로 전환 후 재시도 (이 프로세스만 로컬 제한)."""
+        try:
+            return getattr(self._store, method)(*args)
+        except self._store.errors as e:
+            logger.warning(f"[dart-quota] Redis 오류 ({e}) → SQLite 로 전환 (job 간 공유 안 됨)")
+            self._store = _SqliteStore(self._db_path, self.burst, self.base_rate)
+            return getattr(self._store, method)(*args)
+
+    @property
+    def backend(self) -> str:
+        """공유 저장소 ("redis" 또는 SQLite 경로)."""
+        return self._store.name
+
+    # ── 토큰 확보 ─────────────────────────────────────────────────────────────
+
+    @property
+    def rate(self) -> float:
+        """현재 공유 속도 (020 backoff 반영)."""
+        return self._call("state")[0]
+
+    def acquire(self) -> None:
+        """토큰 1개 확보까지 대기. 우선순위별 일일 쿼터 상한 도달 시 QuotaExceeded."""
+        hold, share = PRIORITIES[self.priority]
+        limit = int(self.daily_quota * share)
+        while True:
+            wait, used = self._call("try_acquire", self.caller, self.priority, hold, limit, self.burst)
+            if wait is None:
+                raise QuotaExceeded(
+                    f"DART 일일 쿼터 상한 도달 ({self.priority}: {used}/{limit}, 전체 {self.daily_quota})"
+                )
+            if wait <= 0:
+                return
+            time.sleep(min(wait, MAX_SLEEP))
+
+    # ── 020 적응형 backoff ────────────────────────────────────────────────────
+
+    def backoff(self, pause: float) -> None:
+        """020 수신: 모든 프로세스의 요청을 pause 초 멈추고 공유 속도를 절반으로."""
+        rate = self._call("backoff", pause, self.min_rate)
+        logger.warning(f"[dart-quota] DART 020 ({self.caller}) → {pause:.0f}초 정지, 속도 {rate:.2f} req/s")
+
+    def success(self) -> None:
+        """정상 응답: RECOVER_EVERY 회 연속 성공마다 속도 25% 복구 (base_rate 상한)."""
+        self._call("success")
+
+    # ── 사용량 ────────────────────────────────────────────────────────────────
+
+    def usage(self, days: int = 1) -> dict:
+        """
+        최근 days 일 사용량.
+        반환: {"day", "used", "quota", "remaining", "rate", "paused_for", "backend",
+               "by_caller": [{"day", "caller", "priority", "calls"}, ...]}
+        """
+        since = (datetime.now(KST) - timedelta(days=days - 1)).strftime("%Y-%m-%d")
+        rows = self._call("usage_rows", since)
+        rate, paused_until = self._call("state")
+        today = _today()
+        used = sum(r[3] for r in rows if r[0] == today)
+        return {
+            "day":        today,
+            "used":       used,
+            "quota":      self.daily_quota,
+            "remaining":  max(0, self.daily_quota - used),
+            "rate":       rate,
+            "paused_for": max(0.0, paused_until - time.time()),
+            "backend":    self.backend,
+            "by_caller":  [{"day": d, "caller": c, "priority": p, "calls": n} for d, c, p, n in rows],
+        }
+
+
+# ── 프로세스 내 공유 인스턴스 ────────────────────────────────────────────────
+
+_limiters: dict[tuple[str, str], SharedDartLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_dart_limiter(caller: str, priority: str = "bulk") -> SharedDartLimiter:
+    """(caller, priority) 별 싱글톤. 같은 프로세스의 여러 클라이언트가 연결을 공유."""
+    with _limiters_lock:
+        limiter = _limiters.get((caller, priority))
+        if limiter is None:
+            limiter = SharedDartLimiter(caller, priority)
+            _limiters[(caller, priority)] = limiter
+        return limiter
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DART API 공용 쿼터 사용량")
+    parser.add_argument("--days", type=int, default=1, help="조회 일수 (기본: 오늘)")
+    args = parser.parse_args()
+
+    u = SharedDartLimiter("dart_quota_cli", "live").usage(args.days)
+    print(f"[{u['day']} KST] 사용 {u['used']:,} / {u['quota']:,} (남음 {u['remaining']:,}) — {u['backend']}")
+    print(f"  현재 속도 {u['rate']:.2f} req/s" + (f", 020 정지 {u['paused_for']:.0f}초 남음" if u["paused_for"] else ""))
+    for r in u["by_caller"]:
+        print(f"  {r['day']}  {r['caller']:24s} {r['priority']:9s} {r['calls']:>7,}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+"""
+scripts/disclosure_priority.py
+==============================
+공시 제목(report_nm) 기반 처리 우선순위.
+
+공시가 몰리는 날 dart_crawler 는 DART 목록 순서대로 본문을 받아서,
+유상증자·합병 같은 고시그널 공시가 수백 건의 정기 공시 뒤에서 기다렸습니다.
+여기서 매긴 점수로 수집(dart_crawler) → 분석(auto_analyst) 전 구간을 높은 순으로 처리합니다.
+
+점수 규칙 (AI 호출 없이 제목만 사용):
+  1) hint_types(title)       AIAnalyst.classify_disclosure 와 같은 유형 힌트 (규칙 원본은 disclosure_rules)
+  2) HINT_WEIGHTS            힌트 중 가장 높은 가중치
+  3) [기재정정]               AMENDMENT_WHITELIST 해당 시 AMENDMENT_PENALTY 만큼 감점,
+                             미해당 정정은 0점 (auto_analyst 가 skip 처리하는 유형)
+
+티어:
+  1 (top)   DILUTION / MNA / CONTRACT 원공시   — 지연 시간 별도 집계 대상
+  2         BUYBACK / DISPOSAL / LEGAL / CAPEX / DIVIDEND, 화이트리스트 정정
+  3         EXECUTIVE_CHANGE / EARNINGS(정기보고서) / OTHER
+
+disclosure_insights.fetch_priority 에 점수를 저장하고
+auto_analyst 는 pending 조회 시 fetch_priority 내림차순으로 가져갑니다.
+"""
+
+# 제목 규칙(힌트 키워드·[기재정정] 화이트리스트)은 disclosure_rules 에서 한 번에 판정
+try:
+    from .disclosure_rules import AMENDMENT_WHITELIST, hint_types   # scripts.disclosure_priority (dart_crawler)
+except ImportError:
+    from disclosure_rules import AMENDMENT_WHITELIST, hint_types    # scripts/ 직접 실행 (auto_analyst)
+
+HINT_WEIGHTS: dict[str, int] = {
+    "DILUTION":         100,
+    "MNA":              100,
+    "CONTRACT":          90,
+    "BUYBACK":           60,
+    "DISPOSAL":          60,
+    "LEGAL":             50,
+    "CAPEX":             50,
+    "DIVIDEND":          40,
+    "EXECUTIVE_CHANGE":  30,
+    "EARNINGS":          20,   # 정기보고서 — 본문이 길고 시의성 낮음
+    "OTHER":             10,
+}
+AMENDMENT_PENALTY = 30
+
+TOP_TIER   = 1
+_TIER_MIN  = ((TOP_TIER, 80), (2, 40))   # (티어, 최소 점수) — 나머지 3
+
+
+def priority_score(report_nm: str) -> int:
+    """제목 → 처리 우선순위 점수 (0~100, 높을수록 먼저)."""
+    nm = (report_nm or "").strip()
+    score = max(HINT_WEIGHTS.get(h, 0) for h in hint_types(nm))
+    if nm.startswith("[기재정정]"):
+        if not any(nm.startswith(w) for w in AMENDMENT_WHITELIST):
+            return 0
+        score -= AMENDMENT_PENALTY
+    return max(0, score)
+
+
+def priority_tier(score: int) -> int:
+    """점수 → 티어 (1 = top)."""
+    for tier, min_score in _TIER_MIN:
+        if score >= min_score:
+            return tier
+    return 3
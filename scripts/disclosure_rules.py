@@ -0,0 +1,474 @@
+"""
+scripts/disclosure_rules.py
+===========================
+공시 제목(report_nm) · 회사명 필터 규칙 (한 곳에 모음) + 한 번 훑기 판정기.
+
+제목 필터가 여러 곳에 따로 구현되어 있었습니다.
+  - auto_analyst._should_skip_report          AI 분석 생략 (정확히 일치 / 접두어 / 포함, 튜플마다 any(startswith))
+  - dart_crawler.is_signal_disclosure / is_noise_corp  수집 allowlist / 종목명 필터
+  - reprocess_db.NOISE_KEYWORDS                기존 DB 노이즈 정리
+  - disclosure_priority.hint_types             유형 힌트 (if 체인으로 부분 문자열 20여 회 검사)
+같은 제목을 단계마다 수십~수백 번 부분 문자열 검사했고, 목록이 어긋나도 알 수 없었습니다.
+
+여기서는 규칙 목록을 모두 이 파일에 두고, import 시 하나의 Aho-Corasick 자동자로 컴파일해
+제목을 한 번만 훑어 아래를 동시에 판정합니다 (classify_title).
+  skip     AI 분석 생략 여부              (기존 _should_skip_report)
+  signal   수집 allowlist 해당 여부       (기존 is_signal_disclosure)
+  noise    reprocess 노이즈 키워드 해당    (기존 NOISE_KEYWORDS ilike)
+  hints    유형 힌트 목록                 (기존 hint_types, 순서·중복 포함 동일)
+종목명(is_noise_corp)은 별도 자동자, 임원 변동 2차 필터(is_executive_noise)는 본문 기준이라 그대로 둡니다.
+
+매칭 규칙:
+  - 자동자는 소문자로 변환한 제목 위에서 동작. 원래 대소문자를 구분하던 규칙(allowlist·스킵 목록·
+    CAPEX 키워드 등)은 매칭 위치의 원문을 다시 비교해 기존 동작을 그대로 유지
+  - 접두어 = 시작 위치 0, 정확히 일치 = 시작 0 + 끝이 제목 끝 (strip 한 제목 기준 — 기존과 동일)
+  - 같은 제목은 반복 판정이 많아 결과를 LRU 캐시
+
+규칙을 고치면 일관성 검사를 돌릴 것:
+  python scripts/check_disclosure_rules.py                  # 기존 구현(오라클)과 결과 비교
+  python scripts/check_disclosure_rules.py --bench --days 365
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+
+# ── 수집 allowlist (dart_crawler) ─────────────────────────────────────────────
+# report_nm 에 아래 키워드 중 하나라도 포함되면 수집 대상.
+# 포함되지 않는 공시는 본문 파싱·AI 분석 없이 즉시 skip.
+#
+# 설계 원칙:
+#   - DART 30초 갱신으로 일 2,300건+ 급증 → 전수 수집은 Groq 토큰/크롤러 시간 낭비
+#   - event_type 은 AI 분석 후에야 확정 → 분석 전 필터 불가
+#   - report_nm 은 DART API 응답에서 즉시 획득 — AI 없이 유형 판별 가능
+#   - 네거티브(_NOISE_KEYWORDS) 방식 → 포지티브(allowlist) 방식으로 전환
+#   - 예상 효과: 수집 대상 2,300건 → 100~200건 (90% 감소)
+SIGNAL_ALLOWLIST: tuple[str, ...] = (
+    # EARNINGS — 정기보고서
+    "사업보고서", "반기보고서", "분기보고서",
+
+    # CONTRACT — 단일판매·공급계약 / 수주
+    "단일판매ㆍ공급계약체결",   # DART 공식 표기 (ㆍ 사용)
+    "단일판매·공급계약체결",    # 일부 문서 중점(·) 표기
+    "공급계약체결",             # 기타 계약 변형 캐치
+    "수주공시",
+
+    # DILUTION — 유상증자·CB·BW·EB
+    "유상증자결정",
+    "전환사채권발행결정",
+    "신주인수권부사채권발행결정",
+    "교환사채권발행결정",
+
+    # BUYBACK — 자사주 취득·처분
+    "자기주식취득결정",
+    "자기주식처분결정",
+    "자기주식취득신탁계약체결결정",
+
+    # DIVIDEND — 배당 결정
+    "현금ㆍ현물배당결정",
+    "현금배당결정",
+    "주식배당결정",
+
+    # MNA — 합병·분할·포괄 교환
+    "합병결정",
+    "분할결정",
+    "분할합병결정",
+    "주식의포괄적교환",
+    "주식의포괄적이전",
+
+    # LEGAL — 소송 판결
+    "소송등의판결",
+
+    # CAPEX / acquisition — 타법인 취득·유형자산 취득
+    "타법인주식및출자증권취득결정",
+    "타법인주식및출자증권처분결정",
+    "유형자산취득결정",
+    "유형자산처분결정",
+
+    # EXECUTIVE_CHANGE — CEO·임원 변동 (is_executive_noise() 2차 필터 적용)
+    "임원의변동",
+    "대표이사의변동",
+)
+
+# 종목명 필터 — 스팩/펀드/부동산리츠/비상장금융기관 등 투자 시그널 무의미 종목 제외
+NOISE_CORP_KEYWORDS: tuple[str, ...] = (
+    "전문유한회사", "부동산투자회사", "스팩", "자산운용", "자산운영", "펀드",
+    "기업인수목적", "투자증권", "투자자문",
+)
+
+# ── 임원 변동 2차 필터 (본문 기준) ───────────────────────────────────────────
+# "임원의변동" / "대표이사의변동" 공시(EXECUTIVE_CHANGE 힌트) 중 사외이사·감사만 언급 → 노이즈
+# CEO / C-Level 포함 공시 → 신호로 통과
+EXEC_SIGNAL_KEYWORDS: tuple[str, ...] = (
+    "대표이사", "CEO", "사장", "부사장",
+    "CFO", "COO", "CTO", "CSO", "CCO",
+    "전무이사", "전무", "상무이사", "상무",
+)
+
+# ── AI 분석 스킵 필터 (auto_analyst, 비용 절감 + 저시그널 제거) ──────────────
+# 목표: DART 일 ~2,300건 → 필터 후 300~500건 → AI 분석 100~250건
+# 분석 대상: CONTRACT, DILUTION, BUYBACK, DIVIDEND, MNA, CAPEX, EARNINGS(결정류), LEGAL(중요)
+
+SKIP_EXACT: frozenset[str] = frozenset({
+    # ① 지분/의결권 변동 — 정형화된 신고, 트레이딩 시그널 없음
+    "주식등의대량보유상황보고서(일반)",
+    "주식등의대량보유상황보고서(약식)",
+    "임원ㆍ주요주주특정증권등소유상황보고서",
+    "최대주주등소유주식변동신고서",
+    "소속부변경",
+    "주주명부폐쇄기간또는기준일설정",
+    "주권매매거래정지(주식의 병합, 분할 등 전자등록 변경, 말소)",
+    "주주총회소집결의(임시주주총회)",
+    "주주총회소집결의",
+    "주주총회결과",
+
+    # ② 정기보고서 — 토큰 비용 과다, 실시간 시그널 없음 (이미 알려진 정보)
+    # ※ DART는 "분기보고서 (2026.03)" 형식으로 날짜 suffix를 붙임 → prefix로 처리
+    "연결재무제표기준영업(잠정)실적(공정공시)",  # 잠정실적 공정공시 — 별도 결산공시로 커버
+
+    # ③ 임원 변동 — 뉴스 가치 있으나 단기 트레이딩 시그널 미미
+    "임원의변동",
+    "대표이사의변동",
+
+    # ④ 주식매수선택권 — 행사/취득은 이미 주가 반영, 부여 신고는 저시그널
+    "주식매수선택권행사",
+    "주식매수선택권취득",
+    "주식매수선택권부여에관한신고",
+    "[기재정정]주식매수선택권부여에관한신고",
+
+    # ⑤ 소급/결과 보고 — 이미 주가 반응 완료
+    "자기주식처분결과보고서",
+    "자기주식취득결과보고서",
+    "전환청구권행사",
+    "결산실적공시예고(안내공시)",
+
+    # ⑥ 의무/형식 공시 — 정보 가치 없음
+    "타인에대한채무보증결정",
+    "채권자이의제출공고",
+    "공정공시",
+    "기업설명회(IR) 개최",
+
+    # ⑦ ELS/DLS 파생결합 — 주식 희석 아님, 시그널 없음
+    "일괄신고추가서류(파생결합사채-주가연계파생결합사채)",
+    "일괄신고추가서류(파생결합증권-주가연계증권)",
+    "일괄신고추가서류",
+})
+
+# prefix 패턴: startswith 확인 (변형 이름 다수 존재)
+SKIP_PREFIXES: tuple[str, ...] = (
+    # 소급 보고 — 발행 결과 (이미 주가 반응 완료)
+    "증권발행결과",
+    "[기재정정]증권발행결과",
+
+    # 정기보고서 — "사업보고서 (2025.12)" 등 날짜 suffix 형식 대응
+    "사업보고서 ",
+    "반기보고서 ",
+    "분기보고서 ",
+    "[첨부추가]사업보고서",
+    "[첨부추가]반기보고서",
+    "[첨부추가]분기보고서",
+
+    # IR 개최 안내 변형 ("기업설명회(IR) 개최(안내공시)" 등)
+    "기업설명회(IR)",
+
+    # 기재정정 — 원공시 이미 분석, 대부분 오탈자·첨부 수정
+    # 단, 고시그널 유형(유상증자·CB·BW·합병·분할)은 AMENDMENT_WHITELIST 로 예외 처리
+    "[기재정정]사업보고서",
+    "[기재정정]반기보고서",
+    "[기재정정]분기보고서",
+    "[기재정정]임원의변동",
+    "[기재정정]주주총회",
+    "[기재정정]주식등의대량보유",
+    "[기재정정]임원ㆍ주요주주",
+
+    # ELS/DLS 변형
+    "일괄신고추가서류(기타파생결합사채)",
+    "[기재정정]일괄신고추가서류(기타파생결합사채)",
+    "일괄신고서(기타파생결합사채)",
+    "[기재정정]일괄신고서(기타파생결합사채)",
+
+    # 채무증권 발행조건확정 — 소급성 강함, 주식 희석 없음
+    "[발행조건확정]증권신고서(채무증권)",
+
+    # ETF/집합투자 관련
+    "집합투자업자변경",
+    "투자신탁재산운용보고서",
+)
+
+# 키워드 포함 패턴: 제목에 해당 문자열 포함 시 스킵
+SKIP_CONTAINS: tuple[str, ...] = (
+    "소송등의판결",       # 소송 진행 업데이트 (결정이 아닌 경과 보고)
+    "소송취하",
+    "집합투자기구",       # 펀드/ETF 관련
+    "투자신탁",
+    "수익증권",
+    "부동산투자회사",     # 리츠 정기보고 (리츠 배당결정은 별도 처리)
+)
+
+AMENDMENT_PREFIX = "[기재정정]"
+
+# [기재정정] 중 분석 가치 있는 고시그널 유형 화이트리스트 (처리 우선순위와 공유)
+AMENDMENT_WHITELIST: tuple[str, ...] = (
+    "[기재정정]유상증자",
+    "[기재정정]전환사채권",
+    "[기재정정]신주인수권부사채",
+    "[기재정정]합병",
+    "[기재정정]분할",
+    "[기재정정]주요사항보고서(유상증자",
+    "[기재정정]주요사항보고서(전환사채",
+    "[기재정정]주요사항보고서(신주인수권",
+    "[기재정정]주요사항보고서(합병",
+    "[기재정정]주요사항보고서(분할",
+)
+
+# ── reprocess_db 노이즈 키워드 (DB ilike 정리용) ──────────────────────────────
+NOISE_KEYWORDS: tuple[str, ...] = (
+    "주주총회소집공고", "주주총회결과", "투자설명서",
+    "기업설명회", "증권발행실적보고서", "의결권대리행사권유", "소액공모",
+    "주주명부폐쇄기준일", "배당기준일", "명의개서정지",
+    "사외이사의선임", "사외이사의해임", "사외이사의중도퇴임",
+    # "임원의변동"    ← 제거: CEO/C-Level 포함 공시는 신호 — is_executive_noise()로 2차 필터
+    # "대표이사의변동" ← 제거: CEO 변동은 핵심 재료
+)
+
+# ── 유형 힌트 (AIAnalyst.classify_disclosure / 처리 우선순위) ────────────────
+# (유형, 키워드) 슬롯 — 슬롯 순서대로 힌트를 쌓음 (CAPEX 는 두 슬롯이라 중복 가능, 기존과 동일).
+# 소문자 제목 기준. _HINT_CASED 는 원문 대소문자 그대로 비교.
+_HINT_SLOTS: tuple[tuple[str, tuple[str, ...]], ...] = (
+    ("DILUTION",         ("전환사채", "bw", "cb", "유상증자")),
+    ("CONTRACT",         ("단일판매", "공급계약", "수주", "mou")),
+    ("TREASURY",         ("자기주식",)),                       # 처분 → DISPOSAL / 그 외 → BUYBACK
+    ("DIVIDEND",         ("배당", "dividend", "기준일설정", "배당결정", "현금·현물")),
+    ("CAPEX",            ("유형자산취득",)),                   # 물리적 자산: 공장·설비·토지, 항상 CAPEX
+    ("MNA",              ("합병", "인수", "분할", "타법인주식")),  # + "지분" 과 "취득" 동시 포함
+    ("LEGAL",            ("소송", "횡령", "배임", "과징금", "수사")),
+    ("EARNINGS",         ("분기", "사업보고서", "잠정", "실적", "결산")),
+    ("EXECUTIVE_CHANGE", ("임원의변동", "대표이사의변동")),
+    ("CAPEX_KW",         ()),                                  # _HINT_CASED
+)
+_HINT_CASED: tuple[str, ...] = (
+    "시설투자", "설비투자", "CAPEX", "투자 결정", "신규 투자",
+    "증설", "공장 신설", "라인 증설",
+)
+_TREASURY_DISPOSAL = ("처분", "disposal")
+_MNA_PAIR = ("지분", "취득")
+
+
+# ── Aho-Corasick ──────────────────────────────────────────────────────────────
+
+class _Automaton:
+    """다중 문자열 검색 자동자 (pure Python). 입력 1회 순회로 모든 패턴의 출현 위치를 찾음."""
+
+    def __init__(self, patterns: list[str]):
+        self.patterns = patterns
+        self._goto: list[dict[str, int]] = [{}]
+        out: list[list[int]] = [[]]
+        for pid, pat in enumerate(patterns):
+            node = 0
+            for ch in pat:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    out.append([])
+                node = nxt
+            out[node].append(pid)
+
+        fail = [0] * len(self._goto)
+        queue = list(self._goto[0].values())
+        for node in queue:
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                f = fail[node]
+                while f and ch not in self._goto[f]:
+                    f = fail[f]
+                cand = self._goto[f].get(ch, 0)
+                fail[nxt] = cand if cand != nxt else 0
+                out[nxt].extend(out[fail[nxt]])
+        self._fail = fail
+        self._out = [tuple(o) for o in out]
+
+    def scan(self, text: str):
+        """(시작 위치, 패턴 id) 를 출현 순서대로 생성."""
+        goto, fail, out, pats = self._goto, self._fail, self._out, self.patterns
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for pid in out[node]:
+                yield i - len(pats[pid]) + 1, pid
+
+
+# 패턴 종류 — (kind, 값, 대소문자 구분)
+_SIGNAL, _SKIP_EXACT, _SKIP_PREFIX, _SKIP_CONTAINS, _WHITELIST, _NOISE, _HINT = range(7)
+
+
+def _compile_title_rules():
+    table: dict[str, list[tuple[int, object, bool]]] = {}
+
+    def add(pattern: str, kind: int, value=None, cased: bool = False):
+        table.setdefault(pattern.lower(), []).append((kind, value if value is not None else pattern, cased))
+
+    for p in SIGNAL_ALLOWLIST:
+        add(p, _SIGNAL, cased=True)
+    for p in SKIP_EXACT:
+        add(p, _SKIP_EXACT, cased=True)
+    for p in SKIP_PREFIXES:
+        add(p, _SKIP_PREFIX, cased=True)
+    for p in SKIP_CONTAINS:
+        add(p, _SKIP_CONTAINS, cased=True)
+    for p in AMENDMENT_WHITELIST + (AMENDMENT_PREFIX,):
+        add(p, _WHITELIST, cased=True)
+    for p in NOISE_KEYWORDS:
+        add(p, _NOISE)                       # DB ilike 와 같은 대소문자 무시
+    for slot, (_, words) in enumerate(_HINT_SLOTS):
+        for w in words:
+            add(w, _HINT, value=(slot, w))
+    for w in _HINT_CASED + _TREASURY_DISPOSAL + _MNA_PAIR:
+        add(w, _HINT, value=(-1, w), cased=w in _HINT_CASED)
+
+    patterns = list(table)
+    return _Automaton(patterns), [table[p] for p in patterns]
+
+
+_TITLE_AC, _TITLE_TAGS = _compile_title_rules()
+_CORP_AC = _Automaton([k.lower() for k in NOISE_CORP_KEYWORDS])
+
+
+def _lower_aligned(text: str) -> str:
+    """소문자 변환 — 글자 수가 바뀌는 문자(İ 등)는 그대로 두어 원문과 위치를 맞춤."""
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    return "".join(c if len(c.lower()) != 1 else c.lower() for c in text)
+
+
+@dataclass(frozen=True)
+class TitleVerdict:
+    skip: bool                 # AI 분석 생략
+    signal: bool               # 수집 allowlist 해당
+    noise: bool                # reprocess 노이즈 키워드 해당
+    hints: tuple[str, ...]     # 유형 힌트 (없으면 ("OTHER",))
+
+
+@lru_cache(maxsize=8192)
+def classify_title(report_nm: str) -> TitleVerdict:
+    """제목 1회 순회로 skip / signal / noise / hints 판정."""
+    raw = report_nm or ""
+    nm = raw.strip()
+    lead = len(raw) - len(raw.lstrip())          # strip 전 제목의 앞 공백 (contains 는 위치 무관)
+    lowered = _lower_aligned(raw)
+
+    signal = noise = skip_contains = False
+    skip_exact = skip_prefix = whitelisted = amendment = False
+    slots: set[int] = set()
+    cased_words: set[str] = set()
+    found_words: set[str] = set()
+
+    for start, pid in _TITLE_AC.scan(lowered):
+        length = len(_TITLE_AC.patterns[pid])
+        for kind, value, cased in _TITLE_TAGS[pid]:
+            if cased:
+                text = value[1] if kind == _HINT else value
+                if raw[start:start + length] != text:
+                    continue
+            if kind == _SIGNAL:
+                signal = True
+            elif kind == _NOISE:
+                noise = True
+            elif kind == _SKIP_CONTAINS:
+                skip_contains = True
+            elif kind == _HINT:
+                slot, word = value
+                if slot >= 0:
+                    slots.add(slot)
+                found_words.add(word)
+                if cased:
+                    cased_words.add(word)
+            else:
+                # 접두어·정확히 일치 — strip 한 제목 기준
+                end = lead + len(nm)
+                if start != lead or start + length > end:
+                    continue
+                if kind == _SKIP_EXACT:
+                    skip_exact = skip_exact or start + length == end
+                elif kind == _SKIP_PREFIX:
+                    skip_prefix = True
+                elif value == AMENDMENT_PREFIX:
+                    amendment = True
+                else:
+                    whitelisted = True
+
+    if amendment and whitelisted:
+        skip = False
+    else:
+        skip = skip_exact or skip_prefix or skip_contains or amendment
+
+    hints: list[str] = []
+    for slot, (name, _) in enumerate(_HINT_SLOTS):
+        if name == "TREASURY":
+            if slot in slots:
+                hints.append("DISPOSAL" if found_words & set(_TREASURY_DISPOSAL) else "BUYBACK")
+        elif name == "MNA":
+            if slot in slots or all(w in found_words for w in _MNA_PAIR):
+                hints.append("MNA")
+        elif name == "CAPEX_KW":
+            if cased_words:
+                hints.append("CAPEX")
+        elif slot in slots:
+            hints.append(name)
+
+    return TitleVerdict(
+        skip=skip,
+        signal=signal,
+        noise=noise,
+        hints=tuple(hints) if hints else ("OTHER",),
+    )
+
+
+# ── 기존 함수 이름 (호출부 호환) ──────────────────────────────────────────────
+
+def should_skip_analysis(report_nm: str) -> bool:
+    """report_nm이 AI 분석 불필요 공시인지 판단."""
+    return classify_title(report_nm).skip
+
+
+def is_signal_disclosure(report_nm: str) -> bool:
+    """allowlist 키워드 중 하나라도 포함되면 True — 수집 대상."""
+    return classify_title(report_nm).signal
+
+
+def is_noise_title(report_nm: str) -> bool:
+    """reprocess_db 노이즈 키워드 포함 여부 (대소문자 무시)."""
+    return classify_title(report_nm).noise
+
+
+def hint_types(title: str) -> list[str]:
+    """
+    title 키워드 기반 유형 힌트. 복수 매칭 가능 (e.g. "유상증자 + 합병" → [DILUTION, MNA]).
+    최종 event_type 결정은 AI 가 content 기반으로 수행.
+    """
+    return list(classify_title(title).hints)
+
+
+def is_executive_noise(report_nm: str, content: str = "") -> bool:
+    """
+    임원 변동 공시 중 CEO/C-Level 신호가 없는 경우 True(노이즈) 반환.
+    - report_nm이 임원변동 계열이 아니면 False (해당 없음)
+    - 본문 없으면 일단 통과(False) — 내용 확인 불가
+    - CEO/C-Level 키워드 존재 → False (신호, 통과)
+    - 없으면 True (사외이사/감사만 → 노이즈)
+    """
+    if "EXECUTIVE_CHANGE" not in classify_title(report_nm).hints:
+        return False
+    if not content:
+        return False
+    return not any(kw in content for kw in EXEC_SIGNAL_KEYWORDS)
+
+
+@lru_cache(maxsize=4096)
+def is_noise_corp(corp_name: str) -> bool:
+    for _ in _CORP_AC.scan((corp_name or "").lower()):
+        return True
+    return False
@@ -13,6 +13,10 @@ scripts/eval_quality.py
   python scripts/eval_quality.py --limit 20  # 빠른 테스트
   python scripts/eval_quality.py --dry-run   # DB 조회만, AI 호출 없음
   python scripts/eval_quality.py --out eval_result.json
+  LLM_CACHE=0 python scripts/eval_quality.py  # 결과 캐시 무시 (같은 프롬프트로 모델 응답 변동성 측정)
+
+같은 프롬프트·본문으로 이미 분석한 샘플은 결과 캐시(scripts/llm_cache.py)에서 재사용합니다.
+프롬프트를 고치면 캐시 키가 바뀌므로 새 프롬프트 평가는 항상 실제 호출입니다.
 """
 
 import os, sys, json, time, logging, argparse
@@ -363,6 +367,7 @@ def main():
 
     for i, row in enumerate(records, 1):
         log.info(f"  [{i:>3}/{total}] {row.get('corp_name','')[:14]:<14} | {(row.get('report_nm') or '').strip()[:32]}")
+        hits_before = analyst.cache.stats()["hit"] if analyst.cache else 0
         result = gemini_classify(analyst, row)
         if result:
             row["_gemini_et"]      = result.get("event_type", "OTHER")
@@ -370,7 +375,11 @@ def main():
             row["_gemini_inv_raw"] = result.get("_invalid_raw", "")
         else:
             row["_gemini_et"] = None
-        time.sleep(args.sleep)
+        if not analyst.cache or analyst.cache.stats()["hit"] == hits_before:
+            time.sleep(args.sleep)   # 캐시 hit 은 API 호출이 없으므로 대기 생략
+
+    if analyst.cache:
+        log.info(f"  [llm-cache] {analyst.cache.summary()}")
 
     # JSON 저장 먼저 (print 오류와 무관하게 데이터 보존)
     if args.out:
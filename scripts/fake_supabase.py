@@ -0,0 +1,221 @@
+"""
+scripts/fake_supabase.py
+========================
+오프라인 벤치마크용 인메모리 Supabase 대체 (supabase-py 쿼리 빌더 일부 흉내).
+
+실제 DB 없이 배치 스크립트를 돌려 처리량·DB 왕복 횟수를 재기 위한 것으로,
+PostgREST 의미를 완전히 재현하지는 않습니다. 지원 범위:
+
+  table(name)
+    .select(cols) / .insert(rows) / .upsert(rows, on_conflict=, ignore_duplicates=)
+    .update(values) / .delete()
+    .eq / .neq / .in_ / .is_ / .lt / .lte / .gt / .gte / .not_.is_
+    .order(col, desc=) / .limit(n) / .range(a, b) / .maybe_single()
+    .execute()  → .data (list 또는 maybe_single 이면 dict|None), .count
+  rpc(name, params).execute()  → rpc_handlers[name](params) 결과 (없으면 None)
+
+latency: execute() 1회당 대기 초 — 네트워크 왕복 흉내 (배치 효과 측정용)
+calls:   테이블·동작별 execute() 횟수 ({"disclosure_insights.upsert": 3, ...})
+
+사용 예시:
+  from scripts.fake_supabase import FakeSupabase
+
+  import scripts.dart_crawler as crawler
+  crawler.supabase = FakeSupabase(latency=0.05)
+"""
+
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import Any, Callable
+
+
+class _Result:
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+
+class _Not:
+    def __init__(self, query: "_Query"):
+        self._q = query
+
+    def is_(self, col: str, value):
+        return self._q._filter(col, lambda v, x=_null(value): v is not x if x is None else v != x)
+
+
+def _null(value):
+    return None if value in (None, "null") else value
+
+
+class _Query:
+    def __init__(self, db: "FakeSupabase", table: str):
+        self._db = db
+        self._table = table
+        self._op = "select"
+        self._payload: Any = None
+        self._conflict: str | None = None
+        self._ignore_dup = False
+        self._filters: list[Callable[[dict], bool]] = []
+        self._order: list[tuple[str, bool]] = []
+        self._slice: tuple[int, int | None] = (0, None)
+        self._single = False
+
+    # ── 동작 ──────────────────────────────────────────────────────────────────
+
+    def select(self, *_cols, **_kw):
+        self._op = "select"
+        return self
+
+    def insert(self, rows, **_kw):
+        self._op, self._payload = "insert", rows
+        return self
+
+    def upsert(self, rows, on_conflict: str | None = None, ignore_duplicates: bool = False, **_kw):
+        self._op, self._payload = "upsert", rows
+        self._conflict, self._ignore_dup = on_conflict, ignore_duplicates
+        return self
+
+    def update(self, values: dict, **_kw):
+        self._op, self._payload = "update", values
+        return self
+
+    def delete(self, **_kw):
+        self._op = "delete"
+        return self
+
+    # ── 필터 ──────────────────────────────────────────────────────────────────
+
+    def _filter(self, col: str, pred: Callable[[Any], bool]):
+        self._filters.append(lambda row: pred(row.get(col)))
+        return self
+
+    def eq(self, col, value):
+        return self._filter(col, lambda v: v == value)
+
+    def neq(self, col, value):
+        return self._filter(col, lambda v: v != value)
+
+    def in_(self, col, values):
+        s = set(values)
+        return self._filter(col, lambda v: v in s)
+
+    def is_(self, col, value):
+        x = _null(value)
+        return self._filter(col, lambda v: v is x if x is None else v == x)
+
+    def lt(self, col, value):
+        return self._filter(col, lambda v: v is not None and v < value)
+
+    def lte(self, col, value):
+        return self._filter(col, lambda v: v is not None and v <= value)
+
+    def gt(self, col, value):
+        return self._filter(col, lambda v: v is not None and v > value)
+
+    def gte(self, col, value):
+        return self._filter(col, lambda v: v is not None and v >= value)
+
+    def or_(self, _expr: str, **_kw):
+        # PostgREST or 문법은 해석하지 않음 (벤치마크 용도에서는 필터 생략)
+        return self
+
+    @property
+    def not_(self):
+        return _Not(self)
+
+    def order(self, col, desc: bool = False, **_kw):
+        self._order.append((col, desc))
+        return self
+
+    def limit(self, n: int, **_kw):
+        self._slice = (self._slice[0], self._slice[0] + n)
+        return self
+
+    def range(self, start: int, end: int, **_kw):
+        self._slice = (start, end + 1)
+        return self
+
+    def maybe_single(self):
+        self._single = True
+        return self
+
+    # ── 실행 ──────────────────────────────────────────────────────────────────
+
+    def execute(self) -> _Result:
+        self._db._call(f"{self._table}.{self._op}")
+        with self._db._lock:
+            rows = self._db.tables.setdefault(self._table, [])
+            if self._op == "select":
+                data = [dict(r) for r in rows if all(f(r) for f in self._filters)]
+                for col, desc in reversed(self._order):
+                    data.sort(key=lambda r: (r.get(col) is None, r.get(col)), reverse=desc)
+                data = data[self._slice[0]:self._slice[1]]
+                if self._single:
+                    return _Result(data[0] if data else None)
+                return _Result(data, count=len(data))
+            if self._op in ("insert", "upsert"):
+                return _Result(self._write(rows))
+            matched = [r for r in rows if all(f(r) for f in self._filters)]
+            if self._op == "update":
+                for r in matched:
+                    r.update(self._payload)
+            else:
+                self._db.tables[self._table] = [r for r in rows if r not in matched]
+            return _Result([dict(r) for r in matched])
+
+    def _write(self, rows: list[dict]) -> list[dict]:
+        payload = self._payload if isinstance(self._payload, list) else [self._payload]
+        keys = (self._conflict or "id").split(",")
+        index = {tuple(r.get(k) for k in keys): r for r in rows}
+        written = []
+        for new in payload:
+            k = tuple(new.get(c) for c in keys)
+            old = index.get(k) if any(v is not None for v in k) else None   # 키 없는 행 = 새 행 (serial id)
+            if old is not None:
+                if self._op == "insert":
+                    raise RuntimeError(f"duplicate key {self._table} {k}")
+                if self._ignore_dup:
+                    continue
+                old.update(new)
+                written.append(dict(old))
+            else:
+                row = {"id": str(uuid.uuid4()), **new}
+                rows.append(row)
+                index[k] = row
+                written.append(dict(row))
+        return written
+
+
+class _Rpc:
+    def __init__(self, db: "FakeSupabase", name: str, params: dict):
+        self._db, self._name, self._params = db, name, params
+
+    def execute(self) -> _Result:
+        self._db._call(f"rpc.{self._name}")
+        handler = self._db.rpc_handlers.get(self._name)
+        return _Result(handler(self._params) if handler else None)
+
+
+class FakeSupabase:
+    """인메모리 Supabase 클라이언트 대체 (스레드 안전)."""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.tables: dict[str, list[dict]] = {}
+        self.rpc_handlers: dict[str, Callable[[dict], Any]] = {}
+        self.calls: Counter = Counter()
+        self._lock = threading.RLock()
+
+    def _call(self, name: str) -> None:
+        with self._lock:
+            self.calls[name] += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def table(self, name: str) -> _Query:
+        return _Query(self, name)
+
+    def rpc(self, name: str, params: dict | None = None) -> _Rpc:
+        return _Rpc(self, name, params or {})
@@ -27,6 +27,7 @@ URL: https://apis.data.go.kr/1160100/service/GetCorpBasicInfoService_V2/getCorpO
 import os
 import sys
 import argparse
+import asyncio
 import time
 import requests
 from datetime import datetime
@@ -312,6 +313,16 @@ def main():
     print("=" * 60)
     print(f"완료: 성공 {success}건 / 실패 {failure}건")
     print("=" * 60)
+
+    # 5. 캐시 무효화 — /v1/companies/lookup 인덱스 재빌드 트리거
+    if success > 0:
+        try:
+            from backend.core.cache import cache_delete_pattern
+            deleted = asyncio.run(cache_delete_pattern("v1:companies:*"))
+            print(f"[cache] 무효화 완료: v1:companies:* ({deleted}개 삭제)")
+        except Exception as e:
+            print(f"[cache] 무효화 실패 (무시): {e}")
+
     sys.exit(0 if failure == 0 else 1)
 
 
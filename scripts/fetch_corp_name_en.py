@@ -13,7 +13,7 @@ DART /company: https://opendart.fss.or.kr/api/company.json?crtfc_key=...&corp_co
 
 import os
 import sys
-import time
+import asyncio
 import argparse
 from pathlib import Path
 
@@ -27,13 +27,18 @@ load_env()
 import requests
 from supabase import create_client
 
+from scripts.dart_quota import get_dart_limiter, QuotaExceeded
+
 DART_API_URL = "https://opendart.fss.or.kr/api/company.json"
-RATE_LIMIT = 0.15   # DART API 호출 간격 (초)
 BATCH_SIZE = 100    # Supabase upsert 배치
 
+# 호출 간격은 공용 제한기가 관리 (다른 DART 스크립트와 속도·일일 쿼터 공유)
+dart_limiter = get_dart_limiter("fetch_corp_name_en", priority="bulk")
+
 
 def fetch_eng_name(dart_key: str, corp_code: str) -> str | None:
     """DART /company API에서 eng_name 조회"""
+    dart_limiter.acquire()
     try:
         resp = requests.get(
             DART_API_URL,
@@ -44,6 +49,8 @@ def fetch_eng_name(dart_key: str, corp_code: str) -> str | None:
         data = resp.json()
         if data.get("status") == "000":
             return data.get("corp_name_eng") or None
+        if data.get("status") == "020":
+            dart_limiter.backoff(10.0)
     except Exception as e:
         print(f"  [WARN] corp_code={corp_code} 오류: {e}")
     return None
@@ -104,7 +111,11 @@ def main():
         corp_name = row["corp_name"]
         stock_code = row["stock_code"]
 
-        eng_name = fetch_eng_name(dart_key, corp_code)
+        try:
+            eng_name = fetch_eng_name(dart_key, corp_code)
+        except QuotaExceeded as e:
+            print(f"[STOP] {e} — 남은 {len(rows) - i + 1}건은 다음 실행에서 처리")
+            break
         print(f"  [{i}/{len(rows)}] {corp_name} ({stock_code}) → {eng_name or '(없음)'}")
 
         if eng_name:
@@ -115,14 +126,21 @@ def main():
             _flush(sb, updates)
             updates = []
 
-        time.sleep(RATE_LIMIT)
-
     # 나머지 저장
     if not args.dry_run and updates:
         _flush(sb, updates)
 
     print(f"[DONE] 영문명 수집 완료")
 
+    # 캐시 무효화 — /v1/companies/lookup 인덱스 재빌드 트리거
+    if not args.dry_run:
+        try:
+            from backend.core.cache import cache_delete_pattern
+            deleted = asyncio.run(cache_delete_pattern("v1:companies:*"))
+            print(f"[cache] 무효화 완료: v1:companies:* ({deleted}개 삭제)")
+        except Exception as e:
+            print(f"[cache] 무효화 실패 (무시): {e}")
+
 
 if __name__ == "__main__":
     main()
@@ -15,13 +15,19 @@ Cron (연 2회):
 
 import os
 import sys
-import time
 import logging
 import argparse
 import requests
 from datetime import datetime
+from pathlib import Path
 from supabase import create_client, Client
 
+_ROOT = Path(__file__).resolve().parent.parent
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
+from scripts.dart_quota import get_dart_limiter, QuotaExceeded
+
 # ── 로깅 ──────────────────────────────────────────────────────────────────────
 logging.basicConfig(
     level=logging.INFO,
@@ -36,9 +42,11 @@ SUPABASE_URL   = os.environ.get("NEXT_PUBLIC_SUPABASE_URL", "")
 SUPABASE_KEY   = os.environ.get("SUPABASE_SERVICE_ROLE_KEY", "")
 
 REPRT_CODE     = "11011"   # 사업보고서(연간)만 사용
-RATE_LIMIT     = 0.7       # DART API 100 req/min 기준
 BATCH_SIZE     = 50        # Supabase upsert 배치
 
+# 호출 속도·일일 쿼터는 공용 제한기가 관리 (dart_crawler 등과 공유, 당일 수집이 우선)
+dart_limiter   = get_dart_limiter("fetch_financials", priority="bulk")
+
 # 금융업 sector 목록 (companies 테이블 기준)
 FINANCIAL_SECTORS = {"금융", "금융지원서비스", "보험·연금", "지주회사(금융)"}
 
@@ -101,6 +109,7 @@ def _fetch_dart_financials(corp_code: str, year: int) -> dict | None:
         "bsns_year": str(year),
         "reprt_code": REPRT_CODE,
     }
+    dart_limiter.acquire()
     try:
         res = requests.get(url, params=params, timeout=10)
         data = res.json()
@@ -108,6 +117,8 @@ def _fetch_dart_financials(corp_code: str, year: int) -> dict | None:
         logger.warning(f"  ⚠ DART 호출 실패: {e}")
         return None
 
+    if data.get("status") == "020":
+        dart_limiter.backoff(10.0)
     if data.get("status") != "000":
         return None
 
@@ -169,8 +180,15 @@ def main():
         is_fin     = stock_code in financial_sector_codes
 
         for year in years:
-            result = _fetch_dart_financials(corp_code, year)
-            time.sleep(RATE_LIMIT)
+            try:
+                result = _fetch_dart_financials(corp_code, year)
+            except QuotaExceeded as e:
+                # 쿼터 상한 — 모은 행만 저장하고 종료 (다음 실행에서 이어서)
+                logger.error(f"⛔ {e}")
+                if rows:
+                    _flush(sb, rows)
+                logger.info(f"\n[STOP] 성공={success} 스킵={skip} 실패={fail}")
+                sys.exit(1)
 
             if result is None:
                 skip += 1
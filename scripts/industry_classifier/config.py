@@ -42,7 +42,8 @@ CACHE_DIR = DATA_DIR / "cache"
 CORP_CODE_CACHE_HOURS = 24  # 기업코드 매핑 캐시 유지 시간
 
 # API 호출 제한
-DART_API_RATE_LIMIT = 1.0  # 초당 최대 요청 수
+# 호출 속도·일일 쿼터는 scripts/dart_quota.py 공용 제한기가 관리 (DART_RATE_PER_SEC)
+DART_API_RATE_LIMIT = 1.0  # (미사용 — 하위 호환용)
 DART_API_TIMEOUT = 30  # API 타임아웃 (초)
 
 # 로깅 설정
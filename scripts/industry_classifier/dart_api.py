@@ -10,7 +10,6 @@ DART API Client
 """
 
 import logging
-import time
 import zipfile
 from pathlib import Path
 from typing import Optional
@@ -24,10 +23,10 @@ from .config import (
     DART_CORP_CODE_URL,
     DART_CORP_CODE_ZIP_PATH,
     DART_CORP_CODE_XML_PATH,
-    DART_API_RATE_LIMIT,
     DART_API_TIMEOUT,
     get_dart_api_key,
 )
+from scripts.dart_quota import get_dart_limiter
 
 logger = logging.getLogger(__name__)
 
@@ -44,19 +43,16 @@ class DARTClient:
         """
         self.api_key = api_key or get_dart_api_key()
         self.base_url = DART_API_BASE_URL
-        self.last_request_time = 0
+        self.limiter = get_dart_limiter("industry_classifier", priority="bulk")
         self.corp_code_map = {}  # {stock_code: {corp_code, corp_name}}
         logger.info("DART Client 초기화 완료")
 
     def _rate_limit(self):
         """
         API 호출 속도 제한 (Rate Limiting)
+        같은 DART 키를 쓰는 다른 스크립트와 속도·일일 쿼터 공유 (scripts/dart_quota.py)
         """
-        elapsed = time.time() - self.last_request_time
-        if elapsed < (1.0 / DART_API_RATE_LIMIT):
-            sleep_time = (1.0 / DART_API_RATE_LIMIT) - elapsed
-            time.sleep(sleep_time)
-        self.last_request_time = time.time()
+        self.limiter.acquire()
 
     def download_corp_code(self, force_refresh: bool = False) -> Path:
         """
@@ -17,7 +17,6 @@ DB를 사용하여 성능을 개선합니다.
 """
 
 import logging
-import time
 from typing import Optional, Dict
 import sys
 from pathlib import Path
@@ -29,10 +28,10 @@ sys.path.insert(0, str(PROJECT_ROOT))
 from utils.env_loader import load_env, get_supabase_config
 from .config import (
     DART_API_BASE_URL,
-    DART_API_RATE_LIMIT,
     DART_API_TIMEOUT,
     get_dart_api_key,
 )
+from scripts.dart_quota import get_dart_limiter
 
 # 환경변수 로드
 load_env()
@@ -55,7 +54,7 @@ class DARTDBClient:
         """
         self.api_key = api_key or get_dart_api_key()
         self.base_url = DART_API_BASE_URL
-        self.last_request_time = 0
+        self.limiter = get_dart_limiter("industry_classifier", priority="bulk")
 
         # Supabase 클라이언트 초기화
         try:
@@ -71,12 +70,9 @@ class DARTDBClient:
     def _rate_limit(self):
         """
         API 호출 속도 제한 (Rate Limiting)
+        같은 DART 키를 쓰는 다른 스크립트와 속도·일일 쿼터 공유 (scripts/dart_quota.py)
         """
-        elapsed = time.time() - self.last_request_time
-        if elapsed < (1.0 / DART_API_RATE_LIMIT):
-            sleep_time = (1.0 / DART_API_RATE_LIMIT) - elapsed
-            time.sleep(sleep_time)
-        self.last_request_time = time.time()
+        self.limiter.acquire()
 
     def get_corp_code(self, stock_code: str) -> Optional[Dict]:
         """
@@ -0,0 +1,269 @@
+"""
+scripts/llm_backends.py
+=======================
+AIAnalyst LLM 백엔드 (실제 Gemini / 오프라인 대체).
+
+분석 파이프라인 부하 시험을 할 때마다 Gemini 크레딧이 들었습니다.
+AIAnalyst 는 이제 SDK 를 직접 부르지 않고 백엔드의 generate() 만 호출하므로,
+LLM_BACKEND=standin 으로 같은 경로(claim → 프롬프트 → 파싱 → 스코어 → 저장)를 비용 없이 돌릴 수 있습니다.
+
+구성:
+  LLMResponse       text + 입력·출력 토큰 (SDK 응답 형태와 무관한 공통 결과)
+  GeminiBackend     google-genai SDK (유료). SDK 는 생성 시점에만 import
+  StandInBackend    로컬 대체 — 프롬프트의 제목·본문으로 스키마에 맞는 JSON 을 만들어 반환
+                      - 단건 / 배치(=== ITEM <id> ===) 프롬프트 모두 지원
+                      - event_type 은 제목 유형 힌트(disclosure_rules), 수치는 본문 숫자에서
+                      - 같은 입력이면 같은 결과 (sentiment_score 등은 입력 해시로 결정)
+                      - 지연·오류 비율 설정 가능: 429(엔진 백오프 경로) / 5xx / 잘린 JSON(파싱 실패 경로)
+  get_backend()     프로세스당 1개 (LLM_BACKEND 환경변수로 선택)
+
+환경변수:
+  LLM_BACKEND                gemini | standin                 (기본 gemini)
+  GEMINI_API_KEY             Gemini API 키
+  LLM_STANDIN_LATENCY        대체 응답 평균 지연 초            (기본 0.8)
+  LLM_STANDIN_JITTER         지연 변동 비율 (±)                (기본 0.3)
+  LLM_STANDIN_SEC_PER_1K_OUT 출력 1천 토큰당 추가 지연 초      (기본 0 — 배치 응답이 길수록 느려지게 할 때)
+  LLM_STANDIN_429_RATE       429 RESOURCE_EXHAUSTED 비율       (기본 0)
+  LLM_STANDIN_ERROR_RATE     5xx 오류 비율                     (기본 0)
+  LLM_STANDIN_BAD_JSON_RATE  잘린 JSON 응답 비율               (기본 0)
+  LLM_STANDIN_SEED           난수 시드 (지연·오류 재현용)       (기본 없음)
+
+사용 예시:
+  from llm_backends import get_backend
+
+  backend = get_backend()
+  resp = backend.generate(system_prompt, user_prompt)
+  result = json.loads(resp.text)
+
+  LLM_BACKEND=standin LLM_STANDIN_LATENCY=1.5 LLM_STANDIN_429_RATE=0.02 python scripts/bench_analyst.py --limit 200
+"""
+
+import hashlib
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+
+try:
+    from .disclosure_rules import hint_types
+    from .llm_engine import estimate_tokens
+except ImportError:
+    from disclosure_rules import hint_types
+    from llm_engine import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+GEMINI_MODEL = "gemini-2.5-flash"
+MAX_OUTPUT_TOKENS = 8192   # 장문 DART 본문 대응 (기존 2400 → truncation 발생)
+
+
+@dataclass
+class LLMResponse:
+    text: str
+    prompt_tokens: int = 0
+    output_tokens: int = 0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.output_tokens
+
+
+class LLMBackend(ABC):
+    """generate(system, user) → LLMResponse. 속도 제한·429 재시도는 호출 측(llm_engine)이 담당."""
+
+    model = ""
+    cacheable = True   # False 면 AIAnalyst 가 결과 캐시(llm_cache)를 쓰지 않음
+
+    @abstractmethod
+    def generate(self, system_prompt: str, user_prompt: str,
+                 max_output_tokens: int = MAX_OUTPUT_TOKENS) -> LLMResponse:
+        ...
+
+
+# ── Gemini (google-genai SDK, 유료) ───────────────────────────────────────────
+
+class GeminiBackend(LLMBackend):
+
+    def __init__(self, model: str = GEMINI_MODEL, api_key: str | None = None):
+        from google import genai
+        from google.genai import types as genai_types
+        self.model = model
+        self._types = genai_types
+        self._client = genai.Client(api_key=api_key or os.environ.get("GEMINI_API_KEY"))
+
+    def generate(self, system_prompt: str, user_prompt: str,
+                 max_output_tokens: int = MAX_OUTPUT_TOKENS) -> LLMResponse:
+        # thinking_budget=0: 2.5 Flash 기본 thinking 비활성화
+        #   → thinking 토큰이 output 예산 소진하는 문제 방지
+        #   → JSON 구조화 출력에는 thinking 불필요 (비용 절감 효과도 있음)
+        response = self._client.models.generate_content(
+            model=self.model,
+            contents=user_prompt,
+            config=self._types.GenerateContentConfig(
+                system_instruction=system_prompt,
+                response_mime_type="application/json",
+                temperature=0.2,
+                max_output_tokens=max_output_tokens,
+                thinking_config=self._types.ThinkingConfig(thinking_budget=0),
+            ),
+        )
+        meta = getattr(response, "usage_metadata", None)
+        return LLMResponse(
+            text=response.text,
+            prompt_tokens=getattr(meta, "prompt_token_count", None) or 0,
+            output_tokens=getattr(meta, "candidates_token_count", None) or 0,
+        )
+
+
+# ── 오프라인 대체 ─────────────────────────────────────────────────────────────
+
+class StandInError(Exception):
+    """대체 백엔드의 흉내 오류. code=429 는 llm_engine.is_rate_limited 가 재시도 대상으로 판별."""
+
+    def __init__(self, code: int, message: str):
+        super().__init__(f"{code} {message} (stand-in)")
+        self.code = code
+
+
+_ITEM_RE = re.compile(r"^=== ITEM (\S+) ===$", re.M)
+_TITLE_RE = re.compile(r"^Title: (.*)$", re.M)
+_COMPANY_RE = re.compile(r"^Company: (.*)$", re.M)
+_NUMBER_RE = re.compile(r"\d[\d,]*(?:\.\d+)?\s*(?:%|원|주|억원|조원)?")
+
+_SENTIMENT_BIAS = {
+    "EARNINGS": 0.1, "CONTRACT": 0.4, "DILUTION": -0.5, "BUYBACK": 0.4, "DISPOSAL": -0.4,
+    "DIVIDEND": 0.3, "MNA": 0.2, "LEGAL": -0.5, "CAPEX": 0.2, "EXECUTIVE_CHANGE": 0.0, "OTHER": 0.0,
+}
+
+
+class StandInBackend(LLMBackend):
+    """
+    프롬프트만 보고 스키마에 맞는 분석 JSON 을 만들어 주는 로컬 대체 (네트워크·비용 없음).
+    분석 품질이 아니라 파이프라인 처리량·오류 경로를 재기 위한 것.
+    """
+
+    model = "standin"
+    cacheable = False   # 대체 응답이 운영 결과 캐시에 섞이지 않도록
+
+    def __init__(
+        self,
+        latency: float | None = None,
+        jitter: float | None = None,
+        sec_per_1k_out: float | None = None,
+        rate_limit_rate: float | None = None,
+        error_rate: float | None = None,
+        bad_json_rate: float | None = None,
+        seed: int | None = None,
+    ):
+        def pick(value, name, default):
+            return _env_float(name, default) if value is None else value
+
+        self.latency         = max(0.0, pick(latency, "LLM_STANDIN_LATENCY", 0.8))
+        self.jitter          = min(1.0, max(0.0, pick(jitter, "LLM_STANDIN_JITTER", 0.3)))
+        self.sec_per_1k_out  = max(0.0, pick(sec_per_1k_out, "LLM_STANDIN_SEC_PER_1K_OUT", 0.0))
+        self.rate_limit_rate = pick(rate_limit_rate, "LLM_STANDIN_429_RATE", 0.0)
+        self.error_rate      = pick(error_rate, "LLM_STANDIN_ERROR_RATE", 0.0)
+        self.bad_json_rate   = pick(bad_json_rate, "LLM_STANDIN_BAD_JSON_RATE", 0.0)
+        if seed is None and os.environ.get("LLM_STANDIN_SEED"):
+            seed = int(_env_float("LLM_STANDIN_SEED", 0))
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def generate(self, system_prompt: str, user_prompt: str,
+                 max_output_tokens: int = MAX_OUTPUT_TOKENS) -> LLMResponse:
+        with self._lock:
+            roll = self._rng.random()
+            jitter = self._rng.uniform(1 - self.jitter, 1 + self.jitter)
+
+        items = _ITEM_RE.split(user_prompt)
+        if len(items) > 1:
+            # split 결과: [머리말, id1, 본문1, id2, 본문2, ...]
+            results = [dict(self._analysis(body), id=item_id) for item_id, body in zip(items[1::2], items[2::2])]
+            text = json.dumps({"results": results}, ensure_ascii=False)
+        else:
+            text = json.dumps(self._analysis(user_prompt), ensure_ascii=False)
+        output_tokens = min(estimate_tokens(text), max_output_tokens)
+        time.sleep(self.latency * jitter + self.sec_per_1k_out * output_tokens / 1000)
+
+        # 오류 판정은 지연 뒤에 — 실제 API 처럼 실패한 요청도 왕복 시간은 쓴다
+        if roll < self.rate_limit_rate:
+            raise StandInError(429, "RESOURCE_EXHAUSTED")
+        roll -= self.rate_limit_rate
+        if roll < self.error_rate:
+            raise StandInError(503, "UNAVAILABLE")
+        roll -= self.error_rate
+        if roll < self.bad_json_rate:
+            text = text[: len(text) // 2]   # max_output_tokens 초과로 잘린 응답 흉내
+
+        return LLMResponse(
+            text=text,
+            prompt_tokens=estimate_tokens(system_prompt + user_prompt),
+            output_tokens=output_tokens,
+        )
+
+    @staticmethod
+    def _analysis(prompt: str) -> dict:
+        title_m = _TITLE_RE.search(prompt)
+        company_m = _COMPANY_RE.search(prompt)
+        title = title_m.group(1).strip() if title_m else ""
+        company = company_m.group(1).strip() if company_m else "Company"
+        body = prompt[title_m.end():] if title_m else prompt
+
+        event_type = hint_types(title)[0]
+        digest = hashlib.sha256(prompt.encode("utf-8")).digest()
+        noise = (digest[0] / 255 - 0.5) * 0.4
+        sentiment = round(max(-1.0, min(1.0, _SENTIMENT_BIAS.get(event_type, 0.0) + noise)), 2)
+
+        figures = list(dict.fromkeys(m.group(0).strip() for m in _NUMBER_RE.finditer(body)))[:5]
+        if len(figures) < 3:
+            figures += [f"{digest[1] + 1}%", f"{digest[2] * 100 + 100} 100M KRW", "2026-01-01"][: 3 - len(figures)]
+        key_numbers = [f"• Figure {i}: {v}" for i, v in enumerate(figures, 1)]
+        impact = "POSITIVE" if sentiment > 0.15 else "NEGATIVE" if sentiment < -0.15 else "NEUTRAL"
+
+        return {
+            "report_nm": f"{event_type.title().replace('_', ' ')} Disclosure",
+            "headline": f"{company[:30]} {event_type.lower()} update",
+            "key_numbers": key_numbers,
+            "event_type": event_type,
+            "financial_impact": impact,
+            "short_term_impact_score": 1 + digest[3] % 5,
+            "sentiment_score": sentiment,
+            "ai_summary": (
+                f"{company} filed a {event_type.lower()} disclosure. "
+                f"Key figures: {', '.join(figures[:3])}. Stand-in analysis for offline benchmarking."
+            ),
+            "risk_factors": "Stand-in response — no real analysis.",
+        }
+
+
+# ── 선택 ──────────────────────────────────────────────────────────────────────
+
+_backend: LLMBackend | None = None
+_backend_lock = threading.Lock()
+
+
+def get_backend() -> LLMBackend:
+    """프로세스 공용 백엔드 (LLM_BACKEND 환경변수, 알 수 없는 값이면 gemini)."""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            name = os.environ.get("LLM_BACKEND", "gemini").strip().lower()
+            if name == "standin":
+                _backend = StandInBackend()
+                logger.warning("[llm] LLM_BACKEND=standin — 오프라인 대체 응답 사용 (실제 분석 아님)")
+            else:
+                _backend = GeminiBackend()
+        return _backend
@@ -0,0 +1,236 @@
+"""
+scripts/llm_cache.py
+====================
+LLM 공시 분석 결과 영속 캐시 (로컬 SQLite).
+
+backfill_scores.py / reprocess_db.py --step reanalyze / eval_quality.py 를 다시 돌릴 때마다
+이미 같은 프롬프트로 분석한 공시를 Gemini 에 다시 보내던 것을 디스크에서 재사용합니다.
+
+키 규칙:
+  sha256(model, prompt_version, corp_name, report_nm, content)
+    prompt_version  프롬프트 템플릿 지문 (prompt_fingerprint) — 프롬프트를 고치면 자동으로 miss
+  → 모델·프롬프트·입력이 모두 같을 때만 hit. 내용이 바뀐 공시(재수집·정정)는 새로 분석.
+
+저장 대상: 스키마 검증을 통과한 결과만 (실패·잘린 응답은 다음 실행에서 다시 시도).
+저장 시 원래 호출의 입력·출력 토큰을 함께 기록 → hit 때 절약한 토큰·비용으로 집계.
+
+보관: 마지막 사용(저장 또는 hit)이 LLM_CACHE_KEEP_DAYS 보다 오래된 항목은 시작 시 삭제
+      (예전 prompt_version 항목이 자연히 정리됨).
+
+환경변수:
+  LLM_CACHE             0 이면 캐시 비활성화  (기본 1 — 모델 변동성 자체를 측정할 때 0)
+  LLM_CACHE_DB          SQLite 경로           (기본 scripts/data/llm_cache.db)
+  LLM_CACHE_KEEP_DAYS   보관 일수             (기본 180)
+  GEMINI_PRICE_IN       입력 USD / 1M tokens  (기본 0.30 — 2.5 Flash)
+  GEMINI_PRICE_OUT      출력 USD / 1M tokens  (기본 2.50)
+
+사용 예시:
+  from llm_cache import get_llm_cache, cache_key, prompt_fingerprint
+
+  cache = get_llm_cache()
+  key = cache_key(model, version, corp_name, report_nm, content)
+  result = cache.get(key) if cache else None
+  if result is None:
+      result = call_llm(...)
+      if cache:
+          cache.put(key, model, version, result, prompt_tokens, output_tokens)
+
+사용량 확인:
+  python scripts/llm_cache.py
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB = Path(__file__).resolve().parent / "data" / "llm_cache.db"
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+PRICE_IN  = _env_float("GEMINI_PRICE_IN", 0.30)    # USD / 1M input tokens
+PRICE_OUT = _env_float("GEMINI_PRICE_OUT", 2.50)   # USD / 1M output tokens
+KEEP_DAYS = _env_float("LLM_CACHE_KEEP_DAYS", 180)
+
+
+def estimate_cost(prompt_tokens: int, output_tokens: int) -> float:
+    """토큰 수 → USD (GEMINI_PRICE_IN / GEMINI_PRICE_OUT 기준)."""
+    return (prompt_tokens * PRICE_IN + output_tokens * PRICE_OUT) / 1e6
+
+
+def prompt_fingerprint(*templates: str) -> str:
+    """프롬프트 템플릿 문자열들 → 12자리 버전 지문."""
+    h = hashlib.sha256()
+    for t in templates:
+        h.update((t or "").encode("utf-8"))
+        h.update(b"\x1f")
+    return h.hexdigest()[:12]
+
+
+def cache_key(model: str, prompt_version: str, corp_name, report_nm, content) -> str:
+    h = hashlib.sha256()
+    for part in (model, prompt_version, corp_name, report_nm, content):
+        h.update(str(part or "").encode("utf-8", errors="ignore"))
+        h.update(b"\x1f")
+    return h.hexdigest()
+
+
+class LlmResultCache:
+    """분석 결과 SQLite 캐시 (스레드 안전, 여러 프로세스가 같은 파일 공유 가능)."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._stats = {"hit": 0, "miss": 0, "put": 0, "saved_prompt_tokens": 0, "saved_output_tokens": 0}
+        self._conn = sqlite3.connect(
+            str(self.path), timeout=10.0, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " key TEXT PRIMARY KEY, model TEXT NOT NULL, prompt_version TEXT NOT NULL,"
+            " result TEXT NOT NULL, prompt_tokens INTEGER NOT NULL, output_tokens INTEGER NOT NULL,"
+            " created_at REAL NOT NULL, used_at REAL NOT NULL, hits INTEGER NOT NULL DEFAULT 0"
+            ") WITHOUT ROWID"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_results_used ON results (used_at)")
+        if KEEP_DAYS > 0:
+            cur = self._conn.execute(
+                "DELETE FROM results WHERE used_at < ?", (time.time() - KEEP_DAYS * 86400,)
+            )
+            if cur.rowcount:
+                logger.info(f"[llm-cache] {KEEP_DAYS:.0f}일 이상 미사용 {cur.rowcount}건 삭제")
+
+    # ── 조회 / 저장 ───────────────────────────────────────────────────────────
+
+    def get(self, key: str) -> Optional[dict]:
+        """hit 이면 새 dict 반환 (호출자가 수정해도 캐시에 영향 없음)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result, prompt_tokens, output_tokens FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            if not row:
+                self._stats["miss"] += 1
+                return None
+            try:
+                result = json.loads(row[0])
+            except ValueError:
+                self._conn.execute("DELETE FROM results WHERE key = ?", (key,))
+                self._stats["miss"] += 1
+                return None
+            self._conn.execute(
+                "UPDATE results SET hits = hits + 1, used_at = ? WHERE key = ?", (time.time(), key)
+            )
+            self._stats["hit"] += 1
+            self._stats["saved_prompt_tokens"] += row[1]
+            self._stats["saved_output_tokens"] += row[2]
+        return result
+
+    def put(
+        self,
+        key: str,
+        model: str,
+        prompt_version: str,
+        result: dict,
+        prompt_tokens: int = 0,
+        output_tokens: int = 0,
+    ) -> None:
+        now = time.time()
+        payload = json.dumps(result, ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results"
+                " (key, model, prompt_version, result, prompt_tokens, output_tokens, created_at, used_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, model, prompt_version, payload, int(prompt_tokens or 0), int(output_tokens or 0), now, now),
+            )
+            self._stats["put"] += 1
+
+    # ── 통계 ──────────────────────────────────────────────────────────────────
+
+    def stats(self) -> dict:
+        with self._lock:
+            s = dict(self._stats)
+        s["saved_usd"] = estimate_cost(s["saved_prompt_tokens"], s["saved_output_tokens"])
+        return s
+
+    def summary(self) -> str:
+        s = self.stats()
+        total = s["hit"] + s["miss"]
+        rate = s["hit"] / total * 100 if total else 0.0
+        return (
+            f"hit {s['hit']} / miss {s['miss']} ({rate:.0f}%) / 저장 {s['put']} — "
+            f"절약 입력 {s['saved_prompt_tokens']:,} · 출력 {s['saved_output_tokens']:,} 토큰 "
+            f"(≈ ${s['saved_usd']:.4f})"
+        )
+
+    def report(self) -> list[tuple]:
+        """(model, prompt_version, 항목 수, 누적 hit, 누적 절약 USD, 마지막 사용) 목록."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT model, prompt_version, COUNT(*), SUM(hits),"
+                " SUM(hits * prompt_tokens), SUM(hits * output_tokens), MAX(used_at)"
+                " FROM results GROUP BY model, prompt_version ORDER BY MAX(used_at) DESC"
+            ).fetchall()
+        return [
+            (model, ver, n, hits, estimate_cost(pt or 0, ot or 0), used)
+            for model, ver, n, hits, pt, ot, used in rows
+        ]
+
+
+# ── 싱글톤 (lazy init, 1회만 시도) ────────────────────────────────────────────
+
+_cache: Optional[LlmResultCache] = None
+_cache_initialized: bool = False
+_init_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[LlmResultCache]:
+    """
+    결과 캐시 인스턴스 반환.
+    - LLM_CACHE=0 → None (비활성화)
+    - 열기 실패   → None (캐시 없이 매번 호출)
+    """
+    global _cache, _cache_initialized
+    with _init_lock:
+        if _cache_initialized:
+            return _cache
+        _cache_initialized = True
+        if os.environ.get("LLM_CACHE", "1").strip().lower() in ("0", "false", "no", "off"):
+            return None
+
+        path = os.environ.get("LLM_CACHE_DB") or str(DEFAULT_DB)
+        try:
+            _cache = LlmResultCache(path)
+            logger.info(f"[llm-cache] 사용: {path}")
+        except Exception as e:
+            logger.warning(f"[llm-cache] 열기 실패 ({e}) → 캐시 없이 진행")
+        return _cache
+
+
+if __name__ == "__main__":
+    from datetime import datetime
+
+    cache = get_llm_cache()
+    if cache is None:
+        print("LLM 캐시 비활성화 (LLM_CACHE=0) 또는 열기 실패")
+        raise SystemExit(1)
+    print(f"LLM 결과 캐시: {cache.path}")
+    print(f"  {'model':20s} {'prompt':12s} {'항목':>7s} {'hit':>7s} {'절약 USD':>10s}  마지막 사용")
+    for model, ver, n, hits, usd, used in cache.report():
+        print(f"  {model:20s} {ver:12s} {n:7d} {hits or 0:7d} {usd:10.4f}  "
+              f"{datetime.fromtimestamp(used):%Y-%m-%d %H:%M}")
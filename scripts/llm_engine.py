@@ -0,0 +1,305 @@
+"""
+scripts/llm_engine.py
+=====================
+LLM 공시 분석 동시 실행 엔진 (auto_analyst / backfill_scores / reprocess_db 공용).
+
+기존에는 공시를 한 건씩 순차 분석하고 매 건 time.sleep(4.0) 으로 속도를 맞춰
+Gemini 티어 한도와 무관하게 분당 ~15건에 묶여 있었습니다.
+여기서는 속도를 요청 간 고정 대기가 아니라 분당 한도로 제어하고, 한도 안에서 여러 건을 동시에 처리합니다.
+
+구성:
+  RateLimiter     분당 요청 수(RPM) + 분당 토큰 수(TPM) 토큰 버킷.
+                  호출 전 예상 토큰으로 선차감 → 응답의 실제 사용량으로 정산.
+  AnalysisEngine
+    call(fn)        제한기 통과 후 fn() 실행. 429 / RESOURCE_EXHAUSTED 면
+                    지터 포함 지수 백오프(전체 일시 정지) 후 재시도, 그 외 예외는 그대로 전달
+    map(fn, items)  최대 workers 개 스레드로 동시 처리.
+                    SIGINT/SIGTERM 또는 shutdown() → 새 항목은 시작하지 않고
+                    진행 중인 항목만 마무리한 뒤 반환 (두 번째 신호는 즉시 중단)
+  get_engine()    프로세스당 1개 — 같은 API 키를 쓰는 호출이 한 제한기를 공유
+
+환경변수:
+  LLM_WORKERS       동시 분석 스레드 수        (기본 4)
+  LLM_RPM           분당 요청 상한             (기본 60)
+  LLM_TPM           분당 토큰 상한             (기본 900000)
+  LLM_MAX_RETRIES   429 재시도 횟수            (기본 4)
+
+제한은 프로세스 단위입니다. 같은 키로 여러 배치를 동시에 돌릴 때는 LLM_RPM / LLM_TPM 을 나눠 설정하세요.
+
+사용 예시:
+  from llm_engine import get_engine
+
+  engine = get_engine()
+  resp = engine.call(lambda: client.models.generate_content(...), est_tokens=3000)
+  stats = engine.map(process_one, rows, label="analyst")
+"""
+
+import logging
+import os
+import random
+import signal
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable
+
+logger = logging.getLogger(__name__)
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+LLM_WORKERS     = int(_env_float("LLM_WORKERS", 4))
+LLM_RPM         = _env_float("LLM_RPM", 60)
+LLM_TPM         = _env_float("LLM_TPM", 900_000)
+LLM_MAX_RETRIES = int(_env_float("LLM_MAX_RETRIES", 4))
+
+BACKOFF_BASE_SEC = 5.0    # 429 첫 재시도 대기 (이후 2배씩, 지터 ±50%)
+BACKOFF_MAX_SEC  = 60.0
+
+
+def estimate_tokens(text: str) -> int:
+    """문자 수 기반 토큰 추정 (한글 ≈ 1자 1토큰, 영문·숫자 ≈ 4자 1토큰)."""
+    if not text:
+        return 0
+    non_ascii = sum(1 for ch in text if ord(ch) > 127)
+    return non_ascii + (len(text) - non_ascii) // 4 + 1
+
+
+def is_rate_limited(exc: BaseException) -> bool:
+    """Gemini(google-genai) / Groq 429 예외 판별 (SDK 별 예외 클래스에 의존하지 않음)."""
+    code = getattr(exc, "code", None) or getattr(exc, "status_code", None)
+    if code == 429:
+        return True
+    msg = str(exc)
+    return "429" in msg or "RESOURCE_EXHAUSTED" in msg or "rate limit" in msg.lower()
+
+
+class RateLimiter:
+    """
+    RPM + TPM 토큰 버킷 (스레드 안전).
+    요청 버킷 용량은 5초치 — 정지 해제 직후 워커가 한꺼번에 몰리지 않도록.
+    """
+
+    def __init__(self, rpm: float, tpm: float):
+        self.rpm = max(1.0, rpm)
+        self.tpm = max(1.0, tpm)
+        self.req_burst = max(1.0, self.rpm / 12)
+        self._req = self.req_burst
+        self._tok = self.tpm
+        self._last = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        dt = now - self._last
+        self._last = now
+        self._req = min(self.req_burst, self._req + dt * self.rpm / 60)
+        self._tok = min(self.tpm, self._tok + dt * self.tpm / 60)
+
+    def acquire(self, tokens: int = 0) -> None:
+        """요청 1건 + tokens 확보까지 대기 (한 건이 TPM 보다 크면 버킷 최대치로 취급)."""
+        tokens = min(float(tokens), self.tpm)
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now >= self._paused_until and self._req >= 1.0 and self._tok >= tokens:
+                    self._req -= 1.0
+                    self._tok -= tokens
+                    return
+                wait_sec = max(
+                    self._paused_until - now,
+                    (1.0 - self._req) * 60 / self.rpm,
+                    (tokens - self._tok) * 60 / self.tpm,
+                    0.01,
+                )
+            time.sleep(wait_sec)
+
+    def settle(self, delta: int) -> None:
+        """실제 사용량 - 예상치 정산 (음수면 반환, 양수면 빚 → 다음 호출이 그만큼 대기)."""
+        with self._lock:
+            self._tok = min(self.tpm, self._tok - delta)
+
+    def pause(self, seconds: float) -> None:
+        """429 수신: 모든 호출을 seconds 동안 멈추고, 재개 후에는 정상 속도로 하나씩."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._req = 0.0
+
+
+@dataclass
+class EngineStats:
+    done: int = 0           # fn 정상 종료
+    failed: int = 0         # fn 이 False 반환 또는 예외
+    skipped: int = 0        # fn 이 None 반환 (다른 워커가 처리 중 / 분석 불필요)
+    unstarted: int = 0      # 종료 신호로 시작하지 않은 항목
+    rate_limited: int = 0   # 이번 map 중 429 재시도 횟수
+    elapsed: float = 0.0
+
+    def summary(self) -> str:
+        rate = self.done / self.elapsed * 60 if self.elapsed else 0.0
+        return (
+            f"완료 {self.done} / 실패 {self.failed} / skip {self.skipped} / 미시작 {self.unstarted} / "
+            f"429 {self.rate_limited}회 "
+            f"— {self.elapsed:.0f}초 ({rate:.1f}건/분)"
+        )
+
+
+class AnalysisEngine:
+
+    def __init__(
+        self,
+        workers: int = LLM_WORKERS,
+        rpm: float = LLM_RPM,
+        tpm: float = LLM_TPM,
+        max_retries: int = LLM_MAX_RETRIES,
+    ):
+        self.workers = max(1, workers)
+        self.limiter = RateLimiter(rpm, tpm)
+        self.max_retries = max(0, max_retries)
+        self.stop_event = threading.Event()
+        self._lock = threading.Lock()
+        self.rate_limited = 0
+
+    @property
+    def stopping(self) -> bool:
+        return self.stop_event.is_set()
+
+    def shutdown(self) -> None:
+        """새 항목 시작 중단 (진행 중인 항목은 끝까지 처리)."""
+        if not self.stop_event.is_set():
+            logger.warning("[llm] 종료 요청 — 진행 중인 분석만 마무리합니다")
+        self.stop_event.set()
+
+    # ── 단건 호출 ────────────────────────────────────────────────────────────
+
+    def call(
+        self,
+        fn: Callable[[], Any],
+        est_tokens: int = 0,
+        usage: Callable[[Any], int | None] | None = None,
+    ) -> Any:
+        """
+        fn() 을 제한기 안에서 실행하고 결과 반환.
+        usage(result) 가 실제 토큰 수를 주면 예상치와의 차이를 정산한다.
+        """
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire(est_tokens)
+            try:
+                result = fn()
+            except Exception as e:
+                if not is_rate_limited(e) or attempt >= self.max_retries:
+                    raise
+                self.limiter.settle(-est_tokens)   # 거절된 요청은 토큰 미사용
+                delay = min(BACKOFF_MAX_SEC, BACKOFF_BASE_SEC * 2 ** attempt) * random.uniform(0.5, 1.5)
+                with self._lock:
+                    self.rate_limited += 1
+                logger.warning(f"[llm] 429 → {delay:.1f}초 정지 후 재시도 ({attempt + 1}/{self.max_retries})")
+                self.limiter.pause(delay)
+                continue
+
+            if usage is not None:
+                try:
+                    actual = usage(result)
+                except Exception:
+                    actual = None
+                if actual:
+                    self.limiter.settle(actual - est_tokens)
+            return result
+
+    # ── 동시 처리 ────────────────────────────────────────────────────────────
+
+    def map(self, fn: Callable[[Any], Any], items: Iterable, label: str = "llm") -> EngineStats:
+        """
+        items 를 최대 workers 개씩 동시에 fn(item) 처리.
+        fn 반환값: False 또는 예외 → 실패 (예외는 로그만 남기고 계속) / None → skip / 그 외 → 완료.
+        """
+        stats = EngineStats()
+        started = time.monotonic()
+        limited_before = self.rate_limited
+        restore = self._install_signal_handlers()
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=label) as pool:
+                in_flight: set = set()
+                remaining = iter(items)
+                for item in remaining:
+                    if self.stop_event.is_set():
+                        stats.unstarted = 1 + sum(1 for _ in remaining)
+                        break
+                    in_flight.add(pool.submit(fn, item))
+                    if len(in_flight) >= self.workers:
+                        done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                        self._collect(done, stats)
+                done, _ = wait(in_flight)
+                self._collect(done, stats)
+        finally:
+            restore()
+        stats.rate_limited = self.rate_limited - limited_before
+        stats.elapsed = time.monotonic() - started
+        return stats
+
+    @staticmethod
+    def _collect(done, stats: EngineStats) -> None:
+        for fut in done:
+            try:
+                ok = fut.result()
+            except Exception as e:
+                logger.error(f"[llm] 처리 중 예외: {e}")
+                ok = False
+            if ok is False:
+                stats.failed += 1
+            elif ok is None:
+                stats.skipped += 1
+            else:
+                stats.done += 1
+
+    def _install_signal_handlers(self) -> Callable[[], None]:
+        """메인 스레드에서만: 첫 신호 → shutdown(), 두 번째 → 기본 동작(즉시 중단)."""
+        if threading.current_thread() is not threading.main_thread():
+            return lambda: None
+
+        previous = {}
+
+        def handler(signum, frame):
+            if self.stop_event.is_set():
+                signal.signal(signum, previous.get(signum) or signal.SIG_DFL)
+                raise KeyboardInterrupt
+            self.shutdown()
+
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                previous[sig] = signal.signal(sig, handler)
+            except (ValueError, OSError):
+                pass
+
+        def restore() -> None:
+            for sig, prev in previous.items():
+                try:
+                    signal.signal(sig, prev)
+                except (ValueError, OSError):
+                    pass
+
+        return restore
+
+
+_engine: AnalysisEngine | None = None
+_engine_lock = threading.Lock()
+
+
+def get_engine() -> AnalysisEngine:
+    """프로세스 공용 엔진 (환경변수 설정값)."""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = AnalysisEngine()
+            logger.info(
+                f"[llm] engine: workers={_engine.workers} rpm={_engine.limiter.rpm:.0f} "
+                f"tpm={_engine.limiter.tpm:.0f}"
+            )
+        return _engine
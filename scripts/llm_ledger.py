@@ -0,0 +1,283 @@
+"""
+scripts/llm_ledger.py
+=====================
+LLM 호출 원장 — AIAnalyst 의 호출마다 모델·토큰·지연·재시도·결과·최종 analysis_status 를 기록.
+
+지금까지 analyze_content 의 비용·지연은 로그 줄로만 남아 동시성(LLM_WORKERS)·배치(LLM_BATCH_*)·
+본문 압축(LLM_COMPACT) 을 실제 수치로 조정할 수 없었습니다.
+
+기록 단위: LLM 요청 1회 (배치 요청은 1행 — items 에 공시 수, disclosure_ids 에 공시 ID 목록)
+  latency_ms  마지막 시도의 모델 응답 시간
+  wall_ms     제한기 대기 + 429 백오프 포함 전체 시간
+  retries     429 재시도 횟수 (llm_engine)
+  outcome     ok / partial(배치 일부만 유효) / invalid(스키마 불일치) / parse_error / error / rate_limited
+  analysis_status  그 호출로 분석한 공시의 최종 상태 (completed / low_quality / pending / failed,
+                   배치에서 공시마다 다르면 mixed). 결과 캐시 hit·유사 중복 복사는 호출이 없으므로 기록 없음.
+
+쓰기:
+  공시 ID 가 있는 호출은 저장 단계(auto_analyst._apply_result)가 최종 상태를 알려줄 때까지 보류하고,
+  이후 버퍼에 모아 LLM_LEDGER_BATCH 건 또는 LLM_LEDGER_FLUSH_SEC 초마다 INSERT 1회로 기록.
+  저장 실패 시 버퍼에 되돌려 다음 flush 에서 재시도 (LLM_LEDGER_MAX_BUFFER 초과분은 오래된 것부터 버림).
+  테이블이 없으면 (migration 065 미적용) 경고 후 비활성화 — 분석은 그대로 진행.
+  프로세스 종료 시 (atexit) 보류 중인 호출까지 모두 기록.
+
+집계: llm_call_daily(p_since) RPC (일별 × 모델 × 단건/배치) → python scripts/check_llm_usage.py
+
+환경변수:
+  LLM_LEDGER              0 이면 비활성화                    (기본 1)
+  LLM_LEDGER_BATCH        INSERT 1회당 행 수                 (기본 200)
+  LLM_LEDGER_FLUSH_SEC    버퍼 최대 보관 초                  (기본 30)
+  LLM_LEDGER_MAX_BUFFER   저장 실패 시 보관할 최대 행 수      (기본 5000)
+  LLM_LEDGER_OPEN_SEC     최종 상태를 기다리는 최대 초       (기본 3600 — 넘으면 상태 없이 기록)
+
+사용 예시 (auto_analyst):
+  ledger = get_ledger(supabase, worker=ANALYST_WORKER_ID)
+  call = LlmCall.start(model, prompt_version, "single", [item_id])
+  ...                                  # 호출 후 call.prompt_tokens / latency_ms / outcome 채움
+  ledger.record(call)
+  ledger.resolve(item_id, "completed") # 저장 단계 — 보류 중인 호출에 최종 상태 기록
+"""
+
+import atexit
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+try:
+    from .llm_cache import estimate_cost
+except ImportError:
+    from llm_cache import estimate_cost
+
+logger = logging.getLogger(__name__)
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+LLM_LEDGER_BATCH      = max(1, int(_env_float("LLM_LEDGER_BATCH", 200)))
+LLM_LEDGER_FLUSH_SEC  = _env_float("LLM_LEDGER_FLUSH_SEC", 30)
+LLM_LEDGER_MAX_BUFFER = int(_env_float("LLM_LEDGER_MAX_BUFFER", 5000))
+LLM_LEDGER_OPEN_SEC   = _env_float("LLM_LEDGER_OPEN_SEC", 3600)
+
+TABLE = "llm_call_ledger"
+
+
+@dataclass
+class LlmCall:
+    model: str
+    prompt_version: str | None
+    mode: str                                  # single / batch
+    disclosure_ids: list[str]
+    called_at: str = ""
+    prompt_tokens: int = 0
+    output_tokens: int = 0
+    latency_ms: int | None = None
+    wall_ms: int | None = None                 # None → 요청 전 실패 (기록하지 않음)
+    retries: int = 0
+    outcome: str = "ok"
+    error: str | None = None
+    statuses: dict = field(default_factory=dict)
+    opened: float = field(default_factory=time.monotonic)
+
+    @classmethod
+    def start(cls, model: str, prompt_version: str | None, mode: str, refs) -> "LlmCall":
+        return cls(
+            model=model, prompt_version=prompt_version, mode=mode,
+            disclosure_ids=[str(r) for r in (refs or []) if r],
+            called_at=datetime.now(timezone.utc).isoformat(),
+        )
+
+    @property
+    def attempted(self) -> bool:
+        return self.wall_ms is not None
+
+    @property
+    def resolved(self) -> bool:
+        return len(self.statuses) >= len(self.disclosure_ids)
+
+    def analysis_status(self) -> str | None:
+        seen = {s for s in self.statuses.values() if s}
+        if len(seen) > 1:
+            return "mixed"
+        return seen.pop() if seen else None
+
+    def row(self, worker: str | None) -> dict:
+        cost = estimate_cost(self.prompt_tokens, self.output_tokens) if self.model.startswith("gemini") else 0.0
+        return {
+            "called_at":       self.called_at,
+            "worker":          worker,
+            "model":           self.model,
+            "prompt_version":  self.prompt_version,
+            "mode":            self.mode,
+            "items":           max(1, len(self.disclosure_ids)),
+            "disclosure_ids":  self.disclosure_ids or None,
+            "prompt_tokens":   self.prompt_tokens,
+            "output_tokens":   self.output_tokens,
+            "latency_ms":      self.latency_ms,
+            "wall_ms":         self.wall_ms,
+            "retries":         self.retries,
+            "outcome":         self.outcome,
+            "error":           (self.error or "")[:500] or None,
+            "analysis_status": self.analysis_status(),
+            "cost_usd":        round(cost, 6),
+        }
+
+
+class LlmLedger:
+
+    def __init__(self, sb, worker: str | None = None,
+                 batch_size: int = LLM_LEDGER_BATCH,
+                 flush_sec: float = LLM_LEDGER_FLUSH_SEC,
+                 max_buffer: int = LLM_LEDGER_MAX_BUFFER,
+                 open_sec: float = LLM_LEDGER_OPEN_SEC):
+        self.sb = sb
+        self.worker = worker
+        self.batch_size = batch_size
+        self.flush_sec = flush_sec
+        self.max_buffer = max(batch_size, max_buffer)
+        self.open_sec = open_sec
+        self.enabled = True
+        self.stats = Counter()
+        self._open: dict[str, list[LlmCall]] = {}   # 공시 ID → 최종 상태를 기다리는 호출
+        self._buffer: list[dict] = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+
+    # ── 기록 ──────────────────────────────────────────────────────────────────
+
+    def record(self, call: LlmCall) -> None:
+        """호출 1건 기록. 공시 ID 가 있으면 resolve() 로 최종 상태가 모두 채워질 때까지 보류."""
+        if not self.enabled or not call.attempted:
+            return
+        with self._lock:
+            self.stats["recorded"] += 1
+            if call.disclosure_ids:
+                for ref in call.disclosure_ids:
+                    self._open.setdefault(ref, []).append(call)
+            else:
+                self._buffer.append(call.row(self.worker))
+        self._maybe_flush()
+
+    def resolve(self, disclosure_id: str, status: str | None) -> None:
+        """공시의 최종 analysis_status (저장 단계). 변경 없으면 status=None."""
+        if not self.enabled:
+            return
+        ref = str(disclosure_id)
+        with self._lock:
+            for call in self._open.pop(ref, []):
+                call.statuses[ref] = status
+                if call.resolved:
+                    self._buffer.append(call.row(self.worker))
+        self._maybe_flush()
+
+    # ── 쓰기 ──────────────────────────────────────────────────────────────────
+
+    def _maybe_flush(self) -> None:
+        with self._lock:
+            due = (len(self._buffer) >= self.batch_size
+                   or (self._buffer and time.monotonic() - self._last_flush >= self.flush_sec))
+        if due:
+            self.flush()
+
+    def _expire_open(self, force: bool) -> None:
+        """최종 상태가 오지 않는 호출 (분석 결과를 저장하지 않는 경로 등) → 상태 없이 기록."""
+        now = time.monotonic()
+        with self._lock:
+            stale = {
+                id(c): c for calls in self._open.values() for c in calls
+                if force or now - c.opened >= self.open_sec
+            }
+            if not stale:
+                return
+            self._open = {
+                ref: kept for ref, calls in self._open.items()
+                if (kept := [c for c in calls if id(c) not in stale])
+            }
+            self._buffer += [c.row(self.worker) for c in stale.values()]
+
+    def flush(self, force: bool = False) -> int:
+        """버퍼를 INSERT (batch_size 행씩). force=True 면 보류 중인 호출도 상태 없이 기록. 반환: 저장 행 수."""
+        if not self.enabled:
+            return 0
+        if not self._flush_lock.acquire(blocking=force):
+            return 0   # 다른 스레드가 쓰는 중 — 다음 기회에
+        written = 0
+        try:
+            self._expire_open(force)
+            with self._lock:
+                rows, self._buffer = self._buffer, []
+                self._last_flush = time.monotonic()
+            while rows:
+                chunk = rows[: self.batch_size]
+                try:
+                    self.sb.table(TABLE).insert(chunk).execute()
+                except Exception as e:
+                    self._on_flush_error(e, rows)
+                    break
+                rows = rows[len(chunk):]
+                written += len(chunk)
+            with self._lock:
+                self.stats["written"] += written
+        finally:
+            self._flush_lock.release()
+        return written
+
+    def _on_flush_error(self, exc: Exception, rows: list[dict]) -> None:
+        msg = str(exc)
+        if "PGRST205" in msg or "42P01" in msg:
+            self.enabled = False
+            with self._lock:
+                self.stats["dropped"] += len(rows) + len(self._buffer)
+                self._buffer, self._open = [], {}
+            logger.warning(f"[llm-ledger] {TABLE} 테이블 없음 → 비활성화 (065 마이그레이션 확인): {exc}")
+            return
+        with self._lock:
+            self._buffer = rows + self._buffer
+            overflow = len(self._buffer) - self.max_buffer
+            if overflow > 0:
+                self._buffer = self._buffer[overflow:]
+                self.stats["dropped"] += overflow
+            self.stats["flush_failed"] += 1
+        logger.warning(f"[llm-ledger] 저장 실패 ({len(rows)}행 보관, 다음 flush 에서 재시도): {exc}")
+
+    def close(self) -> None:
+        self.flush(force=True)
+
+    def summary(self) -> str:
+        s = self.stats
+        with self._lock:
+            pending = len(self._buffer) + len({id(c) for calls in self._open.values() for c in calls})
+        return f"호출 {s['recorded']} / 저장 {s['written']} / 대기 {pending} / 버림 {s['dropped']}"
+
+
+# ── 싱글톤 (lazy init) ────────────────────────────────────────────────────────
+
+_ledger: LlmLedger | None = None
+_ledger_initialized = False
+_init_lock = threading.Lock()
+
+
+def get_ledger(sb, worker: str | None = None) -> LlmLedger | None:
+    """
+    원장 반환 (프로세스당 1개, 종료 시 남은 기록 flush).
+    - LLM_LEDGER=0 → None
+    """
+    global _ledger, _ledger_initialized
+    with _init_lock:
+        if _ledger_initialized:
+            return _ledger
+        _ledger_initialized = True
+        if os.environ.get("LLM_LEDGER", "1").strip().lower() in ("0", "false", "no", "off"):
+            return None
+        _ledger = LlmLedger(sb, worker=worker)
+        atexit.register(_ledger.close)
+        return _ledger
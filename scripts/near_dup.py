@@ -0,0 +1,415 @@
+"""
+scripts/near_dup.py
+===================
+유사 중복 공시 감지 — 분석 완료 공시와 거의 같은 본문이면 AI 분석 결과를 복사.
+
+DART 는 같은 사건을 여러 번 공시합니다.
+  - [기재정정] 재공시 (오탈자·서식만 고친 경우가 많음)
+  - 자회사 주요경영사항을 모회사가 다시 공시
+  - 같은 문구의 공정공시 반복
+지금까지는 매 건 처음부터 Gemini 로 분석했습니다.
+
+방식:
+  서명      정제 본문(공백·표 구분자 정리, 소문자) 의 단어 3-gram → 64bit SimHash
+            (본문 MIN_CHARS 미만 — 제목만 있는 공시 — 는 서명 없음: 서로 다 비슷해 보이므로)
+  유사도    1 - 해밍거리/64.  NEAR_DUP_MIN_SIM 이상이면 후보
+  인덱스    최근 NEAR_DUP_DAYS 일 분석 완료 공시의 서명 (disclosure_insights.content_simhash)
+            해밍거리 k 이하를 찾기 위해 64bit 를 k+1 개 구간으로 나눈 버킷 인덱스
+            (비둘기집 원리: k 비트 이하로 다르면 적어도 한 구간은 완전히 같음)
+  판정      후보를 찾으면 원본 행을 조회해 아래를 모두 만족할 때만 복사, 아니면 새로 분석
+              - 원본이 completed
+              - 본문의 숫자 집합이 같음     (다르면 figures_changed — 정정 공시는 대개 숫자가 바뀜)
+              - 제목이 같음 ([기재정정] 등 머리말 제외)  (다르면 title_differs)
+              - 같은 회사                   (다르면 cross_corp — NEAR_DUP_CROSS_CORP=1 이면 허용)
+  감사      후보를 찾을 때마다 disclosure_near_dups 에 1행 + 로그 (copied / reanalyzed + 사유)
+
+환경변수:
+  NEAR_DUP              0 이면 비활성화          (기본 1)
+  NEAR_DUP_MIN_SIM      유사도 임계값            (기본 0.95 → 해밍거리 3 이하)
+  NEAR_DUP_DAYS         인덱스 대상 기간(일)     (기본 30)
+  NEAR_DUP_CROSS_CORP   1 이면 다른 회사 공시에서도 복사 (기본 0 — 요약문에 원본 회사명이 남을 수 있음)
+
+사용 예시 (auto_analyst):
+  detector = get_detector(supabase)
+  copied = detector.find_copy(item) if detector else None   # item["_simhash"] 도 채워짐
+  ...
+  detector.register(item["id"], item["_simhash"])            # 분석 완료 후
+
+기존 행 서명 채우기:
+  python scripts/near_dup.py --backfill-days 30
+  python scripts/near_dup.py --audit-days 7      # 최근 감지 결과 집계
+"""
+
+import hashlib
+import logging
+import os
+import re
+import threading
+from collections import Counter
+from datetime import datetime, timedelta
+
+logger = logging.getLogger(__name__)
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+NEAR_DUP_MIN_SIM    = _env_float("NEAR_DUP_MIN_SIM", 0.95)
+NEAR_DUP_DAYS       = int(_env_float("NEAR_DUP_DAYS", 30))
+NEAR_DUP_CROSS_CORP = os.environ.get("NEAR_DUP_CROSS_CORP", "0").strip() in ("1", "true", "yes")
+
+MIN_CHARS   = 200    # 정제 본문이 이보다 짧으면 서명 없음
+SHINGLE     = 3      # 단어 n-gram
+PAGE_SIZE   = 1000
+BITS        = 64
+
+# 원본 분석 결과 → 복사 대상 컬럼
+COPY_FIELDS = (
+    "headline", "report_nm_en", "key_numbers", "event_type", "financial_impact",
+    "short_term_impact_score", "sentiment_score", "ai_summary", "risk_factors",
+)
+
+_SEPARATORS = re.compile(r"[|\-=_:·ㆍ*#>\[\]()]+|\s+")
+_FIGURE     = re.compile(r"\d[\d,]*(?:\.\d+)?")
+_TITLE_HEAD = re.compile(r"^\s*(?:\[[^\]]*\]\s*)+")
+
+
+# ── 서명 ──────────────────────────────────────────────────────────────────────
+
+def normalize_text(content: str) -> str:
+    """표 구분자·공백 정리 + 소문자 (서식만 다른 정정 공시가 같은 서명이 되도록)."""
+    return _SEPARATORS.sub(" ", str(content or "").replace("\x00", "")).strip().lower()
+
+
+def simhash(content: str) -> int | None:
+    """정제 본문 → 64bit SimHash (unsigned). 본문이 짧거나 없으면 None."""
+    if not content or content == "CONTENT_NOT_AVAILABLE":
+        return None
+    text = normalize_text(content)
+    if len(text) < MIN_CHARS:
+        return None
+    words = text.split()
+    if len(words) < SHINGLE:
+        return None
+    shingles = Counter(" ".join(words[i:i + SHINGLE]) for i in range(len(words) - SHINGLE + 1))
+    hashes = [
+        (int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "big"), w)
+        for s, w in shingles.items()
+    ]
+    total = sum(shingles.values())
+    sig = 0
+    for bit in range(BITS):
+        mask = 1 << bit
+        if sum(w for h, w in hashes if h & mask) * 2 > total:
+            sig |= mask
+    return sig
+
+
+def to_signed(sig: int) -> int:
+    """unsigned 64bit → Postgres bigint."""
+    return sig - (1 << BITS) if sig >= 1 << (BITS - 1) else sig
+
+
+def to_unsigned(value: int) -> int:
+    return value + (1 << BITS) if value < 0 else value
+
+
+def similarity(a: int, b: int) -> float:
+    return 1.0 - bin(a ^ b).count("1") / BITS
+
+
+def figures(content: str) -> frozenset[str]:
+    """본문의 숫자 토큰 집합 (쉼표 제거) — 정정으로 금액·수량이 바뀌었는지 비교."""
+    return frozenset(m.replace(",", "") for m in _FIGURE.findall(str(content or "")))
+
+
+def core_title(report_nm: str) -> str:
+    """'[기재정정]단일판매ㆍ공급계약체결' → '단일판매ㆍ공급계약체결' (공백 제거)."""
+    return re.sub(r"\s+", "", _TITLE_HEAD.sub("", report_nm or ""))
+
+
+# ── 인덱스 ────────────────────────────────────────────────────────────────────
+
+class NearDupIndex:
+    """해밍거리 max_distance 이하 검색용 버킷 인덱스 (스레드 안전)."""
+
+    def __init__(self, max_distance: int):
+        self.max_distance = max(0, min(max_distance, 15))
+        n = self.max_distance + 1
+        width = BITS // n
+        # 구간 (shift, mask) — 마지막 구간이 나머지 비트를 가져감
+        self._bands = [
+            (i * width, (1 << (width if i < n - 1 else BITS - i * width)) - 1) for i in range(n)
+        ]
+        self._buckets: list[dict[int, list[tuple[str, int]]]] = [dict() for _ in self._bands]
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, item_id: str, sig: int) -> None:
+        with self._lock:
+            for (shift, mask), bucket in zip(self._bands, self._buckets):
+                bucket.setdefault((sig >> shift) & mask, []).append((item_id, sig))
+            self._size += 1
+
+    def match(self, sig: int, exclude_id: str | None = None) -> tuple[str, int] | None:
+        """가장 가까운 (id, 해밍거리) — max_distance 초과면 None."""
+        best: tuple[str, int] | None = None
+        with self._lock:
+            for (shift, mask), bucket in zip(self._bands, self._buckets):
+                for item_id, other in bucket.get((sig >> shift) & mask, ()):
+                    if item_id == exclude_id:
+                        continue
+                    d = bin(sig ^ other).count("1")
+                    if d <= self.max_distance and (best is None or d < best[1]):
+                        best = (item_id, d)
+        return best
+
+
+# ── 감지기 ────────────────────────────────────────────────────────────────────
+
+class NearDupDetector:
+
+    def __init__(self, sb, min_sim: float = NEAR_DUP_MIN_SIM, days: int = NEAR_DUP_DAYS,
+                 cross_corp: bool = NEAR_DUP_CROSS_CORP):
+        self.sb = sb
+        self.min_sim = min_sim
+        self.days = days
+        self.cross_corp = cross_corp
+        self.index = NearDupIndex(int((1.0 - min_sim) * BITS + 1e-9))
+        self.stats = Counter()
+        self._lock = threading.Lock()
+        self._audit_ok = True
+
+    def load(self) -> int:
+        """최근 days 일 분석 완료 공시 서명 로드. 컬럼이 없으면(마이그레이션 미적용) 예외."""
+        since = (datetime.now() - timedelta(days=self.days)).strftime("%Y%m%d")
+        start = 0
+        while True:
+            res = self.sb.table("disclosure_insights") \
+                .select("id, content_simhash") \
+                .eq("analysis_status", "completed") \
+                .not_.is_("content_simhash", "null") \
+                .gte("rcept_dt", since) \
+                .order("rcept_dt", desc=True) \
+                .range(start, start + PAGE_SIZE - 1) \
+                .execute()
+            rows = res.data or []
+            for r in rows:
+                self.index.add(r["id"], to_unsigned(int(r["content_simhash"])))
+            if len(rows) < PAGE_SIZE:
+                break
+            start += PAGE_SIZE
+        return len(self.index)
+
+    def reload(self) -> int:
+        """인덱스를 새로 만들어 다시 로드 (장기 실행 워커 — 기간이 지난 서명 정리). 실패 시 기존 인덱스 유지."""
+        current, self.index = self.index, NearDupIndex(self.index.max_distance)
+        try:
+            return self.load()
+        except Exception:
+            self.index = current
+            raise
+
+    def register(self, item_id: str, sig: int | None) -> None:
+        if sig is not None:
+            self.index.add(item_id, sig)
+
+    def find_copy(self, item: dict) -> dict | None:
+        """
+        item 과 거의 같은 분석 완료 공시가 있고 복사 조건을 만족하면 AIAnalyst 결과 형식의 dict 반환.
+        item["_simhash"] 에 서명을 기록한다 (분석 완료 후 register / 저장용).
+        """
+        sig = simhash(item.get("content"))
+        item["_simhash"] = sig
+        if sig is None:
+            return None
+        with self._lock:
+            self.stats["checked"] += 1
+        hit = self.index.match(sig, exclude_id=item.get("id"))
+        if hit is None:
+            return None
+
+        source_id, distance = hit
+        sim = 1.0 - distance / BITS
+        try:
+            source = self.sb.table("disclosure_insights") \
+                .select("id, corp_name, stock_code, report_nm, content, analysis_status, " + ", ".join(COPY_FIELDS)) \
+                .eq("id", source_id) \
+                .maybe_single() \
+                .execute().data
+        except Exception as e:
+            logger.warning(f"[near-dup] 원본 조회 실패 ({source_id[:8]}): {e}")
+            source = None
+
+        reason = self._reject_reason(item, source)
+        if reason:
+            self._audit(item, source_id, sim, "reanalyzed", reason)
+            return None
+
+        self._audit(item, source_id, sim, "copied", None)
+        result = {f: source.get(f) for f in COPY_FIELDS if f != "report_nm_en"}
+        result["report_nm"] = _amended_title(item.get("report_nm"), source.get("report_nm_en"))
+        return result
+
+    def _reject_reason(self, item: dict, source: dict | None) -> str | None:
+        if not source or source.get("analysis_status") != "completed" or not source.get("headline"):
+            return "source_missing"
+        if core_title(item.get("report_nm")) != core_title(source.get("report_nm")):
+            return "title_differs"
+        same_corp = (
+            (item.get("stock_code") and item.get("stock_code") == source.get("stock_code"))
+            or item.get("corp_name") == source.get("corp_name")
+        )
+        if not same_corp and not self.cross_corp:
+            return "cross_corp"
+        if figures(item.get("content")) != figures(source.get("content")):
+            return "figures_changed"
+        return None
+
+    def _audit(self, item: dict, source_id: str, sim: float, action: str, reason: str | None) -> None:
+        with self._lock:
+            self.stats[action] += 1
+            if reason:
+                self.stats[reason] += 1
+        logger.info(
+            f"[near-dup] {action}{f' ({reason})' if reason else ''}: "
+            f"{item.get('corp_name')} | {item.get('report_nm')} ← {source_id[:8]} (sim {sim:.3f})"
+        )
+        if not self._audit_ok:
+            return
+        try:
+            self.sb.table("disclosure_near_dups").insert({
+                "disclosure_id": item["id"],
+                "source_id":     source_id,
+                "similarity":    round(sim, 4),
+                "action":        action,
+                "reason":        reason,
+            }).execute()
+        except Exception as e:
+            self._audit_ok = False
+            logger.warning(f"[near-dup] 감사 로그 저장 실패 → 이후 로그만 남김: {e}")
+
+    def summary(self) -> str:
+        s = self.stats
+        return (
+            f"인덱스 {len(self.index)} / 검사 {s['checked']} / 복사 {s['copied']} / 재분석 {s['reanalyzed']} "
+            f"(숫자 변경 {s['figures_changed']}, 제목 상이 {s['title_differs']}, 타사 {s['cross_corp']})"
+        )
+
+
+def _amended_title(report_nm: str | None, source_title_en: str | None) -> str | None:
+    """정정 공시에 원본 영문 제목을 복사할 때 '[Amendment]' 머리말 보정."""
+    if not source_title_en:
+        return None
+    if "정정" in (report_nm or "") and not source_title_en.startswith("[Amendment]"):
+        return f"[Amendment] {source_title_en}"
+    return source_title_en
+
+
+# ── 싱글톤 (lazy init, 1회만 시도) ────────────────────────────────────────────
+
+_detector: NearDupDetector | None = None
+_detector_initialized = False
+_init_lock = threading.Lock()
+
+
+def get_detector(sb) -> NearDupDetector | None:
+    """
+    감지기 반환 (최초 호출 시 인덱스 로드).
+    - NEAR_DUP=0          → None
+    - 로드 실패 (컬럼 없음) → None (모든 공시 새로 분석)
+    """
+    global _detector, _detector_initialized
+    with _init_lock:
+        if _detector_initialized:
+            return _detector
+        _detector_initialized = True
+        if os.environ.get("NEAR_DUP", "1").strip().lower() in ("0", "false", "no", "off"):
+            return None
+        detector = NearDupDetector(sb)
+        try:
+            n = detector.load()
+        except Exception as e:
+            logger.warning(f"[near-dup] 인덱스 로드 실패 ({e}) → 비활성화 (063 마이그레이션 확인)")
+            return None
+        logger.info(
+            f"[near-dup] 인덱스 {n}건 (최근 {detector.days}일, 유사도 ≥ {detector.min_sim}, "
+            f"해밍 ≤ {detector.index.max_distance})"
+        )
+        _detector = detector
+        return _detector
+
+
+# ── CLI: 기존 행 서명 채우기 / 감사 로그 집계 ─────────────────────────────────
+
+def _backfill(sb, days: int) -> None:
+    since = (datetime.now() - timedelta(days=days)).strftime("%Y%m%d")
+    done = empty = 0
+    last_id = None
+    while True:
+        q = sb.table("disclosure_insights") \
+            .select("id, content") \
+            .eq("analysis_status", "completed") \
+            .is_("content_simhash", "null") \
+            .gte("rcept_dt", since) \
+            .not_.is_("content", "null")
+        if last_id:
+            q = q.gt("id", last_id)   # 본문이 짧아 서명 없는 행은 null 로 남으므로 id 순으로 전진
+        rows = q.order("id").limit(200).execute().data or []
+        if not rows:
+            break
+        last_id = rows[-1]["id"]
+        pending = [(r["id"], simhash(r.get("content"))) for r in rows]
+        pending = [(i, s) for i, s in pending if s is not None]
+        empty += len(rows) - len(pending)
+        for row_id, sig in pending:
+            sb.table("disclosure_insights").update({"content_simhash": to_signed(sig)}).eq("id", row_id).execute()
+        done += len(pending)
+        logger.info(f"  서명 기록 {done}건")
+    logger.info(f"완료: 서명 {done}건 기록 / 본문 짧음(서명 없음) {empty}건")
+
+
+def _audit_report(sb, days: int) -> None:
+    since = (datetime.now() - timedelta(days=days)).isoformat()
+    rows = sb.table("disclosure_near_dups") \
+        .select("action, reason, similarity") \
+        .gte("created_at", since) \
+        .execute().data or []
+    counts = Counter((r["action"], r.get("reason") or "-") for r in rows)
+    print(f"최근 {days}일 유사 중복 감지 {len(rows)}건")
+    for (action, reason), n in counts.most_common():
+        print(f"  {action:11s} {reason:16s} {n:6d}")
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+    from pathlib import Path
+
+    _ROOT = Path(__file__).resolve().parent.parent
+    if str(_ROOT) not in sys.path:
+        sys.path.insert(0, str(_ROOT))
+    from utils.env_loader import load_env
+    from supabase import create_client
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    load_env()
+
+    parser = argparse.ArgumentParser(description="유사 중복 공시 서명 backfill / 감사 로그 집계")
+    parser.add_argument("--backfill-days", dest="backfill_days", type=int, default=0,
+                        help="최근 N일 completed 행 중 서명 없는 행에 content_simhash 기록")
+    parser.add_argument("--audit-days", dest="audit_days", type=int, default=7,
+                        help="최근 N일 감지 결과 집계 (기본 7)")
+    args = parser.parse_args()
+
+    sb = create_client(os.environ["NEXT_PUBLIC_SUPABASE_URL"], os.environ["SUPABASE_SERVICE_ROLE_KEY"])
+    if args.backfill_days:
+        _backfill(sb, args.backfill_days)
+    _audit_report(sb, args.audit_days)
@@ -7,7 +7,7 @@ analysis_status를 pending으로 되돌려 재분석 대기열에 넣는 스크
   python refetch_empty_content.py --dry-run # 대상 목록만 출력
   python refetch_empty_content.py --limit 50
 """
-import os, sys, re, zipfile, io, time, argparse, logging
+import os, sys, re, zipfile, io, argparse, logging
 from datetime import datetime
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
@@ -23,8 +23,14 @@ import requests, urllib3
 urllib3.disable_warnings()
 from supabase import create_client
 
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from scripts.dart_doc_cache import get_doc_cache
+from scripts.dart_markdown import html_to_markdown, extract_key_sections, PARSER_VERSION
+from scripts.dart_quota import get_dart_limiter, QuotaExceeded
+
 sb = create_client(os.environ['NEXT_PUBLIC_SUPABASE_URL'], os.environ['SUPABASE_SERVICE_ROLE_KEY'])
 DART_KEY = os.environ['DART_API_KEY']
+dart_limiter = get_dart_limiter('refetch_empty_content', priority='backfill')
 
 session = requests.Session()
 session.verify = False
@@ -35,61 +41,27 @@ session.headers.update({
 })
 
 
-_IMPORTANT_KEYWORDS = [
-    "매출", "영업이익", "당기순이익", "순이익",
-    "계약", "금액", "발행", "증자", "취득", "처분",
-    "손실", "감소", "증가", "%", "억원", "백만원", "KRW",
-    "보증", "채무", "주식수", "주당", "전환가",
-    "수주", "납품", "공급", "투자", "배당", "자본금",
-]
-
-def extract_key_sections(text: str) -> str:
-    """키워드 포함 줄 + 마크다운 테이블/헤딩만 추출 (truncate 금지)"""
-    if not text:
-        return text
-    lines = text.split("\n")
-    filtered = []
-    for line in lines:
-        stripped = line.strip()
-        if not stripped:
-            continue
-        if any(k in stripped for k in _IMPORTANT_KEYWORDS):
-            filtered.append(stripped)
-        elif stripped.startswith("|") or stripped.startswith("##"):
-            filtered.append(stripped)
-    result = "\n".join(filtered[:300])
-    if len(result) < 200 and len(text) > 200:
-        return text[:6000]
-    return result
-
-
-def _clean_html_to_md(raw_html: str) -> str:
-    """HTML → 투자 분석용 마크다운 텍스트"""
-    clean = re.sub(r'<(script|style|head)[^>]*>.*?</\1>', '', raw_html, flags=re.DOTALL | re.IGNORECASE)
-
-    def table_to_md(html):
-        rows = re.findall(r'<tr[^>]*>(.*?)</tr>', html, flags=re.DOTALL | re.IGNORECASE)
-        md_rows = []
-        for row in rows:
-            cells = re.findall(r'<t[dh][^>]*>(.*?)</t[dh]>', row, flags=re.DOTALL | re.IGNORECASE)
-            cells = [re.sub(r'<[^>]+>', '', c).strip() for c in cells]
-            cells = [re.sub(r'\s+', ' ', c) for c in cells if c]
-            if cells:
-                md_rows.append('| ' + ' | '.join(cells) + ' |')
-        return '\n'.join(md_rows)
-
-    clean = re.sub(r'<table[^>]*>(.*?)</table>', lambda m: '\n' + table_to_md(m.group(0)) + '\n', clean, flags=re.DOTALL | re.IGNORECASE)
-    clean = re.sub(r'<h[1-3][^>]*>(.*?)</h[1-3]>', lambda m: '\n## ' + re.sub(r'<[^>]+>', '', m.group(1)).strip() + '\n', clean, flags=re.DOTALL | re.IGNORECASE)
-    clean = re.sub(r'<br\s*/?>', '\n', clean, flags=re.IGNORECASE)
-    clean = re.sub(r'</p>', '\n', clean, flags=re.IGNORECASE)
-    clean = re.sub(r'<[^>]+>', ' ', clean)
-    clean = clean.replace('\x00', '').replace('\u0000', '')
-    clean = re.sub(r'[ \t]+', ' ', clean)
-    clean = re.sub(r'\n{3,}', '\n\n', clean)
-    return clean.strip()
+def _parse_zip(zip_bytes: bytes) -> str:
+    with zipfile.ZipFile(io.BytesIO(zip_bytes)) as z:
+        with z.open(z.namelist()[0]) as f:
+            raw_bytes = f.read()
+    raw = raw_bytes.decode('utf-8', errors='ignore')
+    cache = get_doc_cache()
+    if cache is None:
+        return html_to_markdown(raw)
+    return cache.get_text(PARSER_VERSION, raw, lambda: html_to_markdown(raw))
 
 
 def fetch_content(rcept_no: str) -> str | None:
+    """document.xml ZIP 본문. 디스크 캐시 hit 이면 DART 호출(+ 공용 제한기 대기) 생략."""
+    cache = get_doc_cache()
+    cached = cache.get(f'zip:{rcept_no}') if cache else None
+    if cached is not None:
+        text = _parse_zip(cached)
+        logger.info(f"  ZIP 캐시 hit: {len(text)}자")
+        return extract_key_sections(text) if len(text) > 0 else None
+
+    dart_limiter.acquire()
     url = f'https://opendart.fss.or.kr/api/document.xml?crtfc_key={DART_KEY}&rcept_no={rcept_no}'
     try:
         resp = session.get(url, timeout=30)
@@ -97,11 +69,9 @@ def fetch_content(rcept_no: str) -> str | None:
             return None
 
         if resp.content[:4] == b'PK\x03\x04':
-            with zipfile.ZipFile(io.BytesIO(resp.content)) as z:
-                with z.open(z.namelist()[0]) as f:
-                    raw_bytes = f.read()
-            raw = raw_bytes.decode('utf-8', errors='ignore')
-            text = _clean_html_to_md(raw)
+            if cache is not None:
+                cache.put(f'zip:{rcept_no}', resp.content)
+            text = _parse_zip(resp.content)
             korean = len(re.findall(r'[\uAC00-\uD7A3]', text))
             logger.info(f"  ZIP OK: {len(text)}자, 한글 {korean}자")
             return extract_key_sections(text) if len(text) > 0 else None
@@ -110,6 +80,8 @@ def fetch_content(rcept_no: str) -> str | None:
         status_match = re.search(r'<status>(\d+)</status>', resp.text)
         status = status_match.group(1) if status_match else '?'
         logger.warning(f"  DART 오류 status={status}")
+        if status == '020':
+            dart_limiter.backoff(10.0)
         return None
 
     except Exception as e:
@@ -161,8 +133,11 @@ def main():
         rcept_no = d['rcept_no']
         logger.info(f"[{i}/{len(items)}] {d['corp_name']} | {(d['report_nm'] or '').strip()[:30]}")
 
-        time.sleep(2)
-        content = fetch_content(rcept_no)
+        try:
+            content = fetch_content(rcept_no)
+        except QuotaExceeded as e:
+            logger.error(f"중단: {e}")
+            break
 
         if content:
             sb.table('disclosure_insights').update({
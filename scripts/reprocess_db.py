@@ -21,7 +21,6 @@ scripts/reprocess_db.py
 import os
 import sys
 import json
-import time
 import logging
 import argparse
 from datetime import datetime
@@ -38,6 +37,10 @@ load_env()
 from supabase import create_client, Client
 from groq import Groq
 
+# 노이즈 키워드 · 종목명 필터 · 임원 변동 2차 필터 — dart_crawler / auto_analyst 와 같은 규칙
+# NOISE_KEYWORDS / NOISE_CORP_KEYWORDS 는 DB 조회의 ilike 필터로 사용
+from scripts.disclosure_rules import NOISE_KEYWORDS, NOISE_CORP_KEYWORDS, is_executive_noise
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s'
@@ -46,42 +49,11 @@ logger = logging.getLogger(__name__)
 
 # ── 상수 ──────────────────────────────────────────────────────────────────────
 
-# dart_crawler.py 와 동일한 노이즈 키워드
-NOISE_KEYWORDS = [
-    "주주총회소집공고", "주주총회결과", "투자설명서",
-    "기업설명회", "증권발행실적보고서", "의결권대리행사권유", "소액공모",
-    "주주명부폐쇄기준일", "배당기준일", "명의개서정지",
-    "사외이사의선임", "사외이사의해임", "사외이사의중도퇴임",
-    # "임원의변동"    ← 제거: CEO/C-Level 포함 공시는 신호 — is_executive_noise()로 2차 필터
-    # "대표이사의변동" ← 제거: CEO 변동은 핵심 재료
-]
-
-# 임원 변동 2차 필터 (dart_crawler.py와 동일 로직)
-_EXEC_SIGNAL_KEYWORDS = [
-    "대표이사", "CEO", "사장", "부사장",
-    "CFO", "COO", "CTO", "CSO", "CCO",
-    "전무이사", "전무", "상무이사", "상무",
-]
-_EXEC_CHANGE_REPORT_NMS = ("임원의변동", "대표이사의변동")
-
-def is_executive_noise(report_nm: str, content: str = "") -> bool:
-    """CEO/C-Level 없는 임원 변동 공시 → True (노이즈)"""
-    if not any(nm in (report_nm or "") for nm in _EXEC_CHANGE_REPORT_NMS):
-        return False
-    if not content:
-        return False
-    return not any(kw in content for kw in _EXEC_SIGNAL_KEYWORDS)
-
-# 종목명 필터 — 스팩/펀드/부동산리츠/비상장금융기관 등 투자 시그널 무의미 종목 제외
-NOISE_CORP_KEYWORDS = [
-    "전문유한회사", "부동산투자회사", "스팩", "자산운용", "자산운영", "펀드",
-    "기업인수목적", "투자증권", "투자자문",
-]
-
 # 구분류 event_type 값 (재분석 대상)
 OLD_EVENT_TYPES = ["ONE_TIME", "STRUCTURAL", "NEUTRAL"]
 
-GROQ_SLEEP = 1.2   # 요청 간 대기 (초) — Pro 100 RPM, 터미널 2개 동시 기준 각 50 RPM
+# 분석 속도: AIAnalyst 호출이 공용 엔진(scripts/llm_engine.py)을 거침 — LLM_RPM / LLM_TPM 로 제한,
+# 터미널 2개 동시 실행 시 LLM_RPM 을 나눠 설정 (기존 GROQ_SLEEP=1.2초 고정 대기 대체)
 
 # ── Supabase / Groq 초기화 ─────────────────────────────────────────────────────
 
@@ -237,78 +209,81 @@ def step_noise(sb: Client, dry_run: bool):
 
 def _run_analysis(analyst, sb: Client, rows: list[dict], tag: str, dry_run: bool) -> tuple[int, int]:
     """
-    rows 를 Groq로 분석하고 DB 업데이트.
-    반환: (성공 수, 실패 수)
+    rows 를 공용 엔진으로 동시 분석하고 DB 업데이트.
+    반환: (성공 수, 실패 수)  — 임원변동 노이즈 skipped 는 어느 쪽에도 포함하지 않음
     """
-    ok = 0
-    fail = 0
-
-    for item in rows:
-        cid = item["id"]
-        corp = item.get("corp_name", "")
-        report = item.get("report_nm", "")
-        content = item.get("content") or ""
-
-        # 임원 변동 2차 필터: 본문에 CEO/C-Level 없으면 skipped 처리
-        if is_executive_noise(report, content):
-            logger.info(f"  ⏭ 임원변동 노이즈 (CEO/C-Level 없음): {corp} — {report[:40]}")
-            sb.table("disclosure_insights").update({
-                "analysis_status": "skipped",
-                "updated_at": datetime.now().isoformat(),
-            }).eq("id", cid).execute()
-            continue
+    from llm_engine import get_engine   # auto_analyst 와 같은 모듈 인스턴스 (제한기 공유)
 
-        if dry_run:
-            logger.info(f"  [DRY] {tag} {corp} — {report[:40]}")
-            ok += 1
-            continue
+    stats = get_engine().map(
+        lambda item: _analyze_row(analyst, sb, item, tag, dry_run), rows, label="reprocess",
+    )
+    if stats.unstarted:
+        logger.warning(f"  종료 요청 — {stats.unstarted}건 미처리 (다음 실행에서 이어서)")
+    return stats.done, stats.failed
+
+
+def _analyze_row(analyst, sb: Client, item: dict, tag: str, dry_run: bool) -> bool | None:
+    """1건 분석 + 저장 (엔진 워커 스레드). True 성공 / False 실패 / None skipped."""
+    cid = item["id"]
+    corp = item.get("corp_name", "")
+    report = item.get("report_nm", "")
+    content = item.get("content") or ""
+
+    # 임원 변동 2차 필터: 본문에 CEO/C-Level 없으면 skipped 처리
+    if is_executive_noise(report, content):
+        logger.info(f"  ⏭ 임원변동 노이즈 (CEO/C-Level 없음): {corp} — {report[:40]}")
+        sb.table("disclosure_insights").update({
+            "analysis_status": "skipped",
+            "updated_at": datetime.now().isoformat(),
+        }).eq("id", cid).execute()
+        return None
+
+    if dry_run:
+        logger.info(f"  [DRY] {tag} {corp} — {report[:40]}")
+        return True
+
+    # processing 마킹
+    sb.table("disclosure_insights").update({
+        "analysis_status": "processing"
+    }).eq("id", cid).execute()
+
+    result = analyst.analyze_content(corp, report, content)
+
+    if result:
+        raw_score = result.get("sentiment_score")
+        try:
+            sentiment_score = float(raw_score) if raw_score is not None else None
+            if sentiment_score is not None:
+                sentiment_score = max(-1.0, min(1.0, sentiment_score))
+        except (TypeError, ValueError):
+            sentiment_score = None
 
-        # processing 마킹
         sb.table("disclosure_insights").update({
-            "analysis_status": "processing"
+            "headline":                result.get("headline"),
+            "key_numbers":             result.get("key_numbers"),
+            "event_type":              result.get("event_type"),
+            "financial_impact":        result.get("financial_impact"),
+            "short_term_impact_score": result.get("short_term_impact_score"),
+            "sentiment_score":         sentiment_score,
+            "ai_summary":              result.get("ai_summary"),
+            "risk_factors":            result.get("risk_factors"),
+            "analysis_status":         "completed",
+            "is_visible":              True,
+            "updated_at":              datetime.now().isoformat(),
         }).eq("id", cid).execute()
 
-        result = analyst.analyze_content(corp, report, content)
-
-        if result:
-            raw_score = result.get("sentiment_score")
-            try:
-                sentiment_score = float(raw_score) if raw_score is not None else None
-                if sentiment_score is not None:
-                    sentiment_score = max(-1.0, min(1.0, sentiment_score))
-            except (TypeError, ValueError):
-                sentiment_score = None
-
-            sb.table("disclosure_insights").update({
-                "headline":                result.get("headline"),
-                "key_numbers":             result.get("key_numbers"),
-                "event_type":              result.get("event_type"),
-                "financial_impact":        result.get("financial_impact"),
-                "short_term_impact_score": result.get("short_term_impact_score"),
-                "sentiment_score":         sentiment_score,
-                "ai_summary":              result.get("ai_summary"),
-                "risk_factors":            result.get("risk_factors"),
-                "analysis_status":         "completed",
-                "is_visible":              True,
-                "updated_at":              datetime.now().isoformat(),
-            }).eq("id", cid).execute()
-
-            logger.info(f"  ✅ {tag} {corp}")
-            ok += 1
-        else:
-            retry = (item.get("analysis_retry_count") or 0) + 1
-            new_status = "failed" if retry >= 3 else "pending"
-            sb.table("disclosure_insights").update({
-                "analysis_status":       new_status,
-                "analysis_retry_count":  retry,
-                "updated_at":            datetime.now().isoformat(),
-            }).eq("id", cid).execute()
-            logger.warning(f"  ⚠️ {tag} 실패: {corp}")
-            fail += 1
-
-        time.sleep(GROQ_SLEEP)
-
-    return ok, fail
+        logger.info(f"  ✅ {tag} {corp}")
+        return True
+
+    retry = (item.get("analysis_retry_count") or 0) + 1
+    new_status = "failed" if retry >= 3 else "pending"
+    sb.table("disclosure_insights").update({
+        "analysis_status":       new_status,
+        "analysis_retry_count":  retry,
+        "updated_at":            datetime.now().isoformat(),
+    }).eq("id", cid).execute()
+    logger.warning(f"  ⚠️ {tag} 실패: {corp}")
+    return False
 
 # ── Step 2: pending + failed 분석 ─────────────────────────────────────────────
 
@@ -351,6 +326,8 @@ def step_pending(sb: Client, groq_client, batch_size: int, dry_run: bool):
             break   # dry-run 은 1회만
 
     logger.info(f"✅ Step 2 완료: 성공 {total_ok} / 실패 {total_fail}")
+    if analyst.cache:
+        logger.info(f"  [llm-cache] {analyst.cache.summary()}")
     return total_ok, total_fail
 
 # ── Step 3: completed + 구분류 event_type 재분석 ──────────────────────────────
@@ -395,6 +372,8 @@ def step_reanalyze(sb: Client, groq_client, batch_size: int, dry_run: bool):
             break
 
     logger.info(f"✅ Step 3 완료: 성공 {total_ok} / 실패 {total_fail}")
+    if analyst.cache:
+        logger.info(f"  [llm-cache] {analyst.cache.summary()}")
     return total_ok, total_fail
 
 # ── 메인 ──────────────────────────────────────────────────────────────────────
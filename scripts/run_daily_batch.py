@@ -44,6 +44,7 @@ EOD 배치 실행 순서 (장 마감 후 ~16:30 KST, cron/trigger.py 에서 1일
   7. compute_market_radar.py       : 시장 레이더 집계 (외국인 순매수 포함)
   8. compute_alpha_score.py        : 통합 알파 스코어 (Base+Sector+Market+Regime)
   9. backfill_prices.py --days 30  : 최근 30일 공시 T+3/T+5 수익률 백필 + event_stats 재집계
+  9-2. build_stock_timelines.py    : 변동 종목 이벤트 타임라인 재계산 (→ stock_timelines)
  10. compute_backtest.py           : event_macro_v1 백테스트 업데이트
 """
 
@@ -248,6 +249,7 @@ def run_analyze(args):
     logger.info("="*55)
 
     steps = [
+        # 상주 워커(scripts/analyst_daemon.py)가 떠 있으면 대부분 이미 처리됨 — 남은 건만 claim
         ("AI 분석",
          "auto_analyst.py",
          ["--limit", "100", "--single-pass"],
@@ -354,6 +356,13 @@ def run_eod(args):
          ["--days", "30"] + dry_flag,
          skip_prices),
 
+        # Step 8-2: 종목별 이벤트 타임라인 (공시 + 수익률/MDD + 종가 → stock_timelines)
+        # 최근 30일 변동 종목만 재계산, 입력 해시 동일 시 upsert 생략
+        ("종목 타임라인 갱신",
+         "build_stock_timelines.py",
+         ["--days", "30"] + dry_flag,
+         False),
+
         # Step 9: event_macro_v1 백테스트 업데이트
         ("백테스트 갱신",
          "compute_backtest.py",
@@ -0,0 +1,37 @@
+-- ============================================================
+-- 057_create_stock_timelines.sql
+-- 종목별 이벤트 타임라인 사전 계산 문서
+--
+-- 배경:
+--   "공시 이후 이 종목은 어떻게 움직였나"를 보려면 클라이언트가
+--   /v1/disclosures 조회 후 가격을 따로 받아 조인해야 했음.
+--   disclosure_insights + scores_log(forward return / MDD) + price_history(종가)를
+--   EOD 배치(build_stock_timelines.py)에서 종목별 JSON 문서 1개로 미리 합쳐 둔다.
+--   GET /v1/stocks/{code}/timeline 은 이 행 1개만 읽는다 (요청 시 조인 없음).
+--
+-- 갱신:
+--   source_hash = 문서 입력값 해시. 값이 바뀐 종목만 upsert 하므로
+--   매일 전 종목을 다시 쓰지 않는다.
+-- ============================================================
+
+CREATE TABLE IF NOT EXISTS public.stock_timelines (
+  stock_code       text        PRIMARY KEY,
+  corp_name        text,
+  doc              jsonb       NOT NULL,        -- {"events": [...], "prices": [[date, close], ...]}
+  event_count      int         NOT NULL DEFAULT 0,
+  last_event_date  date,
+  source_hash      text        NOT NULL,        -- 입력 데이터 해시 (변경 감지)
+  updated_at       timestamptz NOT NULL DEFAULT now()
+);
+
+COMMENT ON TABLE  public.stock_timelines             IS '종목별 공시 이벤트 + 사후 수익률 + 종가 타임라인 (EOD 배치 사전 계산)';
+COMMENT ON COLUMN public.stock_timelines.doc         IS 'events: 공시별 스코어/forward return/MDD, prices: [YYYY-MM-DD, close] 배열';
+COMMENT ON COLUMN public.stock_timelines.source_hash IS '문서 입력값 sha256 — 동일하면 upsert 생략';
+
+-- RLS
+ALTER TABLE public.stock_timelines ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Service role full access stock_timelines" ON public.stock_timelines;
+CREATE POLICY "Service role full access stock_timelines"
+  ON public.stock_timelines FOR ALL
+  USING (auth.role() = 'service_role');
@@ -0,0 +1,66 @@
+-- ============================================================
+-- 058_create_paddle_webhook_events.sql
+-- Paddle 웹훅 이벤트 멱등성 저장소 + 처리 큐
+--
+-- 배경:
+--   Paddle 은 응답이 늦거나 실패하면 같은 이벤트를 재전송한다.
+--   기존 핸들러는 요청 경로에서 subscriptions/users/payments 를 순차로 쓰고
+--   중복 검사가 없어 재전송 시 payments 가 중복 insert 되었다.
+--   요청 경로는 이 테이블에 event_id 기준 insert 1회만 하고 즉시 200 을 반환,
+--   실제 DB 반영은 백그라운드 워커가 배치로 처리한다 (backend/routers/paddle.py).
+--   uvicorn 프로세스가 여러 개여도 이벤트는 한 워커만 처리하도록
+--   pending → processing 조건부 update 로 선점하고, 반환된 행만 처리한다.
+--   payments 는 paddle_event_id 유니크 키로 upsert (ignore_duplicates) — 재처리돼도 1행.
+--   요청 경로는 처리 전에 200 을 돌려주므로 Paddle 재전송에 기대지 않고 여기서 재시도한다.
+--
+-- status:
+--   pending     수신 완료 또는 재시도 대기 (next_attempt_at 이후 워커 sweep 이 적재)
+--   processing  워커가 선점해 처리 중 (claimed_at 이 오래되면 처리 실패와 같은 재시도 경로)
+--   processed   반영 완료
+--   failed      MAX_ATTEMPTS 회 실패 — 자동 재시도 끝 (error 컬럼 확인, 수동으로 pending 복귀 가능)
+--
+-- 재시도:
+--   실패할 때마다 attempts + 1, pending 으로 되돌리고 next_attempt_at = now + 5분 × 2^(attempts-1).
+-- ============================================================
+
+CREATE TABLE IF NOT EXISTS public.paddle_webhook_events (
+  event_id      text        PRIMARY KEY,     -- Billing v2 event_id / Classic alert_id / 본문 sha256
+  event_type    text        NOT NULL DEFAULT '',
+  payload       jsonb       NOT NULL,
+  status        text        NOT NULL DEFAULT 'pending'
+                            CHECK (status IN ('pending', 'processing', 'processed', 'failed')),
+  error         text,
+  received_at   timestamptz NOT NULL DEFAULT now(),
+  claimed_at    timestamptz,
+  attempts      integer     NOT NULL DEFAULT 0,
+  next_attempt_at timestamptz,
+  processed_at  timestamptz
+);
+
+CREATE INDEX IF NOT EXISTS idx_paddle_webhook_events_pending
+  ON public.paddle_webhook_events (received_at)
+  WHERE status = 'pending';
+
+COMMENT ON TABLE  public.paddle_webhook_events          IS 'Paddle 웹훅 수신 기록 (event_id 중복 제거 + 비동기 처리 큐)';
+COMMENT ON COLUMN public.paddle_webhook_events.event_id IS 'Paddle event_id (Classic: alert_id, 없으면 본문 sha256)';
+COMMENT ON COLUMN public.paddle_webhook_events.status   IS 'pending / processing / processed / failed';
+COMMENT ON COLUMN public.paddle_webhook_events.claimed_at IS '워커가 processing 으로 선점한 시각';
+COMMENT ON COLUMN public.paddle_webhook_events.attempts   IS '처리 실패 횟수 (processing 시간 초과 포함)';
+COMMENT ON COLUMN public.paddle_webhook_events.next_attempt_at IS '재시도 가능 시각 (NULL 이면 즉시)';
+
+-- payments 멱등 키: 같은 웹훅 이벤트가 두 번 처리돼도 결제 행은 1개
+ALTER TABLE public.payments
+  ADD COLUMN IF NOT EXISTS paddle_event_id text;
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_payments_paddle_event_id
+  ON public.payments (paddle_event_id);
+
+COMMENT ON COLUMN public.payments.paddle_event_id IS 'Paddle 웹훅 event_id (paddle_webhook_events.event_id) — 중복 insert 방지';
+
+-- RLS
+ALTER TABLE public.paddle_webhook_events ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Service role full access paddle_webhook_events" ON public.paddle_webhook_events;
+CREATE POLICY "Service role full access paddle_webhook_events"
+  ON public.paddle_webhook_events FOR ALL
+  USING (auth.role() = 'service_role');
@@ -0,0 +1,35 @@
+-- ============================================================
+-- 059_create_dart_list_watermarks.sql
+-- DART 공시 목록 증분 조회 워터마크 (scripts/dart_crawler.py)
+--
+-- 배경:
+--   15분 주기 prod 배치가 매 실행마다 당일 list.json 전체 페이지를 다시 받고
+--   전 건을 disclosure_insights 에 중복 조회했다.
+--   날짜별로 마지막 total_count 를 저장해 두고, 다음 실행은 첫 페이지의 total_count 가
+--   같으면 그대로 끝낸다 (신규 공시 없음: API 1회).
+--   바뀌었으면 전체 페이지를 다시 읽고 모든 건을 disclosure_insights 기준으로 중복 제거한다.
+--   rcept_no 는 단조 증가가 아니어서(거래소 80xxxxx / 금감원 00xxxxx 계열) 최대값으로 거르지 않는다.
+--
+-- 갱신 규칙:
+--   목록을 끝까지 받은 경우에만 갱신.
+--   DB 저장 실패 건이 있으면 completed=false (061) → 다음 실행에서 전체 재조회.
+-- ============================================================
+
+CREATE TABLE IF NOT EXISTS public.dart_list_watermarks (
+  list_date     date        PRIMARY KEY,
+  max_rcept_no  text        NOT NULL,
+  total_count   integer     NOT NULL DEFAULT 0,
+  updated_at    timestamptz NOT NULL DEFAULT now()
+);
+
+COMMENT ON TABLE  public.dart_list_watermarks              IS 'DART list.json 날짜별 증분 조회 워터마크';
+COMMENT ON COLUMN public.dart_list_watermarks.max_rcept_no IS '마지막으로 저장한 최대 접수번호 (참고용 — 조회 필터에 쓰지 않음)';
+COMMENT ON COLUMN public.dart_list_watermarks.total_count  IS '마지막 조회 시 total_count (같으면 재조회 생략)';
+
+-- RLS
+ALTER TABLE public.dart_list_watermarks ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Service role full access dart_list_watermarks" ON public.dart_list_watermarks;
+CREATE POLICY "Service role full access dart_list_watermarks"
+  ON public.dart_list_watermarks FOR ALL
+  USING (auth.role() = 'service_role');
@@ -0,0 +1,16 @@
+-- 060_add_fetch_priority_to_disclosure_insights.sql
+-- 공시 처리 우선순위 점수 (scripts/disclosure_priority.py, 0~100).
+-- dart_crawler 가 저장 시 기록하고, auto_analyst 는 pending 을 이 값 내림차순으로 가져가
+-- 유상증자·합병·공급계약 같은 고시그널 공시가 정기 공시 뒤에서 기다리지 않게 한다.
+-- 기존 행은 0 (신규 수집분보다 뒤에 처리됨).
+
+ALTER TABLE public.disclosure_insights
+  ADD COLUMN IF NOT EXISTS fetch_priority SMALLINT NOT NULL DEFAULT 0;
+
+COMMENT ON COLUMN public.disclosure_insights.fetch_priority
+  IS '처리 우선순위 점수 (report_nm 기반, 높을수록 먼저). 80 이상 = top 티어 — 지연 시간 별도 집계';
+
+-- auto_analyst pending 조회 (fetch_priority DESC, rcept_dt DESC) 용 부분 인덱스
+CREATE INDEX IF NOT EXISTS idx_disclosure_insights_pending_priority
+  ON public.disclosure_insights (fetch_priority DESC, rcept_dt DESC)
+  WHERE analysis_status = 'pending';
@@ -0,0 +1,20 @@
+-- ============================================================
+-- 061_add_completed_to_dart_list_watermarks.sql
+-- dart_list_watermarks.completed — backfill 체크포인트 (scripts/dart_crawler.py)
+--
+-- 배경:
+--   범위 수집(--start/--end, --day-workers)이 쿼터 소진·중단으로 끊기면
+--   다음 실행이 처음 날짜부터 다시 목록을 훑었다.
+--   날짜별 완료 여부를 기록해 두고 끝난 날짜는 건너뛴다.
+--
+-- 갱신 규칙:
+--   true  : 해당 날짜 목록을 끝까지 조회했고 저장 실패 건 없음 (공시 없는 날 포함)
+--   false : 저장 실패 건 있음 → 다음 실행에서 total_count 와 무관하게 목록 전체 재처리
+--   최근 2일(CHECKPOINT_SETTLE_DAYS) 이내 날짜는 지연 공시 때문에 true 여도 재확인.
+-- ============================================================
+
+ALTER TABLE public.dart_list_watermarks
+  ADD COLUMN IF NOT EXISTS completed boolean NOT NULL DEFAULT false;
+
+COMMENT ON COLUMN public.dart_list_watermarks.completed IS
+  '목록 끝까지 조회 + 저장 실패 없음 (dart_crawler backfill 재개 시 skip 기준)';
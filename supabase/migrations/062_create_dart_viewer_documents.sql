@@ -0,0 +1,30 @@
+-- ============================================================
+-- 062_create_dart_viewer_documents.sql
+-- DART 웹 뷰어 rcept_no → dcmNo 매핑 (scripts/dart_crawler.py 뷰어 폴백)
+--
+-- 배경:
+--   document.xml 이 014(파일 없음)이면 뷰어 메인 페이지(main.do)에서 dcmNo 를 찾은 뒤
+--   viewer.do 로 본문을 받는다. 뷰어 요청은 초당 1회로 제한돼 있어
+--   재실행·재수집 때마다 main.do 를 다시 받는 비용이 컸다.
+--   한 번 찾은 dcmNo 를 저장해 두고 다음부터는 viewer.do 만 요청한다.
+--
+-- 갱신 규칙:
+--   main.do 에서 dcmNo 를 추출한 경우에만 upsert (추출 실패는 기록하지 않음).
+-- ============================================================
+
+CREATE TABLE IF NOT EXISTS public.dart_viewer_documents (
+  rcept_no    text        PRIMARY KEY,
+  dcm_no      text        NOT NULL,
+  updated_at  timestamptz NOT NULL DEFAULT now()
+);
+
+COMMENT ON TABLE  public.dart_viewer_documents        IS 'DART 뷰어 rcept_no → dcmNo 매핑 (뷰어 폴백 main.do 요청 생략용)';
+COMMENT ON COLUMN public.dart_viewer_documents.dcm_no IS 'viewer.do dcm_no 파라미터';
+
+-- RLS
+ALTER TABLE public.dart_viewer_documents ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Service role full access dart_viewer_documents" ON public.dart_viewer_documents;
+CREATE POLICY "Service role full access dart_viewer_documents"
+  ON public.dart_viewer_documents FOR ALL
+  USING (auth.role() = 'service_role');
@@ -0,0 +1,53 @@
+-- ============================================================
+-- 063_add_near_duplicate_detection.sql
+-- 공시 본문 유사 중복 감지 (scripts/near_dup.py, scripts/auto_analyst.py)
+--
+-- 배경:
+--   [기재정정] 재공시, 자회사 공시를 모회사가 다시 내는 경우, 같은 문구의 공정공시 반복 등
+--   사실상 같은 본문이 여러 번 들어오는데 매번 처음부터 AI 분석했다.
+--   분석 완료 시 정제 본문의 64bit SimHash 를 저장해 두고,
+--   새 공시가 최근 공시와 거의 같으면 (해밍 거리 임계값 이하) 분석 결과를 복사한다.
+--
+-- 갱신 규칙:
+--   content_simhash  auto_analyst 가 분석(또는 복사) 완료 시 기록.
+--                    기존 행은 python scripts/near_dup.py --backfill-days N 으로 채움.
+--   disclosure_near_dups  유사 공시를 찾을 때마다 1행 (복사했든 재분석했든) — 감사 로그.
+-- ============================================================
+
+ALTER TABLE public.disclosure_insights
+  ADD COLUMN IF NOT EXISTS content_simhash BIGINT;
+
+COMMENT ON COLUMN public.disclosure_insights.content_simhash
+  IS '정제 본문 64bit SimHash (signed). 유사 중복 공시 감지용 — scripts/near_dup.py';
+
+-- 최근 N일 분석 완료 공시 서명 로드용 부분 인덱스
+CREATE INDEX IF NOT EXISTS idx_disclosure_insights_simhash_recent
+  ON public.disclosure_insights (rcept_dt DESC)
+  INCLUDE (content_simhash)
+  WHERE content_simhash IS NOT NULL;
+
+CREATE TABLE IF NOT EXISTS public.disclosure_near_dups (
+  id             bigserial   PRIMARY KEY,
+  disclosure_id  uuid        NOT NULL,
+  source_id      uuid        NOT NULL,
+  similarity     real        NOT NULL,
+  action         text        NOT NULL CHECK (action IN ('copied', 'reanalyzed')),
+  reason         text,
+  created_at     timestamptz NOT NULL DEFAULT now()
+);
+
+COMMENT ON TABLE  public.disclosure_near_dups             IS '유사 중복 공시 감지 감사 로그 (auto_analyst)';
+COMMENT ON COLUMN public.disclosure_near_dups.similarity  IS '1 - 해밍거리/64';
+COMMENT ON COLUMN public.disclosure_near_dups.action      IS 'copied: 원본 분석 결과 복사 / reanalyzed: 유사하지만 새로 분석';
+COMMENT ON COLUMN public.disclosure_near_dups.reason      IS 'reanalyzed 사유 (figures_changed / title_differs / cross_corp / source_missing)';
+
+CREATE INDEX IF NOT EXISTS idx_disclosure_near_dups_created
+  ON public.disclosure_near_dups (created_at DESC);
+
+-- RLS
+ALTER TABLE public.disclosure_near_dups ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Service role full access disclosure_near_dups" ON public.disclosure_near_dups;
+CREATE POLICY "Service role full access disclosure_near_dups"
+  ON public.disclosure_near_dups FOR ALL
+  USING (auth.role() = 'service_role');
@@ -0,0 +1,84 @@
+-- ============================================================
+-- 064_add_analysis_claim_lease.sql
+-- AI 분석 대기열 일괄 claim + lease (scripts/auto_analyst.py)
+--
+-- 배경:
+--   auto_analyst 는 pending 을 limit 건 SELECT 한 뒤 건마다
+--   UPDATE ... WHERE analysis_status = 'pending' 으로 락을 잡았다 (건당 1회 왕복).
+--   워커가 여러 개면 같은 행을 서로 SELECT 하고 락 경쟁에서 대부분 헛돌았고,
+--   중간에 죽은 워커의 processing 행은 reap_stuck_processing(2시간 경과) 이 돌아야 풀렸다.
+--
+--   claim_pending_disclosures 는 FOR UPDATE SKIP LOCKED 로 N건을 한 번에 processing 으로 바꾸고
+--   그 행들을 돌려준다 — 워커마다 겹치지 않는 묶음을 1회 왕복으로 가져간다.
+--   processing 행에는 lease_expires_at 을 기록하고, 만료된 행은 다음 claim 이 다시 가져간다
+--   (별도 reaper 불필요).
+--
+-- 갱신 규칙:
+--   claimed_by / lease_expires_at  claim 시 기록. processing 이 아닌 행에서는 마지막 claim 기록일 뿐
+--                                  (완료·실패·skip 시 따로 비우지 않음).
+--   lease 만료 전 processing 행은 다른 워커가 가져가지 않음. 이전 방식으로 잠긴 행(lease 없음)은
+--   updated_at + 2시간 을 만료 시각으로 본다.
+--   처리 중인 워커는 lease 의 1/3 주기로 lease_expires_at 을 연장하고 (claimed_by = 자신 AND processing),
+--   결과 저장·상태 변경도 claimed_by = 자신 인 행에만 한다 → 재claim 된 행의 결과를 덮어쓰지 않음.
+--   p_date_from / p_date_to  'YYYYMMDD' 텍스트. rcept_dt 가 TEXT 이므로 캐스팅 없이 문자열로 비교
+--                            (기존 경로의 .gte("rcept_dt", ...) 와 같은 의미, 형식이 어긋난 행이 있어도 claim 전체가 실패하지 않음).
+--   p_exclude  같은 실행에서 이미 시도한 행 (실패로 pending 복귀한 건을 바로 다시 가져가지 않도록).
+-- ============================================================
+
+ALTER TABLE public.disclosure_insights
+  ADD COLUMN IF NOT EXISTS claimed_by       TEXT,
+  ADD COLUMN IF NOT EXISTS lease_expires_at TIMESTAMPTZ;
+
+COMMENT ON COLUMN public.disclosure_insights.claimed_by
+  IS '마지막으로 AI 분석을 claim 한 워커 ID (host:pid)';
+COMMENT ON COLUMN public.disclosure_insights.lease_expires_at
+  IS 'AI 분석 lease 만료 시각. 지나면 다른 워커가 다시 claim — scripts/auto_analyst.py';
+
+-- 만료 lease 조회용 부분 인덱스 (pending 쪽은 060 의 idx_disclosure_insights_pending_priority)
+CREATE INDEX IF NOT EXISTS idx_disclosure_insights_processing_lease
+  ON public.disclosure_insights (lease_expires_at)
+  WHERE analysis_status = 'processing';
+
+-- 날짜 인자를 date → text 로 바꾼 이전 시그니처 제거 (오버로드가 남지 않도록)
+DROP FUNCTION IF EXISTS public.claim_pending_disclosures(text, integer, integer, date, date, uuid[]);
+
+CREATE OR REPLACE FUNCTION public.claim_pending_disclosures(
+  p_worker        text,
+  p_limit         integer,
+  p_lease_seconds integer DEFAULT 900,
+  p_date_from     text    DEFAULT NULL,
+  p_date_to       text    DEFAULT NULL,
+  p_exclude       uuid[]  DEFAULT NULL
+) RETURNS SETOF public.disclosure_insights
+LANGUAGE sql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+  UPDATE public.disclosure_insights d
+     SET analysis_status  = 'processing',
+         claimed_by       = p_worker,
+         lease_expires_at = now() + make_interval(secs => p_lease_seconds),
+         updated_at       = now()
+    FROM (
+      SELECT id
+        FROM public.disclosure_insights
+       WHERE (analysis_status = 'pending'
+              OR (analysis_status = 'processing'
+                  AND COALESCE(lease_expires_at, updated_at + interval '2 hours') < now()))
+         AND (analysis_retry_count IS NULL OR analysis_retry_count < 3)
+         AND (p_date_from IS NULL OR rcept_dt >= p_date_from)
+         AND (p_date_to   IS NULL OR rcept_dt <= p_date_to)
+         AND (p_exclude   IS NULL OR id <> ALL (p_exclude))
+       ORDER BY fetch_priority DESC, rcept_dt DESC
+       LIMIT p_limit
+       FOR UPDATE SKIP LOCKED
+    ) c
+   WHERE d.id = c.id
+  RETURNING d.*;
+$$;
+
+COMMENT ON FUNCTION public.claim_pending_disclosures(text, integer, integer, text, text, uuid[])
+  IS 'pending(또는 lease 만료 processing) 공시 N건을 processing 으로 claim 하고 반환 (FOR UPDATE SKIP LOCKED)';
+
+REVOKE ALL ON FUNCTION public.claim_pending_disclosures(text, integer, integer, text, text, uuid[]) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.claim_pending_disclosures(text, integer, integer, text, text, uuid[]) TO service_role;
@@ -0,0 +1,116 @@
+-- ============================================================
+-- 065_create_llm_call_ledger.sql
+-- LLM 호출 원장 (scripts/llm_ledger.py, scripts/auto_analyst.py)
+--
+-- 배경:
+--   analyze_content 의 비용·지연은 로그 줄로만 남아, 동시성(LLM_WORKERS)·배치(LLM_BATCH_*)·
+--   본문 압축(LLM_COMPACT) 을 실제 수치로 조정할 수 없었다.
+--   LLM 요청 1회마다 모델·토큰·지연·재시도·결과와 그 호출로 분석한 공시의 최종 상태를 1행 기록하고,
+--   llm_call_daily 로 일별 집계한다 (python scripts/check_llm_usage.py).
+--
+-- 갱신 규칙:
+--   llm_call_ledger  auto_analyst 가 버퍼에 모아 INSERT (LLM_LEDGER_BATCH 행 / LLM_LEDGER_FLUSH_SEC 초).
+--                    append-only — 수정하지 않음.
+--   analysis_status  호출로 분석한 공시의 최종 상태. 배치에서 공시마다 다르면 'mixed',
+--                    저장 단계에 도달하지 않은 호출(프로세스 종료 등)은 NULL.
+--   cost_usd         기록 시점 단가(GEMINI_PRICE_IN / GEMINI_PRICE_OUT) 기준 추정치.
+-- ============================================================
+
+CREATE TABLE IF NOT EXISTS public.llm_call_ledger (
+  id               bigserial   PRIMARY KEY,
+  called_at        timestamptz NOT NULL,
+  worker           text,
+  model            text        NOT NULL,
+  prompt_version   text,
+  mode             text        NOT NULL CHECK (mode IN ('single', 'batch')),
+  items            integer     NOT NULL DEFAULT 1,
+  disclosure_ids   uuid[],
+  prompt_tokens    integer     NOT NULL DEFAULT 0,
+  output_tokens    integer     NOT NULL DEFAULT 0,
+  latency_ms       integer,
+  wall_ms          integer,
+  retries          integer     NOT NULL DEFAULT 0,
+  outcome          text        NOT NULL
+                   CHECK (outcome IN ('ok', 'partial', 'invalid', 'parse_error', 'error', 'rate_limited')),
+  error            text,
+  analysis_status  text,
+  cost_usd         numeric(12, 6) NOT NULL DEFAULT 0,
+  created_at       timestamptz NOT NULL DEFAULT now()
+);
+
+COMMENT ON TABLE  public.llm_call_ledger                 IS 'LLM 호출 원장 — 요청 1회당 1행 (auto_analyst)';
+COMMENT ON COLUMN public.llm_call_ledger.called_at       IS '요청 시작 시각 (제한기 대기 전)';
+COMMENT ON COLUMN public.llm_call_ledger.worker          IS 'ANALYST_WORKER_ID (host:pid)';
+COMMENT ON COLUMN public.llm_call_ledger.prompt_version  IS '프롬프트 템플릿 지문 (llm_cache.prompt_fingerprint)';
+COMMENT ON COLUMN public.llm_call_ledger.items           IS '요청에 담긴 공시 수 (단건 1)';
+COMMENT ON COLUMN public.llm_call_ledger.latency_ms      IS '마지막 시도의 모델 응답 시간';
+COMMENT ON COLUMN public.llm_call_ledger.wall_ms         IS '제한기 대기 + 429 백오프 포함 전체 시간';
+COMMENT ON COLUMN public.llm_call_ledger.retries         IS '429 재시도 횟수';
+COMMENT ON COLUMN public.llm_call_ledger.outcome         IS 'ok / partial(배치 일부 유효) / invalid(스키마 불일치) / parse_error / error / rate_limited';
+COMMENT ON COLUMN public.llm_call_ledger.analysis_status IS '분석한 공시의 최종 analysis_status (배치 혼합이면 mixed)';
+
+CREATE INDEX IF NOT EXISTS idx_llm_call_ledger_called_at
+  ON public.llm_call_ledger (called_at DESC);
+
+-- RLS
+ALTER TABLE public.llm_call_ledger ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Service role full access llm_call_ledger" ON public.llm_call_ledger;
+CREATE POLICY "Service role full access llm_call_ledger"
+  ON public.llm_call_ledger FOR ALL
+  USING (auth.role() = 'service_role');
+
+-- 일별(KST) × 모델 × 단건/배치 집계. outcomes / statuses 는 {값: 호출 수}
+CREATE OR REPLACE FUNCTION public.llm_call_daily(p_since date DEFAULT NULL)
+RETURNS TABLE (
+  day             date,
+  model           text,
+  mode            text,
+  calls           bigint,
+  items           bigint,
+  retries         bigint,
+  prompt_tokens   bigint,
+  output_tokens   bigint,
+  cost_usd        numeric,
+  p50_latency_ms  double precision,
+  p90_latency_ms  double precision,
+  p99_latency_ms  double precision,
+  p90_wall_ms     double precision,
+  outcomes        jsonb,
+  statuses        jsonb
+)
+LANGUAGE sql
+STABLE
+SECURITY DEFINER
+SET search_path = public
+AS $$
+  WITH l AS (
+    SELECT (g.called_at AT TIME ZONE 'Asia/Seoul')::date AS d, g.*
+      FROM public.llm_call_ledger g
+     WHERE g.called_at >= (COALESCE(p_since, current_date - 14)::timestamp AT TIME ZONE 'Asia/Seoul')
+  )
+  SELECT l.d, l.model, l.mode,
+         count(*), sum(l.items), sum(l.retries),
+         sum(l.prompt_tokens), sum(l.output_tokens), sum(l.cost_usd),
+         percentile_cont(0.5)  WITHIN GROUP (ORDER BY l.latency_ms),
+         percentile_cont(0.9)  WITHIN GROUP (ORDER BY l.latency_ms),
+         percentile_cont(0.99) WITHIN GROUP (ORDER BY l.latency_ms),
+         percentile_cont(0.9)  WITHIN GROUP (ORDER BY l.wall_ms),
+         (SELECT jsonb_object_agg(o.outcome, o.n)
+            FROM (SELECT x.outcome, count(*) AS n FROM l x
+                   WHERE x.d = l.d AND x.model = l.model AND x.mode = l.mode
+                   GROUP BY x.outcome) o),
+         (SELECT jsonb_object_agg(s.st, s.n)
+            FROM (SELECT COALESCE(x.analysis_status, 'unknown') AS st, count(*) AS n FROM l x
+                   WHERE x.d = l.d AND x.model = l.model AND x.mode = l.mode
+                   GROUP BY 1) s)
+    FROM l
+   GROUP BY l.d, l.model, l.mode
+   ORDER BY l.d, l.model, l.mode;
+$$;
+
+COMMENT ON FUNCTION public.llm_call_daily(date)
+  IS 'llm_call_ledger 일별(KST) × 모델 × 단건/배치 집계 — scripts/check_llm_usage.py';
+
+REVOKE ALL ON FUNCTION public.llm_call_daily(date) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.llm_call_daily(date) TO service_role;